@@ -0,0 +1,400 @@
+"""
+Benchmarks for the stages of a backtest, using the shipped .csv data and the chapter 15 systems
+
+Each benchmark times one stage method across all the instruments in a system, with everything upstream
+already in the cache, so we only time the stage itself. They are run for one or more instrument counts.
+We record the best wall clock time over a number of repeats, and the peak memory allocated while running
+the stage (measured in a separate run, as tracing allocations slows things down).
+
+Results are written as json, and two sets of results (eg from before and after a change) can be compared:
+
+    python -m benchmarks.backtest_stages run --instrument-counts 6 20 --output before.json
+    ... make changes ...
+    python -m benchmarks.backtest_stages run --instrument-counts 6 20 --output after.json
+    python -m benchmarks.backtest_stages compare before.json after.json
+
+compare exits with a non zero status if anything is slower or uses more memory than the tolerance allows.
+"""
+
+import argparse
+import datetime
+import json
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from syscore.objects import arg_not_supplied
+from sysdata.config.configdata import Config
+from sysdata.sim.csv_futures_sim_data import csvFuturesSimData
+from systems.provided.futures_chapter15.basesystem import (
+    futures_system as base_futures_system,
+)
+from systems.provided.futures_chapter15.estimatedsystem import (
+    futures_system as estimated_futures_system,
+)
+
+BASE_SYSTEM = "base"
+ESTIMATED_SYSTEM = "estimated"
+
+BASE_CONFIG = "systems.provided.futures_chapter15.futuresconfig.yaml"
+ESTIMATED_CONFIG = "systems.provided.futures_chapter15.futuresestimateconfig.yaml"
+
+DEFAULT_INSTRUMENT_COUNTS = [6]
+DEFAULT_REPEATS = 1
+DEFAULT_TIME_TOLERANCE = 0.2
+DEFAULT_MEMORY_TOLERANCE = 0.2
+
+# we don't want instruments with so little data that they distort the timings
+MINIMUM_DAYS_OF_DATA = 750
+
+BYTES_IN_MB = 1024 * 1024
+
+
+def rawdata_vol(system, instrument_list: list):
+    for instrument_code in instrument_list:
+        system.rawdata.daily_returns_volatility(instrument_code)
+
+
+def raw_forecasts(system, instrument_list: list):
+    for instrument_code in instrument_list:
+        for rule_variation_name in system.combForecast.get_trading_rule_list(
+            instrument_code
+        ):
+            system.rules.get_raw_forecast(instrument_code, rule_variation_name)
+
+
+def forecast_scaling(system, instrument_list: list):
+    for instrument_code in instrument_list:
+        for rule_variation_name in system.combForecast.get_trading_rule_list(
+            instrument_code
+        ):
+            system.forecastScaleCap.get_capped_forecast(
+                instrument_code, rule_variation_name
+            )
+
+
+def forecast_combination(system, instrument_list: list):
+    for instrument_code in instrument_list:
+        system.combForecast.get_combined_forecast(instrument_code)
+
+
+def position_sizing(system, instrument_list: list):
+    for instrument_code in instrument_list:
+        system.positionSize.get_subsystem_position(instrument_code)
+
+
+def accounts_pandl(system, instrument_list: list):
+    system.accounts.portfolio().sharpe()
+
+
+def instrument_weight_estimation(system, instrument_list: list):
+    system.portfolio.get_instrument_weights()
+
+
+## Each benchmark is timed after the stages before it in this list have been calculated
+BASE_SYSTEM_STAGES = [
+    rawdata_vol,
+    raw_forecasts,
+    forecast_scaling,
+    forecast_combination,
+    position_sizing,
+    accounts_pandl,
+]
+
+ESTIMATED_SYSTEM_STAGES = [position_sizing, instrument_weight_estimation]
+
+ALL_BENCHMARKS = dict(
+    [
+        ("%s/%s" % (BASE_SYSTEM, stage_function.__name__), (BASE_SYSTEM, stage_function))
+        for stage_function in BASE_SYSTEM_STAGES
+    ]
+    + [
+        (
+            "%s/%s" % (ESTIMATED_SYSTEM, stage_function.__name__),
+            (ESTIMATED_SYSTEM, stage_function),
+        )
+        for stage_function in ESTIMATED_SYSTEM_STAGES[1:]
+    ]
+)
+
+
+def run_benchmarks(
+    instrument_counts: list = arg_not_supplied,
+    benchmark_names: list = arg_not_supplied,
+    repeats: int = DEFAULT_REPEATS,
+) -> dict:
+    """
+    :param instrument_counts: list of int, numbers of instruments to run each benchmark for
+    :param benchmark_names: list of str, defaults to all of ALL_BENCHMARKS
+    :param repeats: we report the fastest of this many runs
+    :return: dict with keys 'metadata' and 'results', which can be saved as json
+    """
+    if instrument_counts is arg_not_supplied:
+        instrument_counts = DEFAULT_INSTRUMENT_COUNTS
+    if benchmark_names is arg_not_supplied:
+        benchmark_names = list(ALL_BENCHMARKS.keys())
+
+    all_instruments = instruments_for_benchmarks(max(instrument_counts))
+
+    results = []
+    for instrument_count in instrument_counts:
+        instrument_list = all_instruments[:instrument_count]
+        for benchmark_name in benchmark_names:
+            result = run_single_benchmark(
+                benchmark_name, instrument_list=instrument_list, repeats=repeats
+            )
+            print(
+                "%s with %d instruments: %.3f seconds, peak memory %.1f MB"
+                % (
+                    benchmark_name,
+                    len(instrument_list),
+                    result["seconds"],
+                    result["peak_memory_mb"],
+                )
+            )
+            results.append(result)
+
+    return dict(metadata=_metadata(), results=results)
+
+
+def run_single_benchmark(benchmark_name: str, instrument_list: list, repeats: int) -> dict:
+    system_name, stage_function = ALL_BENCHMARKS[benchmark_name]
+
+    all_seconds = []
+    for _ in range(repeats):
+        system = _system_ready_for_stage(system_name, stage_function, instrument_list)
+        start_time = time.perf_counter()
+        stage_function(system, instrument_list)
+        all_seconds.append(time.perf_counter() - start_time)
+
+    system = _system_ready_for_stage(system_name, stage_function, instrument_list)
+    tracemalloc.start()
+    try:
+        stage_function(system, instrument_list)
+        _, peak_memory = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return dict(
+        benchmark=benchmark_name,
+        n_instruments=len(instrument_list),
+        seconds=min(all_seconds),
+        all_seconds=all_seconds,
+        peak_memory_mb=peak_memory / BYTES_IN_MB,
+    )
+
+
+def _system_ready_for_stage(system_name: str, stage_function, instrument_list: list):
+    # a new data object each time, so data reads aren't already cached
+    data = csvFuturesSimData()
+    if system_name == BASE_SYSTEM:
+        config = Config(BASE_CONFIG)
+        # equal weights, so we can use any instruments
+        config.instrument_weights = dict(
+            [
+                (instrument_code, 1.0 / len(instrument_list))
+                for instrument_code in instrument_list
+            ]
+        )
+        system = base_futures_system(data=data, config=config, log_level="off")
+        list_of_stages = BASE_SYSTEM_STAGES
+    elif system_name == ESTIMATED_SYSTEM:
+        config = Config(ESTIMATED_CONFIG)
+        config.instruments = instrument_list
+        system = estimated_futures_system(data=data, config=config, log_level="off")
+        list_of_stages = ESTIMATED_SYSTEM_STAGES
+    else:
+        raise Exception("System %s not recognised" % system_name)
+
+    for earlier_stage_function in list_of_stages[: list_of_stages.index(stage_function)]:
+        earlier_stage_function(system, instrument_list)
+
+    return system
+
+
+def instruments_for_benchmarks(instrument_count: int) -> list:
+    """
+    The instruments in the chapter 15 config first, then others from the shipped data in alphabetical order
+
+    Always the same instruments for a given count, so results can be compared
+    """
+    data = csvFuturesSimData()
+    config_instruments = Config(ESTIMATED_CONFIG).instruments
+    other_instruments = [
+        instrument_code
+        for instrument_code in sorted(data.get_instrument_list())
+        if instrument_code not in config_instruments
+    ]
+
+    instrument_list = []
+    for instrument_code in config_instruments + other_instruments:
+        if len(instrument_list) >= instrument_count:
+            break
+        if _instrument_has_enough_data(data, instrument_code):
+            instrument_list.append(instrument_code)
+
+    if len(instrument_list) < instrument_count:
+        raise Exception(
+            "Only %d instruments have enough data, can't run benchmarks for %d"
+            % (len(instrument_list), instrument_count)
+        )
+
+    return instrument_list
+
+
+def _instrument_has_enough_data(data: csvFuturesSimData, instrument_code: str) -> bool:
+    try:
+        data.get_instrument_object_with_meta_data(instrument_code)
+        daily_prices = data.daily_prices(instrument_code)
+        multiple_prices = data.get_multiple_prices(instrument_code)
+    except Exception:
+        return False
+
+    return len(daily_prices) >= MINIMUM_DAYS_OF_DATA and len(multiple_prices) > 0
+
+
+def _metadata() -> dict:
+    return dict(
+        git_commit=_git_commit(),
+        timestamp=datetime.datetime.now().isoformat(),
+        python_version=platform.python_version(),
+        pandas_version=pd.__version__,
+        numpy_version=np.__version__,
+        machine=platform.node(),
+    )
+
+
+def _git_commit() -> str:
+    try:
+        return (
+            subprocess.check_output(
+                ["git", "rev-parse", "HEAD"], stderr=subprocess.DEVNULL
+            )
+            .decode()
+            .strip()
+        )
+    except Exception:
+        return ""
+
+
+def compare_benchmark_results(
+    old_results: dict,
+    new_results: dict,
+    time_tolerance: float = DEFAULT_TIME_TOLERANCE,
+    memory_tolerance: float = DEFAULT_MEMORY_TOLERANCE,
+) -> pd.DataFrame:
+    """
+    :param time_tolerance: eg 0.2 means we flag a regression if anything takes more than 20% longer
+    :param memory_tolerance: same, for peak memory
+    :return: pd.DataFrame, one row per benchmark and instrument count in both sets of results
+    """
+    old_results = _results_as_df(old_results)
+    new_results = _results_as_df(new_results)
+    comparison = old_results.join(
+        new_results, how="inner", lsuffix="_old", rsuffix="_new"
+    )
+
+    comparison["time_ratio"] = comparison.seconds_new / comparison.seconds_old
+    comparison["memory_ratio"] = (
+        comparison.peak_memory_mb_new / comparison.peak_memory_mb_old
+    )
+    comparison["regression"] = (comparison.time_ratio > 1 + time_tolerance) | (
+        comparison.memory_ratio > 1 + memory_tolerance
+    )
+
+    return comparison
+
+
+def _results_as_df(results: dict) -> pd.DataFrame:
+    results_df = pd.DataFrame(results["results"])
+
+    return results_df.set_index(["benchmark", "n_instruments"])[
+        ["seconds", "peak_memory_mb"]
+    ]
+
+
+def _run_from_command_line(parsed_args):
+    results = run_benchmarks(
+        instrument_counts=parsed_args.instrument_counts,
+        benchmark_names=_benchmark_names_or_all(parsed_args.benchmarks),
+        repeats=parsed_args.repeats,
+    )
+    with open(parsed_args.output, "w") as output_file:
+        json.dump(results, output_file, indent=2)
+
+    print("Results written to %s" % parsed_args.output)
+
+
+def _benchmark_names_or_all(benchmark_names: list):
+    if benchmark_names is None:
+        return arg_not_supplied
+
+    return benchmark_names
+
+
+def _compare_from_command_line(parsed_args) -> int:
+    with open(parsed_args.old_results) as old_file:
+        old_results = json.load(old_file)
+    with open(parsed_args.new_results) as new_file:
+        new_results = json.load(new_file)
+
+    comparison = compare_benchmark_results(
+        old_results,
+        new_results,
+        time_tolerance=parsed_args.time_tolerance,
+        memory_tolerance=parsed_args.memory_tolerance,
+    )
+
+    with pd.option_context("display.width", 200, "display.max_columns", 20):
+        print(comparison)
+
+    regressions = comparison[comparison.regression]
+    if len(regressions) > 0:
+        print("Regressions in: %s" % ", ".join(str(idx) for idx in regressions.index))
+        return 1
+
+    print("No regressions")
+    return 0
+
+
+def _parse_args(args: list):
+    parser = argparse.ArgumentParser(description="Benchmark backtest stages")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = subparsers.add_parser("run")
+    run_parser.add_argument(
+        "--instrument-counts", type=int, nargs="+", default=DEFAULT_INSTRUMENT_COUNTS
+    )
+    run_parser.add_argument(
+        "--benchmarks",
+        nargs="+",
+        choices=list(ALL_BENCHMARKS.keys()),
+        default=None,
+    )
+    run_parser.add_argument("--repeats", type=int, default=DEFAULT_REPEATS)
+    run_parser.add_argument("--output", default="benchmark_results.json")
+
+    compare_parser = subparsers.add_parser("compare")
+    compare_parser.add_argument("old_results")
+    compare_parser.add_argument("new_results")
+    compare_parser.add_argument(
+        "--time-tolerance", type=float, default=DEFAULT_TIME_TOLERANCE
+    )
+    compare_parser.add_argument(
+        "--memory-tolerance", type=float, default=DEFAULT_MEMORY_TOLERANCE
+    )
+
+    return parser.parse_args(args)
+
+
+if __name__ == "__main__":
+    parsed_args = _parse_args(sys.argv[1:])
+    if parsed_args.command == "run":
+        _run_from_command_line(parsed_args)
+    else:
+        sys.exit(_compare_from_command_line(parsed_args))
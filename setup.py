@@ -103,7 +103,7 @@ setup(
         "PyPDF2>=2.5.0"
     ],
     tests_require=["nose", "flake8"],
-    extras_require=dict(),
+    extras_require=dict(parquet=["pyarrow"]),
     test_suite="nose.collector",
     include_package_data=True,
 )
@@ -1,21 +1,15 @@
 from dateutil.tz import tz
-import datetime
 
 from ib_insync import Contract
 from ib_insync import IB
 
 from sysbrokers.IB.ib_connection import connectionIB
+from sysbrokers.IB.client.ib_pacing import historicalDataPacer
 
 from syscore.dateutils import strip_timezone_fromdatetime
 from syslogdiag.logger import logger
 from syslogdiag.log_to_screen import logtoscreen
 
-# IB state that pacing violations only occur for bar sizes of less than 1 minute
-# See footnote at bottom of
-# https://interactivebrokers.github.io/tws-api/historical_limitations.html#pacing_violations
-PACING_INTERVAL_SECONDS = 0.5
-
-
 STALE_SECONDS_ALLOWED_ACCOUNT_SUMMARY = 600
 
 IB_ERROR_TYPES = {200: "invalid_contract"}
@@ -34,10 +28,8 @@ class ibClient(object):
         self, ibconnection: connectionIB, log: logger = logtoscreen("ibClient")
     ):
 
-        # means our first call won't be throttled for pacing
-        self.last_historic_price_calltime = (
-            datetime.datetime.now() - datetime.timedelta(seconds=PACING_INTERVAL_SECONDS)
-        )
+        # shared by all historical data requests made through this client, one at a time or concurrently
+        self.historical_data_pacer = historicalDataPacer()
 
         # Add error handler
         ibconnection.ib.errorEvent += self.error_handler
@@ -0,0 +1,130 @@
+"""
+Pacing of historical data requests to IB
+
+Rather than waiting a fixed interval after every request, we use a token bucket: tokens drip in at the rate
+IB allow, up to a small burst, and each request takes one. Requests that find the bucket empty wait until
+the next token is due, so several requests can be in flight at once without breaking the pacing limits.
+"""
+
+import asyncio
+import time
+
+from syslogdiag.logger import logger
+
+# IB state that pacing violations only occur for bar sizes of less than 1 minute
+# See footnote at bottom of
+# https://interactivebrokers.github.io/tws-api/historical_limitations.html#pacing_violations
+PACING_INTERVAL_SECONDS = 0.5
+
+# Six or more identical requests within 2 seconds is a pacing violation, so stay below that
+# See https://interactivebrokers.github.io/tws-api/historical_limitations.html#pacing_violations
+HISTORICAL_REQUEST_BURST = 5
+
+# IB allow at most 50 historical data requests to be open at once; leave some room for anything else
+MAX_CONCURRENT_HISTORICAL_REQUESTS = 40
+
+# ib_insync cancels a request after this long, and returns no bars, as if there was no data
+HISTORICAL_REQUEST_TIMEOUT_SECONDS = 60
+
+
+class tokenBucket(object):
+    def __init__(
+        self,
+        tokens_per_second: float = 1.0 / PACING_INTERVAL_SECONDS,
+        capacity: int = HISTORICAL_REQUEST_BURST,
+        clock=time.monotonic,
+    ):
+        self._tokens_per_second = float(tokens_per_second)
+        self._capacity = float(capacity)
+        self._clock = clock
+
+        # means our first calls won't be throttled for pacing
+        self._tokens = self._capacity
+        self._last_refill = clock()
+
+    @property
+    def capacity(self) -> float:
+        return self._capacity
+
+    def seconds_until_token_available(self) -> float:
+        self._refill()
+        tokens_short = 1.0 - self._tokens
+        if tokens_short <= 0:
+            return 0.0
+
+        return tokens_short / self._tokens_per_second
+
+    def try_to_take_token(self) -> bool:
+        self._refill()
+        if self._tokens < 1.0:
+            return False
+
+        self._tokens = self._tokens - 1.0
+
+        return True
+
+    async def wait_for_token(self):
+        while not self.try_to_take_token():
+            await asyncio.sleep(self.seconds_until_token_available())
+
+    def wait_for_token_blocking(self, sleep_function=time.sleep, log: logger = None):
+        seconds_to_wait = self.seconds_until_token_available()
+        if seconds_to_wait > 0 and log is not None:
+            log.msg("Pausing %f seconds to avoid pacing violation" % seconds_to_wait)
+
+        while not self.try_to_take_token():
+            sleep_function(self.seconds_until_token_available())
+
+    def _refill(self):
+        now = self._clock()
+        elapsed = max(now - self._last_refill, 0.0)
+        self._tokens = min(
+            self._capacity, self._tokens + elapsed * self._tokens_per_second
+        )
+        self._last_refill = now
+
+
+class historicalDataPacer(object):
+    """
+    Paces historical data requests, whether they are made one at a time or concurrently:
+       a token bucket limits the rate, and a semaphore limits how many are in flight at once
+    """
+
+    def __init__(
+        self,
+        token_bucket: tokenBucket = None,
+        max_concurrent_requests: int = MAX_CONCURRENT_HISTORICAL_REQUESTS,
+    ):
+        if token_bucket is None:
+            token_bucket = tokenBucket()
+
+        self._token_bucket = token_bucket
+        self._max_concurrent_requests = max_concurrent_requests
+
+    @property
+    def token_bucket(self) -> tokenBucket:
+        return self._token_bucket
+
+    @property
+    def max_concurrent_requests(self) -> int:
+        return self._max_concurrent_requests
+
+    def wait_before_request(self, sleep_function=time.sleep, log: logger = None):
+        self.token_bucket.wait_for_token_blocking(
+            sleep_function=sleep_function, log=log
+        )
+
+    async def paced_request(self, semaphore: asyncio.Semaphore, request_coroutine_function):
+        """
+        Awaits a request once we have a token, and a slot to make it in
+
+        :param semaphore: shared between all the requests we are making concurrently, created in the event loop
+        :param request_coroutine_function: no arguments, returns the coroutine for the request
+        """
+        async with semaphore:
+            await self.token_bucket.wait_for_token()
+            return await request_coroutine_function()
+
+    def new_semaphore(self) -> asyncio.Semaphore:
+        return asyncio.Semaphore(self.max_concurrent_requests)
+
@@ -1,13 +1,15 @@
 from dateutil.tz import tz
 
+import asyncio
 import datetime
+import time
 import pandas as pd
 
 from ib_insync import Contract as ibContract
 from ib_insync import util
 
-from sysbrokers.IB.client.ib_client import PACING_INTERVAL_SECONDS
 from sysbrokers.IB.client.ib_contracts_client import ibContractsClient
+from sysbrokers.IB.client.ib_pacing import HISTORICAL_REQUEST_TIMEOUT_SECONDS
 from sysbrokers.IB.ib_positions import resolveBS_for_list
 from sysbrokers.IB.ib_instruments_data import instrumentWithIBConfigData
 from sysbrokers.IB.ib_instruments import ib_equity_instrument
@@ -69,7 +71,93 @@ class ibPriceClient(ibContractsClient):
 
         return price_data
 
+    def broker_get_historical_futures_data_for_list_of_contracts(
+        self,
+        list_of_contracts_and_frequencies: list,
+        whatToShow="TRADES",
+        allow_expired=False,
+    ):
+        """
+        Get historical data for many contracts and frequencies, with the requests made concurrently within
+        the IB pacing limits
+
+        :param list_of_contracts_and_frequencies: list of (contract where instrument has ib metadata, Frequency)
+        :return: generator; each time some requests have finished, yields list of (index in list, pd.DataFrame),
+           with missing_data if something went wrong
+        """
+
+        list_of_requests = []
+        list_of_failures = []
+        for idx, (contract_object_with_ib_broker_config, bar_freq) in enumerate(
+            list_of_contracts_and_frequencies
+        ):
+            specific_log = contract_object_with_ib_broker_config.specific_log(
+                self.log
+            )
+            ibcontract = self.ib_futures_contract(
+                contract_object_with_ib_broker_config, allow_expired=allow_expired
+            )
+
+            if ibcontract is missing_contract:
+                specific_log.warn(
+                    "Can't resolve IB contract %s"
+                    % str(contract_object_with_ib_broker_config)
+                )
+                list_of_failures.append((idx, missing_data))
+                continue
+
+            try:
+                barSizeSetting, durationStr = _get_barsize_and_duration_from_frequency(
+                    bar_freq
+                )
+            except Exception as exception:
+                specific_log.warn(exception)
+                list_of_failures.append((idx, missing_data))
+                continue
+
+            list_of_requests.append(
+                dict(
+                    idx=idx,
+                    ibcontract=ibcontract,
+                    durationStr=durationStr,
+                    barSizeSetting=barSizeSetting,
+                    whatToShow=whatToShow,
+                    log=specific_log,
+                )
+            )
 
+        if len(list_of_failures) > 0:
+            yield list_of_failures
+
+        yield from self._get_generic_data_for_list_of_requests(list_of_requests)
+
+    def _get_generic_data_for_list_of_requests(self, list_of_requests: list):
+        if len(list_of_requests) == 0:
+            return
+
+        async def _start_requests() -> list:
+            ## the semaphore has to be created inside the event loop the requests run in
+            semaphore = self.historical_data_pacer.new_semaphore()
+            return [
+                asyncio.ensure_future(
+                    self._ib_get_historical_data_as_df_async(
+                        semaphore=semaphore, **request
+                    )
+                )
+                for request in list_of_requests
+            ]
+
+        pending = set(self.ib.run(_start_requests()))
+        try:
+            while len(pending) > 0:
+                done, pending = self.ib.run(
+                    asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                )
+                yield [task.result() for task in done]
+        finally:
+            # only if we were abandoned part way through
+            for task in pending:
+                task.cancel()
 
     def broker_get_historical_equity_data_for_instrument(
             self,
@@ -292,8 +380,9 @@ class ibPriceClient(ibContractsClient):
         if log is None:
             log = self.log
 
-        last_call = self.last_historic_price_calltime
-        _avoid_pacing_violation(last_call, log=log)
+        self.historical_data_pacer.wait_before_request(
+            sleep_function=self.ib.sleep, log=log
+        )
 
         bars = self.ib.reqHistoricalData(
             ibcontract,
@@ -306,10 +395,68 @@ class ibPriceClient(ibContractsClient):
         )
         df = util.df(bars)
 
-        self.last_historic_price_calltime = datetime.datetime.now()
-
         return df
 
+    async def _ib_get_historical_data_as_df_async(
+        self,
+        idx: int,
+        ibcontract: ibContract,
+        semaphore: asyncio.Semaphore,
+        durationStr: str = "1 Y",
+        barSizeSetting: str = "1 day",
+        whatToShow="TRADES",
+        log: logger = None,
+    ) -> tuple:
+        """
+        As _ib_get_historical_data_of_duration_and_barSize, but awaits its turn to make the request
+
+        :returns tuple: idx, pd.DataFrame of prices or missing_data
+        """
+        if log is None:
+            log = self.log
+
+        try:
+            bars, seconds_taken = await self.historical_data_pacer.paced_request(
+                semaphore,
+                lambda: _timed_request(
+                    self.ib.reqHistoricalDataAsync(
+                        ibcontract,
+                        endDateTime="",
+                        durationStr=durationStr,
+                        barSizeSetting=barSizeSetting,
+                        whatToShow=whatToShow,
+                        useRTH=True,
+                        formatDate=2,
+                        timeout=HISTORICAL_REQUEST_TIMEOUT_SECONDS,
+                    )
+                ),
+            )
+            ## the event loop can time out a fraction early
+            timed_out = seconds_taken >= HISTORICAL_REQUEST_TIMEOUT_SECONDS * 0.99
+            if len(bars) == 0 and timed_out:
+                log.warn(
+                    "Historical data request timed out after %d seconds, rather than there being no data"
+                    % HISTORICAL_REQUEST_TIMEOUT_SECONDS
+                )
+                return idx, missing_data
+
+            price_data_raw = util.df(bars)
+            price_data_as_df = self._raw_ib_data_to_df(
+                price_data_raw=price_data_raw, log=log
+            )
+        except Exception as exception:
+            log.warn("Error getting historical data from IB: %s" % str(exception))
+            price_data_as_df = missing_data
+
+        return idx, price_data_as_df
+
+
+async def _timed_request(request_coroutine) -> tuple:
+    start_time = time.monotonic()
+    result = await request_coroutine
+
+    return result, time.monotonic() - start_time
+
 
 def _get_barsize_and_duration_from_frequency(bar_freq: Frequency) -> (str, str):
 
@@ -350,28 +497,3 @@ def _get_barsize_and_duration_from_frequency(bar_freq: Frequency) -> (str, str):
 
     return ib_barsize, ib_duration
 
-
-def _avoid_pacing_violation(
-    last_call_datetime: datetime.datetime, log: logger = logtoscreen("")
-):
-    printed_warning_already = False
-    while _pause_for_pacing(last_call_datetime):
-        if not printed_warning_already:
-            log.msg(
-                "Pausing %f seconds to avoid pacing violation"
-                % (
-                    last_call_datetime
-                    + datetime.timedelta(seconds=PACING_INTERVAL_SECONDS)
-                    - datetime.datetime.now()
-                ).total_seconds()
-            )
-            printed_warning_already = True
-        pass
-
-
-def _pause_for_pacing(last_call_datetime: datetime.datetime):
-    time_since_last_call = datetime.datetime.now() - last_call_datetime
-    seconds_since_last_call = time_since_last_call.total_seconds()
-    should_pause = seconds_since_last_call < PACING_INTERVAL_SECONDS
-
-    return should_pause
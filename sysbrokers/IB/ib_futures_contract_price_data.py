@@ -185,6 +185,54 @@ class ibFuturesContractPriceData(brokerFuturesContractPriceData):
 
         return prices
 
+    def get_prices_at_frequency_for_list_of_contract_objects(
+        self, list_of_contracts_and_frequencies: list
+    ):
+        """
+        Get prices for many contracts and frequencies, making the requests to IB concurrently
+
+        :param list_of_contracts_and_frequencies: list of (futuresContract, Frequency)
+        :return: generator; each time some prices have arrived, yields list of (index in list, futuresContractPrices),
+           with missing_data if something went wrong
+        """
+        list_of_failures = []
+        list_with_ib_broker_config = []
+        original_index = []
+        for idx, (futures_contract_object, frequency) in enumerate(
+            list_of_contracts_and_frequencies
+        ):
+            contract_object_with_ib_broker_config = (
+                self.futures_contract_data.get_contract_object_with_IB_data(
+                    futures_contract_object
+                )
+            )
+            if contract_object_with_ib_broker_config is missing_contract:
+                new_log = futures_contract_object.log(self.log)
+                new_log.warn("Can't get data for %s" % str(futures_contract_object))
+                list_of_failures.append((idx, missing_data))
+                continue
+
+            list_with_ib_broker_config.append(
+                (contract_object_with_ib_broker_config, frequency)
+            )
+            original_index.append(idx)
+
+        if len(list_of_failures) > 0:
+            yield list_of_failures
+
+        for list_of_price_data in self.ib_client.broker_get_historical_futures_data_for_list_of_contracts(
+            list_with_ib_broker_config
+        ):
+            yield [
+                (
+                    original_index[ib_idx],
+                    self._futures_contract_prices_from_ib_price_data(
+                        price_data, list_with_ib_broker_config[ib_idx][0]
+                    ),
+                )
+                for ib_idx, price_data in list_of_price_data
+            ]
+
     def _get_prices_at_frequency_for_contract_object_no_checking(self,
             futures_contract_object: futuresContract, frequency: Frequency) -> futuresContractPrices:
 
@@ -232,14 +280,22 @@ class ibFuturesContractPriceData(brokerFuturesContractPriceData):
         allow_expired: bool = False,
     ) -> futuresContractPrices:
 
-        new_log = contract_object_with_ib_broker_config.log(self.log)
-
         price_data = self.ib_client.broker_get_historical_futures_data_for_contract(
             contract_object_with_ib_broker_config,
             bar_freq=freq,
             allow_expired=allow_expired,
         )
 
+        return self._futures_contract_prices_from_ib_price_data(
+            price_data, contract_object_with_ib_broker_config
+        )
+
+    def _futures_contract_prices_from_ib_price_data(
+        self, price_data, contract_object_with_ib_broker_config
+    ) -> futuresContractPrices:
+
+        new_log = contract_object_with_ib_broker_config.log(self.log)
+
         if price_data is missing_data:
             new_log.warn(
                 "Something went wrong getting IB price data for %s"
@@ -458,6 +458,15 @@ class ibExecutionStackData(brokerExecutionStackData):
 
         return broker_order_with_controls
 
+    def add_callback_on_order_status_change(self, callback):
+        ## ib_insync only fires these whilst its event loop is running, eg in sleep_and_process_broker_messages
+        ib = self.ibconnection.ib
+        ib.orderStatusEvent += lambda trade: callback()
+        ib.execDetailsEvent += lambda trade, fill: callback()
+
+    def sleep_and_process_broker_messages(self, seconds: float):
+        self.ibconnection.ib.sleep(seconds)
+
 
 def add_trade_info_to_broker_order(
     broker_order: brokerOrder, broker_order_from_trade_object: ibBrokerOrder
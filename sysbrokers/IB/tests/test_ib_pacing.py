@@ -0,0 +1,131 @@
+import asyncio
+
+import pandas as pd
+from ib_insync import IB, BarData
+
+from sysbrokers.IB.client import ib_price_client
+from sysbrokers.IB.client.ib_pacing import historicalDataPacer, tokenBucket
+from sysbrokers.IB.client.ib_price_client import ibPriceClient
+from syscore.dateutils import DAILY_PRICE_FREQ
+from syscore.objects import missing_data
+
+
+class _fakeClock(object):
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float):
+        self.now += seconds
+
+
+class _fakeIB(IB):
+    """
+    Answers historical data requests after a delay, keeping track of how many were open at once
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.requests_open = 0
+        self.max_requests_open = 0
+
+    async def reqHistoricalDataAsync(self, contract, durationStr, **kwargs):
+        self.requests_open += 1
+        self.max_requests_open = max(self.max_requests_open, self.requests_open)
+        await asyncio.sleep(0.01 * contract)
+        self.requests_open -= 1
+
+        return [
+            BarData(
+                date=pd.Timestamp("2021-01-04").date(),
+                open=contract,
+                high=contract,
+                low=contract,
+                close=contract,
+                volume=1,
+            )
+        ]
+
+
+class _fakeConnection(object):
+    def __init__(self):
+        self.ib = _fakeIB()
+
+
+class _fakeContract(object):
+    def __init__(self, number: int):
+        self.number = number
+
+    def specific_log(self, log):
+        return log
+
+
+class _fakePriceClient(ibPriceClient):
+    def ib_futures_contract(self, contract_object_with_ib_broker_config, **kwargs):
+        return contract_object_with_ib_broker_config.number
+
+
+class TestTokenBucket:
+    def test_burst_then_paced(self):
+        clock = _fakeClock()
+        bucket = tokenBucket(tokens_per_second=2, capacity=3, clock=clock)
+
+        assert all(bucket.try_to_take_token() for _ in range(3))
+        assert not bucket.try_to_take_token()
+        assert bucket.seconds_until_token_available() == 0.5
+
+        bucket.wait_for_token_blocking(sleep_function=clock.sleep)
+        assert clock.now == 0.5
+
+        ## doesn't keep filling up once full
+        clock.sleep(100)
+        assert all(bucket.try_to_take_token() for _ in range(3))
+        assert not bucket.try_to_take_token()
+
+
+class TestConcurrentHistoricalData:
+    def test_all_prices_arrive_with_limited_requests_open(self):
+        client = _fakePriceClient(_fakeConnection())
+        client.historical_data_pacer = historicalDataPacer(
+            tokenBucket(tokens_per_second=1000, capacity=10), max_concurrent_requests=4
+        )
+        list_of_jobs = [(_fakeContract(number), DAILY_PRICE_FREQ) for number in range(10)]
+
+        list_of_batches = list(
+            client.broker_get_historical_futures_data_for_list_of_contracts(
+                list_of_jobs
+            )
+        )
+        all_prices = dict(
+            [(idx, prices) for batch in list_of_batches for idx, prices in batch]
+        )
+
+        assert sorted(all_prices.keys()) == list(range(10))
+        assert all(prices.FINAL.iloc[0] == idx for idx, prices in all_prices.items())
+        assert len(list_of_batches) > 1
+        assert client.ib.max_requests_open == 4
+
+    def test_timed_out_request_is_missing_data(self, monkeypatch):
+        monkeypatch.setattr(
+            ib_price_client, "HISTORICAL_REQUEST_TIMEOUT_SECONDS", 0.02
+        )
+        client = _fakePriceClient(_fakeConnection())
+        client.historical_data_pacer = historicalDataPacer(
+            tokenBucket(tokens_per_second=1000, capacity=10)
+        )
+
+        async def _times_out(contract, timeout, **kwargs):
+            ## as ib_insync does: cancel after the timeout, and return no bars
+            await asyncio.sleep(timeout)
+            return []
+
+        client.ib.reqHistoricalDataAsync = _times_out
+        list_of_batches = list(
+            client.broker_get_historical_futures_data_for_list_of_contracts(
+                [(_fakeContract(1), DAILY_PRICE_FREQ)]
+            )
+        )
+
+        assert list_of_batches == [[(0, missing_data)]]
@@ -1,4 +1,6 @@
 ### An inheritance of a general order stack that includes methods for actually talking to the broker
+import time
+
 from syscore.objects import arg_not_supplied
 
 from sysexecution.order_stacks.broker_order_stack import brokerOrderStackData
@@ -53,3 +55,11 @@ class brokerExecutionStackData(brokerOrderStackData):
         self, broker_order_with_controls: orderWithControls, new_limit_price: float
     ) -> orderWithControls:
         raise NotImplementedError
+
+    def add_callback_on_order_status_change(self, callback):
+        # callback takes no arguments
+        raise NotImplementedError
+
+    def sleep_and_process_broker_messages(self, seconds: float):
+        # brokers that call us back should process messages whilst we wait
+        time.sleep(seconds)
@@ -35,6 +35,25 @@ class brokerFuturesContractPriceData(futuresContractPriceData):
     ) -> futuresContractPrices:
         raise NotImplementedError
 
+    def get_prices_at_frequency_for_list_of_contract_objects(
+        self, list_of_contracts_and_frequencies: list
+    ):
+        """
+        Get prices for many contracts and frequencies; brokers that can make requests concurrently should
+        override this, here we just get them one at a time
+
+        :param list_of_contracts_and_frequencies: list of (futuresContract, Frequency)
+        :return: generator; each time some prices have arrived, yields list of (index in list, futuresContractPrices),
+           with missing_data if something went wrong
+        """
+        for idx, (contract_object, frequency) in enumerate(
+            list_of_contracts_and_frequencies
+        ):
+            prices = self.get_prices_at_frequency_for_contract_object(
+                contract_object, frequency, return_empty=False
+            )
+            yield [(idx, prices)]
+
     def get_ticker_object_for_order(self, order: contractOrder) -> tickerObject:
         raise NotImplementedError
 
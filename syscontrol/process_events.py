@@ -0,0 +1,116 @@
+"""
+Events that can wake up a process between the scheduled runs of its methods
+
+A callback (eg from the broker when an order fills) publishes an event, and the process runs the methods
+that care about that event straight away, rather than waiting for its next pass over all its methods.
+
+Changes made by other processes, eg new orders on the stacks, can't call us back; instead we add a poller
+which cheaply checks a value that changes when there is something to do (eg the highest order ID), and
+publishes an event when it does change.
+"""
+
+import threading
+import time
+
+from syscore.objects import missing_data
+
+# How often we check pollers, and let the broker process its messages, whilst waiting for events
+WAIT_INTERVAL_SECONDS = 0.05
+POLL_INTERVAL_SECONDS = 0.25
+
+
+class processEvents(object):
+    def __init__(self, sleep_function=time.sleep):
+        """
+        :param sleep_function: called with seconds to wait; eg the broker's sleep, so its callbacks can fire
+        """
+        self._sleep_function = sleep_function
+        self._published_events = []
+        self._lock = threading.Lock()
+        self._list_of_pollers = []
+
+    def publish(self, event_name: str):
+        with self._lock:
+            if event_name not in self._published_events:
+                self._published_events.append(event_name)
+
+    def add_poller(
+        self,
+        poll_function,
+        event_name: str,
+        interval_seconds: float = POLL_INTERVAL_SECONDS,
+    ):
+        """
+        :param poll_function: no arguments, returns a value that changes when event_name should be published
+        """
+        self._list_of_pollers.append(
+            eventPoller(
+                poll_function, event_name=event_name, interval_seconds=interval_seconds
+            )
+        )
+
+    def wait_for_events(self, timeout_seconds: float) -> list:
+        """
+        Wait until something has been published, or we run out of time
+
+        :return: list of event names, in the order they were first published
+        """
+        time_to_stop_waiting = time.monotonic() + timeout_seconds
+        while True:
+            self._check_pollers()
+            published_events = self._get_and_clear_published_events()
+            if len(published_events) > 0:
+                return published_events
+
+            seconds_left = time_to_stop_waiting - time.monotonic()
+            if seconds_left <= 0:
+                return []
+
+            self._sleep_function(min(seconds_left, WAIT_INTERVAL_SECONDS))
+
+    def _check_pollers(self):
+        for poller in self._list_of_pollers:
+            if poller.has_changed():
+                self.publish(poller.event_name)
+
+    def _get_and_clear_published_events(self) -> list:
+        with self._lock:
+            published_events = self._published_events
+            self._published_events = []
+
+        return published_events
+
+
+class eventPoller(object):
+    def __init__(
+        self,
+        poll_function,
+        event_name: str,
+        interval_seconds: float = POLL_INTERVAL_SECONDS,
+    ):
+        self._poll_function = poll_function
+        self._event_name = event_name
+        self._interval_seconds = interval_seconds
+        self._last_value = missing_data
+        self._last_poll_time = None
+
+    @property
+    def event_name(self) -> str:
+        return self._event_name
+
+    def has_changed(self) -> bool:
+        time_now = time.monotonic()
+        if self._last_poll_time is not None:
+            if time_now - self._last_poll_time < self._interval_seconds:
+                return False
+
+        self._last_poll_time = time_now
+        new_value = self._poll_function()
+        last_value = self._last_value
+        self._last_value = new_value
+
+        # the first poll just tells us where we are starting from
+        if last_value is missing_data:
+            return False
+
+        return new_value != last_value
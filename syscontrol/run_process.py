@@ -19,7 +19,8 @@ We kick them all off in the crontab at a specific time (midnight is easiest), bu
 import time
 import sys
 from syscontrol.report_process_status import reportProcessStatus
-from syscore.objects import success, failure, status
+from syscontrol.process_events import processEvents
+from syscore.objects import success, failure, status, arg_not_supplied
 
 from syscontrol.timer_functions import get_list_of_timer_functions, listOfTimerFunctions
 
@@ -35,6 +36,7 @@ from sysobjects.production.process_control import (
 
 from sysproduction.data.control_process import dataControlProcess, diagControlProcess
 
+MAIN_LOOP_PAUSE_SECONDS = 0.5
 
 class processToRun(object):
     """
@@ -46,13 +48,26 @@ class processToRun(object):
         process_name: str,
         data: dataBlob,
         list_of_timer_names_and_functions_as_strings: list,
+        process_events: processEvents = arg_not_supplied,
+        dict_of_methods_to_run_on_events: dict = arg_not_supplied,
     ):
+        """
+        :param process_events: if supplied, we wait on these events rather than just sleeping between passes
+        :param dict_of_methods_to_run_on_events: keys event names, values lists of method names to run as soon
+           as that event is published, whether or not their timer says they are due
+        """
         self._data = data
         self._process_name = process_name
         self._list_of_timer_functions = get_list_of_timer_functions(
             data, process_name, list_of_timer_names_and_functions_as_strings
         )
 
+        if dict_of_methods_to_run_on_events is arg_not_supplied:
+            dict_of_methods_to_run_on_events = {}
+
+        self._process_events = process_events
+        self._dict_of_methods_to_run_on_events = dict_of_methods_to_run_on_events
+
         self._setup()
 
     @property
@@ -67,6 +82,25 @@ class processToRun(object):
     def list_of_timer_functions(self) -> listOfTimerFunctions:
         return self._list_of_timer_functions
 
+    @property
+    def process_events(self) -> processEvents:
+        return self._process_events
+
+    def wait_and_return_methods_triggered_by_events(self, seconds: float) -> list:
+        if self.process_events is arg_not_supplied:
+            time.sleep(seconds)
+            return []
+
+        list_of_events = self.process_events.wait_for_events(seconds)
+        list_of_method_names = []
+        for event_name in list_of_events:
+            list_of_method_names = (
+                list_of_method_names
+                + self._dict_of_methods_to_run_on_events.get(event_name, [])
+            )
+
+        return list_of_method_names
+
     def _setup(self):
         self.data.log.setup(type=self.process_name)
         self._log = self.data.log
@@ -109,12 +143,18 @@ class processToRun(object):
     def _main_loop_over_methods(self):
         is_running = True
         while is_running:
-            time.sleep(0.5)
+            methods_triggered_by_events = (
+                self.wait_and_return_methods_triggered_by_events(
+                    MAIN_LOOP_PAUSE_SECONDS
+                )
+            )
             list_of_timer_functions = self._list_of_timer_functions
             we_should_stop = _check_for_stop(self)
             if we_should_stop:
                 return None
-            wait_for_next_method_run_time(self)
+            methods_triggered_by_events = (
+                methods_triggered_by_events + wait_for_next_method_run_time(self)
+            )
 
             for timer_class in list_of_timer_functions:
                 we_should_stop = _check_for_stop(self)
@@ -123,7 +163,10 @@ class processToRun(object):
 
                 we_should_pause = check_for_pause_and_log(self)
                 if not we_should_pause:
-                    timer_class.check_and_run()
+                    timer_class.check_and_run(
+                        triggered_by_event=timer_class.method_name
+                        in methods_triggered_by_events
+                    )
 
     def _finish(self):
         self.list_of_timer_functions.run_methods_which_run_on_exit_only()
@@ -311,7 +354,10 @@ def _check_if_okay_to_wait_before_starting_process(
 ## WAIT CODE
 
 
-def wait_for_next_method_run_time(process_to_run: processToRun):
+def wait_for_next_method_run_time(process_to_run: processToRun) -> list:
+    """
+    :return: list of method names triggered by events whilst we were waiting
+    """
     list_of_timer_functions = process_to_run.list_of_timer_functions
     seconds_to_next_run = list_of_timer_functions.seconds_until_next_method_runs()
     if seconds_to_next_run > 10.0:
@@ -322,7 +368,9 @@ def wait_for_next_method_run_time(process_to_run: processToRun):
         )
         process_to_run.log.msg(msg)
         sys.stdout.flush()
-        time.sleep(seconds_to_next_run)
+        return process_to_run.wait_and_return_methods_triggered_by_events(sleep_time)
+
+    return []
 
 
 ## PAUSE CODE
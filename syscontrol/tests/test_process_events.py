@@ -0,0 +1,46 @@
+from syscontrol.process_events import processEvents
+
+
+class _fakeClockSleeps(object):
+    def __init__(self):
+        self.number_of_sleeps = 0
+        self.callbacks_during_sleep = {}
+
+    def sleep(self, seconds: float):
+        self.number_of_sleeps += 1
+        callback = self.callbacks_during_sleep.get(self.number_of_sleeps, None)
+        if callback is not None:
+            callback()
+
+
+class TestProcessEvents:
+    def test_returns_published_events_once_each(self):
+        process_events = processEvents()
+        process_events.publish("fill")
+        process_events.publish("new_order")
+        process_events.publish("fill")
+
+        assert process_events.wait_for_events(1.0) == ["fill", "new_order"]
+        assert process_events.wait_for_events(0.0) == []
+
+    def test_wakes_up_on_callback_whilst_waiting(self):
+        sleeper = _fakeClockSleeps()
+        process_events = processEvents(sleep_function=sleeper.sleep)
+        sleeper.callbacks_during_sleep[3] = lambda: process_events.publish("fill")
+
+        assert process_events.wait_for_events(60.0) == ["fill"]
+        assert sleeper.number_of_sleeps == 3
+
+    def test_poller_publishes_on_change_only(self):
+        max_order_id = [5]
+        process_events = processEvents()
+        process_events.add_poller(
+            lambda: max_order_id[0], event_name="new_order", interval_seconds=0.0
+        )
+
+        assert process_events.wait_for_events(0.0) == []
+        assert process_events.wait_for_events(0.0) == []
+
+        max_order_id[0] = 6
+        assert process_events.wait_for_events(0.0) == ["new_order"]
+        assert process_events.wait_for_events(0.0) == []
@@ -110,13 +110,16 @@ class timerClassWithFunction(object):
     def log_msg(self, msg: str):
         self.log.msg(msg, type=self.process_name)
 
-    def check_and_run(self, last_run: bool = False):
+    def check_and_run(self, last_run: bool = False, triggered_by_event: bool = False):
         """
 
+        :param triggered_by_event: run even if our timer says we aren't due yet
         :return: None
         """
         self.log_heartbeat_if_required()
-        okay_to_run = self.check_if_okay_to_run(last_run=last_run)
+        okay_to_run = self.check_if_okay_to_run(
+            last_run=last_run, triggered_by_event=triggered_by_event
+        )
         if not okay_to_run:
             return None
 
@@ -124,13 +127,15 @@ class timerClassWithFunction(object):
         self.run_function()
         self.finished_running_method()
 
-    def check_if_okay_to_run(self, last_run=False) -> bool:
+    def check_if_okay_to_run(self, last_run=False, triggered_by_event=False) -> bool:
         if self.run_on_completion_only:
             okay_to_run = self.check_if_okay_to_run_if_runs_at_end_only(last_run)
             return okay_to_run
 
         # normal
-        okay_to_run = self.check_if_okay_to_run_normal_run(last_run)
+        okay_to_run = self.check_if_okay_to_run_normal_run(
+            last_run, triggered_by_event=triggered_by_event
+        )
         return okay_to_run
 
     def check_if_okay_to_run_if_runs_at_end_only(self, last_run: bool = False) -> bool:
@@ -151,11 +156,17 @@ class timerClassWithFunction(object):
         )
         return False
 
-    def check_if_okay_to_run_normal_run(self, last_run: bool = False) -> bool:
+    def check_if_okay_to_run_normal_run(
+        self, last_run: bool = False, triggered_by_event: bool = False
+    ) -> bool:
         if last_run:
             # don't run a normal process on last run
             return False
 
+        if triggered_by_event:
+            # no need to wait for the timer, but we still don't run too many times
+            return not self.completed_max_runs()
+
         # okay not a last run, so check if timer elapsed enough and we
         # haven't done too many
 
@@ -134,38 +134,315 @@ def apply_buffer(
     :returns: pd.Series
     """
 
-    pos_buffers = pos_buffers.ffill()
-    use_optimal_position = optimal_position.ffill()
+    use_optimal_position, top_pos, bot_pos = _positions_and_buffers_ready_to_buffer(
+        optimal_position,
+        top_pos=pos_buffers.top_pos,
+        bot_pos=pos_buffers.bot_pos,
+        roundpositions=roundpositions,
+    )
+
+    buffered_position = apply_buffer_to_array(
+        use_optimal_position.values,
+        top_pos=top_pos.values,
+        bot_pos=bot_pos.values,
+        trade_to_edge=trade_to_edge,
+    )
+
+    buffered_position = pd.Series(buffered_position, index=optimal_position.index)
+
+    return buffered_position
+
+
+def apply_buffer_to_dict_of_positions(
+    dict_of_optimal_positions: dict,
+    dict_of_pos_buffers: dict,
+    trade_to_edge: bool = False,
+    roundpositions: bool = False,
+) -> dict:
+    """
+    Apply buffers to the positions for several instruments at once
+
+    With enough instruments the positions are aligned on a common index, and buffered in a single pass
+    through the dates across all the instruments, then each one is returned on its own index. The result
+    for each instrument is the same as apply_buffer would give, provided (as always) the optimal position
+    lies within its buffers. Buffers must be on the same index as the positions, as for apply_buffer.
+
+    :param dict_of_optimal_positions: dict of pd.Series, keys are instrument codes
+    :param dict_of_pos_buffers: dict of Tx2 pd.DataFrame, top_pos and bot_pos, same keys
+
+    :returns: dict of pd.Series
+    """
+    instrument_list = list(dict_of_optimal_positions.keys())
+    if len(instrument_list) < MIN_INSTRUMENTS_TO_BUFFER_TOGETHER:
+        return dict(
+            [
+                (
+                    instrument_code,
+                    apply_buffer(
+                        dict_of_optimal_positions[instrument_code],
+                        dict_of_pos_buffers[instrument_code],
+                        trade_to_edge=trade_to_edge,
+                        roundpositions=roundpositions,
+                    ),
+                )
+                for instrument_code in instrument_list
+            ]
+        )
+
+    # much quicker than letting pandas align everything
+    list_of_indices = [
+        dict_of_optimal_positions[instrument_code].index
+        for instrument_code in instrument_list
+    ]
+    common_index = pd.Index(
+        np.unique(np.concatenate([index.values for index in list_of_indices]))
+    )
+    list_of_rows_in_common_index = [
+        common_index.get_indexer(index) for index in list_of_indices
+    ]
+
+    # dates only some instruments have are filled with the last value; buffering again with the same values
+    #  doesn't change the position
+    optimal_positions, top_pos, bot_pos = [
+        _forward_fill_and_round_array(
+            _columns_on_common_rows(
+                list_of_columns,
+                list_of_rows_in_common_index=list_of_rows_in_common_index,
+                number_of_rows=len(common_index),
+            ),
+            roundpositions=roundpositions,
+        )
+        for list_of_columns in [
+            [
+                dict_of_optimal_positions[instrument_code].values
+                for instrument_code in instrument_list
+            ],
+            [
+                dict_of_pos_buffers[instrument_code].top_pos.values
+                for instrument_code in instrument_list
+            ],
+            [
+                dict_of_pos_buffers[instrument_code].bot_pos.values
+                for instrument_code in instrument_list
+            ],
+        ]
+    ]
+
+    # each instrument starts on the first date in its own index
+    start_rows = np.array([rows[0] for rows in list_of_rows_in_common_index])
+
+    buffered_positions = apply_buffer_to_array(
+        optimal_positions,
+        top_pos=top_pos,
+        bot_pos=bot_pos,
+        trade_to_edge=trade_to_edge,
+        start_rows=start_rows,
+    )
+
+    return dict(
+        [
+            (
+                instrument_code,
+                pd.Series(buffered_positions[rows, column_idx], index=index),
+            )
+            for column_idx, (instrument_code, index, rows) in enumerate(
+                zip(instrument_list, list_of_indices, list_of_rows_in_common_index)
+            )
+        ]
+    )
+
+
+def _columns_on_common_rows(
+    list_of_columns: list, list_of_rows_in_common_index: list, number_of_rows: int
+) -> np.ndarray:
+    all_columns = np.full((number_of_rows, len(list_of_columns)), np.nan)
+    for column_idx, (column, rows) in enumerate(
+        zip(list_of_columns, list_of_rows_in_common_index)
+    ):
+        all_columns[rows, column_idx] = column
+
+    return all_columns
+
+
+def _forward_fill_and_round_array(
+    some_array: np.ndarray, roundpositions: bool = False
+) -> np.ndarray:
+    some_array = pd.DataFrame(some_array).ffill().values
+    if roundpositions:
+        some_array = np.round(some_array)
+
+    return some_array
 
-    top_pos = pos_buffers.top_pos
-    bot_pos = pos_buffers.bot_pos
+
+def _positions_and_buffers_ready_to_buffer(
+    optimal_position: pd.Series,
+    top_pos: pd.Series,
+    bot_pos: pd.Series,
+    roundpositions: bool = False,
+) -> tuple:
+    use_optimal_position = optimal_position.ffill()
+    top_pos = top_pos.ffill()
+    bot_pos = bot_pos.ffill()
 
     if roundpositions:
         use_optimal_position = use_optimal_position.round()
         top_pos = top_pos.round()
         bot_pos = bot_pos.round()
 
-    current_position = use_optimal_position.values[0]
-    if np.isnan(current_position):
-        current_position = 0.0
+    return use_optimal_position, top_pos, bot_pos
+
+
+# Below this many instruments it's quicker to loop through each one separately
+MIN_INSTRUMENTS_TO_BUFFER_TOGETHER = 32
 
-    buffered_position_list = [current_position]
 
-    for idx in range(len(optimal_position.index))[1:]:
-        current_position = apply_buffer_single_period(
-            current_position,
-            float(use_optimal_position.values[idx]),
-            float(top_pos.values[idx]),
-            float(bot_pos.values[idx]),
+def apply_buffer_to_array(
+    optimal_positions: np.ndarray,
+    top_pos: np.ndarray,
+    bot_pos: np.ndarray,
+    trade_to_edge: bool = False,
+    start_rows: np.ndarray = None,
+) -> np.ndarray:
+    """
+    Apply buffers to positions held as arrays; the same as apply_buffer_single_period applied to each date in turn
+
+    Each instrument starts with its optimal position (zero if that's nan), and positions are left unchanged
+    on dates where the optimal position or either buffer is nan.
+
+    :param optimal_positions: T or TxN np.array, for N instruments
+    :param top_pos: same shape as optimal_positions
+    :param bot_pos: same shape as optimal_positions
+    :param trade_to_edge: Trade to the edge (True) or the optimal (False)
+    :param start_rows: optional, length N; row each instrument starts on. Positions before that are zero.
+
+    :returns: np.array, same shape as optimal_positions
+    """
+    optimal_positions = np.asarray(optimal_positions, dtype=float)
+    is_one_dimensional = optimal_positions.ndim == 1
+    optimal_positions = np.atleast_2d(optimal_positions.T).T
+    top_pos = np.atleast_2d(np.asarray(top_pos, dtype=float).T).T
+    bot_pos = np.atleast_2d(np.asarray(bot_pos, dtype=float).T).T
+
+    number_of_instruments = optimal_positions.shape[1]
+    if start_rows is None:
+        start_rows = np.zeros(number_of_instruments, dtype=int)
+
+    # where anything is missing the position can't be outside the buffer, so doesn't change
+    missing = np.isnan(optimal_positions) | np.isnan(top_pos) | np.isnan(bot_pos)
+    top_pos = np.where(missing, np.inf, top_pos)
+    bot_pos = np.where(missing, -np.inf, bot_pos)
+
+    if number_of_instruments < MIN_INSTRUMENTS_TO_BUFFER_TOGETHER:
+        buffered_positions = np.column_stack(
+            [
+                _apply_buffer_to_single_column(
+                    optimal_positions[:, column_idx],
+                    top_pos=top_pos[:, column_idx],
+                    bot_pos=bot_pos[:, column_idx],
+                    trade_to_edge=trade_to_edge,
+                    start_row=start_rows[column_idx],
+                )
+                for column_idx in range(number_of_instruments)
+            ]
+        )
+    else:
+        buffered_positions = _apply_buffer_to_all_columns(
+            optimal_positions,
+            top_pos=top_pos,
+            bot_pos=bot_pos,
             trade_to_edge=trade_to_edge,
+            start_rows=start_rows,
         )
+
+    if is_one_dimensional:
+        return buffered_positions[:, 0]
+
+    return buffered_positions
+
+
+def _starting_position(optimal_position: float) -> float:
+    if np.isnan(optimal_position):
+        return 0.0
+
+    return optimal_position
+
+
+def _apply_buffer_to_single_column(
+    optimal_position: np.ndarray,
+    top_pos: np.ndarray,
+    bot_pos: np.ndarray,
+    trade_to_edge: bool,
+    start_row: int,
+) -> np.ndarray:
+    buffered_position = np.zeros(len(optimal_position))
+    if start_row >= len(optimal_position):
+        return buffered_position
+
+    current_position = _starting_position(optimal_position[start_row])
+    buffered_position_list = [current_position]
+
+    # plain floats, as indexing numpy arrays one element at a time is slow
+    for optimal, top, bot in zip(
+        optimal_position[start_row + 1 :].tolist(),
+        top_pos[start_row + 1 :].tolist(),
+        bot_pos[start_row + 1 :].tolist(),
+    ):
+        if current_position > top:
+            current_position = top if trade_to_edge else optimal
+        elif current_position < bot:
+            current_position = bot if trade_to_edge else optimal
         buffered_position_list.append(current_position)
 
-    buffered_position = pd.Series(buffered_position_list, index=optimal_position.index)
+    buffered_position[start_row:] = buffered_position_list
 
     return buffered_position
 
 
+def _apply_buffer_to_all_columns(
+    optimal_positions: np.ndarray,
+    top_pos: np.ndarray,
+    bot_pos: np.ndarray,
+    trade_to_edge: bool,
+    start_rows: np.ndarray,
+) -> np.ndarray:
+    number_of_rows, number_of_instruments = optimal_positions.shape
+    columns_starting_on_row = dict(
+        [
+            (row_idx, np.flatnonzero(start_rows == row_idx))
+            for row_idx in np.unique(start_rows)
+        ]
+    )
+
+    buffered_positions = np.zeros(optimal_positions.shape)
+    current_positions = np.zeros(number_of_instruments)
+    for row_idx in range(number_of_rows):
+        top = top_pos[row_idx]
+        bot = bot_pos[row_idx]
+        above_buffer = current_positions > top
+        below_buffer = current_positions < bot
+        if trade_to_edge:
+            current_positions = np.where(
+                above_buffer, top, np.where(below_buffer, bot, current_positions)
+            )
+        else:
+            current_positions = np.where(
+                above_buffer | below_buffer,
+                optimal_positions[row_idx],
+                current_positions,
+            )
+
+        starting_columns = columns_starting_on_row.get(row_idx, None)
+        if starting_columns is not None:
+            starting_positions = optimal_positions[row_idx, starting_columns]
+            current_positions[starting_columns] = np.where(
+                np.isnan(starting_positions), 0.0, starting_positions
+            )
+
+        buffered_positions[row_idx] = current_positions
+
+    return buffered_positions
+
+
 def return_mapping_params(a_param):
     """
     The process of non-linear mapping is designed to ensure that we can still trade with small account sizes
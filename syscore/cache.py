@@ -4,24 +4,43 @@ I use caching a lot
 There is the caching in the base system, but that's special uses decorators etc
 
 Here's a more general one
+
+It's safe to share between threads: if two threads ask for the same thing at once, one calculates it and the
+other waits for the answer
 """
 
+import threading
+
 from syscore.objects import missing_data
 
 class Cache(object):
     def __init__(self, parent_object):
         self._parent = parent_object
         self._store = {}
+        self._locks_for_keys = {}
+        self._lock_for_locks = threading.Lock()
 
     def get(self, function_instance, *args, **kwargs):
         function_name = function_instance.__name__
         key = _get_key(function_name, args, kwargs)
         value_from_store = self._get_from_store(key)
         if value_from_store is missing_data:
-            value_from_store = self._calculate_and_store(key, function_instance, *args, **kwargs)
+            with self._lock_for_key(key):
+                ## might have been calculated by another thread whilst we waited
+                value_from_store = self._get_from_store(key)
+                if value_from_store is missing_data:
+                    value_from_store = self._calculate_and_store(key, function_instance, *args, **kwargs)
 
         return value_from_store
 
+    def _lock_for_key(self, key: str) -> threading.RLock:
+        with self._lock_for_locks:
+            lock = self._locks_for_keys.get(key, None)
+            if lock is None:
+                lock = self._locks_for_keys[key] = threading.RLock()
+
+        return lock
+
     def _calculate_and_store(self, key: str, function_instance, *args, **kwargs):
         value = function_instance(*args, **kwargs)
         self._put_in_store(key, value)
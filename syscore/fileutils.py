@@ -1,5 +1,6 @@
 import glob
 import datetime
+import hashlib
 import time
 from importlib import import_module
 import os
@@ -205,6 +206,40 @@ def files_with_extension_in_resolved_pathname(resolved_pathname, extension=".csv
     return file_list_no_extension
 
 
+def fingerprint_of_files_in_pathname(pathname, extension=".csv") -> str:
+    """
+    Fingerprint which changes when files with extension are added to, removed from or modified in a directory
+
+    :param pathname: absolute eg "home/user/data" or relative inside pysystemtrade eg "data.futures"
+    :param extension: str
+    :return: str
+    """
+    resolved_pathname = get_resolved_pathname(pathname)
+    file_list = files_with_extension_in_resolved_pathname(
+        resolved_pathname, extension=extension
+    )
+    full_filename_list = [
+        os.path.join(resolved_pathname, filename + extension) for filename in file_list
+    ]
+
+    return fingerprint_of_files(full_filename_list)
+
+
+def fingerprint_of_files(list_of_full_filenames: list) -> str:
+    """
+    Fingerprint using the size and modification time of files, which is much quicker than reading them
+
+    :param list_of_full_filenames: list of resolved filenames
+    :return: str
+    """
+    file_stats = []
+    for full_filename in sorted(list_of_full_filenames):
+        stat = os.stat(full_filename)
+        file_stats.append("%s:%d:%d" % (full_filename, stat.st_size, stat.st_mtime_ns))
+
+    return hashlib.sha256("/".join(file_stats).encode("utf-8")).hexdigest()
+
+
 def file_in_home_dir(filename):
     pathname = os.path.expanduser("~")
 
@@ -5,6 +5,7 @@ import numpy
 import pandas
 import pandas as pd
 import datetime
+import hashlib
 import random
 
 import numpy as np
@@ -468,6 +469,19 @@ def apply_abs_min(x: pd.Series, min_value=0.1):
     return x
 
 
+def hash_of_pd_object(pd_object) -> str:
+    """
+    Hash of the index and contents; the same across runs for the same data
+    """
+    row_hashes = pd.util.hash_pandas_object(pd_object, index=True)
+    column_names = str(list(getattr(pd_object, "columns", [])))
+
+    hasher = hashlib.sha256(row_hashes.values.tobytes())
+    hasher.update(column_names.encode("utf-8"))
+
+    return hasher.hexdigest()
+
+
 def check_df_equals(x, y):
     try:
         pd.testing.assert_frame_equal(x, y)
@@ -558,6 +572,38 @@ def sumup_business_days_over_pd_series_without_double_counting_of_closing_data(
     return joint_data
 
 
+def union_of_indices(list_of_indices: list) -> pd.Index:
+    if len(list_of_indices) == 0:
+        return pd.Index([])
+
+    common_index = list_of_indices[0]
+    for index in list_of_indices[1:]:
+        common_index = common_index.union(index)
+
+    return common_index
+
+
+def series_covers_index_between_its_dates(data: pd.Series, index: pd.Index) -> bool:
+    """
+    Does data have a row for every date in index, between the first and last date of data?
+
+    If it does, then reindexing it to index only adds rows before or after its own data, so rolling
+    and exponentially weighted calculations on a panel give the same answer as on the series alone.
+    """
+    if not isinstance(data, pd.Series):
+        return False
+
+    data_index = data.index
+    if len(data_index) == 0:
+        return False
+    if not data_index.is_monotonic_increasing or not data_index.is_unique:
+        return False
+
+    index_over_same_period = index[index.slice_indexer(data_index[0], data_index[-1])]
+
+    return len(index_over_same_period) == len(data_index)
+
+
 def replace_all_zeros_with_nan(result: pd.Series) -> pd.Series:
     check_result = copy(result)
     check_result[check_result == 0.0] = np.nan
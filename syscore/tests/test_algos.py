@@ -6,7 +6,14 @@ Created on 27 Nov 2015
 import unittest as ut
 
 import numpy as np
-
+import pandas as pd
+
+from syscore.algos import (
+    apply_buffer,
+    apply_buffer_single_period,
+    apply_buffer_to_dict_of_positions,
+    MIN_INSTRUMENTS_TO_BUFFER_TOGETHER,
+)
 from syscore.pdutils import pd_readcsv
 from sysquant.estimators.vol import robust_vol_calc
 from syscore.fileutils import get_filename_for_package
@@ -22,7 +29,88 @@ def get_data(path):
     return df
 
 
+def _random_position_and_buffers(random_generator, start: int, every: int = 1):
+    index = pd.bdate_range("2000-01-01", periods=2000)[start::every]
+    position = pd.Series(
+        np.cumsum(random_generator.normal(size=len(index))) * 3, index=index
+    )
+    position[random_generator.random(len(index)) < 0.02] = np.nan
+    buffer = position.abs() * 0.1 + 0.5
+    pos_buffers = pd.DataFrame(dict(top_pos=position + buffer, bot_pos=position - buffer))
+
+    return position, pos_buffers
+
+
+def _buffer_one_period_at_a_time(
+    optimal_position: pd.Series, pos_buffers: pd.DataFrame, trade_to_edge: bool
+) -> pd.Series:
+    optimal_position = optimal_position.ffill().round()
+    pos_buffers = pos_buffers.ffill().round()
+    current_position = optimal_position.values[0]
+    if np.isnan(current_position):
+        current_position = 0.0
+
+    buffered_position_list = [current_position]
+    for idx in range(1, len(optimal_position)):
+        current_position = apply_buffer_single_period(
+            current_position,
+            optimal_position.values[idx],
+            pos_buffers.top_pos.values[idx],
+            pos_buffers.bot_pos.values[idx],
+            trade_to_edge=trade_to_edge,
+        )
+        buffered_position_list.append(current_position)
+
+    return pd.Series(buffered_position_list, index=optimal_position.index)
+
+
 class Test(ut.TestCase):
+    def test_apply_buffer(self):
+        random_generator = np.random.default_rng(42)
+        position, pos_buffers = _random_position_and_buffers(random_generator, start=0)
+        for trade_to_edge in [True, False]:
+            buffered_position = apply_buffer(
+                position, pos_buffers, trade_to_edge=trade_to_edge, roundpositions=True
+            )
+            expected = _buffer_one_period_at_a_time(
+                position, pos_buffers, trade_to_edge=trade_to_edge
+            )
+            pd.testing.assert_series_equal(buffered_position, expected)
+
+    def test_apply_buffer_to_dict_of_positions(self):
+        random_generator = np.random.default_rng(42)
+        dict_of_positions = {}
+        dict_of_pos_buffers = {}
+        # enough to buffer them all together, on different dates
+        for instrument_idx in range(MIN_INSTRUMENTS_TO_BUFFER_TOGETHER + 1):
+            instrument_code = "instrument%d" % instrument_idx
+            (
+                dict_of_positions[instrument_code],
+                dict_of_pos_buffers[instrument_code],
+            ) = _random_position_and_buffers(
+                random_generator,
+                start=int(random_generator.integers(0, 500)),
+                every=1 + instrument_idx % 3,
+            )
+
+        for trade_to_edge in [True, False]:
+            buffered_positions = apply_buffer_to_dict_of_positions(
+                dict_of_positions,
+                dict_of_pos_buffers,
+                trade_to_edge=trade_to_edge,
+                roundpositions=True,
+            )
+            for instrument_code, position in dict_of_positions.items():
+                expected = apply_buffer(
+                    position,
+                    dict_of_pos_buffers[instrument_code],
+                    trade_to_edge=trade_to_edge,
+                    roundpositions=True,
+                )
+                pd.testing.assert_series_equal(
+                    buffered_positions[instrument_code], expected
+                )
+
     @ut.SkipTest
     def test_robust_vol_calc(self):
         prices = get_data("syscore.tests.pricetestdata.csv")
@@ -0,0 +1,42 @@
+import threading
+import time
+import unittest
+
+from syscore.cache import Cache
+
+
+class slowCalculation(object):
+    def __init__(self):
+        self.number_of_calculations = 0
+
+    def calculate(self, value: int) -> int:
+        self.number_of_calculations += 1
+        time.sleep(0.05)
+
+        return value * 2
+
+
+class Test(unittest.TestCase):
+    def test_calculates_once_across_threads(self):
+        calculation = slowCalculation()
+        cache = Cache(calculation)
+        results = []
+
+        def _get():
+            results.append(cache.get(calculation.calculate, 3))
+
+        threads = [threading.Thread(target=_get) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(results, [6] * 8)
+        self.assertEqual(calculation.number_of_calculations, 1)
+
+        self.assertEqual(cache.get(calculation.calculate, 4), 8)
+        self.assertEqual(calculation.number_of_calculations, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
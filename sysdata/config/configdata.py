@@ -27,10 +27,14 @@ from sysdata.config.fill_config_dict_with_defaults import fill_config_dict_with_
 
 RESERVED_NAMES = ["log", "_elements", "elements",
                   "_default_filename",
-                  "_private_filename"]
+                  "_private_filename",
+                  "_element_access_recorder"]
 
 
 class Config(object):
+    # if set, called with the element name every time an element is read; used by the disk cache
+    _element_access_recorder = None
+
     def __init__(
         self, config_object=arg_not_supplied,
             default_filename=arg_not_supplied,
@@ -206,6 +210,29 @@ class Config(object):
         super().__setattr__(element_name, value)
         self.add_single_element(element_name)
 
+    def __getattribute__(self, element_name: str):
+        recorder = super().__getattribute__("_element_access_recorder")
+        if recorder is None or element_name.startswith("_"):
+            return super().__getattribute__(element_name)
+
+        try:
+            value = super().__getattribute__(element_name)
+        except AttributeError:
+            # a missing element is also something we depend on, in case it is added later
+            recorder(element_name)
+            raise
+
+        if element_name in super().__getattribute__("__dict__").get("_elements", []):
+            recorder(element_name)
+
+        return value
+
+    def set_element_access_recorder(self, recorder):
+        """
+        :param recorder: function called with element_name whenever an element is read, or None to stop recording
+        """
+        super().__setattr__("_element_access_recorder", recorder)
+
     def fill_with_defaults(self):
         """
         Fills with defaults - private stuff first, then defaults
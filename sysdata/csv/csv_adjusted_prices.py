@@ -4,6 +4,7 @@ from sysdata.futures.adjusted_prices import futuresAdjustedPricesData
 from sysobjects.adjusted_prices import futuresAdjustedPrices
 from syscore.fileutils import get_filename_for_package, files_with_extension_in_pathname
 from syscore.pdutils import pd_readcsv
+from sysdata.csv.csv_binary_cache import pd_readcsv_with_binary_cache
 from syscore.objects import arg_not_supplied
 from syslogdiag.log_to_screen import logtoscreen
 
@@ -18,7 +19,10 @@ class csvFuturesAdjustedPricesData(futuresAdjustedPricesData):
     """
 
     def __init__(
-        self, datapath=arg_not_supplied, log=logtoscreen("csvFuturesContractPriceData")
+        self,
+        datapath=arg_not_supplied,
+        log=logtoscreen("csvFuturesContractPriceData"),
+        use_binary_cache: bool = False,
     ):
 
         super().__init__(log=log)
@@ -27,6 +31,7 @@ class csvFuturesAdjustedPricesData(futuresAdjustedPricesData):
             datapath = ADJUSTED_PRICES_DIRECTORY
 
         self._datapath = datapath
+        self.use_binary_cache = use_binary_cache
 
     def __repr__(self):
         return "csvFuturesAdjustedPricesData accessing %s" % self._datapath
@@ -44,7 +49,10 @@ class csvFuturesAdjustedPricesData(futuresAdjustedPricesData):
         filename = self._filename_given_instrument_code(instrument_code)
 
         try:
-            instrpricedata = pd_readcsv(filename)
+            if self.use_binary_cache:
+                instrpricedata = pd_readcsv_with_binary_cache(filename)
+            else:
+                instrpricedata = pd_readcsv(filename)
         except OSError:
             self.log.warn("Can't find adjusted price file %s" % filename)
             return futuresAdjustedPrices.create_empty()
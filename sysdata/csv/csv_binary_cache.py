@@ -0,0 +1,155 @@
+"""
+Binary copies of .csv price files, so they can be read again without parsing text and dates
+
+The first time a .csv file is read, the DataFrame is also saved as a numpy .npz file in a _binary_cache directory
+next to it. After that the .npz file is read instead, provided the .csv file still has the same size and
+modification time; otherwise it is read again and the binary copy replaced. If the directory can't be written
+to we just read the .csv file each time.
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+
+from syscore.objects import missing_data
+from syscore.pdutils import pd_readcsv, DEFAULT_DATE_FORMAT
+
+BINARY_CACHE_DIRECTORY = "_binary_cache"
+BINARY_CACHE_EXTENSION = ".npz"
+
+SOURCE_STAMP_KEY = "_source_stamp"
+SETTINGS_KEY = "_settings"
+INDEX_KEY = "_index"
+COLUMNS_KEY = "_columns"
+STRING_COLUMNS_KEY = "_string_columns"
+COLUMN_KEY_PREFIX = "column_"
+
+
+def pd_readcsv_with_binary_cache(
+    filename: str,
+    date_index_name: str = "DATETIME",
+    date_format: str = DEFAULT_DATE_FORMAT,
+) -> pd.DataFrame:
+    """
+    Same as pd_readcsv(filename, date_index_name=date_index_name, date_format=date_format), but reads and
+    writes a binary copy
+
+    :param filename: resolved filename of .csv file
+    :returns: pd.DataFrame
+    """
+    ## raises OSError if the file isn't there, same as pd_readcsv
+    source_stamp = _source_stamp_for_file(filename)
+    settings = [date_index_name, date_format]
+    cache_filename = binary_cache_filename_for_csv_file(filename)
+
+    cached_data = _read_binary_cache(cache_filename, source_stamp, settings)
+    if cached_data is not missing_data:
+        return cached_data
+
+    data = pd_readcsv(filename, date_index_name=date_index_name, date_format=date_format)
+    _write_binary_cache_if_possible(cache_filename, data, source_stamp, settings)
+
+    return data
+
+
+def binary_cache_filename_for_csv_file(filename: str) -> str:
+    directory, csv_filename = os.path.split(filename)
+    cache_filename = os.path.splitext(csv_filename)[0] + BINARY_CACHE_EXTENSION
+
+    return os.path.join(directory, BINARY_CACHE_DIRECTORY, cache_filename)
+
+
+def _source_stamp_for_file(filename: str) -> np.ndarray:
+    stat = os.stat(filename)
+
+    return np.array([stat.st_size, stat.st_mtime_ns], dtype=np.int64)
+
+
+def _read_binary_cache(
+    cache_filename: str, source_stamp: np.ndarray, settings: list
+) -> pd.DataFrame:
+    if not os.path.exists(cache_filename):
+        return missing_data
+
+    try:
+        with np.load(cache_filename, allow_pickle=False) as cached_arrays:
+            if not np.array_equal(cached_arrays[SOURCE_STAMP_KEY], source_stamp):
+                return missing_data
+            if list(cached_arrays[SETTINGS_KEY]) != settings:
+                return missing_data
+
+            return _dataframe_from_cached_arrays(cached_arrays)
+    except Exception:
+        ## eg half written by another process, or an old format; we'll just write it again
+        return missing_data
+
+
+def _dataframe_from_cached_arrays(cached_arrays) -> pd.DataFrame:
+    columns = list(cached_arrays[COLUMNS_KEY])
+    string_columns = list(cached_arrays[STRING_COLUMNS_KEY])
+    dict_of_columns = {}
+    for column_number, column_name in enumerate(columns):
+        values = cached_arrays[COLUMN_KEY_PREFIX + str(column_number)]
+        if column_name in string_columns:
+            values = values.astype(object)
+        dict_of_columns[column_name] = values
+
+    index = pd.DatetimeIndex(cached_arrays[INDEX_KEY])
+    data = pd.DataFrame(dict_of_columns, index=index, columns=columns)
+
+    return data
+
+
+def _write_binary_cache_if_possible(
+    cache_filename: str, data: pd.DataFrame, source_stamp: np.ndarray, settings: list
+):
+    arrays_to_cache = _arrays_to_cache_for_dataframe(data)
+    if arrays_to_cache is missing_data:
+        return None
+
+    arrays_to_cache[SOURCE_STAMP_KEY] = source_stamp
+    arrays_to_cache[SETTINGS_KEY] = np.array(settings)
+
+    ## write somewhere else first, so nobody reads a half written file
+    temp_filename = "%s.%d.tmp" % (cache_filename, os.getpid())
+    try:
+        os.makedirs(os.path.dirname(cache_filename), exist_ok=True)
+        with open(temp_filename, "wb") as temp_file:
+            np.savez(temp_file, **arrays_to_cache)
+        os.replace(temp_filename, cache_filename)
+    except OSError:
+        ## eg read only directory
+        if os.path.exists(temp_filename):
+            os.remove(temp_filename)
+
+
+def _arrays_to_cache_for_dataframe(data: pd.DataFrame) -> dict:
+    ## returns missing_data if we can't store it without pickling
+    if not isinstance(data.index, pd.DatetimeIndex):
+        return missing_data
+
+    columns = [str(column_name) for column_name in data.columns]
+    if len(set(columns)) < len(columns):
+        return missing_data
+
+    arrays_to_cache = {
+        INDEX_KEY: data.index.values,
+        COLUMNS_KEY: np.array(columns, dtype=str),
+    }
+    string_columns = []
+    for column_number, column_name in enumerate(columns):
+        values = data.iloc[:, column_number].values
+        if values.dtype == object:
+            if not all(isinstance(value, str) for value in values):
+                return missing_data
+            values = values.astype(str)
+            string_columns.append(column_name)
+        elif values.dtype.kind not in "biufM":
+            return missing_data
+
+        arrays_to_cache[COLUMN_KEY_PREFIX + str(column_number)] = values
+
+    arrays_to_cache[STRING_COLUMNS_KEY] = np.array(string_columns, dtype=str)
+
+    return arrays_to_cache
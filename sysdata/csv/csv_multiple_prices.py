@@ -1,3 +1,4 @@
+import numpy as np
 import pandas as pd
 from sysdata.futures.multiple_prices import futuresMultiplePricesData
 from sysobjects.multiple_prices import (
@@ -7,6 +8,7 @@ from sysobjects.multiple_prices import (
 
 from syscore.fileutils import get_filename_for_package, files_with_extension_in_pathname
 from syscore.pdutils import pd_readcsv
+from sysdata.csv.csv_binary_cache import pd_readcsv_with_binary_cache
 from syscore.genutils import str_of_int
 from syscore.objects import arg_not_supplied
 from syslogdiag.log_to_screen import logtoscreen
@@ -25,6 +27,7 @@ class csvFuturesMultiplePricesData(futuresMultiplePricesData):
         self,
         datapath: str = arg_not_supplied,
         log=logtoscreen("csvFuturesMultiplePricesData"),
+        use_binary_cache: bool = False,
     ):
 
         super().__init__(log=log)
@@ -33,6 +36,7 @@ class csvFuturesMultiplePricesData(futuresMultiplePricesData):
             datapath = CSV_MULTIPLE_PRICE_DIRECTORY
 
         self._datapath = datapath
+        self.use_binary_cache = use_binary_cache
 
     def __repr__(self):
         return "csvFuturesMultiplePricesData accessing %s" % self.datapath
@@ -50,9 +54,9 @@ class csvFuturesMultiplePricesData(futuresMultiplePricesData):
 
         instr_all_price_data = self._read_instrument_prices(instrument_code)
         for contract_col_name in list_of_contract_column_names:
-            instr_all_price_data[contract_col_name] = instr_all_price_data[
-                contract_col_name
-            ].apply(str_of_int)
+            instr_all_price_data[contract_col_name] = _contract_column_as_str(
+                instr_all_price_data[contract_col_name]
+            )
 
         return futuresMultiplePrices(instr_all_price_data)
 
@@ -79,7 +83,14 @@ class csvFuturesMultiplePricesData(futuresMultiplePricesData):
         filename = self._filename_given_instrument_code(instrument_code)
 
         try:
-            instr_all_price_data = pd_readcsv(filename, date_index_name=DATE_INDEX_NAME)
+            if self.use_binary_cache:
+                instr_all_price_data = pd_readcsv_with_binary_cache(
+                    filename, date_index_name=DATE_INDEX_NAME
+                )
+            else:
+                instr_all_price_data = pd_readcsv(
+                    filename, date_index_name=DATE_INDEX_NAME
+                )
         except OSError:
             self.log.warn(
                 "Can't find multiple price file %s or error reading" % filename,
@@ -93,3 +104,22 @@ class csvFuturesMultiplePricesData(futuresMultiplePricesData):
         filename = get_filename_for_package(self.datapath, "%s.csv" % (instrument_code))
 
         return filename
+
+
+def _contract_column_as_str(contract_column: pd.Series) -> pd.Series:
+    ## same as contract_column.apply(str_of_int), but each contract only appears in a few places
+    if len(contract_column) == 0:
+        return contract_column.apply(str_of_int)
+
+    codes, unique_values = pd.factorize(contract_column)
+    ## missing values have code -1, so end up as the last entry
+    unique_values_as_str = np.array(
+        [str_of_int(value) for value in unique_values] + [str_of_int(np.nan)],
+        dtype=object,
+    )
+
+    return pd.Series(
+        unique_values_as_str[codes],
+        index=contract_column.index,
+        name=contract_column.name,
+    )
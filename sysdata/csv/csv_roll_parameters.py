@@ -27,6 +27,10 @@ class csvRollParametersData(rollParametersData):
 
         self._config_file = config_file
 
+    @property
+    def config_file(self):
+        return self._config_file
+
     def _get_config_information(self):
         """
         Get configuration information
@@ -6,6 +6,7 @@ from sysobjects.spot_fx_prices import fxPrices
 from syscore.fileutils import get_filename_for_package, files_with_extension_in_pathname
 from syscore.objects import arg_not_supplied
 from syscore.pdutils import pd_readcsv, DEFAULT_DATE_FORMAT
+from sysdata.csv.csv_binary_cache import pd_readcsv_with_binary_cache
 from syslogdiag.log_to_screen import logtoscreen
 
 FX_PRICES_DIRECTORY = "data.futures.fx_prices_csv"
@@ -36,12 +37,14 @@ class csvFxPricesData(fxPricesData):
         datapath=arg_not_supplied,
         log=logtoscreen("csvFxPricesData"),
         config: ConfigCsvFXPrices = arg_not_supplied,
+        use_binary_cache: bool = False,
     ):
         """
         Get FX data from a .csv file
 
         :param datapath: Path where csv files are located
         :param log: logging object
+        :param use_binary_cache: keep a binary copy of each file, which is quicker to read
         """
 
         super().__init__(log=log)
@@ -54,6 +57,7 @@ class csvFxPricesData(fxPricesData):
 
         self._datapath = datapath
         self._config = config
+        self.use_binary_cache = use_binary_cache
 
     def __repr__(self):
         return "csvFxPricesData accessing %s" % self._datapath
@@ -77,9 +81,14 @@ class csvFxPricesData(fxPricesData):
         date_format = config.date_format
 
         try:
-            fx_data = pd_readcsv(
-                filename, date_format=date_format, date_index_name=date_column
-            )
+            if self.use_binary_cache:
+                fx_data = pd_readcsv_with_binary_cache(
+                    filename, date_format=date_format, date_index_name=date_column
+                )
+            else:
+                fx_data = pd_readcsv(
+                    filename, date_format=date_format, date_index_name=date_column
+                )
         except OSError:
             self.log.warn("Can't find currency price file %s" % filename, fx_code=code)
             return fxPrices.create_empty()
@@ -1,7 +1,7 @@
 from copy import copy
 
 from sysbrokers.IB.ib_connection import connectionIB
-from syscore.objects import arg_not_supplied, get_class_name
+from syscore.objects import arg_not_supplied, get_class_name, missing_data
 from syscore.text import camel_case_split
 from sysdata.config.production_config import get_production_config, Config
 from sysdata.mongodb.mongo_connection import mongoDb
@@ -26,7 +26,7 @@ class dataBlob(object):
         Set up of a data pipeline with standard attribute names, logging, links to DB etc
 
         Class names we know how to handle are:
-        'ib*', 'mongo*', 'arctic*', 'csv*'
+        'ib*', 'mongo*', 'arctic*', 'csv*', 'parquet*'
 
             data = dataBlob([arcticFuturesContractPriceData, arcticFuturesContractPriceData, mongoFuturesContractData])
 
@@ -102,6 +102,7 @@ class dataBlob(object):
             csv=self._add_csv_class,
             arctic=self._add_arctic_class,
             mongo=self._add_mongo_class,
+            parquet=self._add_parquet_class,
         )
 
         method_to_add_with = class_dict.get(prefix, None)
@@ -185,6 +186,33 @@ class dataBlob(object):
 
         return resolved_instance
 
+    def _add_parquet_class(self, class_object):
+        datapath = self._get_parquet_store_path()
+        log = self._get_specific_logger(class_object)
+
+        try:
+            resolved_instance = class_object(datapath=datapath, log=log)
+        except Exception as e:
+            class_name = get_class_name(class_object)
+            msg = (
+                "Error %s couldn't evaluate %s(datapath = datapath, log = self.log.setup(component = %s)) \
+                        This might be because pyarrow is not installed, import is missing\
+                         or arguments don't follow pattern"
+                % (str(e), class_name, class_name)
+            )
+            self._raise_and_log_error(msg)
+
+        return resolved_instance
+
+    def _get_parquet_store_path(self) -> str:
+        datapath = self.config.get_element_or_missing_data("parquet_store")
+        if datapath is missing_data:
+            self._raise_and_log_error(
+                "Need to set parquet_store in private config to use parquet data"
+            )
+
+        return datapath
+
     def _get_csv_paths_for_class(self, class_object) -> str:
         class_name = get_class_name(class_object)
         csv_data_paths = self.csv_data_paths
@@ -265,6 +293,10 @@ class dataBlob(object):
             self.ib_conn.close_connection()
             self.db_ib_broker_client_id.release_clientid(self.ib_conn.client_id())
 
+        log = getattr(self, "_log", arg_not_supplied)
+        if log is not arg_not_supplied:
+            log.flush()
+
         # No need to explicitly close Mongo connections; handled by Python garbage collection
 
     @property
@@ -345,7 +377,7 @@ class dataBlob(object):
         return log_name
 
 
-source_dict = dict(arctic="db", mongo="db", csv="db", ib="broker")
+source_dict = dict(arctic="db", mongo="db", csv="db", parquet="db", ib="broker")
 
 
 def identifying_name(split_up_name: list, keep_original_prefix=False) -> str:
@@ -359,7 +391,7 @@ def identifying_name(split_up_name: list, keep_original_prefix=False) -> str:
     data_label = lower_split_up_name.pop(-1)  # always 'data'
     original_source_label = lower_split_up_name.pop(
         0
-    )  # always the source, eg csv, ib, mongo or arctic
+    )  # always the source, eg csv, ib, mongo, arctic or parquet
 
     try:
         assert data_label == "data"
@@ -192,17 +192,11 @@ class futuresContractPriceData(baseData):
         :return: dictFuturesContractPrices
         """
 
-        list_of_contracts = self.contracts_with_merged_price_data_for_instrument_code(
+        list_of_contract_date_str = self.contract_dates_with_merged_price_data_for_instrument_code(
             instrument_code
         )
-        dict_of_prices = dictFuturesContractPrices(
-            [
-                (
-                    contract.date_str,
-                    self.get_merged_prices_for_contract_object(contract),
-                )
-                for contract in list_of_contracts
-            ]
+        dict_of_prices = self.get_merged_prices_for_contract_list(
+            instrument_code, list_of_contract_date_str
         )
 
         return dict_of_prices
@@ -218,17 +212,70 @@ class futuresContractPriceData(baseData):
         :return: dictFuturesContractPrices
         """
 
-        list_of_contracts = self.contracts_with_price_data_at_frequency_for_instrument_code(
+        list_of_contract_date_str = self.contract_dates_with_price_data_at_frequency_for_instrument_code(
             instrument_code=instrument_code,
             frequency=frequency
         )
+        dict_of_prices = self.get_prices_at_frequency_for_contract_list(
+            instrument_code=instrument_code,
+            list_of_contract_date_str=list_of_contract_date_str,
+            frequency=frequency
+        )
+
+        return dict_of_prices
+
+    def get_merged_prices_for_contract_list(
+        self, instrument_code: str,
+            list_of_contract_date_str: list
+    ) -> dictFuturesContractPrices:
+        """
+        Get prices for several contracts of the same instrument, returned as dict keyed by contract date
+
+        Contracts without prices are returned as empty prices. This reads one contract at a time; sources
+        which can read many contracts in one go should override it.
+
+        :param instrument_code: str
+        :param list_of_contract_date_str: list of str
+        :return: dictFuturesContractPrices
+        """
+
+        dict_of_prices = dictFuturesContractPrices(
+            [
+                (
+                    contract_date_str,
+                    self.get_merged_prices_for_contract_object(
+                        futuresContract(instrument_code, contract_date_str)
+                    ),
+                )
+                for contract_date_str in list_of_contract_date_str
+            ]
+        )
+
+        return dict_of_prices
+
+    def get_prices_at_frequency_for_contract_list(
+        self, instrument_code: str,
+            list_of_contract_date_str: list,
+            frequency: Frequency
+    ) -> dictFuturesContractPrices:
+        """
+        Get prices at a given frequency for several contracts of the same instrument, returned as dict
+
+        :param instrument_code: str
+        :param list_of_contract_date_str: list of str
+        :return: dictFuturesContractPrices
+        """
+
         dict_of_prices = dictFuturesContractPrices(
             [
                 (
-                    contract.date_str,
-                    self.get_prices_at_frequency_for_contract_object(contract, frequency=frequency),
+                    contract_date_str,
+                    self.get_prices_at_frequency_for_contract_object(
+                        futuresContract(instrument_code, contract_date_str),
+                        frequency=frequency
+                    ),
                 )
-                for contract in list_of_contracts
+                for contract_date_str in list_of_contract_date_str
             ]
         )
 
@@ -174,11 +174,11 @@ class mongoConnection(object):
         else:
             return False
 
-    def create_index(self, indexname, order=ASCENDING):
+    def create_index(self, indexname, order=ASCENDING, unique: bool = True):
         if self.check_for_index(indexname):
             pass
         else:
-            self.collection.create_index([(indexname, order)], unique=True)
+            self.collection.create_index([(indexname, order)], unique=unique)
 
     def create_multikey_index(
         self, indexname1, indexname2, order1=ASCENDING, order2=ASCENDING
@@ -41,6 +41,14 @@ class mongoDataWithSingleKey(object):
     def __repr__(self):
         return self.name
 
+    def create_index_on_field(self, field_name: str):
+        # unlike the key, values of other fields needn't be unique
+        try:
+            self._mongo.create_index(field_name, unique=False)
+        except:
+            pass
+            ## no big deal, queries will just be slower
+
     @property
     def key_name(self) -> str:
         return self._key_name
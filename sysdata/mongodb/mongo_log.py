@@ -1,5 +1,7 @@
-from syscore.objects import arg_not_supplied, existingData
-from sysdata.mongodb.mongo_connection import mongoDb
+from pymongo import ReturnDocument
+
+from syscore.objects import arg_not_supplied, existingData, missing_data
+from sysdata.mongodb.mongo_connection import mongoDb, mongo_clean_ints
 from sysdata.mongodb.mongo_generic import mongoDataWithSingleKey, MONGO_ID_KEY
 from syscore.dateutils import long_to_datetime, datetime_to_long
 
@@ -14,9 +16,23 @@ from syslogdiag.log_entry import (
 from syslogdiag.database_log import logToDb, logData
 
 from copy import copy
+import atexit
 import datetime
+import os
+import queue
+import threading
 
 LOG_COLLECTION_NAME = "Logs"
+LOG_ID_COUNTER_COLLECTION_NAME = "LogIdCounter"
+LOG_ID_COUNTER_KEY = "collection_name"
+LAST_RESERVED_LOG_ID = "last_reserved_id"
+
+# We reserve this many log IDs with each round trip to mongo
+LOG_ID_BLOCK_SIZE = 100
+
+# Records queued beyond this will block the caller until the writer catches up
+LOG_QUEUE_SIZE = 10000
+LOG_WRITE_BATCH_SIZE = 500
 
 
 class logToMongod(logToDb):
@@ -38,51 +54,178 @@ class logToMongod(logToDb):
             LOG_COLLECTION_NAME, LOG_RECORD_ID, mongo_db=mongo_db
         )
 
+        # shared with any copies of this log made by setup()
+        self._log_id_allocator = mongoLogIdAllocator(
+            self._mongo_data, mongo_db=mongo_db
+        )
+        self._log_writer = mongoLogWriter(self._mongo_data.collection)
+
     @property
     def mongo_data(self):
         return self._mongo_data
 
     def get_next_log_id(self) -> int:
-        # slightly complicated to deal with race conditions
-        invalid_id = True
-        counter = 0
-        while invalid_id:
-            last_id = self._get_last_used_log_id()
-            next_id = last_id + 1
-            reserved_okay = self._reserve_log_id(next_id)
-            if reserved_okay:
-                break
-            counter = counter + 1
-            if counter > 100:
-                raise Exception("Couldn't reserve log ID")
+        return self._log_id_allocator.get_next_log_id()
+
+    def add_log_record(self, log_entry: logEntry):
+        record_as_dict = log_entry.log_as_dict()
+        self._log_writer.add_record(record_as_dict)
+
+    def flush(self):
+        self._log_writer.flush()
+
+
+class mongoLogIdAllocator(object):
+    """
+    Hands out log IDs from blocks reserved with an atomic increment in mongo, so we only need one round trip
+    for every LOG_ID_BLOCK_SIZE log records
+
+    IDs are unique across processes and increase within a process; IDs from different processes are ordered
+    by block rather than by time
+    """
+
+    def __init__(
+        self,
+        log_data: mongoDataWithSingleKey,
+        mongo_db: mongoDb = arg_not_supplied,
+        block_size: int = LOG_ID_BLOCK_SIZE,
+    ):
+        self._log_data = log_data
+        self._counter_data = mongoDataWithSingleKey(
+            LOG_ID_COUNTER_COLLECTION_NAME, LOG_ID_COUNTER_KEY, mongo_db=mongo_db
+        )
+        self._block_size = block_size
+
+        # empty block, so first call will reserve one
+        self._next_id = 1
+        self._last_id_in_block = 0
+        self._lock = threading.Lock()
+
+    def get_next_log_id(self) -> int:
+        with self._lock:
+            if self._next_id > self._last_id_in_block:
+                self._reserve_block_of_log_ids()
+            next_id = self._next_id
+            self._next_id = next_id + 1
 
         return next_id
 
-    def _get_last_used_log_id(self) -> int:
-        """
-        Get last used log id. Returns None if not present
+    def _reserve_block_of_log_ids(self):
+        last_id_in_block = self._increment_counter()
+        if last_id_in_block is missing_data:
+            self._create_counter()
+            last_id_in_block = self._increment_counter()
 
-        :return: int or None
-        """
-        current_max = self.mongo_data.get_max_of_keys()
-        if current_max == None:
-            return 0
+        self._last_id_in_block = last_id_in_block
+        self._next_id = last_id_in_block - self._block_size + 1
+
+    def _increment_counter(self) -> int:
+        counter_dict = self._counter_data.collection.find_one_and_update(
+            {LOG_ID_COUNTER_KEY: LOG_COLLECTION_NAME},
+            {"$inc": {LAST_RESERVED_LOG_ID: self._block_size}},
+            return_document=ReturnDocument.AFTER,
+        )
+        if counter_dict is None:
+            return missing_data
 
-        return current_max
+        return counter_dict[LAST_RESERVED_LOG_ID]
 
-    def _reserve_log_id(self, next_id: int) -> bool:
+    def _create_counter(self):
+        # carry on from any log IDs used before we had a counter
+        last_used_id = self._log_data.get_max_of_keys()
         try:
-            self.mongo_data.add_data(next_id, {})
+            self._counter_data.add_data(
+                LOG_COLLECTION_NAME, {LAST_RESERVED_LOG_ID: last_used_id}
+            )
         except existingData:
-            return False
-        else:
-            return True
+            ## another process created it first, no problem
+            pass
 
-    def add_log_record(self, log_entry: logEntry):
-        record_as_dict = log_entry.log_as_dict()
-        key = record_as_dict[LOG_RECORD_ID]
 
-        self.mongo_data.add_data(key, record_as_dict, allow_overwrite=True)
+class mongoLogWriter(object):
+    """
+    Queues up log records and writes them to mongo in batches on a background thread
+
+    The queue is bounded, so if mongo can't keep up the callers slow down rather than us using up memory.
+    Anything still queued is written when flush() is called, or when the process exits.
+    """
+
+    def __init__(
+        self,
+        collection,
+        queue_size: int = LOG_QUEUE_SIZE,
+        batch_size: int = LOG_WRITE_BATCH_SIZE,
+    ):
+        self._collection = collection
+        self._queue_size = queue_size
+        self._batch_size = batch_size
+        self._lock = threading.Lock()
+        self._registered_flush_on_exit = False
+        self._start_queue()
+
+    def add_record(self, record_as_dict: dict):
+        self._start_writing_if_needed()
+        self._queue.put(mongo_clean_ints(record_as_dict))
+
+    def flush(self):
+        if self._pid != os.getpid():
+            # we've been forked and haven't logged anything since; the queue is our parent's, and there
+            # is no writer thread here to empty it
+            return
+
+        if self._thread is None:
+            return
+
+        self._queue.join()
+
+    def _start_queue(self):
+        self._queue = queue.Queue(maxsize=self._queue_size)
+        self._thread = None
+        self._pid = os.getpid()
+
+    def _start_writing_if_needed(self):
+        with self._lock:
+            if self._pid != os.getpid():
+                # we've been forked; the writer thread didn't come with us
+                self._start_queue()
+
+            if self._thread is not None:
+                return
+
+            thread = threading.Thread(
+                target=self._write_records_from_queue, name="mongoLogWriter", daemon=True
+            )
+            thread.start()
+            self._thread = thread
+
+            if not self._registered_flush_on_exit:
+                atexit.register(self.flush)
+                self._registered_flush_on_exit = True
+
+    def _write_records_from_queue(self):
+        ## bind the queue, in case it's replaced after a fork
+        records_queue = self._queue
+        while True:
+            list_of_records = [records_queue.get()]
+            while len(list_of_records) < self._batch_size:
+                try:
+                    list_of_records.append(records_queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            self._write_records(list_of_records)
+            for _ in list_of_records:
+                records_queue.task_done()
+
+    def _write_records(self, list_of_records: list):
+        try:
+            self._collection.insert_many(list_of_records, ordered=False)
+        except Exception as e:
+            # can't log to ourselves...
+            print(
+                "Couldn't write %d log records to mongo: %s"
+                % (len(list_of_records), str(e))
+            )
 
 
 class mongoLogData(logData):
@@ -126,8 +269,8 @@ class mongoLogData(logData):
             for single_log_dict in results_list
         ]
 
-        # sort by log ID
-        list_of_log_items.sort(key=lambda x: x._log_id)
+        # sort by time, then log ID; IDs from different processes don't interleave by time
+        list_of_log_items.sort(key=lambda x: (x.timestamp, x._log_id))
 
         return list_of_log_items
 
@@ -1,9 +1,12 @@
-from syscore.objects import success, missing_data
+from copy import deepcopy
+
+from syscore.objects import success, missing_data, arg_not_supplied
 from sysdata.mongodb.mongo_generic import mongoDataWithSingleKey
 from syslogdiag.log_to_screen import logtoscreen
 
 from sysexecution.order_stacks.order_stack import orderStackData, missing_order
 from sysexecution.orders.base_orders import Order
+from sysexecution.orders.list_of_orders import listOfOrders
 from sysexecution.orders.instrument_orders import instrumentOrder
 from sysexecution.order_stacks.instrument_order_stack import instrumentOrderStackData
 from sysexecution.orders.contract_orders import contractOrder
@@ -14,6 +17,9 @@ from sysexecution.order_stacks.broker_order_stack import brokerOrderStackData
 ORDER_ID_STORE_KEY = "_ORDER_ID_STORE_KEY"
 MAX_ORDER_KEY = "max_order_id"
 
+# fields we query on every stack handler cycle
+LIST_OF_INDEXED_ORDER_FIELDS = ["active", "key"]
+
 
 class mongoOrderStackData(orderStackData):
     """
@@ -28,7 +34,16 @@ class mongoOrderStackData(orderStackData):
     def _order_class(self):
         return Order
 
-    def __init__(self, mongo_db=None, log=logtoscreen("mongoOrderStackData")):
+    def __init__(
+        self,
+        mongo_db=None,
+        log=logtoscreen("mongoOrderStackData"),
+        use_cache: bool = False,
+    ):
+        """
+        :param use_cache: keep orders we've read in memory until we change them. Only safe if no other process
+           is changing this stack at the same time
+        """
         # Not needed as we don't store anything in _state attribute used in parent class
         # If we did have _state would risk breaking if we forgot to override methods
         # super().__init__()
@@ -36,6 +51,11 @@ class mongoOrderStackData(orderStackData):
         self._mongo_data = mongoDataWithSingleKey(
             collection_name, "order_id", mongo_db=mongo_db
         )
+        for field_name in LIST_OF_INDEXED_ORDER_FIELDS:
+            self._mongo_data.create_index_on_field(field_name)
+
+        self._use_cache = use_cache
+        self._cache_of_order_dicts = {}
 
         super().__init__(log=log)
 
@@ -51,15 +71,87 @@ class mongoOrderStackData(orderStackData):
         )
 
     def get_order_with_id_from_stack(self, order_id: int):
-        result_dict = self.mongo_data.get_result_dict_for_key(order_id)
+        result_dict = self._cache_of_order_dicts.get(order_id, missing_data)
         if result_dict is missing_data:
-            return missing_order
+            result_dict = self.mongo_data.get_result_dict_for_key(order_id)
+            if result_dict is missing_data:
+                return missing_order
+            self._add_order_dict_to_cache(result_dict)
+
+        order = self._order_from_dict(result_dict)
+
+        return order
+
+    def get_list_of_orders_from_order_id_list(self, list_of_order_ids) -> listOfOrders:
+        ## one query, rather than one for each order
+        order_ids_to_read = [
+            order_id
+            for order_id in list_of_order_ids
+            if order_id not in self._cache_of_order_dicts
+        ]
+        dict_of_order_dicts = dict(
+            [
+                (order_id, self._cache_of_order_dicts[order_id])
+                for order_id in list_of_order_ids
+                if order_id in self._cache_of_order_dicts
+            ]
+        )
+        if len(order_ids_to_read) > 0:
+            list_of_result_dicts = self.mongo_data.get_list_of_result_dict_for_custom_dict(
+                {"order_id": {"$in": order_ids_to_read}}
+            )
+            for result_dict in list_of_result_dicts:
+                self._add_order_dict_to_cache(result_dict)
+                dict_of_order_dicts[result_dict["order_id"]] = result_dict
+
+        order_list = [
+            self._order_from_dict(dict_of_order_dicts[order_id])
+            if order_id in dict_of_order_dicts
+            else missing_order
+            for order_id in list_of_order_ids
+        ]
+
+        return listOfOrders(order_list)
+
+    def _get_list_of_orders_on_stack(
+        self, active: bool = arg_not_supplied, order_key: str = arg_not_supplied
+    ) -> listOfOrders:
+        # Only orders have an active field, so this excludes the order ID store
+        custom_dict = {"active": {"$exists": True}}
+        if active is not arg_not_supplied:
+            custom_dict["active"] = active
+        if order_key is not arg_not_supplied:
+            custom_dict["key"] = order_key
+
+        ## always read, as orders may have been added since we last looked
+        list_of_result_dicts = self.mongo_data.get_list_of_result_dict_for_custom_dict(
+            custom_dict
+        )
+        list_of_result_dicts.sort(key=lambda result_dict: result_dict["order_id"])
+        for result_dict in list_of_result_dicts:
+            self._add_order_dict_to_cache(result_dict)
+
+        order_list = [
+            self._order_from_dict(result_dict) for result_dict in list_of_result_dicts
+        ]
+
+        return listOfOrders(order_list)
 
+    def _order_from_dict(self, result_dict: dict) -> Order:
         order_class = self._order_class()
-        order = order_class.from_dict(result_dict)
+
+        ## from_dict consumes the dict, which we might want to keep in the cache
+        order = order_class.from_dict(deepcopy(result_dict))
 
         return order
 
+    def _add_order_dict_to_cache(self, result_dict: dict):
+        if self._use_cache:
+            self._cache_of_order_dicts[result_dict["order_id"]] = result_dict
+
+    def _remove_order_from_cache(self, order_id: int):
+        self._cache_of_order_dicts.pop(order_id, None)
+
     def _get_list_of_all_order_ids(self) -> list:
         order_ids = self.mongo_data.get_list_of_keys()
         try:
@@ -70,6 +162,7 @@ class mongoOrderStackData(orderStackData):
         return order_ids
 
     def _change_order_on_stack_no_checking(self, order_id: int, order):
+        self._remove_order_from_cache(order_id)
         order_as_dict = order.as_dict()
 
         self.mongo_data.add_data(order_id, order_as_dict, allow_overwrite=True)
@@ -111,6 +204,7 @@ class mongoOrderStackData(orderStackData):
         return first_order_id
 
     def _remove_order_with_id_from_stack_no_checking(self, order_id):
+        self._remove_order_from_cache(order_id)
         self.mongo_data.delete_data_without_any_warning(order_id)
 
 
@@ -1,16 +1,50 @@
+"""
+Timed storage in mongo, one document per entry
+
+Each document holds the args dict (eg strategy and instrument), the name of the data class, the date and the
+entry itself. Adding an entry is a single insert, rather than rewriting the whole history; and reads of the
+current entry or a range of dates are done by the database using the index on (args, date).
+
+Older versions kept the whole history for an args dict as an array inside one document. These have to be moved
+across with sysinit/futures/migrate_timed_storage_to_one_document_per_entry.py, whilst nothing else is running;
+the old documents are kept in a backup collection. Reading or writing data which hasn't been moved yet raises an
+exception, rather than reading it as empty.
+"""
+
+from copy import copy
+import datetime
+
+from pymongo import ASCENDING, DESCENDING
+
 from sysdata.production.timed_storage import (
     listOfEntriesData,
     classStrWithListOfEntriesAsListOfDicts,
     listOfEntriesAsListOfDicts,
 )
-from syscore.objects import arg_not_supplied, missing_data
+from syscore.objects import arg_not_supplied, missing_data, success, failure, resolve_function
 
+from sysdata.mongodb.mongo_connection import mongoConnection
 from sysdata.mongodb.mongo_generic import mongoDataWithMultipleKeys
+from sysobjects.production.timed_storage import (
+    timedEntry,
+    listOfEntries,
+    DATE_KEY_NAME,
+)
 from syslogdiag.log_to_screen import logtoscreen
 
 DATA_CLASS_KEY = "data_class"
 ENTRY_SERIES_KEY = "entry_series"
 
+ARGS_KEY = "args"
+ENTRY_KEY = "entry"
+ENTRY_DATE_KEY = "entry_date"
+MONGO_ID_KEY = "_id"
+
+ENTRIES_COLLECTION_SUFFIX = "_entries"
+SINGLE_DOCUMENT_BACKUP_COLLECTION_SUFFIX = "_single_document_backup"
+
+MIGRATION_SCRIPT = "sysinit/futures/migrate_timed_storage_to_one_document_per_entry.py"
+
 
 class mongoListOfEntriesData(listOfEntriesData):
     """
@@ -30,56 +64,425 @@ class mongoListOfEntriesData(listOfEntriesData):
     def __init__(self, mongo_db=arg_not_supplied, log=logtoscreen("mongoStrategyCapitalData")):
 
         super().__init__(log=log)
-        self._mongo_data = mongoDataWithMultipleKeys(
+        self._mongo_entries = mongoConnection(
+            self._entries_collection_name, mongo_db=mongo_db
+        )
+        self._mongo_data_in_single_document_layout = mongoDataWithMultipleKeys(
             self._collection_name, mongo_db=mongo_db
         )
+        self._mongo_data_in_single_document_layout_backup = mongoDataWithMultipleKeys(
+            self._collection_name + SINGLE_DOCUMENT_BACKUP_COLLECTION_SUFFIX,
+            mongo_db=mongo_db,
+        )
+
+    @property
+    def _entries_collection_name(self) -> str:
+        return self._collection_name + ENTRIES_COLLECTION_SUFFIX
+
+    @property
+    def mongo_entries(self) -> mongoConnection:
+        return self._mongo_entries
 
     @property
-    def mongo_data(self):
-        return self._mongo_data
+    def mongo_data_in_single_document_layout(self) -> mongoDataWithMultipleKeys:
+        return self._mongo_data_in_single_document_layout
+
+    @property
+    def mongo_data_in_single_document_layout_backup(self) -> mongoDataWithMultipleKeys:
+        return self._mongo_data_in_single_document_layout_backup
+
+    @property
+    def _entries_collection(self):
+        return self.mongo_entries.collection
 
     def __repr__(self):
         return "Data connection for %s, mongodb %s" % (
             self._data_name,
-            str(self.mongo_data),
+            str(self.mongo_entries),
         )
 
     def _get_list_of_args_dict(self) -> list:
-        dict_list = self.mongo_data.get_list_of_all_dicts()
+        list_of_args_dict = self._entries_collection.distinct(ARGS_KEY)
+        for args_dict in self._get_list_of_args_dict_in_single_document_layout():
+            if args_dict not in list_of_args_dict:
+                list_of_args_dict.append(args_dict)
+
+        return list_of_args_dict
+
+    def _get_list_of_args_dict_in_single_document_layout(self) -> list:
+        dict_list = self.mongo_data_in_single_document_layout.get_list_of_all_dicts()
         _ = [dict_entry.pop(DATA_CLASS_KEY) for dict_entry in dict_list]
         _ = [dict_entry.pop(ENTRY_SERIES_KEY) for dict_entry in dict_list]
 
         return dict_list
 
+    def _update_entry_for_args_dict(self, new_entry: timedEntry, args_dict: dict):
+        ## Only need the last entry to check we are adding the right kind of thing
+        last_entry_as_document = self._get_last_entry_as_document_for_args_dict(
+            args_dict
+        )
+        if last_entry_as_document is not missing_data:
+            self._check_new_entry_matches_last_entry(
+                new_entry, last_entry_as_document, args_dict=args_dict
+            )
+
+        class_of_entry_list_as_str = new_entry.containing_data_class_name
+        self._insert_list_of_entry_dicts_for_args_dict(
+            args_dict,
+            [new_entry.as_dict()],
+            class_of_entry_list_as_str=class_of_entry_list_as_str,
+        )
+
+        return success
+
+    def _check_new_entry_matches_last_entry(
+        self, new_entry: timedEntry, last_entry_as_document: dict, args_dict: dict
+    ):
+        entry_class_name_existing = last_entry_as_document[DATA_CLASS_KEY]
+        self._check_class_name_matches_existing_class_name(
+            new_entry, entry_class_name_existing
+        )
+
+        last_entry = _entry_from_document(last_entry_as_document)
+        try:
+            last_entry.check_args_match(new_entry)
+        except Exception as e:
+            error_msg = "Error %s when updating for %s with %s" % (
+                str(e),
+                str(args_dict),
+                str(new_entry),
+            )
+
+            self.log.critical(error_msg)
+            raise Exception(error_msg)
+
+    def _get_current_entry_for_args_dict(self, args_dict: dict):
+        last_entry_as_document = self._get_last_entry_as_document_for_args_dict(
+            args_dict
+        )
+        if last_entry_as_document is missing_data:
+            return missing_data
+
+        return _entry_from_document(last_entry_as_document)
+
+    def _delete_last_entry_for_args_dict(self, args_dict: dict, are_you_sure=False):
+        if not are_you_sure:
+            self.log.warn("Have to set are_you_sure to True when deleting")
+            return failure
+
+        last_entry_as_document = self._get_last_entry_as_document_for_args_dict(
+            args_dict
+        )
+        if last_entry_as_document is missing_data:
+            self.log.warn(
+                "Can't delete last entry for %s, as none present" % str(args_dict)
+            )
+            return failure
+
+        self._entries_collection.delete_one(
+            {MONGO_ID_KEY: last_entry_as_document[MONGO_ID_KEY]}
+        )
+
+        return success
+
+    def _delete_all_data_for_args_dict(
+        self, args_dict: dict, are_you_really_sure: bool = False
+    ):
+        if not are_you_really_sure:
+            self.log.warn("To delete all data, need to set are_you_really_sure=True")
+            return failure
+
+        self._check_args_dict_not_in_single_document_layout(args_dict)
+        self._entries_collection.delete_many(_filter_for_args_dict(args_dict))
+
+        return success
+
+    def _get_series_for_args_dict_between_dates(
+        self,
+        args_dict: dict,
+        start_date: datetime.datetime = arg_not_supplied,
+        end_date: datetime.datetime = arg_not_supplied,
+    ) -> listOfEntries:
+
+        class_str_with_series_as_list_of_dicts = (
+            self._get_series_dict_with_data_class_for_args_dict(
+                args_dict, start_date=start_date, end_date=end_date
+            )
+        )
+        if class_str_with_series_as_list_of_dicts is missing_data:
+            return self._empty_data_series
+
+        return class_str_with_series_as_list_of_dicts.as_list_of_entries()
+
+    def _get_class_of_entry_list_as_str(
+        self,
+        args_dict: dict,
+    ) -> str:
+        last_entry_as_document = self._get_last_entry_as_document_for_args_dict(
+            args_dict
+        )
+        if last_entry_as_document is missing_data:
+            return self._data_class_name()
+
+        return last_entry_as_document[DATA_CLASS_KEY]
+
     def _get_series_dict_with_data_class_for_args_dict(
-        self, args_dict: dict
+        self,
+        args_dict: dict,
+        start_date: datetime.datetime = arg_not_supplied,
+        end_date: datetime.datetime = arg_not_supplied,
     ) -> classStrWithListOfEntriesAsListOfDicts:
 
-        result_dict = self.mongo_data.get_result_dict_for_dict_keys(args_dict)
-        if result_dict is missing_data:
+        self._check_args_dict_not_in_single_document_layout(args_dict)
+
+        filter_dict = _filter_for_args_dict(args_dict)
+        date_filter = _date_filter(start_date=start_date, end_date=end_date)
+        if len(date_filter) > 0:
+            filter_dict[ENTRY_DATE_KEY] = date_filter
+
+        ## entries can have the same date, so use the order they were written in as well
+        list_of_documents = list(
+            self._entries_collection.find(
+                filter_dict, sort=[(ENTRY_DATE_KEY, ASCENDING), (MONGO_ID_KEY, ASCENDING)]
+            )
+        )
+        if len(list_of_documents) == 0:
             return missing_data
 
-        data_class = result_dict[DATA_CLASS_KEY]
-        series_as_list_of_dicts = result_dict[ENTRY_SERIES_KEY]
-        series_as_list_of_dicts = listOfEntriesAsListOfDicts(series_as_list_of_dicts)
+        data_class = list_of_documents[-1][DATA_CLASS_KEY]
+        series_as_list_of_dicts = listOfEntriesAsListOfDicts(
+            [document[ENTRY_KEY] for document in list_of_documents]
+        )
 
-        class_str_with_series_as_list_of_dicts = classStrWithListOfEntriesAsListOfDicts(
+        return classStrWithListOfEntriesAsListOfDicts(
             data_class, series_as_list_of_dicts
         )
 
-        return class_str_with_series_as_list_of_dicts
-
     def _write_series_dict_for_args_dict(
         self,
         args_dict: dict,
         class_str_with_series_as_list_of_dicts: classStrWithListOfEntriesAsListOfDicts,
     ):
+        ## Replaces all the existing entries; normally we only append or delete the last entry
+        self._check_args_dict_not_in_single_document_layout(args_dict)
+        self._entries_collection.delete_many(_filter_for_args_dict(args_dict))
+        self._insert_list_of_entry_dicts_for_args_dict(
+            args_dict,
+            class_str_with_series_as_list_of_dicts.entry_list_as_plain_list(),
+            class_of_entry_list_as_str=class_str_with_series_as_list_of_dicts.class_of_entry_list_as_str,
+        )
+
+    def _get_entry_for_args_dict_as_at_date(
+        self, args_dict: dict, date: datetime.datetime
+    ):
+        entry_as_document = self._get_last_entry_as_document_for_args_dict(
+            args_dict, as_at_date=date
+        )
+        if entry_as_document is missing_data:
+            return missing_data
+
+        return _entry_from_document(entry_as_document)
+
+    def _get_last_entry_as_document_for_args_dict(
+        self, args_dict: dict, as_at_date: datetime.datetime = arg_not_supplied
+    ) -> dict:
+        self._check_args_dict_not_in_single_document_layout(args_dict)
+
+        return self._find_last_entry_as_document_for_args_dict(
+            args_dict, as_at_date=as_at_date
+        )
+
+    def _find_last_entry_as_document_for_args_dict(
+        self, args_dict: dict, as_at_date: datetime.datetime = arg_not_supplied
+    ) -> dict:
+        filter_dict = _filter_for_args_dict(args_dict)
+        if as_at_date is not arg_not_supplied:
+            filter_dict[ENTRY_DATE_KEY] = _date_filter(end_date=as_at_date)
+
+        last_entry_as_document = self._entries_collection.find_one(
+            filter_dict, sort=[(ENTRY_DATE_KEY, DESCENDING), (MONGO_ID_KEY, DESCENDING)]
+        )
+        if last_entry_as_document is None:
+            return missing_data
+
+        return last_entry_as_document
+
+    def _insert_list_of_entry_dicts_for_args_dict(
+        self,
+        args_dict: dict,
+        list_of_entry_dicts: list,
+        class_of_entry_list_as_str: str,
+    ):
+        if len(list_of_entry_dicts) == 0:
+            return None
+
+        self._create_index_for_args_dict_if_needed(args_dict)
+        list_of_documents = [
+            {
+                ARGS_KEY: dict(args_dict),
+                DATA_CLASS_KEY: class_of_entry_list_as_str,
+                ENTRY_DATE_KEY: entry_dict[DATE_KEY_NAME],
+                ENTRY_KEY: entry_dict,
+            }
+            for entry_dict in list_of_entry_dicts
+        ]
 
-        series_as_plain_list = (
-            class_str_with_series_as_list_of_dicts.entry_list_as_plain_list()
+        self._entries_collection.insert_many(list_of_documents)
+
+    def _create_index_for_args_dict_if_needed(self, args_dict: dict):
+        ## creating an index that exists is harmless, but it's a round trip so only do it once
+        indexed_args_keys = self._indexed_args_keys
+        args_keys = tuple(sorted(args_dict.keys()))
+        if args_keys in indexed_args_keys:
+            return None
+
+        index_fields = [
+            (_args_field_name(key), ASCENDING) for key in args_keys
+        ] + [(ENTRY_DATE_KEY, ASCENDING)]
+        self._entries_collection.create_index(
+            index_fields, name="_".join(args_keys + (ENTRY_DATE_KEY,))
         )
-        data_class = class_str_with_series_as_list_of_dicts.class_of_entry_list_as_str
+        indexed_args_keys.append(args_keys)
+
+    @property
+    def _indexed_args_keys(self) -> list:
+        indexed_args_keys = getattr(self, "_indexed_args_keys_store", None)
+        if indexed_args_keys is None:
+            indexed_args_keys = self._indexed_args_keys_store = []
+
+        return indexed_args_keys
+
+    def migrate_from_single_document_layout(self) -> int:
+        """
+        Move series stored as one document with an array of entries into one document per entry
+
+        Only run this when nothing else is reading or writing this data. Each old document is moved to a backup
+        collection once the entries have been copied and counted. Series which already have the same number of
+        entries in the new layout aren't copied again, so this is safe to run again.
+
+        :return: number of series copied
+        """
+        number_of_series_copied = 0
+        for args_dict in self._get_list_of_args_dict_in_single_document_layout():
+            copied = self._move_from_single_document_layout(args_dict)
+            if copied:
+                number_of_series_copied += 1
+
+        return number_of_series_copied
+
+    def _check_args_dict_not_in_single_document_layout(self, args_dict: dict):
+        ## Only need to look once per args dict, since nothing writes the old layout any more
+        args_dict_key = _key_for_args_dict(args_dict)
+        args_dicts_already_checked = self._args_dicts_checked_for_single_document_layout
+        if args_dict_key in args_dicts_already_checked:
+            return None
+
+        old_document = self.mongo_data_in_single_document_layout.get_result_dict_for_dict_keys(
+            args_dict
+        )
+        if old_document is not missing_data:
+            error_msg = (
+                "Data for %s is still stored as a single document: stop all processes and run %s"
+                % (str(args_dict), MIGRATION_SCRIPT)
+            )
+            self.log.critical(error_msg)
+            raise Exception(error_msg)
+
+        args_dicts_already_checked.append(args_dict_key)
+
+    def _move_from_single_document_layout(self, args_dict: dict) -> bool:
+        old_mongo_data = self.mongo_data_in_single_document_layout
+        old_document = old_mongo_data.get_result_dict_for_dict_keys(args_dict)
+        if old_document is missing_data:
+            return False
+
+        data_class = old_document[DATA_CLASS_KEY]
+        list_of_entry_dicts = old_document[ENTRY_SERIES_KEY]
+
+        number_of_entries_already_there = self._count_entries_for_args_dict(args_dict)
+        if number_of_entries_already_there == 0:
+            self._insert_list_of_entry_dicts_for_args_dict(
+                args_dict, list_of_entry_dicts, class_of_entry_list_as_str=data_class
+            )
+            copied = len(list_of_entry_dicts) > 0
+        elif number_of_entries_already_there == len(list_of_entry_dicts):
+            ## eg if we stopped before moving the old document last time
+            copied = False
+        else:
+            self.log.warn(
+                "Not moving %s: %d entries in the old document, but already %d in the new layout; sort out by hand"
+                % (
+                    str(args_dict),
+                    len(list_of_entry_dicts),
+                    number_of_entries_already_there,
+                )
+            )
+            return False
+
+        number_of_entries = self._count_entries_for_args_dict(args_dict)
+        if number_of_entries != len(list_of_entry_dicts):
+            self.log.warn(
+                "Copied %d entries for %s, but there are %d in the new layout; leaving the old document"
+                % (len(list_of_entry_dicts), str(args_dict), number_of_entries)
+            )
+            return False
+
+        ## keep the old document, but out of the way so we know it has been moved
+        self.mongo_data_in_single_document_layout_backup.add_data(
+            args_dict, old_document, allow_overwrite=True, clean_ints=False
+        )
+        old_mongo_data.delete_data_without_any_warning(args_dict)
+        self.log.msg(
+            "Moved %d entries for %s" % (len(list_of_entry_dicts), str(args_dict))
+        )
+
+        return copied
+
+    def _count_entries_for_args_dict(self, args_dict: dict) -> int:
+        return self._entries_collection.count_documents(
+            _filter_for_args_dict(args_dict)
+        )
+
+    @property
+    def _args_dicts_checked_for_single_document_layout(self) -> list:
+        args_dicts_checked = getattr(self, "_args_dicts_checked_store", None)
+        if args_dicts_checked is None:
+            args_dicts_checked = self._args_dicts_checked_store = []
+
+        return args_dicts_checked
+
+
+def _filter_for_args_dict(args_dict: dict) -> dict:
+    return dict(
+        [(_args_field_name(key), value) for key, value in args_dict.items()]
+    )
+
+
+def _key_for_args_dict(args_dict: dict) -> tuple:
+    return tuple(sorted(args_dict.items()))
+
+
+def _args_field_name(key: str) -> str:
+    return "%s.%s" % (ARGS_KEY, key)
+
+
+def _date_filter(
+    start_date: datetime.datetime = arg_not_supplied,
+    end_date: datetime.datetime = arg_not_supplied,
+) -> dict:
+    date_filter = {}
+    if start_date is not arg_not_supplied:
+        date_filter["$gte"] = start_date
+    if end_date is not arg_not_supplied:
+        date_filter["$lte"] = end_date
+
+    return date_filter
+
 
-        data_dict = {ENTRY_SERIES_KEY: series_as_plain_list, DATA_CLASS_KEY: data_class}
+def _entry_from_document(entry_as_document: dict) -> timedEntry:
+    class_of_entry_list = resolve_function(entry_as_document[DATA_CLASS_KEY])
+    class_of_each_individual_entry = class_of_entry_list.as_empty()._entry_class()
 
-        self.mongo_data.add_data(args_dict, data_dict, allow_overwrite=True)
+    return class_of_each_individual_entry.from_dict(
+        copy(entry_as_document[ENTRY_KEY])
+    )
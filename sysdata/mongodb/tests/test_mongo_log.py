@@ -0,0 +1,67 @@
+import threading
+
+from sysdata.mongodb.mongo_log import mongoLogWriter
+
+
+class _fakeCollection(object):
+    def __init__(self):
+        self.list_of_batches = []
+        self.thread_names = set()
+        self.lock = threading.Lock()
+        self.fail_next_write = False
+
+    def insert_many(self, list_of_records, ordered=True):
+        self.thread_names.add(threading.current_thread().name)
+        if self.fail_next_write:
+            self.fail_next_write = False
+            raise Exception("mongo went away")
+
+        self.list_of_batches.append(list_of_records)
+
+
+class TestMongoLogWriter:
+    def test_records_written_in_batches_on_flush(self):
+        collection = _fakeCollection()
+        writer = mongoLogWriter(collection, queue_size=5, batch_size=3)
+
+        for log_id in range(20):
+            writer.add_record(dict(_Log_Record_id=log_id, _Text="hello"))
+        writer.flush()
+
+        written = [
+            record["_Log_Record_id"]
+            for batch in collection.list_of_batches
+            for record in batch
+        ]
+        assert written == list(range(20))
+        assert all(len(batch) <= 3 for batch in collection.list_of_batches)
+        assert collection.thread_names == {"mongoLogWriter"}
+
+    def test_carries_on_after_failed_write(self):
+        collection = _fakeCollection()
+        collection.fail_next_write = True
+        writer = mongoLogWriter(collection, batch_size=1)
+
+        writer.add_record(dict(_Log_Record_id=1))
+        writer.flush()
+        writer.add_record(dict(_Log_Record_id=2))
+        writer.flush()
+
+        assert collection.list_of_batches == [[dict(_Log_Record_id=2)]]
+
+    def test_flush_with_nothing_written(self):
+        writer = mongoLogWriter(_fakeCollection())
+        writer.flush()
+
+    def test_flush_after_fork_doesnt_wait_for_parent_queue(self):
+        writer = mongoLogWriter(_fakeCollection())
+        # as if forked with a record still queued, and without the writer thread
+        writer._thread = threading.Thread(target=lambda: None)
+        writer._queue.put(dict(_Log_Record_id=1))
+        writer._pid = -1
+
+        flush_thread = threading.Thread(target=writer.flush, daemon=True)
+        flush_thread.start()
+        flush_thread.join(timeout=5)
+
+        assert not flush_thread.is_alive()
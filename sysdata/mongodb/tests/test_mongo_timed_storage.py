@@ -0,0 +1,336 @@
+import datetime
+from copy import deepcopy
+
+import pytest
+
+from syscore.objects import missing_data
+from sysdata.mongodb.mongo_positions_by_strategy import mongoStrategyPositionData
+from sysdata.mongodb.mongo_position_by_contract import mongoContractPositionData
+from sysdata.production.timed_storage import listOfEntriesData
+from sysobjects.contracts import futuresContract
+from sysobjects.production.tradeable_object import instrumentStrategy
+from syslogdiag.log_to_screen import logtoscreen
+
+
+class _fakeCollection(object):
+    """
+    Enough of a pymongo collection for one document per entry, counting the writes
+    """
+
+    def __init__(self):
+        self.list_of_documents = []
+        self.list_of_indexes = []
+        self.number_of_documents_written = 0
+        self._next_id = 0
+
+    def create_index(self, index_fields, name=None):
+        self.list_of_indexes.append(index_fields)
+
+    def insert_many(self, list_of_documents):
+        for document in list_of_documents:
+            document = deepcopy(document)
+            document["_id"] = self._next_id
+            self._next_id += 1
+            self.list_of_documents.append(document)
+            self.number_of_documents_written += 1
+
+    def find(self, filter_dict, sort=None):
+        matching_documents = [
+            deepcopy(document)
+            for document in self.list_of_documents
+            if _document_matches(document, filter_dict)
+        ]
+        if sort is not None:
+            ## sort on the last key first, so the first key matters most
+            for field_name, direction in reversed(sort):
+                matching_documents.sort(
+                    key=lambda document: document[field_name], reverse=direction < 0
+                )
+
+        return matching_documents
+
+    def count_documents(self, filter_dict):
+        return len(self.find(filter_dict))
+
+    def find_one(self, filter_dict, sort=None):
+        matching_documents = self.find(filter_dict, sort=sort)
+        if len(matching_documents) == 0:
+            return None
+
+        return matching_documents[0]
+
+    def delete_one(self, filter_dict):
+        matching_documents = self.find(filter_dict)
+        self._remove(matching_documents[:1])
+
+    def delete_many(self, filter_dict):
+        self._remove(self.find(filter_dict))
+
+    def distinct(self, field_name):
+        distinct_values = []
+        for document in self.list_of_documents:
+            if document[field_name] not in distinct_values:
+                distinct_values.append(document[field_name])
+
+        return distinct_values
+
+    def _remove(self, list_of_documents):
+        ids_to_remove = [document["_id"] for document in list_of_documents]
+        self.list_of_documents = [
+            document
+            for document in self.list_of_documents
+            if document["_id"] not in ids_to_remove
+        ]
+
+
+def _document_matches(document: dict, filter_dict: dict) -> bool:
+    for field_name, condition in filter_dict.items():
+        value = document
+        for part_of_field_name in field_name.split("."):
+            value = value.get(part_of_field_name, None)
+
+        if isinstance(condition, dict):
+            if "$gte" in condition and value < condition["$gte"]:
+                return False
+            if "$lte" in condition and value > condition["$lte"]:
+                return False
+        elif value != condition:
+            return False
+
+    return True
+
+
+class _fakeOldLayoutData(object):
+    def __init__(self, list_of_dicts: list):
+        self.list_of_dicts = deepcopy(list_of_dicts)
+
+    def get_list_of_all_dicts(self) -> list:
+        return deepcopy(self.list_of_dicts)
+
+    def get_result_dict_for_dict_keys(self, dict_of_keys: dict) -> dict:
+        for result_dict in self.list_of_dicts:
+            if _old_document_matches(result_dict, dict_of_keys):
+                return deepcopy(result_dict)
+
+        return missing_data
+
+    def add_data(self, dict_of_keys: dict, data_dict: dict, allow_overwrite=False, clean_ints=True):
+        self.delete_data_without_any_warning(dict_of_keys)
+        self.list_of_dicts.append(dict(deepcopy(data_dict), **dict_of_keys))
+
+    def delete_data_without_any_warning(self, dict_of_keys: dict):
+        self.list_of_dicts = [
+            result_dict
+            for result_dict in self.list_of_dicts
+            if not _old_document_matches(result_dict, dict_of_keys)
+        ]
+
+
+def _old_document_matches(result_dict: dict, dict_of_keys: dict) -> bool:
+    return all(
+        [result_dict.get(key, None) == value for key, value in dict_of_keys.items()]
+    )
+
+
+class _fakeMongoConnection(object):
+    def __init__(self):
+        self.collection = _fakeCollection()
+
+
+class _fakeMongoStrategyPositionData(mongoStrategyPositionData):
+    def __init__(self, list_of_dicts_in_old_layout: list = []):
+        listOfEntriesData.__init__(self, log=logtoscreen("test"))
+        self._mongo_entries = _fakeMongoConnection()
+        self._mongo_data_in_single_document_layout = _fakeOldLayoutData(
+            list_of_dicts_in_old_layout
+        )
+        self._mongo_data_in_single_document_layout_backup = _fakeOldLayoutData([])
+
+
+class _fakeMongoContractPositionData(mongoContractPositionData):
+    def __init__(self):
+        listOfEntriesData.__init__(self, log=logtoscreen("test"))
+        self._mongo_entries = _fakeMongoConnection()
+        self._mongo_data_in_single_document_layout = _fakeOldLayoutData([])
+        self._mongo_data_in_single_document_layout_backup = _fakeOldLayoutData([])
+
+
+def _old_layout_document(dates: list) -> dict:
+    return dict(
+        STRATEGY_EDOLLAR.as_dict(),
+        data_class="sysdata.production.historic_positions.listPositions",
+        entry_series=[
+            dict(position=position, date=date) for position, date in enumerate(dates)
+        ],
+    )
+
+
+def _dates(number_of_days: int) -> list:
+    return [
+        datetime.datetime(2021, 1, 1) + datetime.timedelta(days=day)
+        for day in range(number_of_days)
+    ]
+
+
+STRATEGY_EDOLLAR = instrumentStrategy("strat", "EDOLLAR")
+STRATEGY_US10 = instrumentStrategy("strat", "US10")
+
+
+class TestMongoTimedStorage:
+    def test_each_update_writes_one_entry(self):
+        position_data = _fakeMongoStrategyPositionData()
+        for position, date in enumerate(_dates(5)):
+            position_data.update_position_for_instrument_strategy_object(
+                STRATEGY_EDOLLAR, position, date=date
+            )
+        position_data.update_position_for_instrument_strategy_object(
+            STRATEGY_US10, -3, date=_dates(1)[0]
+        )
+
+        collection = position_data.mongo_entries.collection
+        assert collection.number_of_documents_written == 6
+        assert len(collection.list_of_indexes) == 1
+        assert (
+            position_data.get_current_position_for_instrument_strategy_object(
+                STRATEGY_EDOLLAR
+            )
+            == 4
+        )
+        assert list(
+            position_data.get_position_as_df_for_instrument_strategy_object(
+                STRATEGY_EDOLLAR
+            ).position
+        ) == [0, 1, 2, 3, 4]
+        assert position_data.get_list_of_instrument_strategies() == [
+            STRATEGY_EDOLLAR,
+            STRATEGY_US10,
+        ]
+
+    def test_date_range_and_delete_last_entry(self):
+        position_data = _fakeMongoStrategyPositionData()
+        dates = _dates(5)
+        for position, date in enumerate(dates):
+            position_data.update_position_for_instrument_strategy_object(
+                STRATEGY_EDOLLAR, position, date=date
+            )
+
+        entries_in_range = position_data._get_series_for_args_dict_between_dates(
+            STRATEGY_EDOLLAR.as_dict(), start_date=dates[1], end_date=dates[3]
+        )
+        assert [entry.position for entry in entries_in_range] == [1, 2, 3]
+
+        position_data.delete_last_position_for_instrument_strategy_object(
+            STRATEGY_EDOLLAR, are_you_sure=True
+        )
+        assert (
+            position_data.get_current_position_for_instrument_strategy_object(
+                STRATEGY_EDOLLAR
+            )
+            == 3
+        )
+
+    def test_migrate_from_single_document_layout(self):
+        dates = _dates(3)
+        old_document = _old_layout_document(dates)
+        position_data = _fakeMongoStrategyPositionData([old_document])
+
+        assert position_data.migrate_from_single_document_layout() == 1
+        assert position_data.migrate_from_single_document_layout() == 0
+
+        assert position_data.mongo_data_in_single_document_layout.list_of_dicts == []
+        assert position_data.mongo_data_in_single_document_layout_backup.list_of_dicts == [
+            old_document
+        ]
+        assert position_data.mongo_entries.collection.number_of_documents_written == 3
+
+        current_entry = (
+            position_data.get_current_position_entry_for_instrument_strategy_object(
+                STRATEGY_EDOLLAR
+            )
+        )
+        assert current_entry.position == 2
+        assert current_entry.date == dates[-1]
+        assert (
+            position_data.get_current_position_entry_for_instrument_strategy_object(
+                STRATEGY_US10
+            )
+            is missing_data
+        )
+
+    def test_migration_leaves_old_document_if_entries_dont_match(self):
+        dates = _dates(3)
+        old_document = _old_layout_document(dates)
+        position_data = _fakeMongoStrategyPositionData([old_document])
+        position_data._insert_list_of_entry_dicts_for_args_dict(
+            STRATEGY_EDOLLAR.as_dict(),
+            old_document["entry_series"][:1],
+            class_of_entry_list_as_str=old_document["data_class"],
+        )
+
+        assert position_data.migrate_from_single_document_layout() == 0
+        assert position_data.mongo_data_in_single_document_layout.list_of_dicts == [
+            old_document
+        ]
+        assert position_data.mongo_data_in_single_document_layout_backup.list_of_dicts == []
+
+    def test_data_which_has_not_been_migrated_raises_exception(self):
+        dates = _dates(3)
+        position_data = _fakeMongoStrategyPositionData([_old_layout_document(dates)])
+
+        assert position_data.get_list_of_instrument_strategies() == [STRATEGY_EDOLLAR]
+        with pytest.raises(Exception):
+            position_data.get_current_position_for_instrument_strategy_object(
+                STRATEGY_EDOLLAR
+            )
+        with pytest.raises(Exception):
+            position_data.update_position_for_instrument_strategy_object(
+                STRATEGY_EDOLLAR, 5, date=datetime.datetime(2021, 2, 1)
+            )
+
+        assert position_data.mongo_entries.collection.number_of_documents_written == 0
+        assert (
+            position_data.get_current_position_for_instrument_strategy_object(
+                STRATEGY_US10
+            )
+            == 0
+        )
+
+    def test_entries_with_the_same_date_in_the_order_written(self):
+        position_data = _fakeMongoStrategyPositionData()
+        date = _dates(1)[0]
+        for position in [3, 1, 2]:
+            position_data.update_position_for_instrument_strategy_object(
+                STRATEGY_EDOLLAR, position, date=date
+            )
+
+        assert (
+            position_data.get_current_position_for_instrument_strategy_object(
+                STRATEGY_EDOLLAR
+            )
+            == 2
+        )
+        entries = position_data._get_series_for_args_dict_between_dates(
+            STRATEGY_EDOLLAR.as_dict()
+        )
+        assert [entry.position for entry in entries] == [3, 1, 2]
+
+    def test_any_positions_for_contract_in_date_range(self):
+        position_data = _fakeMongoContractPositionData()
+        contract = futuresContract("EDOLLAR", "202312")
+        dates = _dates(10)
+        for position, date in zip([1, 0, 2], [dates[1], dates[3], dates[7]]):
+            position_data.update_position_for_contract_object(
+                contract, position, date=date
+            )
+
+        def _any_positions(start_day: int, end_day: int) -> bool:
+            return position_data.any_positions_for_contract_in_date_range(
+                contract, dates[start_day], dates[end_day]
+            )
+
+        assert not _any_positions(0, 0)
+        assert _any_positions(2, 2)
+        assert _any_positions(3, 3)
+        assert not _any_positions(4, 6)
+        assert _any_positions(4, 9)
+        assert _any_positions(8, 9)
@@ -0,0 +1,370 @@
+"""
+Read and write individual futures contract prices as parquet files
+
+Each instrument and frequency has its own hive partitioned dataset:
+
+    <datapath>/<frequency>/<instrument_code>/contract=<contract date>/prices.parquet
+
+Reading many contracts for an instrument is done with one scan of the dataset, rather than a read per contract.
+Only the columns asked for are read, and date filters are pushed down so row groups outside the range are skipped.
+
+Needs pyarrow, which is an optional dependency (pip install pyarrow)
+"""
+
+import os
+import shutil
+
+import pandas as pd
+
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+from syscore.dateutils import Frequency, MIXED_FREQ
+from syscore.fileutils import get_resolved_pathname
+from syscore.objects import arg_not_supplied
+from sysdata.futures.futures_per_contract_prices import futuresContractPriceData
+from sysobjects.contracts import futuresContract, listOfFuturesContracts
+from sysobjects.dict_of_futures_per_contract_prices import dictFuturesContractPrices
+from sysobjects.futures_per_contract_prices import (
+    futuresContractPrices,
+    PRICE_DATA_COLUMNS,
+)
+from syslogdiag.log_to_screen import logtoscreen
+
+DATE_COLUMN = "DATETIME"
+CONTRACT_PARTITION = "contract"
+PRICES_FILENAME = "prices.parquet"
+
+PARTITIONING = ds.partitioning(
+    pa.schema([(CONTRACT_PARTITION, pa.string())]), flavor="hive"
+)
+PRICES_SCHEMA = pa.schema(
+    [(DATE_COLUMN, pa.timestamp("ns"))]
+    + [(column_name, pa.float64()) for column_name in PRICE_DATA_COLUMNS]
+)
+
+
+class parquetFuturesContractPriceData(futuresContractPriceData):
+    """
+    Class to read / write individual futures contract price data to and from parquet files
+    """
+
+    def __init__(
+        self,
+        datapath=arg_not_supplied,
+        log=logtoscreen("parquetFuturesContractPriceData"),
+    ):
+
+        super().__init__(log=log)
+        if datapath is arg_not_supplied:
+            raise Exception("Need to pass datapath")
+
+        self._datapath = get_resolved_pathname(datapath)
+
+    def __repr__(self):
+        return "parquetFuturesContractPriceData accessing %s" % self._datapath
+
+    @property
+    def datapath(self) -> str:
+        return self._datapath
+
+    def _get_merged_prices_for_contract_object_no_checking(
+        self, futures_contract_object: futuresContract
+    ) -> futuresContractPrices:
+
+        return self._get_prices_at_frequency_for_contract_object_no_checking(
+            futures_contract_object, frequency=MIXED_FREQ
+        )
+
+    def _get_prices_at_frequency_for_contract_object_no_checking(
+        self, futures_contract_object: futuresContract, frequency: Frequency
+    ) -> futuresContractPrices:
+
+        filename = self._filename_for_contract_and_frequency(
+            futures_contract_object, frequency=frequency
+        )
+        table = pq.read_table(filename, columns=[DATE_COLUMN] + PRICE_DATA_COLUMNS)
+
+        return _futures_contract_prices_from_df(table.to_pandas())
+
+    def get_merged_prices_for_contract_list(
+        self, instrument_code: str, list_of_contract_date_str: list
+    ) -> dictFuturesContractPrices:
+
+        return self.get_prices_at_frequency_for_contract_list(
+            instrument_code,
+            list_of_contract_date_str=list_of_contract_date_str,
+            frequency=MIXED_FREQ,
+        )
+
+    def get_prices_at_frequency_for_contract_list(
+        self,
+        instrument_code: str,
+        list_of_contract_date_str: list,
+        frequency: Frequency,
+    ) -> dictFuturesContractPrices:
+
+        dict_of_df = self.get_df_for_contract_list(
+            instrument_code,
+            list_of_contract_date_str=list_of_contract_date_str,
+            frequency=frequency,
+        )
+        dict_of_prices = dictFuturesContractPrices(
+            [
+                (contract_date_str, _futures_contract_prices_from_df(price_df))
+                for contract_date_str, price_df in dict_of_df.items()
+            ]
+        )
+
+        return dict_of_prices
+
+    def get_df_for_contract_list(
+        self,
+        instrument_code: str,
+        list_of_contract_date_str: list,
+        frequency: Frequency = MIXED_FREQ,
+        columns: list = arg_not_supplied,
+        start_date: pd.Timestamp = arg_not_supplied,
+        end_date: pd.Timestamp = arg_not_supplied,
+    ) -> dict:
+        """
+        Read prices for a list of contracts in a single scan of the dataset
+
+        :param columns: subset of PRICE_DATA_COLUMNS, only these are read from disk
+        :param start_date, end_date: inclusive, applied when the files are read
+        :return: dict of pd.DataFrame, keyed by contract date str, with a DATETIME column. Contracts without data
+           have empty data frames
+        """
+        if columns is arg_not_supplied:
+            columns = PRICE_DATA_COLUMNS
+
+        instrument_path = self._path_for_instrument_and_frequency(
+            instrument_code, frequency=frequency
+        )
+        list_of_filenames = [
+            self._filename_for_instrument_date_str_and_frequency(
+                instrument_code, contract_date_str, frequency=frequency
+            )
+            for contract_date_str in list_of_contract_date_str
+        ]
+        list_of_filenames = [
+            filename for filename in list_of_filenames if os.path.isfile(filename)
+        ]
+
+        empty_df = pd.DataFrame(columns=[DATE_COLUMN] + list(columns))
+        if len(list_of_filenames) == 0:
+            return dict(
+                [
+                    (contract_date_str, empty_df.copy())
+                    for contract_date_str in list_of_contract_date_str
+                ]
+            )
+
+        dataset = ds.dataset(
+            list_of_filenames,
+            format="parquet",
+            partitioning=PARTITIONING,
+            partition_base_dir=instrument_path,
+        )
+        table = dataset.to_table(
+            columns=[CONTRACT_PARTITION, DATE_COLUMN] + list(columns),
+            filter=_date_filter(start_date=start_date, end_date=end_date),
+        )
+        all_prices = table.to_pandas()
+
+        dict_of_df = dict(
+            [
+                (contract_date_str, price_df.drop(columns=CONTRACT_PARTITION))
+                for contract_date_str, price_df in all_prices.groupby(
+                    CONTRACT_PARTITION, sort=False
+                )
+            ]
+        )
+
+        return dict(
+            [
+                (
+                    contract_date_str,
+                    dict_of_df.get(contract_date_str, empty_df.copy()),
+                )
+                for contract_date_str in list_of_contract_date_str
+            ]
+        )
+
+    def _write_merged_prices_for_contract_object_no_checking(
+        self,
+        futures_contract_object: futuresContract,
+        futures_price_data: futuresContractPrices,
+    ):
+
+        self._write_prices_at_frequency_for_contract_object_no_checking(
+            futures_contract_object=futures_contract_object,
+            futures_price_data=futures_price_data,
+            frequency=MIXED_FREQ,
+        )
+
+    def _write_prices_at_frequency_for_contract_object_no_checking(
+        self,
+        futures_contract_object: futuresContract,
+        futures_price_data: futuresContractPrices,
+        frequency: Frequency,
+    ):
+
+        filename = self._filename_for_contract_and_frequency(
+            futures_contract_object, frequency=frequency
+        )
+        os.makedirs(os.path.dirname(filename), exist_ok=True)
+
+        price_df = pd.DataFrame(futures_price_data[PRICE_DATA_COLUMNS]).astype(float)
+        price_df.index = pd.DatetimeIndex(price_df.index)
+        price_df.index.name = DATE_COLUMN
+        table = pa.Table.from_pandas(
+            price_df.reset_index(), schema=PRICES_SCHEMA, preserve_index=False
+        )
+
+        # write then rename, so a crashed write can't leave a half written file behind
+        # the leading dot means a dataset scan won't pick up the temporary file
+        temp_filename = os.path.join(
+            os.path.dirname(filename), ".%s.%d.tmp" % (PRICES_FILENAME, os.getpid())
+        )
+        pq.write_table(table, temp_filename)
+        os.replace(temp_filename, filename)
+
+    def _delete_merged_prices_for_contract_object_with_no_checks_be_careful(
+        self, futures_contract_object: futuresContract
+    ):
+        self._delete_prices_at_frequency_for_contract_object_with_no_checks_be_careful(
+            futures_contract_object, frequency=MIXED_FREQ
+        )
+
+    def _delete_prices_at_frequency_for_contract_object_with_no_checks_be_careful(
+        self, futures_contract_object: futuresContract, frequency: Frequency
+    ):
+        filename = self._filename_for_contract_and_frequency(
+            futures_contract_object, frequency=frequency
+        )
+        shutil.rmtree(os.path.dirname(filename))
+
+        log = futures_contract_object.log(self.log)
+        log.msg(
+            "Deleted all prices for %s from %s"
+            % (futures_contract_object.key, str(self))
+        )
+
+    def has_merged_price_data_for_contract(
+        self, contract_object: futuresContract
+    ) -> bool:
+        return self.has_price_data_for_contract_at_frequency(
+            contract_object, frequency=MIXED_FREQ
+        )
+
+    def has_price_data_for_contract_at_frequency(
+        self, contract_object: futuresContract, frequency: Frequency
+    ) -> bool:
+        filename = self._filename_for_contract_and_frequency(
+            contract_object, frequency=frequency
+        )
+
+        return os.path.isfile(filename)
+
+    def get_contracts_with_merged_price_data(self) -> listOfFuturesContracts:
+
+        return self.get_contracts_with_price_data_for_frequency(frequency=MIXED_FREQ)
+
+    def get_contracts_with_price_data_for_frequency(
+        self, frequency: Frequency
+    ) -> listOfFuturesContracts:
+
+        frequency_path = os.path.join(self.datapath, frequency.name)
+        list_of_contracts = [
+            futuresContract(instrument_code, contract_date_str)
+            for instrument_code in _list_of_directories(frequency_path)
+            for contract_date_str in self._contract_date_str_with_data_for_instrument(
+                instrument_code, frequency=frequency
+            )
+        ]
+
+        return listOfFuturesContracts(list_of_contracts)
+
+    def _contract_date_str_with_data_for_instrument(
+        self, instrument_code: str, frequency: Frequency
+    ) -> list:
+        instrument_path = self._path_for_instrument_and_frequency(
+            instrument_code, frequency=frequency
+        )
+        partition_prefix = CONTRACT_PARTITION + "="
+        list_of_contract_date_str = [
+            partition_name[len(partition_prefix) :]
+            for partition_name in _list_of_directories(instrument_path)
+            if partition_name.startswith(partition_prefix)
+            and os.path.isfile(
+                os.path.join(instrument_path, partition_name, PRICES_FILENAME)
+            )
+        ]
+
+        return sorted(list_of_contract_date_str)
+
+    def _filename_for_contract_and_frequency(
+        self, futures_contract_object: futuresContract, frequency: Frequency
+    ) -> str:
+        return self._filename_for_instrument_date_str_and_frequency(
+            futures_contract_object.instrument_code,
+            futures_contract_object.date_str,
+            frequency=frequency,
+        )
+
+    def _filename_for_instrument_date_str_and_frequency(
+        self, instrument_code: str, contract_date_str: str, frequency: Frequency
+    ) -> str:
+        return os.path.join(
+            self._path_for_instrument_and_frequency(
+                instrument_code, frequency=frequency
+            ),
+            "%s=%s" % (CONTRACT_PARTITION, contract_date_str),
+            PRICES_FILENAME,
+        )
+
+    def _path_for_instrument_and_frequency(
+        self, instrument_code: str, frequency: Frequency
+    ) -> str:
+        return os.path.join(self.datapath, frequency.name, instrument_code)
+
+
+def _futures_contract_prices_from_df(price_df: pd.DataFrame) -> futuresContractPrices:
+    if len(price_df) == 0:
+        return futuresContractPrices.create_empty()
+
+    price_df = price_df.set_index(DATE_COLUMN)
+    price_df.index = pd.DatetimeIndex(price_df.index)
+
+    return futuresContractPrices(price_df[PRICE_DATA_COLUMNS])
+
+
+def _date_filter(start_date=arg_not_supplied, end_date=arg_not_supplied):
+    date_filter = None
+    if start_date is not arg_not_supplied:
+        date_filter = ds.field(DATE_COLUMN) >= _as_arrow_timestamp(start_date)
+    if end_date is not arg_not_supplied:
+        end_filter = ds.field(DATE_COLUMN) <= _as_arrow_timestamp(end_date)
+        if date_filter is None:
+            date_filter = end_filter
+        else:
+            date_filter = date_filter & end_filter
+
+    return date_filter
+
+
+def _as_arrow_timestamp(some_date) -> pa.Scalar:
+    return pa.scalar(pd.Timestamp(some_date).to_datetime64(), type=pa.timestamp("ns"))
+
+
+def _list_of_directories(pathname: str) -> list:
+    if not os.path.isdir(pathname):
+        return []
+
+    return [
+        entry.name
+        for entry in os.scandir(pathname)
+        if entry.is_dir() and not entry.name.startswith(".")
+    ]
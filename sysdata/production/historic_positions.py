@@ -412,15 +412,30 @@ class contractPositionData(listOfEntriesData):
         start_date: datetime.datetime,
         end_date: datetime.datetime,
     ) -> bool:
+        """
+        Any positions held in a given date range
 
-        df_positions = self.get_position_as_df_for_contract_object(contract)
-        if df_positions is missing_data:
-            return False
-        any_positions = any_positions_since_start_date(
-            df_positions, start_date, end_date
+        Either:
+        - we changed our position during the range (return True)
+        - position at start was non zero, and we didn't trade (return True)
+        - position at start was zero and we didn't trade (return False)
+
+        Only reads the entries we need, rather than the whole history
+        """
+        args_dict = {CONTRACTID_KEY: self._keyname_given_contract_object(contract)}
+        positions_during = self._get_series_for_args_dict_between_dates(
+            args_dict, start_date=start_date, end_date=end_date
         )
+        if len(positions_during) > 0:
+            return True
+
+        position_entry_at_start = self._get_entry_for_args_dict_as_at_date(
+            args_dict, start_date
+        )
+        if position_entry_at_start is missing_data:
+            return False
 
-        return any_positions
+        return position_entry_at_start.position != 0
 
     def any_current_position_for_contract(self, contract: futuresContract) -> bool:
         position = self.get_current_position_for_contract_object(contract)
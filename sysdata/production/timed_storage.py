@@ -1,6 +1,7 @@
 """
 Generic timed storage; more bullet proof than a data frame
 """
+import datetime
 
 from syscore.objects import (
     success,
@@ -135,8 +136,15 @@ class listOfEntriesData(baseData):
         self, args_dict: dict, new_entry: timedEntry
     ):
 
-        entry_class_name_new_entry = new_entry.containing_data_class_name
         entry_class_name_existing = self._get_class_of_entry_list_as_str(args_dict)
+        self._check_class_name_matches_existing_class_name(
+            new_entry, entry_class_name_existing
+        )
+
+    def _check_class_name_matches_existing_class_name(
+        self, new_entry: timedEntry, entry_class_name_existing: str
+    ):
+        entry_class_name_new_entry = new_entry.containing_data_class_name
 
         split_new_name = entry_class_name_new_entry.split(".")[-1]
         split_existing_name = entry_class_name_existing.split(".")[-1]
@@ -172,6 +180,33 @@ class listOfEntriesData(baseData):
 
         return current_entry
 
+    def _get_series_for_args_dict_between_dates(
+        self,
+        args_dict: dict,
+        start_date: datetime.datetime = arg_not_supplied,
+        end_date: datetime.datetime = arg_not_supplied,
+    ) -> listOfEntries:
+        ## Inherit to filter in the database; start and end dates are inclusive
+        entry_series = self._get_series_for_args_dict(args_dict)
+        entries_in_range = [
+            entry
+            for entry in entry_series
+            if (start_date is arg_not_supplied or entry.date >= start_date)
+            and (end_date is arg_not_supplied or entry.date <= end_date)
+        ]
+
+        return type(entry_series)(entries_in_range)
+
+    def _get_entry_for_args_dict_as_at_date(
+        self, args_dict: dict, date: datetime.datetime
+    ):
+        ## Inherit to filter in the database; the last entry on or before the date
+        entries_up_to_date = self._get_series_for_args_dict_between_dates(
+            args_dict, end_date=date
+        )
+
+        return entries_up_to_date.final_entry()
+
     def _get_series_for_args_dict(self, args_dict) -> listOfEntries:
         class_with_series_as_list_of_dicts = (
             self._get_series_dict_and_class_for_args_dict(args_dict)
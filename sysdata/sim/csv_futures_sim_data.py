@@ -3,7 +3,15 @@ Get data from .csv files used for futures trading
 
 """
 
-from syscore.objects import arg_not_supplied
+import hashlib
+import os
+
+from syscore.fileutils import (
+    fingerprint_of_files,
+    fingerprint_of_files_in_pathname,
+    get_filename_for_package,
+)
+from syscore.objects import arg_not_supplied, missing_data
 from sysdata.csv.csv_multiple_prices import csvFuturesMultiplePricesData
 from sysdata.csv.csv_adjusted_prices import csvFuturesAdjustedPricesData
 from sysdata.csv.csv_spot_fx import csvFxPricesData
@@ -12,6 +20,7 @@ from sysdata.csv.csv_roll_parameters import csvRollParametersData
 
 from sysdata.data_blob import dataBlob
 from sysdata.sim.futures_sim_data_with_data_blob import genericBlobUsingFuturesSimData
+from sysdata.sim.price_panel import ADJUSTED_PRICES, MULTIPLE_PRICES, FX_PRICES
 
 from syslogdiag.log_to_screen import logtoscreen
 
@@ -19,10 +28,15 @@ from syslogdiag.log_to_screen import logtoscreen
 class csvFuturesSimData(genericBlobUsingFuturesSimData):
     """
     Uses default paths for .csv files, pass in dict of csv_data_paths to modify
+
+    Prices are read from binary copies of the .csv files where possible, see sysdata.csv.csv_binary_cache
     """
 
     def __init__(
-        self, csv_data_paths=arg_not_supplied, log=logtoscreen("csvFuturesSimData")
+        self,
+        csv_data_paths=arg_not_supplied,
+        log=logtoscreen("csvFuturesSimData"),
+        use_binary_cache: bool = True,
     ):
 
         data = dataBlob(
@@ -39,7 +53,111 @@ class csvFuturesSimData(genericBlobUsingFuturesSimData):
 
         super().__init__(data=data)
 
+        for csv_prices_data in self._list_of_csv_prices_data():
+            csv_prices_data.use_binary_cache = use_binary_cache
+
     def __repr__(self):
         return "csvFuturesSimData object with %d instruments" % len(
             self.get_instrument_list()
         )
+
+    def _list_of_csv_prices_data(self) -> list:
+        return [
+            self.db_futures_adjusted_prices_data,
+            self.db_futures_multiple_prices_data,
+            self.db_fx_prices_data,
+        ]
+
+    def build_binary_cache(self):
+        """
+        Read all the prices, so the binary copies are there for next time
+        """
+        adjusted_prices_data = self.db_futures_adjusted_prices_data
+        for instrument_code in adjusted_prices_data.get_list_of_instruments():
+            adjusted_prices_data.get_adjusted_prices(instrument_code)
+
+        multiple_prices_data = self.db_futures_multiple_prices_data
+        for instrument_code in multiple_prices_data.get_list_of_instruments():
+            multiple_prices_data.get_multiple_prices(instrument_code)
+
+        fx_prices_data = self.db_fx_prices_data
+        for fx_code in fx_prices_data.get_list_of_fxcodes():
+            fx_prices_data.get_fx_prices(fx_code)
+
+    def data_fingerprint(self) -> str:
+        """
+        Reading and hashing every file is slow, so use file sizes and modification times instead
+
+        :returns: str
+        """
+        all_fingerprints = [
+            fingerprint_of_files_in_pathname(
+                self.db_futures_adjusted_prices_data.datapath
+            ),
+            fingerprint_of_files_in_pathname(
+                self.db_futures_multiple_prices_data.datapath
+            ),
+            fingerprint_of_files_in_pathname(self.db_fx_prices_data.datapath),
+            fingerprint_of_files(
+                [
+                    self.db_futures_instrument_data.config_file,
+                    self.db_roll_parameters.config_file,
+                ]
+            ),
+        ]
+
+        return hashlib.sha256("/".join(all_fingerprints).encode("utf-8")).hexdigest()
+
+    def data_fingerprint_for_instrument(self, instrument_code: str) -> str:
+        """
+        As data_fingerprint, but only using the price files for one instrument
+
+        :param instrument_code: instrument to get fingerprint for
+        :type instrument_code: str
+
+        :returns: str
+        """
+        price_filenames = [
+            get_filename_for_package(datapath, "%s.csv" % instrument_code)
+            for datapath in [
+                self.db_futures_adjusted_prices_data.datapath,
+                self.db_futures_multiple_prices_data.datapath,
+            ]
+        ]
+        all_fingerprints = [
+            fingerprint_of_files(
+                [filename for filename in price_filenames if os.path.isfile(filename)]
+            ),
+            ## the fx for an instrument can be a cross rate, so could use any of these
+            fingerprint_of_files_in_pathname(self.db_fx_prices_data.datapath),
+            fingerprint_of_files(
+                [
+                    self.db_futures_instrument_data.config_file,
+                    self.db_roll_parameters.config_file,
+                ]
+            ),
+        ]
+
+        return hashlib.sha256("/".join(all_fingerprints).encode("utf-8")).hexdigest()
+
+    def price_panel_source_fingerprint(self, group_name: str, key: str) -> str:
+        """
+        The size and modification time of the .csv file the prices came from
+
+        :param group_name: ADJUSTED_PRICES, MULTIPLE_PRICES or FX_PRICES
+        :param key: instrument code, or fx code
+        :returns: str, or missing_data
+        """
+        csv_prices_data = {
+            ADJUSTED_PRICES: self.db_futures_adjusted_prices_data,
+            MULTIPLE_PRICES: self.db_futures_multiple_prices_data,
+            FX_PRICES: self.db_fx_prices_data,
+        }.get(group_name, missing_data)
+        if csv_prices_data is missing_data:
+            return missing_data
+
+        filename = get_filename_for_package(csv_prices_data.datapath, "%s.csv" % key)
+        if not os.path.isfile(filename):
+            return missing_data
+
+        return fingerprint_of_files([filename])
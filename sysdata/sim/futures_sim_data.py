@@ -1,7 +1,9 @@
+import hashlib
 import pandas as pd
 
-from syscore.objects import missing_instrument
-from sysdata.sim.sim_data import simData
+from syscore.objects import missing_instrument, missing_data, arg_not_supplied
+from syscore.pdutils import hash_of_pd_object
+from sysdata.sim.sim_data import simData, _resolve_config, dict_of_reads_in_parallel
 
 from sysobjects.adjusted_prices import futuresAdjustedPrices
 from sysobjects.instruments import (
@@ -78,6 +80,27 @@ class futuresSimData(simData):
 
         return price[start_date:]
 
+    def data_fingerprint_for_instrument(self, instrument_code: str) -> str:
+        """
+        Also include the multiple prices (for carry), fx and meta data (costs, point size)
+
+        :param instrument_code: instrument to get fingerprint for
+        :type instrument_code: str
+
+        :returns: str
+        """
+        base_currency = _resolve_base_currency(self)
+        all_fingerprints = [
+            hash_of_pd_object(self.get_raw_price(instrument_code)),
+            hash_of_pd_object(self.get_multiple_prices(instrument_code)),
+            hash_of_pd_object(
+                self.get_fx_for_instrument(instrument_code, base_currency)
+            ),
+            str(self.get_instrument_object_with_meta_data(instrument_code)),
+        ]
+
+        return hashlib.sha256("/".join(all_fingerprints).encode("utf-8")).hexdigest()
+
     def get_instrument_raw_carry_data(self, instrument_code: str) -> pd.DataFrame:
         """
         Returns a pd. dataframe with the 4 columns PRICE, CARRY, PRICE_CONTRACT, CARRY_CONTRACT
@@ -210,6 +233,62 @@ class futuresSimData(simData):
 
         raise NotImplementedError()
 
+    def get_backadjusted_futures_prices_for_list(self, instrument_list: list) -> dict:
+        """
+        As get_backadjusted_futures_price, for several instruments with the reads done in parallel
+
+        :returns: dict of futuresAdjustedPrices, keyed by instrument code
+        """
+
+        return dict_of_reads_in_parallel(
+            self.get_backadjusted_futures_price, instrument_list
+        )
+
+    def get_multiple_prices_for_list(self, instrument_list: list) -> dict:
+        """
+        As get_multiple_prices, for several instruments with the reads done in parallel
+
+        :returns: dict of futuresMultiplePrices, keyed by instrument code
+        """
+
+        return dict_of_reads_in_parallel(self.get_multiple_prices, instrument_list)
+
+    def get_instrument_objects_with_meta_data_for_list(
+        self, instrument_list: list
+    ) -> dict:
+
+        return dict_of_reads_in_parallel(
+            self.get_instrument_object_with_meta_data, instrument_list
+        )
+
+    def get_roll_parameters_for_list(self, instrument_list: list) -> dict:
+
+        return dict_of_reads_in_parallel(self.get_roll_parameters, instrument_list)
+
+    def prime_data_cache_for_instrument_list(
+        self, instrument_list: list = arg_not_supplied
+    ):
+        if instrument_list is arg_not_supplied:
+            instrument_list = self.get_instrument_list()
+
+        base_currency = _resolve_base_currency(self)
+        # meta data first, as we need the currencies to get fx
+        list_of_read_functions = [
+            self.get_instrument_object_with_meta_data,
+            self.get_roll_parameters,
+            self.get_backadjusted_futures_price,
+            self.get_multiple_prices,
+            lambda instrument_code: self.get_fx_for_instrument(
+                instrument_code, base_currency
+            ),
+        ]
+        for read_function in list_of_read_functions:
+            # missing data will be dealt with when it's actually asked for
+            dict_of_reads_in_parallel(
+                _read_function_returning_missing_data_on_error(read_function),
+                instrument_list,
+            )
+
     def get_multiple_prices(self, instrument_code: str) -> futuresMultiplePrices:
         start_date = self.start_date_for_data()
 
@@ -250,6 +329,27 @@ class futuresSimData(simData):
         raise NotImplementedError()
 
 
+DEFAULT_BASE_CURRENCY = "USD"
+
+
+def _read_function_returning_missing_data_on_error(read_function):
+    def read_or_missing_data(instrument_code: str):
+        try:
+            return read_function(instrument_code)
+        except Exception:
+            return missing_data
+
+    return read_or_missing_data
+
+
+def _resolve_base_currency(sim_data: futuresSimData) -> str:
+    config = _resolve_config(sim_data)
+    if config is missing_data:
+        return DEFAULT_BASE_CURRENCY
+
+    return getattr(config, "base_currency", DEFAULT_BASE_CURRENCY)
+
+
 if __name__ == "__main__":
     import doctest
 
@@ -1,4 +1,16 @@
-from sysdata.sim.futures_sim_data import futuresSimData
+import copy
+
+import pandas as pd
+
+from syscore.objects import arg_not_supplied, missing_data
+from sysdata.sim.futures_sim_data import futuresSimData, _resolve_base_currency
+from sysdata.sim.price_panel import (
+    pricePanel,
+    write_price_panel,
+    ADJUSTED_PRICES,
+    MULTIPLE_PRICES,
+    FX_PRICES,
+)
 
 from sysdata.futures.adjusted_prices import futuresAdjustedPricesData
 from sysdata.fx.spotfx import fxPricesData
@@ -27,6 +39,12 @@ class genericBlobUsingFuturesSimData(futuresSimData):
         super().__init__(log=data.log)
         self._data = data
 
+        # data won't change within the life of a system, so we only need to read each item once
+        # see prime_data_cache_for_instrument_list to read everything up front, and clear_read_cache
+        # Callers get their own copy, so changing it won't affect anyone else
+        self._read_cache = {}
+        self._price_panel = missing_data
+
     @property
     def data(self):
         return self._data
@@ -54,16 +72,141 @@ class genericBlobUsingFuturesSimData(futuresSimData):
     def get_instrument_list(self):
         return self.db_futures_adjusted_prices_data.get_list_of_instruments()
 
+    def build_price_panel(
+        self, directory: str, instrument_list: list = arg_not_supplied
+    ):
+        """
+        Write the adjusted, multiple and fx prices for some instruments to a memory mapped price panel
+
+        :param directory: directory in 'dot' format eg 'private.price_panel', or absolute path
+        :param instrument_list: defaults to all instruments
+        """
+        if instrument_list is arg_not_supplied:
+            instrument_list = self.get_instrument_list()
+
+        self.prime_data_cache_for_instrument_list(instrument_list)
+        fx_codes = _fx_codes_for_instrument_list(self, instrument_list)
+
+        dict_of_groups = {
+            ADJUSTED_PRICES: dict(
+                [
+                    (instrument_code, self.get_backadjusted_futures_price(instrument_code))
+                    for instrument_code in instrument_list
+                ]
+            ),
+            MULTIPLE_PRICES: dict(
+                [
+                    (instrument_code, self._get_all_multiple_prices(instrument_code))
+                    for instrument_code in instrument_list
+                ]
+            ),
+            FX_PRICES: dict(
+                [(fx_code, self._get_all_fx_prices(fx_code)) for fx_code in fx_codes]
+            ),
+        }
+
+        dict_of_source_fingerprints = dict(
+            [
+                (
+                    group_name,
+                    self._source_fingerprints_for_group(
+                        group_name, list(dict_of_data.keys())
+                    ),
+                )
+                for group_name, dict_of_data in dict_of_groups.items()
+            ]
+        )
+
+        write_price_panel(
+            directory,
+            dict_of_groups,
+            dict_of_source_fingerprints=dict_of_source_fingerprints,
+        )
+
+    def _source_fingerprints_for_group(self, group_name: str, keys: list) -> dict:
+        source_fingerprints = {}
+        for key in keys:
+            fingerprint = self.price_panel_source_fingerprint(group_name, key)
+            if fingerprint is not missing_data:
+                source_fingerprints[key] = fingerprint
+
+        return source_fingerprints
+
+    def price_panel_source_fingerprint(self, group_name: str, key: str) -> str:
+        """
+        Changes whenever the source of some prices in a price panel changes, so stale prices aren't used
+
+        This has to be quick, so it can't read the prices. By default we can't tell, and it's up to you to
+        rebuild the panel when prices are updated. Override if the data source can do better.
+
+        :param group_name: ADJUSTED_PRICES, MULTIPLE_PRICES or FX_PRICES
+        :param key: instrument code, or fx code
+        :returns: str, or missing_data
+        """
+        return missing_data
+
+    def use_price_panel(self, directory: str):
+        """
+        Read prices from a price panel, built with build_price_panel, rather than the underlying data source
+
+        Anything not in the panel is read from the data source as usual
+
+        :param directory: directory in 'dot' format eg 'private.price_panel', or absolute path
+        """
+        price_panel = pricePanel(directory)
+        list_of_stale_keys = price_panel.remove_stale_keys(
+            self.price_panel_source_fingerprint
+        )
+        if len(list_of_stale_keys) > 0:
+            self.log.warn(
+                "Prices in %s have changed since it was built, so reading %s from the source instead; rebuild it"
+                % (str(price_panel), str(list_of_stale_keys))
+            )
+
+        self._price_panel = price_panel
+        self.clear_read_cache()
+
+    @property
+    def price_panel(self):
+        return self._price_panel
+
+    def clear_read_cache(self):
+        """
+        Forget everything read so far, eg to free up memory or pick up changes to the data
+        """
+        self._read_cache = {}
+
+    def _read_once(self, data_name: str, read_function, key: str):
+        cache_key = (data_name, key)
+        data = self._read_cache.get(cache_key, missing_data)
+        if data is missing_data:
+            data = self._read_from_panel_or_source(data_name, read_function, key)
+            self._read_cache[cache_key] = data
+
+        return _copy_unless_read_only(data)
+
+    def _read_from_panel_or_source(self, data_name: str, read_function, key: str):
+        price_panel = self.price_panel
+        if price_panel is not missing_data:
+            data = price_panel.get(data_name, key)
+            if data is not missing_data:
+                return data
+
+        return read_function(key)
+
     def _get_fx_data_from_start_date(
         self, currency1: str, currency2: str, start_date
     ) -> fxPrices:
         fx_code = currency1 + currency2
-        data = self.db_fx_prices_data.get_fx_prices(fx_code)
+        data = self._get_all_fx_prices(fx_code)
 
         data_after_start = data[start_date:]
 
         return data_after_start
 
+    def _get_all_fx_prices(self, fx_code: str) -> fxPrices:
+        return self._read_once(FX_PRICES, self.db_fx_prices_data.get_fx_prices, fx_code)
+
     def get_instrument_asset_classes(self) -> assetClassesAndInstruments:
         all_instrument_data = self.get_all_instrument_data_as_df()
         asset_classes = all_instrument_data["AssetClass"]
@@ -83,17 +226,28 @@ class genericBlobUsingFuturesSimData(futuresSimData):
     def get_backadjusted_futures_price(
         self, instrument_code: str
     ) -> futuresAdjustedPrices:
-        data = self.db_futures_adjusted_prices_data.get_adjusted_prices(instrument_code)
+        data = self._read_once(
+            ADJUSTED_PRICES,
+            self.db_futures_adjusted_prices_data.get_adjusted_prices,
+            instrument_code,
+        )
 
         return data
 
     def get_multiple_prices_from_start_date(
         self, instrument_code: str, start_date
     ) -> futuresMultiplePrices:
-        data = self.db_futures_multiple_prices_data.get_multiple_prices(instrument_code)
+        data = self._get_all_multiple_prices(instrument_code)
 
         return data[start_date:]
 
+    def _get_all_multiple_prices(self, instrument_code: str) -> futuresMultiplePrices:
+        return self._read_once(
+            MULTIPLE_PRICES,
+            self.db_futures_multiple_prices_data.get_multiple_prices,
+            instrument_code,
+        )
+
     def get_instrument_meta_data(
         self, instrument_code: str
     ) -> InstrumentWithMetaData:
@@ -103,13 +257,47 @@ class genericBlobUsingFuturesSimData(futuresSimData):
     def get_instrument_object_with_meta_data(
         self, instrument_code: str
     ) -> InstrumentWithMetaData:
-        instrument = self.db_futures_instrument_data.get_instrument_data(
-            instrument_code
+        instrument = self._read_once(
+            "instrument",
+            self.db_futures_instrument_data.get_instrument_data,
+            instrument_code,
         )
 
         return instrument
 
     def get_roll_parameters(self, instrument_code: str) -> rollParameters:
-        roll_parameters = self.db_roll_parameters.get_roll_parameters(instrument_code)
+        roll_parameters = self._read_once(
+            "roll_parameters", self.db_roll_parameters.get_roll_parameters, instrument_code
+        )
 
         return roll_parameters
+
+
+def _copy_unless_read_only(data):
+    ## series from a price panel can't be changed, and copying them would lose the point of the panel
+    if isinstance(data, pd.Series) and not data.values.flags.writeable:
+        return data
+
+    if isinstance(data, (pd.Series, pd.DataFrame)):
+        ## copy() doesn't keep eg futuresAdjustedPrices
+        return type(data)(data.copy())
+
+    return copy.deepcopy(data)
+
+
+def _fx_codes_for_instrument_list(
+    sim_data: genericBlobUsingFuturesSimData, instrument_list: list
+) -> list:
+    base_currency = _resolve_base_currency(sim_data)
+    list_of_currencies = [
+        sim_data.get_instrument_currency(instrument_code)
+        for instrument_code in instrument_list
+    ]
+    # no need to store a series of 1's
+    fx_codes = [
+        currency + base_currency
+        for currency in set(list_of_currencies)
+        if currency != base_currency
+    ]
+
+    return sorted(fx_codes)
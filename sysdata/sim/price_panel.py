@@ -0,0 +1,306 @@
+"""
+A read only store of the prices used in backtests, held in numpy files which are memory mapped when read
+
+Every process that uses the same panel shares one copy of the prices (the operating system's page cache),
+rather than each having its own copy of every DataFrame. This matters when running several backtests at
+once, or when forked worker processes would otherwise end up with their own copies of the prices.
+
+Each group of data (adjusted prices, multiple prices, fx) is stored as one flat array per column, with the
+series for each instrument (or fx code) held contiguously, plus an index of where each one starts and ends.
+So getting a series (adjusted prices, fx) is a slice of the memory mapped array, with nothing copied. These
+series are read only: writing to them raises a ValueError, so copy them first if you need to change them.
+Multiple prices have several columns, including strings (contract ids), so they are copied into a new
+DataFrame which can be changed without affecting anyone else.
+
+The panel can record a fingerprint of the source of each series (eg .csv file sizes and modification times).
+Series whose source has changed since the panel was built can then be dropped when the panel is opened, with
+remove_stale_keys, so they're read from the source again rather than silently using stale prices.
+
+Build a panel with genericBlobUsingFuturesSimData.build_price_panel, and use it with use_price_panel
+"""
+
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from syscore.fileutils import get_resolved_pathname
+from syscore.objects import arg_not_supplied, missing_data
+from sysobjects.adjusted_prices import futuresAdjustedPrices
+from sysobjects.multiple_prices import futuresMultiplePrices
+from sysobjects.spot_fx_prices import fxPrices
+
+ADJUSTED_PRICES = "adjusted_prices"
+MULTIPLE_PRICES = "multiple_prices"
+FX_PRICES = "fx"
+
+PANEL_INDEX_FILENAME = "panel_index.json"
+DATES_COLUMN = "_index"
+SERIES_COLUMN = "_values"
+
+MISSING_STRING = ""
+
+_type_for_group = {
+    ADJUSTED_PRICES: futuresAdjustedPrices,
+    MULTIPLE_PRICES: futuresMultiplePrices,
+    FX_PRICES: fxPrices,
+}
+
+
+def write_price_panel(
+    directory: str,
+    dict_of_groups: dict,
+    dict_of_source_fingerprints: dict = arg_not_supplied,
+):
+    """
+    :param directory: directory in 'dot' format eg 'private.price_panel', or absolute path
+    :param dict_of_groups: dict, keys are ADJUSTED_PRICES, MULTIPLE_PRICES, FX_PRICES; values are dicts of
+        pd.Series or pd.DataFrame keyed by instrument code (or fx code)
+    :param dict_of_source_fingerprints: dict, same keys as dict_of_groups; values are dicts of str keyed by
+        instrument code (or fx code). Anything without a fingerprint can't be checked when the panel is opened
+    """
+    if dict_of_source_fingerprints is arg_not_supplied:
+        dict_of_source_fingerprints = {}
+
+    directory = get_resolved_pathname(directory)
+    os.makedirs(directory, exist_ok=True)
+
+    # if we're overwriting, make sure nobody reads a half written panel
+    index_filename = os.path.join(directory, PANEL_INDEX_FILENAME)
+    if os.path.exists(index_filename):
+        os.remove(index_filename)
+
+    panel_index = dict(
+        [
+            (
+                group_name,
+                _write_group(
+                    directory,
+                    group_name,
+                    dict_of_data,
+                    source_fingerprints=dict_of_source_fingerprints.get(
+                        group_name, {}
+                    ),
+                ),
+            )
+            for group_name, dict_of_data in dict_of_groups.items()
+        ]
+    )
+
+    with open(index_filename, "w") as index_file:
+        json.dump(panel_index, index_file)
+
+
+def _write_group(
+    directory: str, group_name: str, dict_of_data: dict, source_fingerprints: dict
+) -> dict:
+    # empty data is left out, and will be read from the data source
+    keys = [key for key, data in dict_of_data.items() if len(data) > 0]
+    if len(keys) == 0:
+        return dict(
+            keys={},
+            columns=[],
+            string_columns=[],
+            is_series=False,
+            names={},
+            source_fingerprints={},
+        )
+
+    is_series = isinstance(dict_of_data[keys[0]], pd.Series)
+    if is_series:
+        # series may have different names, so store them separately
+        names = dict([(key, _series_name(dict_of_data[key])) for key in keys])
+        list_of_data = [
+            dict_of_data[key].rename(SERIES_COLUMN).to_frame() for key in keys
+        ]
+    else:
+        names = {}
+        list_of_data = [pd.DataFrame(dict_of_data[key]) for key in keys]
+
+    lengths = [len(data) for data in list_of_data]
+    ends = list(np.cumsum(lengths))
+    starts = [0] + ends[:-1]
+
+    all_data = pd.concat(list_of_data, axis=0)
+    dates = pd.DatetimeIndex(all_data.index).values.astype("datetime64[ns]")
+    _save_array(directory, group_name, DATES_COLUMN, dates.view(np.int64))
+
+    string_columns = []
+    for column_name in all_data.columns:
+        column = all_data[column_name]
+        if column.dtype == object:
+            string_columns.append(str(column_name))
+            values = np.array(
+                [_as_string(value) for value in column.values], dtype=str
+            )
+        else:
+            values = column.values.astype(np.float64)
+        _save_array(directory, group_name, str(column_name), values)
+
+    return dict(
+        keys=dict(
+            [
+                (key, [int(start), int(end)])
+                for key, start, end in zip(keys, starts, ends)
+            ]
+        ),
+        columns=[str(column_name) for column_name in all_data.columns],
+        string_columns=string_columns,
+        is_series=is_series,
+        names=names,
+        source_fingerprints=dict(
+            [(key, source_fingerprints[key]) for key in keys if key in source_fingerprints]
+        ),
+    )
+
+
+def _as_string(value) -> str:
+    if isinstance(value, str):
+        return value
+    if pd.isna(value):
+        return MISSING_STRING
+
+    return str(value)
+
+
+def _series_name(series: pd.Series):
+    name = series.name
+    if name is None:
+        return None
+
+    return str(name)
+
+
+def _save_array(directory: str, group_name: str, column_name: str, values: np.ndarray):
+    np.save(_array_filename(directory, group_name, column_name), values)
+
+
+def _array_filename(directory: str, group_name: str, column_name: str) -> str:
+    return os.path.join(directory, "%s.%s.npy" % (group_name, column_name))
+
+
+class pricePanel(object):
+    def __init__(self, directory: str):
+        """
+        :param directory: directory in 'dot' format eg 'private.price_panel', or absolute path
+        """
+        directory = get_resolved_pathname(directory)
+        index_filename = os.path.join(directory, PANEL_INDEX_FILENAME)
+        if not os.path.exists(index_filename):
+            raise Exception("No price panel in %s" % directory)
+
+        with open(index_filename, "r") as index_file:
+            self._panel_index = json.load(index_file)
+
+        self._directory = directory
+        self._arrays = {}
+
+    def __repr__(self):
+        return "Price panel in %s" % self.directory
+
+    @property
+    def directory(self) -> str:
+        return self._directory
+
+    def keys_for_group(self, group_name: str) -> list:
+        group_index = self._panel_index.get(group_name, {})
+
+        return list(group_index.get("keys", {}).keys())
+
+    def remove_stale_keys(self, source_fingerprint_function) -> list:
+        """
+        Stop using series whose source has changed since the panel was built, so they're read from the source
+
+        Series without a fingerprint, in the panel or now, are assumed to be up to date
+
+        :param source_fingerprint_function: function(group_name, key) returning str, or missing_data if the
+            source can't be fingerprinted
+        :returns: list of (group_name, key) which have been removed
+        """
+        list_of_stale_keys = []
+        for group_name, group_index in self._panel_index.items():
+            source_fingerprints = group_index.get("source_fingerprints", {})
+            for key, panel_fingerprint in source_fingerprints.items():
+                if key not in group_index["keys"]:
+                    continue
+                current_fingerprint = source_fingerprint_function(group_name, key)
+                if current_fingerprint is missing_data:
+                    continue
+                if current_fingerprint != panel_fingerprint:
+                    list_of_stale_keys.append((group_name, key))
+
+        for group_name, key in list_of_stale_keys:
+            self._panel_index[group_name]["keys"].pop(key)
+
+        return list_of_stale_keys
+
+    def get(self, group_name: str, key: str):
+        """
+        :returns: the prices for key (instrument or fx code) in this group, or missing_data. Series are read
+            only views of the memory mapped arrays; DataFrames are copies
+        """
+        group_index = self._panel_index.get(group_name, missing_data)
+        if group_index is missing_data:
+            return missing_data
+
+        start_and_end = group_index["keys"].get(key, missing_data)
+        if start_and_end is missing_data:
+            return missing_data
+
+        start, end = start_and_end
+        dates = self._array(group_name, DATES_COLUMN)[start:end].view("datetime64[ns]")
+        index = pd.DatetimeIndex(dates)
+
+        string_columns = group_index["string_columns"]
+        data = dict(
+            [
+                (
+                    column_name,
+                    self._column(
+                        group_name,
+                        column_name,
+                        start=start,
+                        end=end,
+                        is_string=column_name in string_columns,
+                    ),
+                )
+                for column_name in group_index["columns"]
+            ]
+        )
+
+        if group_index["is_series"]:
+            data = pd.Series(
+                data[SERIES_COLUMN], index=index, name=group_index["names"][key]
+            )
+        else:
+            ## pandas copies the columns into one block anyway; make sure it does
+            data = pd.DataFrame(
+                data, index=index, columns=group_index["columns"], copy=True
+            )
+
+        return _type_for_group[group_name](data)
+
+    def _column(
+        self, group_name: str, column_name: str, start: int, end: int, is_string: bool
+    ) -> np.ndarray:
+        values = self._array(group_name, column_name)[start:end]
+        if not is_string:
+            return values
+
+        values = values.astype(object)
+        values[values == MISSING_STRING] = np.nan
+
+        return values
+
+    def _array(self, group_name: str, column_name: str) -> np.ndarray:
+        array_key = (group_name, column_name)
+        array = self._arrays.get(array_key, missing_data)
+        if array is missing_data:
+            array = np.load(
+                _array_filename(self.directory, group_name, column_name),
+                mmap_mode="r",
+            )
+            self._arrays[array_key] = array
+
+        return array
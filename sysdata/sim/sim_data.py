@@ -1,9 +1,15 @@
+import hashlib
 import pandas as pd
 import datetime
+from concurrent.futures import ThreadPoolExecutor
 
-from syscore.objects import get_methods, missing_data
+from syscore.objects import get_methods, missing_data, arg_not_supplied
 from syscore.dateutils import ARBITRARY_START
-from syscore.pdutils import prices_to_daily_prices, get_intraday_df_at_frequency
+from syscore.pdutils import (
+    prices_to_daily_prices,
+    get_intraday_df_at_frequency,
+    hash_of_pd_object,
+)
 from sysdata.base_data import baseData
 
 from sysobjects.spot_fx_prices import fxPrices
@@ -162,6 +168,35 @@ class simData(baseData):
 
         return fx_rate_series
 
+    def get_fx_for_instrument_list(
+        self, instrument_list: list, base_currency: str
+    ) -> dict:
+        """
+        As get_fx_for_instrument, for several instruments with the reads done in parallel
+
+        :returns: dict of Tx1 pd.Series, keyed by instrument code
+        """
+
+        return dict_of_reads_in_parallel(
+            lambda instrument_code: self.get_fx_for_instrument(
+                instrument_code, base_currency
+            ),
+            instrument_list,
+        )
+
+    def prime_data_cache_for_instrument_list(
+        self, instrument_list: list = arg_not_supplied
+    ):
+        """
+        Read everything a backtest will need for a list of instruments in one go, so later
+        requests for individual instruments don't need a round trip to the data source
+
+        Does nothing unless a data source keeps what it has read; see genericBlobUsingFuturesSimData
+
+        :param instrument_list: defaults to all instruments
+        """
+        pass
+
     def get_raw_price(self, instrument_code: str) -> pd.Series:
         """
         Default method to get instrument price at 'natural' frequency
@@ -205,6 +240,33 @@ class simData(baseData):
         """
         raise NotImplementedError("Need to inherit from simData")
 
+    def data_fingerprint(self) -> str:
+        """
+        Changes whenever any of the data changes; used to key the disk cache of a system
+
+        :returns: str
+        """
+        instrument_list = sorted(self.get_instrument_list())
+        all_fingerprints = [
+            "%s:%s" % (instrument_code, self.data_fingerprint_for_instrument(instrument_code))
+            for instrument_code in instrument_list
+        ]
+
+        return hashlib.sha256("/".join(all_fingerprints).encode("utf-8")).hexdigest()
+
+    def data_fingerprint_for_instrument(self, instrument_code: str) -> str:
+        """
+        Changes whenever the data for an instrument changes
+
+        Override if the data source has other data that stages use
+
+        :param instrument_code: instrument to get fingerprint for
+        :type instrument_code: str
+
+        :returns: str
+        """
+        return hash_of_pd_object(self.get_raw_price(instrument_code))
+
     def get_value_of_block_price_move(self, instrument_code: str) -> float:
         """
         How much does a $1 (or whatever) move in the price of an instrument block affect its value?
@@ -286,6 +348,28 @@ class simData(baseData):
         raise NotImplementedError("Need to inherit for a specific data source")
 
 
+DEFAULT_NUMBER_OF_READ_THREADS = 8
+
+
+def dict_of_reads_in_parallel(
+    read_function, list_of_keys: list, n_threads: int = DEFAULT_NUMBER_OF_READ_THREADS
+) -> dict:
+    """
+    Call read_function(key) for each key using a pool of threads
+
+    Reads from databases and files spend most of their time waiting, so threads are fine here
+
+    :returns: dict, keys are list_of_keys
+    """
+    if n_threads <= 1 or len(list_of_keys) <= 1:
+        return dict([(key, read_function(key)) for key in list_of_keys])
+
+    with ThreadPoolExecutor(max_workers=n_threads) as executor:
+        list_of_results = list(executor.map(read_function, list_of_keys))
+
+    return dict(zip(list_of_keys, list_of_results))
+
+
 def _resolve_start_date(sim_data: simData):
 
     config = _resolve_config(sim_data)
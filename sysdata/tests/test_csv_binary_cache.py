@@ -0,0 +1,58 @@
+import os
+
+import pandas as pd
+import pytest
+
+from syscore.pdutils import pd_readcsv
+from sysdata.csv.csv_binary_cache import (
+    pd_readcsv_with_binary_cache,
+    binary_cache_filename_for_csv_file,
+)
+
+CSV_TEXT = """DATETIME,PRICE,PRICE_CONTRACT,NOTE
+2020-01-02 23:00:00,101.5,20200300,a
+2020-01-03 23:00:00,,20200300,b
+2020-01-06 23:00:00,102.25,20200600,c
+"""
+
+
+def _write_csv(tmp_path, text: str = CSV_TEXT) -> str:
+    filename = str(tmp_path / "EDOLLAR.csv")
+    with open(filename, "w") as csv_file:
+        csv_file.write(text)
+
+    return filename
+
+
+class TestCsvBinaryCache:
+    def test_same_as_csv_and_reused(self, tmp_path, monkeypatch):
+        filename = _write_csv(tmp_path)
+
+        data = pd_readcsv_with_binary_cache(filename)
+        pd.testing.assert_frame_equal(data, pd_readcsv(filename))
+        assert os.path.exists(binary_cache_filename_for_csv_file(filename))
+
+        def should_not_be_called(*args, **kwargs):
+            raise Exception("Should have used the binary cache")
+
+        monkeypatch.setattr(
+            "sysdata.csv.csv_binary_cache.pd_readcsv", should_not_be_called
+        )
+        pd.testing.assert_frame_equal(
+            pd_readcsv_with_binary_cache(filename), pd_readcsv(filename)
+        )
+
+    def test_csv_read_again_when_changed(self, tmp_path):
+        filename = _write_csv(tmp_path)
+        pd_readcsv_with_binary_cache(filename)
+
+        _write_csv(tmp_path, CSV_TEXT + "2020-01-07 23:00:00,103.0,20200600,d\n")
+
+        data = pd_readcsv_with_binary_cache(filename)
+        assert len(data) == 4
+        pd.testing.assert_frame_equal(data, pd_readcsv(filename))
+
+    def test_missing_file(self, tmp_path):
+        ## same as pd_readcsv, so the csv data classes can warn about it
+        with pytest.raises(OSError):
+            pd_readcsv_with_binary_cache(str(tmp_path / "NOT_THERE.csv"))
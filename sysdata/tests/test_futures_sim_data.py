@@ -0,0 +1,142 @@
+import pandas as pd
+import pytest
+
+from sysdata.sim.csv_futures_sim_data import csvFuturesSimData
+from sysdata.sim.price_panel import pricePanel, ADJUSTED_PRICES, MULTIPLE_PRICES
+
+INSTRUMENT_LIST = ["EDOLLAR", "US10", "SOFR"]
+
+
+class TestBulkReads:
+    def test_bulk_reads_match_single_reads(self):
+        bulk_data = csvFuturesSimData()
+        single_data = csvFuturesSimData()
+
+        dict_of_prices = bulk_data.get_backadjusted_futures_prices_for_list(
+            INSTRUMENT_LIST
+        )
+        dict_of_fx = bulk_data.get_fx_for_instrument_list(INSTRUMENT_LIST, "GBP")
+
+        assert list(dict_of_prices.keys()) == INSTRUMENT_LIST
+        for instrument_code in INSTRUMENT_LIST:
+            pd.testing.assert_series_equal(
+                dict_of_prices[instrument_code],
+                single_data.get_backadjusted_futures_price(instrument_code),
+            )
+            pd.testing.assert_series_equal(
+                dict_of_fx[instrument_code],
+                single_data.get_fx_for_instrument(instrument_code, "GBP"),
+            )
+
+    def test_primed_data_not_read_again(self, monkeypatch):
+        data = csvFuturesSimData()
+        data.prime_data_cache_for_instrument_list(INSTRUMENT_LIST)
+
+        def should_not_be_called(*args, **kwargs):
+            raise Exception("Should have been read already")
+
+        adjusted_prices_data = data.db_futures_adjusted_prices_data
+        monkeypatch.setattr(
+            adjusted_prices_data, "get_adjusted_prices", should_not_be_called
+        )
+        monkeypatch.setattr(
+            data.db_futures_multiple_prices_data,
+            "get_multiple_prices",
+            should_not_be_called,
+        )
+
+        assert len(data.get_backadjusted_futures_price("US10")) > 0
+        assert len(data.get_multiple_prices("EDOLLAR")) > 0
+
+    def test_changing_data_doesnt_change_later_reads(self):
+        data = csvFuturesSimData()
+        adjusted_prices = data.get_backadjusted_futures_price("US10")
+        first_price = adjusted_prices.iloc[0]
+        adjusted_prices.iloc[0] = first_price + 1.0
+        multiple_prices = data.get_multiple_prices("US10")
+        multiple_prices["PRICE"] = 0.0
+
+        assert data.get_backadjusted_futures_price("US10").iloc[0] == first_price
+        assert (data.get_multiple_prices("US10")["PRICE"] != 0.0).any()
+        assert type(data.get_backadjusted_futures_price("US10")) is type(
+            adjusted_prices
+        )
+
+    def test_clear_read_cache(self, monkeypatch):
+        data = csvFuturesSimData()
+        data.get_backadjusted_futures_price("US10")
+        data.clear_read_cache()
+
+        def read_again(instrument_code):
+            return "read again"
+
+        monkeypatch.setattr(
+            data.db_futures_adjusted_prices_data, "get_adjusted_prices", read_again
+        )
+
+        assert data.get_backadjusted_futures_price("US10") == "read again"
+
+
+class TestPricePanel:
+    def test_panel_matches_source(self, tmp_path):
+        source_data = csvFuturesSimData()
+        source_data.build_price_panel(str(tmp_path), instrument_list=INSTRUMENT_LIST)
+
+        panel_data = csvFuturesSimData()
+        panel_data.use_price_panel(str(tmp_path))
+
+        for instrument_code in INSTRUMENT_LIST:
+            pd.testing.assert_series_equal(
+                panel_data.get_backadjusted_futures_price(instrument_code),
+                source_data.get_backadjusted_futures_price(instrument_code),
+            )
+            pd.testing.assert_frame_equal(
+                panel_data.get_multiple_prices(instrument_code),
+                source_data.get_multiple_prices(instrument_code),
+            )
+            pd.testing.assert_series_equal(
+                panel_data.get_fx_for_instrument(instrument_code, "GBP"),
+                source_data.get_fx_for_instrument(instrument_code, "GBP"),
+            )
+
+        # not in the panel, so read from the .csv files
+        assert len(panel_data.get_backadjusted_futures_price("GOLD")) > 0
+
+    def test_stale_prices_read_from_source(self, tmp_path, monkeypatch):
+        source_data = csvFuturesSimData()
+        source_data.build_price_panel(str(tmp_path), instrument_list=INSTRUMENT_LIST)
+
+        panel_data = csvFuturesSimData()
+        fingerprint_when_built = panel_data.price_panel_source_fingerprint
+
+        def _us10_has_changed(group_name, key):
+            if key == "US10":
+                return "changed"
+            return fingerprint_when_built(group_name, key)
+
+        monkeypatch.setattr(
+            panel_data, "price_panel_source_fingerprint", _us10_has_changed
+        )
+        panel_data.use_price_panel(str(tmp_path))
+
+        assert "US10" not in panel_data.price_panel.keys_for_group(ADJUSTED_PRICES)
+        assert "US10" not in panel_data.price_panel.keys_for_group(MULTIPLE_PRICES)
+        assert "EDOLLAR" in panel_data.price_panel.keys_for_group(ADJUSTED_PRICES)
+        pd.testing.assert_series_equal(
+            panel_data.get_backadjusted_futures_price("US10"),
+            source_data.get_backadjusted_futures_price("US10"),
+        )
+
+    def test_panel_series_are_read_only(self, tmp_path):
+        csvFuturesSimData().build_price_panel(
+            str(tmp_path), instrument_list=INSTRUMENT_LIST
+        )
+        price_panel = pricePanel(str(tmp_path))
+
+        adjusted_prices = price_panel.get(ADJUSTED_PRICES, "US10")
+        with pytest.raises(ValueError):
+            adjusted_prices.iloc[0] = 0.0
+
+        multiple_prices = price_panel.get(MULTIPLE_PRICES, "US10")
+        multiple_prices.iloc[0, 0] = 0.0
+        assert price_panel.get(MULTIPLE_PRICES, "US10").iloc[0, 0] != 0.0
@@ -0,0 +1,100 @@
+import pandas as pd
+import pytest
+
+pytest.importorskip("pyarrow")
+
+from syscore.dateutils import Frequency, MIXED_FREQ
+from sysdata.parquet.parquet_futures_per_contract_prices import (
+    parquetFuturesContractPriceData,
+)
+from sysobjects.contracts import futuresContract
+from sysobjects.futures_per_contract_prices import futuresContractPrices
+
+
+def _some_prices(start: str, periods: int, offset: float) -> futuresContractPrices:
+    index = pd.date_range(start, periods=periods, freq="B")
+    final = pd.Series(range(periods), index=index, dtype=float) + offset
+    price_df = pd.DataFrame(
+        dict(OPEN=final, HIGH=final + 1, LOW=final - 1, FINAL=final, VOLUME=10.0),
+        index=index,
+    )
+
+    return futuresContractPrices(price_df)
+
+
+class TestParquetFuturesContractPriceData:
+    def _data_with_prices(self, tmp_path):
+        data = parquetFuturesContractPriceData(datapath=str(tmp_path))
+        data.write_merged_prices_for_contract_object(
+            futuresContract("EDOLLAR", "20200300"), _some_prices("2019-01-01", 50, 0.0)
+        )
+        data.write_merged_prices_for_contract_object(
+            futuresContract("EDOLLAR", "20200600"),
+            _some_prices("2019-02-01", 40, 100.0),
+        )
+        data.write_prices_at_frequency_for_contract_object(
+            futuresContract("EDOLLAR", "20200600"),
+            _some_prices("2019-02-01", 5, 100.0),
+            frequency=Frequency.Day,
+        )
+
+        return data
+
+    def test_round_trip(self, tmp_path):
+        data = self._data_with_prices(tmp_path)
+        contract = futuresContract("EDOLLAR", "20200300")
+
+        prices = data.get_merged_prices_for_contract_object(contract)
+        expected = _some_prices("2019-01-01", 50, 0.0)
+        pd.testing.assert_frame_equal(
+            prices, expected, check_freq=False, check_like=True
+        )
+
+        assert data.has_merged_price_data_for_contract(contract)
+        assert not data.has_price_data_for_contract_at_frequency(
+            contract, frequency=Frequency.Day
+        )
+        assert data.get_contracts_with_merged_price_data().list_of_dates() == [
+            "20200300",
+            "20200600",
+        ]
+        assert data.contract_dates_with_price_data_at_frequency_for_instrument_code(
+            "EDOLLAR", frequency=Frequency.Day
+        ) == ["20200600"]
+
+        data.delete_merged_prices_for_contract_object(contract, areyousure=True)
+        assert not data.has_merged_price_data_for_contract(contract)
+        assert len(data.get_merged_prices_for_contract_object(contract)) == 0
+
+    def test_contract_list_matches_single_reads(self, tmp_path):
+        data = self._data_with_prices(tmp_path)
+        list_of_contract_date_str = ["20200300", "20200600", "20200900"]
+
+        dict_of_prices = data.get_merged_prices_for_contract_list(
+            "EDOLLAR", list_of_contract_date_str
+        )
+
+        assert list(dict_of_prices.keys()) == list_of_contract_date_str
+        for contract_date_str in list_of_contract_date_str:
+            single_prices = data.get_merged_prices_for_contract_object(
+                futuresContract("EDOLLAR", contract_date_str)
+            )
+            pd.testing.assert_frame_equal(
+                dict_of_prices[contract_date_str], single_prices, check_freq=False
+            )
+
+    def test_columns_and_dates_filtered(self, tmp_path):
+        data = self._data_with_prices(tmp_path)
+
+        dict_of_df = data.get_df_for_contract_list(
+            "EDOLLAR",
+            ["20200300", "20200600"],
+            frequency=MIXED_FREQ,
+            columns=["FINAL"],
+            start_date=pd.Timestamp("2019-02-04"),
+            end_date=pd.Timestamp("2019-02-08"),
+        )
+
+        assert list(dict_of_df["20200300"].columns) == ["DATETIME", "FINAL"]
+        assert len(dict_of_df["20200300"]) == 5
+        assert list(dict_of_df["20200600"].FINAL) == [101.0, 102.0, 103.0, 104.0, 105.0]
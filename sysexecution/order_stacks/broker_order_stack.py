@@ -24,9 +24,8 @@ class brokerOrderStackData(orderStackData):
         self._change_order_on_stack(broker_order_id, db_broker_order)
 
     def find_order_with_broker_tempid(self, broker_tempid: str):
-        list_of_order_ids = self.get_list_of_order_ids(exclude_inactive_orders=False)
-        for order_id in list_of_order_ids:
-            order = self.get_order_with_id_from_stack(order_id)
+        list_of_orders = self._get_list_of_orders_on_stack()
+        for order in list_of_orders:
             if order.broker_tempid == broker_tempid:
                 return order
 
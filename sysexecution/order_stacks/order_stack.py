@@ -1,6 +1,7 @@
 import datetime
 from copy import copy
 from syscore.objects import (
+    arg_not_supplied,
     missing_order,
     success,
     failure,
@@ -163,36 +164,26 @@ class orderStackData(object):
         return listOfOrders(order_list)
 
     def get_list_of_order_ids(self, exclude_inactive_orders: bool = True) -> list:
-        order_ids = self._get_list_of_all_order_ids()
+        if not exclude_inactive_orders:
+            return self._get_list_of_all_order_ids()
 
-        if exclude_inactive_orders:
-            all_orders = [
-                self.get_order_with_id_from_stack(order_id) for order_id in order_ids
-            ]
-            order_ids = [order.order_id for order in all_orders if order.active]
+        active_orders = self._get_list_of_orders_on_stack(active=True)
+        order_ids = [order.order_id for order in active_orders]
 
         return order_ids
 
     def list_of_new_orders(self) -> list:
-        order_ids = self.get_list_of_order_ids()
+        active_orders = self._get_list_of_orders_on_stack(active=True)
         new_order_ids = [
-            order_id for order_id in order_ids if self.is_new_order(order_id)
+            order.order_id for order in active_orders if _order_is_new(order)
         ]
 
         return new_order_ids
 
     def is_new_order(self, order_id: int) -> bool:
         existing_order = self.get_order_with_id_from_stack(order_id)
-        if existing_order is missing_order:
-            return False
-        if existing_order.children is not no_children:
-            return False
-        if not existing_order.active:
-            return False
-        if not existing_order.fill_equals_zero():
-            return False
 
-        return True
+        return _order_is_new(existing_order)
 
     def list_of_completed_order_ids(
         self,
@@ -200,12 +191,12 @@ class orderStackData(object):
         allow_zero_completions=False,
         treat_inactive_as_complete=False,
     ) -> list:
-        order_ids = self.get_list_of_order_ids()
+        active_orders = self._get_list_of_orders_on_stack(active=True)
         completed_order_ids = [
-            order_id
-            for order_id in order_ids
-            if self.is_completed(
-                order_id,
+            order.order_id
+            for order in active_orders
+            if _order_is_completed(
+                order,
                 allow_partial_completions=allow_partial_completions,
                 allow_zero_completions=allow_zero_completions,
                 treat_inactive_as_complete=treat_inactive_as_complete,
@@ -224,26 +215,12 @@ class orderStackData(object):
 
         existing_order = self.get_order_with_id_from_stack(order_id)
 
-        if allow_zero_completions:
-            return True
-
-        if existing_order is missing_order:
-            return False
-
-        order_inactive = not existing_order.active
-        treat_inactive_orders_as_incomplete = not treat_inactive_as_complete
-
-        if order_inactive and treat_inactive_orders_as_incomplete:
-            return False
-
-        if allow_partial_completions:
-            trade_with_no_fills = existing_order.fill_equals_zero()
-            partially_completed = not trade_with_no_fills
-            return partially_completed
-
-        fully_filled = existing_order.fill_equals_desired_trade()
-        is_completed = fully_filled is True
-        return is_completed
+        return _order_is_completed(
+            existing_order,
+            allow_partial_completions=allow_partial_completions,
+            allow_zero_completions=allow_zero_completions,
+            treat_inactive_as_complete=treat_inactive_as_complete,
+        )
 
     # CHILD ORDERS
     def add_children_to_order_without_existing_children(
@@ -387,11 +364,8 @@ class orderStackData(object):
             self.remove_order_with_id_from_stack(order_id)
 
     def get_list_of_inactive_order_ids(self) -> list:
-        all_order_ids = self._get_list_of_all_order_ids()
-        all_orders = [
-            self.get_order_with_id_from_stack(order_id) for order_id in all_order_ids
-        ]
-        order_ids = [order.order_id for order in all_orders if not order.active]
+        inactive_orders = self._get_list_of_orders_on_stack(active=False)
+        order_ids = [order.order_id for order in inactive_orders]
 
         return order_ids
 
@@ -504,17 +478,36 @@ class orderStackData(object):
         self, order_key: str, exclude_inactive_orders: bool = True
     ) -> list:
 
-        all_order_ids = self.get_list_of_order_ids(
-            exclude_inactive_orders=exclude_inactive_orders
+        if exclude_inactive_orders:
+            active = True
+        else:
+            active = arg_not_supplied
+
+        orders_with_key = self._get_list_of_orders_on_stack(
+            active=active, order_key=order_key
         )
+        order_ids = [order.order_id for order in orders_with_key]
 
-        all_orders = [
-            self.get_order_with_id_from_stack(order_id) for order_id in all_order_ids
-        ]
+        return order_ids
 
-        order_ids = [order.order_id for order in all_orders if order.key == order_key]
+    def _get_list_of_orders_on_stack(
+        self, active: bool = arg_not_supplied, order_key: str = arg_not_supplied
+    ) -> listOfOrders:
+        """
+        :param active: True for only active orders, False for only inactive orders, arg_not_supplied for all
+        :param order_key: only orders for this tradeable object, if supplied
+        :return: listOfOrders
+        """
+        # Gets every order; data implementations should override with something that filters as it reads
+        all_order_ids = self._get_list_of_all_order_ids()
+        all_orders = self.get_list_of_orders_from_order_id_list(all_order_ids)
+        matching_orders = [
+            order
+            for order in all_orders
+            if _order_matches(order, active=active, order_key=order_key)
+        ]
 
-        return order_ids
+        return listOfOrders(matching_orders)
 
     def _delete_entire_stack_without_checking_only_use_when_debugging(self):
         order_id_list = self.get_list_of_order_ids(exclude_inactive_orders=False)
@@ -551,6 +544,15 @@ class orderStackData(object):
 
         raise NotImplementedError
 
+    def get_current_max_order_id(self) -> int:
+        ## changes whenever an order is added, so a cheap way to see if there is anything new on the stack
+        return self._get_current_max_order_id()
+
+    def _get_current_max_order_id(self) -> int:
+        # MUST override in data implementation
+
+        raise NotImplementedError
+
     def _get_next_order_id(self):
         # MUST override in data implementation
         # The maximum orderid should ideally live on in permanent storage
@@ -558,3 +560,56 @@ class orderStackData(object):
         # rely on mapping orderids
 
         raise NotImplementedError
+
+
+def _order_matches(
+    order: Order, active: bool = arg_not_supplied, order_key: str = arg_not_supplied
+) -> bool:
+    if active is not arg_not_supplied and order.active != active:
+        return False
+    if order_key is not arg_not_supplied and order.key != order_key:
+        return False
+
+    return True
+
+
+def _order_is_new(order: Order) -> bool:
+    if order is missing_order:
+        return False
+    if order.children is not no_children:
+        return False
+    if not order.active:
+        return False
+    if not order.fill_equals_zero():
+        return False
+
+    return True
+
+
+def _order_is_completed(
+    order: Order,
+    allow_partial_completions=False,
+    allow_zero_completions=False,
+    treat_inactive_as_complete=False,
+) -> bool:
+
+    if allow_zero_completions:
+        return True
+
+    if order is missing_order:
+        return False
+
+    order_inactive = not order.active
+    treat_inactive_orders_as_incomplete = not treat_inactive_as_complete
+
+    if order_inactive and treat_inactive_orders_as_incomplete:
+        return False
+
+    if allow_partial_completions:
+        trade_with_no_fills = order.fill_equals_zero()
+        partially_completed = not trade_with_no_fills
+        return partially_completed
+
+    fully_filled = order.fill_equals_desired_trade()
+    is_completed = fully_filled is True
+    return is_completed
@@ -0,0 +1,126 @@
+from copy import deepcopy
+
+from syscore.objects import arg_not_supplied, missing_data, missing_order
+from sysdata.mongodb.mongo_order_stack import mongoInstrumentOrderStackData
+from sysexecution.order_stacks.order_stack import orderStackData
+from sysexecution.orders.instrument_orders import instrumentOrder
+from sysexecution.trade_qty import tradeQuantity
+
+
+class _fakeMongoData(object):
+    """
+    Enough of mongoDataWithSingleKey for an order stack, counting the reads
+    """
+
+    def __init__(self):
+        self.data = {}
+        self.number_of_reads = 0
+
+    def get_list_of_keys(self) -> list:
+        return list(self.data.keys())
+
+    def get_result_dict_for_key(self, key) -> dict:
+        self.number_of_reads += 1
+        if key not in self.data:
+            return missing_data
+
+        return deepcopy(self.data[key])
+
+    def get_list_of_result_dict_for_custom_dict(self, custom_dict: dict) -> list:
+        self.number_of_reads += 1
+        return [
+            deepcopy(result_dict)
+            for result_dict in self.data.values()
+            if all(
+                _field_matches(result_dict, field_name, condition)
+                for field_name, condition in custom_dict.items()
+            )
+        ]
+
+    def add_data(self, key, data_dict: dict, allow_overwrite=False):
+        data_dict = deepcopy(data_dict)
+        data_dict["order_id"] = key
+        self.data[key] = data_dict
+
+    def delete_data_without_any_warning(self, key):
+        self.data.pop(key)
+
+
+def _field_matches(result_dict: dict, field_name: str, condition) -> bool:
+    if isinstance(condition, dict):
+        if "$exists" in condition:
+            return (field_name in result_dict) == condition["$exists"]
+        if "$in" in condition:
+            return result_dict.get(field_name, None) in condition["$in"]
+
+    return result_dict.get(field_name, None) == condition
+
+
+class _fakeMongoInstrumentOrderStackData(mongoInstrumentOrderStackData):
+    def __init__(self, use_cache: bool = False):
+        self._mongo_data = _fakeMongoData()
+        self._use_cache = use_cache
+        self._cache_of_order_dicts = {}
+        orderStackData.__init__(self)
+
+
+def _stack_with_orders(use_cache: bool = False) -> _fakeMongoInstrumentOrderStackData:
+    ## the first order ID is 2
+    stack = _fakeMongoInstrumentOrderStackData(use_cache=use_cache)
+    stack.put_order_on_stack(instrumentOrder("strat", "EDOLLAR", 5))
+    filled_order_id = stack.put_order_on_stack(instrumentOrder("strat", "US10", 3))
+    inactive_order_id = stack.put_order_on_stack(instrumentOrder("strat", "BUND", -2))
+    stack.put_order_on_stack(instrumentOrder("other", "EDOLLAR", 1))
+
+    stack.change_fill_quantity_for_order(filled_order_id, tradeQuantity([3]))
+    stack.deactivate_order(inactive_order_id)
+
+    return stack
+
+
+class TestMongoOrderStack:
+    def test_queries_match_generic_stack(self):
+        stack = _stack_with_orders()
+
+        assert stack.list_of_new_orders() == [2, 5]
+        assert stack.list_of_completed_order_ids() == [3]
+        assert stack.get_list_of_inactive_order_ids() == [4]
+        assert stack.get_list_of_order_ids() == [2, 3, 5]
+        order_key = instrumentOrder("strat", "EDOLLAR", 0).key
+        assert stack._get_list_of_order_ids_with_key_from_stack(order_key) == [2]
+
+        for active, key in [(True, order_key), (False, arg_not_supplied)]:
+            assert [
+                order.order_id
+                for order in stack._get_list_of_orders_on_stack(
+                    active=active, order_key=key
+                )
+            ] == [
+                order.order_id
+                for order in orderStackData._get_list_of_orders_on_stack(
+                    stack, active=active, order_key=key
+                )
+            ]
+
+    def test_list_of_orders_in_one_read(self):
+        stack = _stack_with_orders()
+        stack.mongo_data.number_of_reads = 0
+
+        list_of_orders = stack.get_list_of_orders_from_order_id_list([5, 99, 2])
+
+        assert stack.mongo_data.number_of_reads == 1
+        assert list_of_orders[0].order_id == 5
+        assert list_of_orders[1] is missing_order
+        assert list_of_orders[2].order_id == 2
+
+    def test_cache_invalidated_on_write(self):
+        stack = _stack_with_orders(use_cache=True)
+        stack.get_order_with_id_from_stack(2)
+        stack.mongo_data.number_of_reads = 0
+
+        assert stack.get_order_with_id_from_stack(2).trade == tradeQuantity([5])
+        assert stack.mongo_data.number_of_reads == 0
+
+        stack.change_fill_quantity_for_order(2, tradeQuantity([2]))
+        assert stack.get_order_with_id_from_stack(2).fill == tradeQuantity([2])
+        assert stack.mongo_data.number_of_reads == 1
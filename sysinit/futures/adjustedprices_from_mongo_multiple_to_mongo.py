@@ -9,7 +9,7 @@ from sysdata.arctic.arctic_multiple_prices import arcticFuturesMultiplePricesDat
 from sysdata.arctic.arctic_adjusted_prices import arcticFuturesAdjustedPricesData
 from sysdata.csv.csv_adjusted_prices import csvFuturesAdjustedPricesData
 
-from sysobjects.adjusted_prices import futuresAdjustedPrices
+from sysobjects.adjusted_prices import futuresAdjustedPrices, PANAMA_STITCHING
 
 
 def _get_data_inputs(csv_adj_data_path):
@@ -21,7 +21,10 @@ def _get_data_inputs(csv_adj_data_path):
 
 
 def process_adjusted_prices_all_instruments(
-    csv_adj_data_path=arg_not_supplied, ADD_TO_ARCTIC=True, ADD_TO_CSV=False
+    csv_adj_data_path=arg_not_supplied,
+    ADD_TO_ARCTIC=True,
+    ADD_TO_CSV=False,
+    stitching_method=PANAMA_STITCHING,
 ):
     arctic_multiple_prices, _notused, _alsonotused = _get_data_inputs(csv_adj_data_path)
     instrument_list = arctic_multiple_prices.get_list_of_instruments()
@@ -32,6 +35,7 @@ def process_adjusted_prices_all_instruments(
             csv_adj_data_path=csv_adj_data_path,
             ADD_TO_ARCTIC=ADD_TO_ARCTIC,
             ADD_TO_CSV=ADD_TO_CSV,
+            stitching_method=stitching_method,
         )
 
 
@@ -41,6 +45,7 @@ def process_adjusted_prices_single_instrument(
     multiple_prices = arg_not_supplied,
     ADD_TO_ARCTIC=True,
     ADD_TO_CSV=False,
+    stitching_method=PANAMA_STITCHING,
 ):
     (
         arctic_multiple_prices,
@@ -50,7 +55,7 @@ def process_adjusted_prices_single_instrument(
     if multiple_prices is arg_not_supplied:
         multiple_prices = arctic_multiple_prices.get_multiple_prices(instrument_code)
     adjusted_prices = futuresAdjustedPrices.stitch_multiple_prices(
-        multiple_prices, forward_fill=True
+        multiple_prices, forward_fill=True, stitching_method=stitching_method
     )
 
     print(adjusted_prices)
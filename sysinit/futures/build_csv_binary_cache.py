@@ -0,0 +1,44 @@
+"""
+Build binary copies of the .csv price files used by csvFuturesSimData, so the first backtest doesn't have to
+
+The copies are kept up to date automatically as the .csv files change; this just saves waiting for them
+
+    python sysinit/futures/build_csv_binary_cache.py
+    python sysinit/futures/build_csv_binary_cache.py --adjusted_prices data.futures.adjusted_prices_csv
+"""
+import argparse
+
+from sysdata.sim.csv_futures_sim_data import csvFuturesSimData
+
+
+def build_csv_binary_cache(csv_data_paths: dict):
+    if len(csv_data_paths) == 0:
+        sim_data = csvFuturesSimData()
+    else:
+        sim_data = csvFuturesSimData(csv_data_paths=csv_data_paths)
+
+    sim_data.build_binary_cache()
+    print("Built binary cache for %s" % str(sim_data))
+
+
+def _csv_data_paths_from_args(args) -> dict:
+    csv_data_paths = dict(
+        csvFuturesAdjustedPricesData=args.adjusted_prices,
+        csvFuturesMultiplePricesData=args.multiple_prices,
+        csvFxPricesData=args.fx_prices,
+    )
+    csv_data_paths = dict(
+        [(key, path) for key, path in csv_data_paths.items() if path is not None]
+    )
+
+    return csv_data_paths
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Build binary copies of the .csv price files used in backtests"
+    )
+    parser.add_argument("--adjusted_prices", help="eg data.futures.adjusted_prices_csv")
+    parser.add_argument("--multiple_prices", help="eg data.futures.multiple_prices_csv")
+    parser.add_argument("--fx_prices", help="eg data.futures.fx_prices_csv")
+    build_csv_binary_cache(_csv_data_paths_from_args(parser.parse_args()))
@@ -0,0 +1,44 @@
+"""
+Move positions, optimal positions and capital from the old mongo layout (whole history in one document)
+to one document per entry
+
+Stop all processes first: nothing else should read or write this data whilst it is moved, and until it has been
+moved reading or writing it raises an exception. Each old document is only moved to a backup collection (eg
+capital_single_document_backup) once all its entries have been copied and counted, so nothing is lost. Safe to
+run more than once; anything already moved is left alone.
+"""
+from sysdata.data_blob import dataBlob
+from sysdata.mongodb.mongo_positions_by_strategy import mongoStrategyPositionData
+from sysdata.mongodb.mongo_position_by_contract import mongoContractPositionData
+from sysdata.mongodb.mongo_optimal_position import mongoOptimalPositionData
+from sysdata.production.TEMP_old_capital_objects import mongoCapitalData
+
+LIST_OF_TIMED_STORAGE_CLASSES = [
+    mongoStrategyPositionData,
+    mongoContractPositionData,
+    mongoOptimalPositionData,
+    mongoCapitalData,
+]
+
+
+def migrate_timed_storage_to_one_document_per_entry(data: dataBlob):
+    for timed_storage_class in LIST_OF_TIMED_STORAGE_CLASSES:
+        timed_storage_data = timed_storage_class(
+            mongo_db=data.mongo_db,
+            log=data.log.setup(component=timed_storage_class.__name__),
+        )
+        number_of_series_copied = (
+            timed_storage_data.migrate_from_single_document_layout()
+        )
+        print(
+            "Moved %d series for %s"
+            % (number_of_series_copied, str(timed_storage_data))
+        )
+
+
+if __name__ == "__main__":
+    input(
+        "Stop all processes that update positions or capital before running. CTL-C to abort"
+    )
+    data = dataBlob(log_name="migrate_timed_storage")
+    migrate_timed_storage_to_one_document_per_entry(data)
@@ -188,6 +188,10 @@ class logger(object):
             "You're using a base class for logger - you need to use an inherited class like logtoscreen()"
         )
 
+    def flush(self):
+        ## Loggers that hold on to records before writing them should override this
+        pass
+
     """
     Following two methods implement context manager
     """
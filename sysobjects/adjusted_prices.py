@@ -13,6 +13,9 @@ from sysobjects.dict_of_named_futures_per_contract_prices import (
 )
 from sysobjects.multiple_prices import futuresMultiplePrices
 
+PANAMA_STITCHING = "panama"
+RATIO_STITCHING = "ratio"
+
 
 class futuresAdjustedPrices(pd.Series):
     """
@@ -38,19 +41,26 @@ class futuresAdjustedPrices(pd.Series):
         futuresAdjustedPrices,
         multiple_prices: futuresMultiplePrices,
         forward_fill: bool = False,
+        stitching_method: str = PANAMA_STITCHING,
     ):
         """
-        Do backstitching of multiple prices using panama method
+        Do backstitching of multiple prices, by default using the panama method
 
         If you want to change then override this method
 
         :param multiple_prices: multiple prices object
         :param forward_fill: forward fill prices and forwards before stitching
+        :param stitching_method: PANAMA_STITCHING (add roll differentials) or RATIO_STITCHING (multiply by
+            the ratio of prices at each roll)
 
         :return: futuresAdjustedPrices
 
         """
-        adjusted_prices = _panama_stitch(multiple_prices, forward_fill)
+        adjusted_prices = _stitch(
+            multiple_prices,
+            forward_fill=forward_fill,
+            stitching_method=stitching_method,
+        )
         return futuresAdjustedPrices(adjusted_prices)
 
     def update_with_multiple_prices_no_roll(
@@ -70,15 +80,18 @@ class futuresAdjustedPrices(pd.Series):
         return updated_adj
 
 
-def _panama_stitch(
-    multiple_prices_input: futuresMultiplePrices, forward_fill: bool = False
+def _stitch(
+    multiple_prices_input: futuresMultiplePrices,
+    forward_fill: bool = False,
+    stitching_method: str = PANAMA_STITCHING,
 ) -> pd.Series:
-    """
-    Do a panama stitch for adjusted prices
+    stitch_function = _stitch_function_for_method.get(stitching_method, None)
+    if stitch_function is None:
+        raise Exception(
+            "Stitching method %s not recognised, must be one of %s"
+            % (stitching_method, str(list(_stitch_function_for_method.keys())))
+        )
 
-    :param multiple_prices:  futuresMultiplePrices
-    :return: pd.Series of adjusted prices
-    """
     multiple_prices = copy(multiple_prices_input)
     if forward_fill:
         multiple_prices.ffill(inplace=True)
@@ -86,56 +99,107 @@ def _panama_stitch(
     if multiple_prices.empty:
         raise Exception("Can't stitch an empty multiple prices object")
 
-    previous_row = multiple_prices.iloc[0, :]
-    adjusted_prices_values = [previous_row.PRICE]
+    return stitch_function(multiple_prices)
 
-    for dateindex in multiple_prices.index[1:]:
-        current_row = multiple_prices.loc[dateindex, :]
 
-        if current_row.PRICE_CONTRACT == previous_row.PRICE_CONTRACT:
-            # no roll has occured
-            # we just append the price
-            adjusted_prices_values.append(current_row.PRICE)
-        else:
-            # A roll has occured
-            adjusted_prices_values = _roll_in_panama(
-                adjusted_prices_values, previous_row, current_row
-            )
+def _panama_stitch(multiple_prices: futuresMultiplePrices) -> pd.Series:
+    """
+    Do a panama stitch for adjusted prices
 
-        previous_row = current_row
+    On each roll we add the roll differential (forward less price, the day before the roll) to all previous
+    prices. So each adjusted price is the price plus the sum of the differentials for all later rolls,
+    which is a reversed cumulative sum.
 
-    # it's ok to return a DataFrame since the calling object will change the
-    # type
-    adjusted_prices = pd.Series(adjusted_prices_values, index=multiple_prices.index)
+    :param multiple_prices:  futuresMultiplePrices
+    :return: pd.Series of adjusted prices
+    """
+    prices, roll_positions, prices_before_roll, forwards_before_roll = _roll_data(
+        multiple_prices
+    )
+    roll_differentials = forwards_before_roll - prices_before_roll
+    _check_roll_adjustments_valid(
+        multiple_prices, roll_positions, valid=~np.isnan(roll_differentials)
+    )
 
-    return adjusted_prices
+    adjustment_on_day_before_roll = np.zeros(len(prices))
+    adjustment_on_day_before_roll[roll_positions - 1] = roll_differentials
+    adjustment = np.cumsum(adjustment_on_day_before_roll[::-1])[::-1]
 
+    # it's ok to return a Series since the calling object will change the type
+    return pd.Series(prices + adjustment, index=multiple_prices.index)
 
-def _roll_in_panama(adjusted_prices_values, previous_row, current_row):
-    # This is the sort of code you will need to change to adjust the roll logic
-    # The roll differential is from the previous_row
-    roll_differential = previous_row.FORWARD - previous_row.PRICE
-    if np.isnan(roll_differential):
-        raise Exception(
-            "On this day %s which should be a roll date we don't have prices for both %s and %s contracts"
-            % (
-                str(current_row.name),
-                previous_row.PRICE_CONTRACT,
-                previous_row.FORWARD_CONTRACT,
-            )
-        )
 
-    # We add the roll differential to all previous prices
-    adjusted_prices_values = [
-        adj_price + roll_differential for adj_price in adjusted_prices_values
-    ]
+def _ratio_stitch(multiple_prices: futuresMultiplePrices) -> pd.Series:
+    """
+    Do a ratio (proportional) stitch for adjusted prices
+
+    On each roll we multiply all previous prices by the ratio of forward to price, the day before the roll.
+    Percentage returns are preserved rather than price differences, but prices have to be positive.
+
+    :param multiple_prices:  futuresMultiplePrices
+    :return: pd.Series of adjusted prices
+    """
+    prices, roll_positions, prices_before_roll, forwards_before_roll = _roll_data(
+        multiple_prices
+    )
+    with np.errstate(divide="ignore", invalid="ignore"):
+        roll_ratios = forwards_before_roll / prices_before_roll
+    _check_roll_adjustments_valid(
+        multiple_prices,
+        roll_positions,
+        valid=np.isfinite(roll_ratios) & (roll_ratios > 0),
+    )
+
+    adjustment_on_day_before_roll = np.ones(len(prices))
+    adjustment_on_day_before_roll[roll_positions - 1] = roll_ratios
+    adjustment = np.cumprod(adjustment_on_day_before_roll[::-1])[::-1]
+
+    return pd.Series(prices * adjustment, index=multiple_prices.index)
+
 
-    # note this includes the price for the previous row, which will now be equal to the forward price
-    # We now add todays price. This will be for the new contract
+def _roll_data(multiple_prices: futuresMultiplePrices) -> tuple:
+    """
+    :return: tuple: prices (np.array), positions of the first row after each roll (np.array), and the
+        prices and forward prices on the row before each roll (np.array)
+    """
+    prices = multiple_prices.PRICE.values.astype(float)
+    forwards = multiple_prices.FORWARD.values.astype(float)
+
+    # element wise comparison, so a missing contract is treated as a roll, as it always was
+    contracts = multiple_prices.PRICE_CONTRACT.values.astype(object)
+    roll_positions = np.flatnonzero(contracts[1:] != contracts[:-1]) + 1
+
+    return (
+        prices,
+        roll_positions,
+        prices[roll_positions - 1],
+        forwards[roll_positions - 1],
+    )
+
+
+def _check_roll_adjustments_valid(
+    multiple_prices: futuresMultiplePrices, roll_positions: np.array, valid: np.array
+):
+    if valid.all():
+        return
+
+    roll_position = roll_positions[np.flatnonzero(~valid)[0]]
+    previous_row = multiple_prices.iloc[roll_position - 1]
+
+    raise Exception(
+        "On this day %s which should be a roll date we don't have prices for both %s and %s contracts"
+        % (
+            str(multiple_prices.index[roll_position]),
+            previous_row.PRICE_CONTRACT,
+            previous_row.FORWARD_CONTRACT,
+        )
+    )
 
-    adjusted_prices_values.append(current_row.PRICE)
 
-    return adjusted_prices_values
+_stitch_function_for_method = {
+    PANAMA_STITCHING: _panama_stitch,
+    RATIO_STITCHING: _ratio_stitch,
+}
 
 
 no_update_roll_has_occured = futuresAdjustedPrices.create_empty()
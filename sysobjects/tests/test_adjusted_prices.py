@@ -0,0 +1,69 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from sysobjects.adjusted_prices import futuresAdjustedPrices, RATIO_STITCHING
+from sysobjects.multiple_prices import futuresMultiplePrices
+
+
+def _multiple_prices(forward=(102.0, 103.0, 51.0, 52.0, 53.0)) -> futuresMultiplePrices:
+    index = pd.date_range("2020-01-01", periods=5, freq="B")
+    data = pd.DataFrame(
+        dict(
+            PRICE=[100.0, 101.0, 104.0, 50.0, 55.0],
+            PRICE_CONTRACT=["20200300", "20200300", "20200600", "20200600", "20200900"],
+            FORWARD=list(forward),
+            FORWARD_CONTRACT=["20200600", "20200600", "20200900", "20200900", "20201200"],
+            CARRY=[np.nan] * 5,
+            CARRY_CONTRACT=["20191200"] * 5,
+        ),
+        index=index,
+    )
+
+    return futuresMultiplePrices(data)
+
+
+class TestAdjustedPrices:
+    def test_panama_stitch(self):
+        adjusted = futuresAdjustedPrices.stitch_multiple_prices(_multiple_prices())
+
+        # roll differentials are 103-101=2 and 52-50=2
+        np.testing.assert_allclose(adjusted.values, [104.0, 105.0, 106.0, 52.0, 55.0])
+
+    def test_ratio_stitch(self):
+        adjusted = futuresAdjustedPrices.stitch_multiple_prices(
+            _multiple_prices(), stitching_method=RATIO_STITCHING
+        )
+
+        first_ratio = 103.0 / 101.0
+        second_ratio = 52.0 / 50.0
+        np.testing.assert_allclose(
+            adjusted.values,
+            [
+                100.0 * first_ratio * second_ratio,
+                101.0 * first_ratio * second_ratio,
+                104.0 * second_ratio,
+                50.0 * second_ratio,
+                55.0,
+            ],
+        )
+        # returns are preserved across a roll
+        assert adjusted.iloc[2] / adjusted.iloc[1] == pytest.approx(104.0 / 103.0)
+
+    def test_missing_forward_on_roll(self):
+        multiple_prices = _multiple_prices(forward=(102.0, np.nan, 51.0, 52.0, 53.0))
+
+        with pytest.raises(Exception, match="which should be a roll date"):
+            futuresAdjustedPrices.stitch_multiple_prices(multiple_prices)
+
+        # filled from the day before
+        adjusted = futuresAdjustedPrices.stitch_multiple_prices(
+            multiple_prices, forward_fill=True
+        )
+        assert adjusted.iloc[1] == pytest.approx(101.0 + 1.0 + 2.0)
+
+    def test_unknown_method(self):
+        with pytest.raises(Exception, match="not recognised"):
+            futuresAdjustedPrices.stitch_multiple_prices(
+                _multiple_prices(), stitching_method="wibble"
+            )
@@ -1,9 +1,12 @@
 from copy import copy
 import datetime
+import hashlib
 import os
 from shutil import copyfile
 
-from syscore.dateutils import create_datetime_string
+import yaml
+
+from syscore.dateutils import create_datetime_string, from_marker_to_datetime
 from syscore.fileutils import files_with_extension_in_pathname, get_resolved_pathname
 from syscore.objects import (
     arg_not_supplied,
@@ -30,8 +33,30 @@ PICKLE_EXT = ".pck"
 CONFIG_EXT = ".yaml"
 PICKLE_FILE_SUFFIX = "_backtest"
 CONFIG_FILE_SUFFIX = "_config"
+ESTIMATES_FILE_SUFFIX = "_estimates"
+FINGERPRINT_FILE_SUFFIX = "_fingerprint"
+FINGERPRINT_EXT = ".txt"
 PICKLE_SUFFIX = PICKLE_FILE_SUFFIX + PICKLE_EXT
 CONFIG_SUFFIX = CONFIG_FILE_SUFFIX + CONFIG_EXT
+ESTIMATES_SUFFIX = ESTIMATES_FILE_SUFFIX + PICKLE_EXT
+ESTIMATES_FINGERPRINT_SUFFIX = (
+    ESTIMATES_FILE_SUFFIX + FINGERPRINT_FILE_SUFFIX + FINGERPRINT_EXT
+)
+
+# estimates are kept in a sub directory so they don't look like backtests
+ESTIMATES_DIRECTORY = "estimates"
+
+# the slow estimates reused by an incremental run; cache item names
+LIST_OF_ESTIMATE_ITEM_NAMES = [
+    "_get_forecast_scalar_estimated_from_instrument_code",
+    "get_monthly_raw_forecast_weights_estimated",
+    "get_forecast_diversification_multiplier_estimated",
+    "get_raw_estimated_instrument_weights",
+    "get_estimated_instrument_diversification_multiplier",
+]
+
+# capital changes every day, but doesn't affect the estimates
+CONFIG_ELEMENTS_NOT_IN_ESTIMATES_FINGERPRINT = ["notional_trading_capital"]
 
 
 def user_choose_backtest(data: dataBlob = arg_not_supplied) -> interactiveBacktest:
@@ -213,6 +238,172 @@ def store_backtest_state(data, system, strategy_name="default_strategy"):
     return success
 
 
+def store_estimates_state(
+    data, system, strategy_name="default_strategy", fingerprint: str = arg_not_supplied
+):
+    """
+    Store the slow to estimate parts of a backtest state, so they can be reused
+
+    :param data: data object, used to access the log
+    :param system: a system object which has run
+    :param strategy_name: str
+    :param fingerprint: from get_estimates_fingerprint before the system ran; worked out now if not supplied
+
+    :return: success or failure
+    """
+    ensure_estimates_directory_exists(strategy_name)
+
+    if fingerprint is arg_not_supplied:
+        fingerprint = get_estimates_fingerprint(system)
+
+    datetime_marker = create_datetime_string()
+    estimates_filename = get_estimates_pickle_filename(strategy_name, datetime_marker)
+    fingerprint_filename = get_estimates_fingerprint_filename(
+        strategy_name, datetime_marker
+    )
+
+    try:
+        system.cache.pickle(estimates_filename, item_names=LIST_OF_ESTIMATE_ITEM_NAMES)
+        with open(fingerprint_filename, "w") as file:
+            file.write(fingerprint)
+        data.log.msg("Pickled estimates to %s" % estimates_filename)
+        return success
+    except Exception as e:
+        data.log.warn(
+            "Couldn't save estimates to %s error %s" % (estimates_filename, e)
+        )
+        return failure
+
+
+def load_most_recent_estimates_state(
+    data,
+    system,
+    strategy_name: str,
+    max_age_days: float,
+    fingerprint: str = arg_not_supplied,
+):
+    """
+    Fill the cache of a system with estimates saved by store_estimates_state
+
+    :param data: data object, used to access the log
+    :param system: a system object which hasn't run yet
+    :param strategy_name: str
+    :param max_age_days: estimates older than this aren't used
+    :param fingerprint: from get_estimates_fingerprint; worked out now if not supplied
+
+    :return: success, or failure if no recent enough estimates for the same config and instruments
+    """
+    list_of_timestamps = get_list_of_estimates_timestamps_for_strategy(strategy_name)
+    if len(list_of_timestamps) == 0:
+        data.log.msg("No saved estimates for %s" % strategy_name)
+        return failure
+
+    # most recent last
+    datetime_marker = sorted(list_of_timestamps)[-1]
+    age = datetime.datetime.now() - from_marker_to_datetime(datetime_marker)
+    if age > datetime.timedelta(days=max_age_days):
+        data.log.msg(
+            "Saved estimates for %s from %s are more than %.1f days old"
+            % (strategy_name, datetime_marker, max_age_days)
+        )
+        return failure
+
+    if fingerprint is arg_not_supplied:
+        fingerprint = get_estimates_fingerprint(system)
+
+    saved_fingerprint = get_saved_estimates_fingerprint(strategy_name, datetime_marker)
+    if saved_fingerprint != fingerprint:
+        data.log.msg(
+            "Saved estimates for %s from %s are for a different config or list of instruments"
+            % (strategy_name, datetime_marker)
+        )
+        return failure
+
+    estimates_filename = get_estimates_pickle_filename(strategy_name, datetime_marker)
+    try:
+        system.cache.unpickle(estimates_filename)
+    except Exception as e:
+        data.log.warn(
+            "Couldn't load estimates from %s error %s" % (estimates_filename, e)
+        )
+        return failure
+
+    data.log.msg("Loaded estimates from %s" % estimates_filename)
+
+    return success
+
+
+def get_estimates_fingerprint(system) -> str:
+    """
+    Identifies the config and instruments the estimates are for, so we don't reuse them if either changes
+    """
+    config_as_dict = system.config.as_dict()
+    for element_name in CONFIG_ELEMENTS_NOT_IN_ESTIMATES_FINGERPRINT:
+        config_as_dict.pop(element_name, None)
+
+    instrument_list = sorted(system.get_instrument_list())
+    to_fingerprint = yaml.dump(
+        dict(config=config_as_dict, instrument_list=instrument_list), sort_keys=True
+    )
+
+    return hashlib.sha256(to_fingerprint.encode("utf-8")).hexdigest()
+
+
+def get_saved_estimates_fingerprint(strategy_name, datetime_marker) -> str:
+    fingerprint_filename = get_estimates_fingerprint_filename(
+        strategy_name, datetime_marker
+    )
+    try:
+        with open(fingerprint_filename, "r") as file:
+            return file.read()
+    except FileNotFoundError:
+        return missing_data
+
+
+def get_list_of_estimates_timestamps_for_strategy(strategy_name):
+    full_directory = get_estimates_directory_for_strategy(strategy_name)
+    if not os.path.exists(full_directory):
+        return []
+
+    list_of_files = files_with_extension_in_pathname(full_directory, PICKLE_EXT)
+    list_of_timestamps = [
+        rchop(file_name, ESTIMATES_FILE_SUFFIX) for file_name in list_of_files
+    ]
+    list_of_timestamps = [
+        timestamp for timestamp in list_of_timestamps if timestamp is not None
+    ]
+
+    return list_of_timestamps
+
+
+def get_estimates_pickle_filename(strategy_name, datetime_marker):
+    # eg
+    # '/home/rob/data/backtests/medium_speed_TF_carry/estimates/20200616_122543_estimates.pck'
+    full_directory = get_estimates_directory_for_strategy(strategy_name)
+
+    return os.path.join(full_directory, datetime_marker + ESTIMATES_SUFFIX)
+
+
+def get_estimates_fingerprint_filename(strategy_name, datetime_marker):
+    # eg
+    # '/home/rob/data/backtests/medium_speed_TF_carry/estimates/20200616_122543_estimates_fingerprint.txt'
+    full_directory = get_estimates_directory_for_strategy(strategy_name)
+
+    return os.path.join(full_directory, datetime_marker + ESTIMATES_FINGERPRINT_SUFFIX)
+
+
+def get_estimates_directory_for_strategy(strategy_name):
+    # eg '/home/rob/data/backtests/medium_speed_TF_carry/estimates'
+    full_directory = get_backtest_directory_for_strategy(strategy_name)
+
+    return os.path.join(full_directory, ESTIMATES_DIRECTORY)
+
+
+def ensure_estimates_directory_exists(strategy_name):
+    full_directory = get_estimates_directory_for_strategy(strategy_name)
+    os.makedirs(full_directory, exist_ok=True)
+
+
 def ensure_backtest_directory_exists(strategy_name):
     full_directory = get_backtest_directory_for_strategy(strategy_name)
     try:
@@ -96,6 +96,12 @@ class dataBroker(productionDataLayerGeneric):
 
     ## Methods
 
+    def add_callback_on_broker_order_status_change(self, callback):
+        self.broker_execution_stack_data.add_callback_on_order_status_change(callback)
+
+    def sleep_and_process_broker_messages(self, seconds: float):
+        self.broker_execution_stack_data.sleep_and_process_broker_messages(seconds)
+
     def get_list_of_contract_dates_for_instrument_code(self, instrument_code: str):
         return self.broker_futures_contract_data.get_list_of_contract_dates_for_instrument_code(instrument_code)
 
@@ -131,6 +137,33 @@ class dataBroker(productionDataLayerGeneric):
         broker_prices_raw = \
                 self.get_prices_at_frequency_for_contract_object(contract_object=contract_object,
                                                          frequency = frequency)
+
+        return self._apply_price_cleaning(broker_prices_raw,
+                                          frequency=frequency,
+                                          cleaning_config=cleaning_config)
+
+    def get_cleaned_prices_for_list_of_contracts_and_frequencies(
+        self, list_of_contracts_and_frequencies: list,
+            cleaning_config = arg_not_supplied
+    ):
+        """
+        :param list_of_contracts_and_frequencies: list of (futuresContract, Frequency)
+        :return: generator; each time some prices have arrived, yields list of (index in list, futuresContractPrices),
+           with missing_data if something went wrong
+        """
+        for list_of_prices in \
+                self.broker_futures_contract_price_data.get_prices_at_frequency_for_list_of_contract_objects(
+                    list_of_contracts_and_frequencies):
+            yield [(idx,
+                    self._apply_price_cleaning(broker_prices_raw,
+                                               frequency=list_of_contracts_and_frequencies[idx][1],
+                                               cleaning_config=cleaning_config))
+                   for idx, broker_prices_raw in list_of_prices]
+
+    def _apply_price_cleaning(self, broker_prices_raw: futuresContractPrices,
+                              frequency: Frequency,
+                              cleaning_config = arg_not_supplied) -> futuresContractPrices:
+
         daily_data = frequency is DAILY_PRICE_FREQ
         if broker_prices_raw is missing_data:
             return missing_data
@@ -201,16 +201,18 @@ class diagPrices(productionDataLayerGeneric):
     def get_dict_of_prices_for_contract_list(
         self, instrument_code: str, list_of_contract_date_str: list
     ) -> dictFuturesContractPrices:
-        dict_of_prices = {}
-        for contract_date_str in list_of_contract_date_str:
-            if contract_date_str is missing_contract:
-                continue
-            # Could blow up here if don't have prices for a contract??
-            contract = futuresContract(instrument_code, contract_date_str)
-            prices = self.get_merged_prices_for_contract_object(contract)
-            dict_of_prices[contract_date_str] = prices
-
-        dict_of_prices = dictFuturesContractPrices(dict_of_prices)
+        list_of_contract_date_str = [
+            contract_date_str
+            for contract_date_str in list_of_contract_date_str
+            if contract_date_str is not missing_contract
+        ]
+
+        # one read for all the contracts, if the data source supports it
+        dict_of_prices = (
+            self.db_futures_contract_price_data.get_merged_prices_for_contract_list(
+                instrument_code, list_of_contract_date_str
+            )
+        )
 
         return dict_of_prices
 
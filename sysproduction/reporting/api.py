@@ -52,6 +52,7 @@ from sysproduction.reporting.data.duplicate_remove_markets import (
     get_list_of_duplicate_market_tables,
     text_suggest_changes_to_duplicate_markets,
     get_remove_market_data,
+    data_for_markets_from_inputs,
     RemoveMarketData,
 )
 from sysproduction.reporting.data.pandl import (
@@ -104,7 +105,12 @@ class reportingApi(object):
         start_date: datetime.datetime = arg_not_supplied,
         start_period: str = arg_not_supplied,
         end_period: str = arg_not_supplied,
+        shared_cache: Cache = arg_not_supplied,
     ):
+        """
+        :param shared_cache: optional, to share inputs which don't depend on the report dates (eg the risk of every
+        instrument) with other reports; see sysproduction.reporting.report_inputs
+        """
 
         self._data = data
         self._calendar_days_back = calendar_days_back
@@ -113,6 +119,7 @@ class reportingApi(object):
         self._end_period = end_period
         self._start_period = start_period
         self._cache = Cache(self)
+        self._shared_cache = shared_cache
 
     def std_header(self, report_name: str):
         start_date = self.start_date
@@ -273,7 +280,7 @@ class reportingApi(object):
         return remove_market_data
 
     def _get_remove_market_data(self) -> RemoveMarketData:
-        return get_remove_market_data(self.data)
+        return get_remove_market_data(self.data, mkt_data=self.data_for_markets())
 
     ## DUPLICATE MARKETS
     def body_text_suggest_changes_to_duplicate_markets(self) -> body_text:
@@ -298,11 +305,23 @@ class reportingApi(object):
         return list_of_duplicate_market_tables
 
     def _get_list_of_duplicate_market_tables(self) -> list:
-        return get_list_of_duplicate_market_tables(self.data)
+        return get_list_of_duplicate_market_tables(
+            self.data, mkt_data=self.data_for_markets()
+        )
+
+    def data_for_markets(self) -> tuple:
+        return data_for_markets_from_inputs(
+            self.SR_costs(),
+            liquidity_data=self.raw_liquidity_data(),
+            risk_data=self.instrument_risk_data_all_instruments(),
+        )
 
     ### MINIMUM CAPITAL
     def table_of_minimum_capital(self) -> table:
-        min_capital = minimum_capital_table(self.data)
+        min_capital = minimum_capital_table(
+            self.data,
+            instrument_risk_table=self.instrument_risk_data_all_instruments(),
+        )
         min_capital = min_capital.sort_values("minimum_capital")
 
         min_capital = nice_format_min_capital_table(min_capital)
@@ -738,15 +757,7 @@ class reportingApi(object):
         return instrument_risk_data
 
     def instrument_risk_data_all_instruments(self) -> pd.DataFrame:
-        instrument_risk_all = getattr(
-            self, "_instrument_risk_all_instruments", missing_data
-        )
-        if instrument_risk_all is missing_data:
-            instrument_risk_all = (
-                self._instrument_risk_all_instruments
-            ) = self._get_instrument_risk_all_instruments()
-
-        return instrument_risk_all
+        return self.shared_cache.get(self._get_instrument_risk_all_instruments)
 
     def _get_instrument_risk_all_instruments(self):
         instrument_risk_all = get_instrument_risk_table(
@@ -822,7 +833,16 @@ class reportingApi(object):
         return liquidity
 
     def _get_liquidity_data(self) -> pd.DataFrame:
-        return get_liquidity_report_data(self.data)
+        ## copy as we change the index, and the raw data can be shared
+        raw_liquidity_data = self.raw_liquidity_data().copy()
+
+        return annonate_df_index_with_positions_held(self.data, raw_liquidity_data)
+
+    def raw_liquidity_data(self) -> pd.DataFrame:
+        return self.shared_cache.get(self._get_raw_liquidity_data)
+
+    def _get_raw_liquidity_data(self) -> pd.DataFrame:
+        return get_liquidity_data_df(self.data)
 
     ##### COSTS ######
     def table_of_sr_costs(self, commission_only=False):
@@ -838,12 +858,12 @@ class reportingApi(object):
         return formatted_table
 
     def SR_costs(self) -> pd.DataFrame:
-        return self.cache.get(
+        return self.shared_cache.get(
             self._SR_costs, include_spread=True, include_commission=True
         )
 
     def SR_costs_commission_only(self) -> pd.DataFrame:
-        return self.cache.get(
+        return self.shared_cache.get(
             self._SR_costs, include_spread=False, include_commission=True
         )
 
@@ -1064,12 +1084,14 @@ class reportingApi(object):
     def cache(self) -> Cache:
         return self._cache
 
+    @property
+    def shared_cache(self) -> Cache:
+        ## only for things which don't depend on the dates of the report
+        shared_cache = self._shared_cache
+        if shared_cache is arg_not_supplied:
+            return self.cache
 
-def get_liquidity_report_data(data: dataBlob) -> pd.DataFrame:
-    all_liquidity_df = get_liquidity_data_df(data)
-    all_liquidity_df = annonate_df_index_with_positions_held(data, all_liquidity_df)
-
-    return all_liquidity_df
+        return shared_cache
 
 
 def filter_data_for_delays_and_return_table(
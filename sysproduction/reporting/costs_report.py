@@ -1,4 +1,5 @@
 from sysdata.data_blob import dataBlob
+from syscore.cache import Cache
 
 from syscore.objects import header, table, arg_not_supplied, body_text
 from sysproduction.reporting.api import reportingApi
@@ -9,7 +10,8 @@ COSTS_REPORT_TEXT = body_text(
 
 def costs_report(
     data: dataBlob = arg_not_supplied,
-        calendar_days_back = 250
+        calendar_days_back = 250,
+    reporting_cache: Cache = arg_not_supplied
 
 
 ):
@@ -19,7 +21,8 @@ def costs_report(
 
     reporting_api = reportingApi(
         data,
-        calendar_days_back=calendar_days_back
+        calendar_days_back=calendar_days_back,
+        shared_cache=reporting_cache
     )
 
     formatted_output = []
@@ -2,7 +2,7 @@ import numpy as np
 import pandas as pd
 from dataclasses import dataclass
 
-from syscore.objects import missing_data, named_object
+from syscore.objects import arg_not_supplied, missing_data, named_object
 from sysdata.config.instruments import generate_matching_duplicate_dict
 from sysdata.config.production_config import get_production_config
 from sysproduction.reporting.data.constants import MAX_SR_COST, MIN_VOLUME_CONTRACTS_DAILY, MIN_VOLUME_RISK_DAILY, BAD_THRESHOLD
@@ -208,14 +208,16 @@ class RemoveMarketData:
         min_ann_perc_std = from_auto_parameters_to_min_ann_perc_std(self.auto_parameters)
         return min_ann_perc_std
 
-def get_remove_market_data(data) -> RemoveMarketData:
+def get_remove_market_data(data, mkt_data: tuple = arg_not_supplied) -> RemoveMarketData:
     existing_bad_markets = get_existing_bad_markets(data)
 
     max_cost, min_volume_contracts, min_volume_risk, \
              = get_bad_market_filter_parameters()
 
     auto_parameters = get_auto_population_parameters()
-    SR_costs, liquidity_data, risk_data = get_data_for_markets(data)
+    if mkt_data is arg_not_supplied:
+        mkt_data = get_data_for_markets(data)
+    SR_costs, liquidity_data, risk_data = mkt_data
 
 
     return RemoveMarketData(
@@ -232,10 +234,11 @@ def get_remove_market_data(data) -> RemoveMarketData:
 
         )
 
-def get_list_of_duplicate_market_tables(data):
+def get_list_of_duplicate_market_tables(data, mkt_data: tuple = arg_not_supplied):
     filters = get_bad_market_filter_parameters()
     duplicate_dict = generate_matching_duplicate_dict(config=data.config)
-    mkt_data = get_data_for_markets(data)
+    if mkt_data is arg_not_supplied:
+        mkt_data = get_data_for_markets(data)
     duplicates = [
         table_of_duplicate_markets_for_dict_entry(mkt_data, dict_entry, filters)
         for dict_entry in duplicate_dict.values()
@@ -290,10 +293,18 @@ def from_auto_parameters_to_min_ann_perc_std(auto_parameters: parametersForAutoP
 
 def get_data_for_markets(data):
     SR_costs = get_table_of_SR_costs(data)
-    SR_costs = SR_costs.dropna()
     liquidity_data = get_liquidity_data_df(data)
     risk_data = get_instrument_risk_table(data, only_held_instruments=False)
 
+    return data_for_markets_from_inputs(SR_costs, liquidity_data=liquidity_data, risk_data=risk_data)
+
+
+def data_for_markets_from_inputs(SR_costs: pd.DataFrame,
+                                 liquidity_data: pd.DataFrame,
+                                 risk_data: pd.DataFrame) -> tuple:
+    ## the inputs can be shared with other reports, so we don't change them
+    SR_costs = SR_costs.dropna()
+
     return SR_costs, liquidity_data, risk_data
 
 
@@ -174,7 +174,7 @@ class pandlCalculateAndStore(object):
     def get_period_perc_pandl_for_instrument_all_strategies_in_date_range(
         self, instrument_code: str
     ) -> float:
-        print("Getting p&l for %s" % instrument_code)
+        self.data.log.msg("Getting p&l for %s" % instrument_code)
 
         pandl_across_contracts = self.pandl_for_instrument_across_contracts(
             instrument_code
@@ -212,7 +212,11 @@ class pandlCalculateAndStore(object):
     ) -> pd.DataFrame:
         ## can return missing contract
         pandl_df_all_data = get_df_of_perc_pandl_series_for_instrument_all_strategies_across_contracts_in_date_range(
-            self.data, instrument_code, self.start_date, self.end_date
+            self.data,
+            instrument_code,
+            self.start_date,
+            self.end_date,
+            capital=self.total_capital_series,
         )
         if pandl_df_all_data is missing_contract:
             return missing_contract
@@ -222,7 +226,7 @@ class pandlCalculateAndStore(object):
         return pandl_df
 
     def get_period_perc_pandl_for_strategy_in_date_range(self, strategy_name: str):
-        print("Getting p&l for %s" % strategy_name)
+        self.data.log.msg("Getting p&l for %s" % strategy_name)
         pandl_df = self.get_df_of_perc_pandl_series_for_strategy_all_instruments(
             strategy_name
         )
@@ -294,7 +298,7 @@ class pandlCalculateAndStore(object):
     ):
 
         pandl_series = get_perc_pandl_series_for_strategy_instrument_vs_total_capital(
-            self.data, instrument_strategy
+            self.data, instrument_strategy, capital=self.total_capital_series
         )
 
         return pandl_series
@@ -306,15 +310,23 @@ class pandlCalculateAndStore(object):
             store = self._strategy_pandl_store = {}
         return store
 
+    @property
+    def total_capital_series(self) -> pd.Series:
+        ## same for every instrument and contract, so only read it once
+        capital = getattr(self, "_total_capital_series", missing_data)
+        if capital is missing_data:
+            capital = self._total_capital_series = get_total_capital_series(self.data)
+        return capital
+
 
 def get_df_of_perc_pandl_series_for_instrument_all_strategies_across_contracts_in_date_range(
-    data, instrument_code, start_date, end_date
+    data, instrument_code, start_date, end_date, capital: pd.Series = arg_not_supplied
 ):
     (
         contract_list,
         pandl_list,
     ) = get_list_of_perc_pandl_series_for_instrument_all_strategies_across_contracts_in_date_range(
-        data, instrument_code, start_date, end_date
+        data, instrument_code, start_date, end_date, capital=capital
     )
 
     if contract_list is missing_data:
@@ -327,7 +339,7 @@ def get_df_of_perc_pandl_series_for_instrument_all_strategies_across_contracts_i
 
 
 def get_list_of_perc_pandl_series_for_instrument_all_strategies_across_contracts_in_date_range(
-    data, instrument_code, start_date, end_date
+    data, instrument_code, start_date, end_date, capital: pd.Series = arg_not_supplied
 ):
     contract_list = get_list_of_contracts_held_for_an_instrument_in_date_range(
         data, instrument_code, start_date, end_date
@@ -335,8 +347,21 @@ def get_list_of_perc_pandl_series_for_instrument_all_strategies_across_contracts
     if len(contract_list) == 0:
         return missing_data, missing_data
 
+    ## these are the same for every contract
+    if capital is arg_not_supplied:
+        capital = get_total_capital_series(data)
+    fx = get_fx_series_for_instrument(data, instrument_code)
+    value_per_point = diagInstruments(data).get_point_size(instrument_code)
+
     pandl_list = [
-        get_perc_pandl_series_for_contract(data, instrument_code, contract_id)
+        get_perc_pandl_series_for_contract(
+            data,
+            instrument_code,
+            contract_id,
+            capital=capital,
+            fx=fx,
+            value_per_point=value_per_point,
+        )
         for contract_id in contract_list
     ]
 
@@ -364,12 +389,22 @@ def get_list_of_instruments_held_for_a_strategy(data, strategy_name):
     return instrument_list
 
 
-def get_perc_pandl_series_for_contract(data, instrument_code, contract_id):
+def get_perc_pandl_series_for_contract(
+    data,
+    instrument_code,
+    contract_id,
+    capital: pd.Series = arg_not_supplied,
+    fx: pd.Series = arg_not_supplied,
+    value_per_point: float = arg_not_supplied,
+):
 
-    capital = get_total_capital_series(data)
-    fx = get_fx_series_for_instrument(data, instrument_code)
-    diag_instruments = diagInstruments(data)
-    value_per_point = diag_instruments.get_point_size(instrument_code)
+    if capital is arg_not_supplied:
+        capital = get_total_capital_series(data)
+    if fx is arg_not_supplied:
+        fx = get_fx_series_for_instrument(data, instrument_code)
+    if value_per_point is arg_not_supplied:
+        diag_instruments = diagInstruments(data)
+        value_per_point = diag_instruments.get_point_size(instrument_code)
 
     positions = get_position_series_for_contract(data, instrument_code, contract_id)
     prices = get_price_series_for_contract(data, instrument_code, contract_id)
@@ -390,13 +425,13 @@ def get_perc_pandl_series_for_contract(data, instrument_code, contract_id):
 
 
 def get_perc_pandl_series_for_strategy_instrument_vs_total_capital(
-    data, instrument_strategy: instrumentStrategy
+    data, instrument_strategy: instrumentStrategy, capital: pd.Series = arg_not_supplied
 ):
-    print("Data for %s" % (instrument_strategy))
     instrument_code = instrument_strategy.instrument_code
     strategy_name = instrument_strategy.strategy_name
 
-    capital = get_total_capital_series(data)
+    if capital is arg_not_supplied:
+        capital = get_total_capital_series(data)
     fx = get_fx_series_for_instrument(data, instrument_code)
 
     diag_instruments = diagInstruments(data)
@@ -57,11 +57,14 @@ def minimum_capital_table(data,
                           risk_target =RISK_TARGET_ASSUMED,
                           min_contracts_held =MIN_CONTRACTS_HELD,
                           idm =IDM_ASSUMED,
-                          instrument_weight =INSTRUMENT_WEIGHT_ASSUMED
+                          instrument_weight =INSTRUMENT_WEIGHT_ASSUMED,
+                          instrument_risk_table: pd.DataFrame = arg_not_supplied
                           ) -> pd.DataFrame:
 
-    instrument_risk_table = get_instrument_risk_table(data,
-                                                      only_held_instruments=only_held_instruments)
+    ## instrument_risk_table can be passed if we already have it
+    if instrument_risk_table is arg_not_supplied:
+        instrument_risk_table = get_instrument_risk_table(data,
+                                                          only_held_instruments=only_held_instruments)
 
     min_capital_pd = from_risk_table_to_min_capital(instrument_risk_table,
                                                  risk_target=risk_target,
@@ -1,4 +1,5 @@
 from sysdata.data_blob import dataBlob
+from syscore.cache import Cache
 
 from syscore.objects import arg_not_supplied, body_text
 from sysproduction.reporting.api import reportingApi
@@ -7,6 +8,7 @@ HEADER_TEXT = body_text("List of duplicate markets eg mini and micro, or dual li
 
 def duplicate_market_report(
     data: dataBlob = arg_not_supplied,
+    reporting_cache: Cache = arg_not_supplied
 
 
 ):
@@ -15,7 +17,8 @@ def duplicate_market_report(
         data = dataBlob()
 
     reporting_api = reportingApi(
-        data
+        data,
+        shared_cache=reporting_cache
     )
 
     formatted_output = []
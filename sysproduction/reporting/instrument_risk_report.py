@@ -1,4 +1,5 @@
 from sysdata.data_blob import dataBlob
+from syscore.cache import Cache
 
 from syscore.objects import header, table, arg_not_supplied, body_text
 from sysproduction.reporting.api import reportingApi
@@ -15,6 +16,7 @@ HEADER_TEXT = body_text("Risk calculation for different instruments, columns as
 
 def instrument_risk_report(
     data: dataBlob = arg_not_supplied,
+    reporting_cache: Cache = arg_not_supplied
 
 
 ):
@@ -23,7 +25,8 @@ def instrument_risk_report(
         data = dataBlob()
 
     reporting_api = reportingApi(
-        data
+        data,
+        shared_cache=reporting_cache
     )
 
     formatted_output = []
@@ -5,6 +5,7 @@ import datetime
 from syscore.objects import header, table, body_text, arg_not_supplied
 
 from sysdata.data_blob import dataBlob
+from syscore.cache import Cache
 
 from sysproduction.reporting.api import reportingApi
 
@@ -14,14 +15,15 @@ LIQUIDITY_TEXT = body_text("This report reports on the liquidity of various futu
                  "It's recommended that the minimum volume a retail trader considers is 100 contracts or $1.5m per day"+
                  "(*) indicates a position currently held in my own trading system")
 
-def liquidity_report(data: dataBlob = arg_not_supplied):
+def liquidity_report(data: dataBlob = arg_not_supplied,
+                     reporting_cache: Cache = arg_not_supplied):
     if data is arg_not_supplied:
         data = dataBlob()
 
     if data is arg_not_supplied:
         data = dataBlob()
 
-    reporting_api = reportingApi(data)
+    reporting_api = reportingApi(data, shared_cache=reporting_cache)
     formatted_output = []
     formatted_output.append(reporting_api.terse_header("Liquidity report"))
     formatted_output.append(LIQUIDITY_TEXT)
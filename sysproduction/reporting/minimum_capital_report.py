@@ -1,4 +1,5 @@
 from sysdata.data_blob import dataBlob
+from syscore.cache import Cache
 
 from syscore.objects import header, table, arg_not_supplied, body_text
 from sysproduction.reporting.api import reportingApi
@@ -18,6 +19,7 @@ HEADER_TEXT = body_text("The following report calculates the minimum capital for
 
 def minimum_capital_report(
     data: dataBlob = arg_not_supplied,
+    reporting_cache: Cache = arg_not_supplied
 
 
 ):
@@ -26,7 +28,8 @@ def minimum_capital_report(
         data = dataBlob()
 
     reporting_api = reportingApi(
-        data
+        data,
+        shared_cache=reporting_cache
     )
 
     formatted_output = []
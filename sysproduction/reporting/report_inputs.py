@@ -0,0 +1,132 @@
+"""
+Inputs which more than one report needs, eg the risk of every instrument, and which take a while to work out
+
+When run_reports runs a batch of reports they share a cache, so each of these inputs is only calculated once. The
+first time a report is run we also start calculating all the inputs the configured reports will need, in a pool of
+threads in the background. A report which needs an input that is still being calculated waits for it.
+
+The cache only lasts for one pass through the reports: when a report runs again, we start again with a new cache,
+so a long running process doesn't keep using old data.
+
+Only inputs which don't depend on the dates of a report can go in here.
+"""
+
+import threading
+
+from syscore.cache import Cache
+from sysdata.data_blob import dataBlob
+from sysdata.sim.sim_data import dict_of_reads_in_parallel, DEFAULT_NUMBER_OF_READ_THREADS
+
+from sysproduction.reporting.api import reportingApi
+
+## reportingApi methods
+SR_COSTS = "SR_costs"
+SR_COSTS_COMMISSION_ONLY = "SR_costs_commission_only"
+RAW_LIQUIDITY_DATA = "raw_liquidity_data"
+INSTRUMENT_RISK_ALL_INSTRUMENTS = "instrument_risk_data_all_instruments"
+
+DATA_FOR_MARKETS = [SR_COSTS, RAW_LIQUIDITY_DATA, INSTRUMENT_RISK_ALL_INSTRUMENTS]
+
+## keys are report functions, as in reportConfig
+SHARED_INPUTS_FOR_REPORT_FUNCTIONS = {
+    "sysproduction.reporting.costs_report.costs_report": [
+        SR_COSTS,
+        SR_COSTS_COMMISSION_ONLY,
+    ],
+    "sysproduction.reporting.liquidity_report.liquidity_report": [RAW_LIQUIDITY_DATA],
+    "sysproduction.reporting.instrument_risk_report.instrument_risk_report": [
+        INSTRUMENT_RISK_ALL_INSTRUMENTS
+    ],
+    "sysproduction.reporting.minimum_capital_report.minimum_capital_report": [
+        INSTRUMENT_RISK_ALL_INSTRUMENTS
+    ],
+    "sysproduction.reporting.duplicate_market_report.duplicate_market_report": DATA_FOR_MARKETS,
+    "sysproduction.reporting.remove_markets_report.remove_markets_report": DATA_FOR_MARKETS,
+}
+
+
+class sharedReportInputs(object):
+    def __init__(
+        self,
+        list_of_report_configs: list,
+        n_threads: int = DEFAULT_NUMBER_OF_READ_THREADS,
+    ):
+        self._list_of_inputs = list_of_shared_inputs_for_reports(list_of_report_configs)
+        self._n_threads = n_threads
+        self._lock = threading.Lock()
+        self._start_new_pass()
+
+    @property
+    def cache(self) -> Cache:
+        return self._cache
+
+    def cache_for_report(self, report_name: str) -> Cache:
+        """
+        Call as each report starts: begins a new pass if this report has already run in this one, and the
+        first time in each pass starts working out what all the reports need in the background
+
+        :returns: the cache for this pass
+        """
+        with self._lock:
+            if report_name in self._reports_run_this_pass:
+                ## anything still being calculated for the last pass goes in the old cache
+                self._start_new_pass()
+            self._reports_run_this_pass.append(report_name)
+            cache = self.cache
+
+        self.start_calculating()
+
+        return cache
+
+    def _start_new_pass(self):
+        self._cache = Cache(self)
+        self._reports_run_this_pass = []
+        self._started = False
+
+    @property
+    def list_of_inputs(self) -> list:
+        return self._list_of_inputs
+
+    def start_calculating(self):
+        ## Only the first time; the reports get on with it whilst we do this
+        with self._lock:
+            if self._started:
+                return None
+            self._started = True
+
+        thread = threading.Thread(
+            target=self.calculate_all_inputs, args=(self.cache,), daemon=True
+        )
+        thread.start()
+
+    def calculate_all_inputs(self, cache: Cache):
+        dict_of_reads_in_parallel(
+            lambda input_name: self._calculate_input(input_name, cache=cache),
+            self.list_of_inputs,
+            n_threads=self._n_threads,
+        )
+
+    def _calculate_input(self, input_name: str, cache: Cache):
+        ## each thread needs its own connections
+        data = dataBlob(log_name="Reporting input %s" % input_name)
+        reporting_api = reportingApi(data, shared_cache=cache)
+        try:
+            getattr(reporting_api, input_name)()
+        except Exception as e:
+            ## the report will try again, and deal with the error
+            data.log.warn("Couldn't calculate %s for reports: %s" % (input_name, str(e)))
+        finally:
+            data.close()
+
+
+def list_of_shared_inputs_for_reports(list_of_report_configs: list) -> list:
+    list_of_inputs = []
+    for report_config in list_of_report_configs:
+        inputs_for_report = SHARED_INPUTS_FOR_REPORT_FUNCTIONS.get(
+            report_config.function, []
+        )
+        for input_name in inputs_for_report:
+            if input_name not in list_of_inputs:
+                list_of_inputs.append(input_name)
+
+    return list_of_inputs
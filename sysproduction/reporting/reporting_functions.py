@@ -1,11 +1,13 @@
 from PyPDF2 import PdfMerger
 import datetime
+import inspect
 import pandas as pd
 import os
 import shutil
 import matplotlib.pyplot as plt
 from matplotlib.backends.backend_pdf import PdfPages
 
+from syscore.cache import Cache
 from syscore.objects import resolve_function, arg_not_supplied, missing_data
 from syscore.objects import header, table, body_text, figure
 from syscore.fileutils import get_resolved_pathname
@@ -39,20 +41,23 @@ class ParsedReport(object):
         return self._pdf_filename
 
 def run_report(report_config: reportConfig,
-               data: dataBlob = arg_not_supplied):
+               data: dataBlob = arg_not_supplied,
+               reporting_cache: Cache = arg_not_supplied):
     """
 
     :param report_config:
+    :param reporting_cache: optional, shared with other reports (see sysproduction.reporting.report_inputs)
     :return:
     """
     pandas_display_for_reports()
     if data is arg_not_supplied:
         data = dataBlob(log_name="Reporting %s" % report_config.title)
 
-    run_report_with_data_blob(report_config, data)
+    run_report_with_data_blob(report_config, data, reporting_cache=reporting_cache)
 
 
-def run_report_with_data_blob(report_config: reportConfig, data: dataBlob):
+def run_report_with_data_blob(report_config: reportConfig, data: dataBlob,
+                              reporting_cache: Cache = arg_not_supplied):
     """
 
     :param report_config:
@@ -62,7 +67,8 @@ def run_report_with_data_blob(report_config: reportConfig, data: dataBlob):
     data.log.msg("Running report %s" % str(report_config))
 
     report_results = run_report_from_config(report_config = report_config,
-                                            data=data)
+                                            data=data,
+                                            reporting_cache=reporting_cache)
     parsed_report = parse_report_results(data = data,
                                          report_results = report_results)
 
@@ -72,16 +78,30 @@ def run_report_with_data_blob(report_config: reportConfig, data: dataBlob):
 
 
 def run_report_from_config(report_config: reportConfig,
-                           data: dataBlob) -> list:
+                           data: dataBlob,
+                           reporting_cache: Cache = arg_not_supplied) -> list:
 
     report_function = resolve_function(report_config.function)
     report_kwargs = report_config.kwargs
+    if reporting_cache is not arg_not_supplied and \
+            report_function_takes_reporting_cache(report_function):
+        report_kwargs = dict(report_kwargs, reporting_cache=reporting_cache)
 
     report_results = report_function(data, **report_kwargs)
 
     return report_results
 
 
+def report_function_takes_reporting_cache(report_function) -> bool:
+    ## not all do, eg reports in private code
+    parameters = inspect.signature(report_function).parameters
+
+    return REPORTING_CACHE_ARG_NAME in parameters
+
+
+REPORTING_CACHE_ARG_NAME = "reporting_cache"
+
+
 def parse_report_results(data: dataBlob, report_results: list) -> ParsedReport:
     """
     Parse report results into human readable text for display, email, or christmas present
@@ -20,29 +20,50 @@ def get_list_of_timer_functions_for_reports(data):
     data_reports = dataReports(data)
     all_configs = data_reports.get_report_configs_to_run()
 
+    ## inputs needed by several reports are only calculated once
+    shared_report_inputs = sharedReportInputs(list(all_configs.values()))
+
     for report_name, report_config in all_configs.items():
         data_for_report = dataBlob(log_name=report_name)
-        report_object = runReport(data_for_report, report_config, report_name)
+        report_object = runReport(
+            data_for_report,
+            report_config,
+            report_name,
+            shared_report_inputs=shared_report_inputs,
+        )
         report_tuple = (report_name, report_object)
         list_of_timer_names_and_functions.append(report_tuple)
 
     return list_of_timer_names_and_functions
 
 
+from syscore.objects import arg_not_supplied
 from sysproduction.reporting.reporting_functions import run_report
+from sysproduction.reporting.report_inputs import sharedReportInputs
 
 
 class runReport(object):
-    def __init__(self, data, config, report_function):
+    def __init__(self, data, config, report_function,
+                 shared_report_inputs: sharedReportInputs = arg_not_supplied):
         self.data = data
         self.config = config
+        self.report_name = report_function
+        self.shared_report_inputs = shared_report_inputs
 
         # run process expects a method with same name as log name
         setattr(self, report_function, self.run_generic_report)
 
     def run_generic_report(self):
         ## Will be renamed
-        run_report(self.config, data=self.data)
+        shared_report_inputs = self.shared_report_inputs
+        if shared_report_inputs is arg_not_supplied:
+            run_report(self.config, data=self.data)
+            return None
+
+        ## first report to run in each pass starts working out what the others need, in the background
+        reporting_cache = shared_report_inputs.cache_for_report(self.report_name)
+        run_report(self.config, data=self.data,
+                   reporting_cache=reporting_cache)
 
 
 if __name__ == '__main__':
@@ -1,19 +1,43 @@
 from syscontrol.run_process import processToRun
+from syscontrol.process_events import processEvents
 from sysexecution.stack_handler.stack_handler import stackHandler
 from sysdata.data_blob import dataBlob
 
+NEW_INSTRUMENT_ORDERS = "new_instrument_orders"
+NEW_CONTRACT_ORDERS = "new_contract_orders"
+BROKER_ORDER_STATUS_CHANGE = "broker_order_status_change"
+
+# These run as soon as the event happens, as well as on their usual timer
+METHODS_TO_RUN_ON_EVENTS = {
+    NEW_INSTRUMENT_ORDERS: ["spawn_children_from_new_instrument_orders"],
+    NEW_CONTRACT_ORDERS: ["create_broker_orders_from_contract_orders"],
+    BROKER_ORDER_STATUS_CHANGE: ["process_fills_stack", "handle_completed_orders"],
+}
+
 
 def run_stack_handler():
     process_name = "run_stack_handler"
     data = dataBlob(log_name=process_name)
-    list_of_timer_names_and_functions = get_list_of_timer_functions_for_stack_handler()
-    price_process = processToRun(process_name, data, list_of_timer_names_and_functions)
+    stack_handler = stackHandler(dataBlob(log_name="stack_handler"))
+    list_of_timer_names_and_functions = get_list_of_timer_functions_for_stack_handler(
+        stack_handler
+    )
+    process_events = get_process_events_for_stack_handler(stack_handler)
+    price_process = processToRun(
+        process_name,
+        data,
+        list_of_timer_names_and_functions,
+        process_events=process_events,
+        dict_of_methods_to_run_on_events=METHODS_TO_RUN_ON_EVENTS,
+    )
     price_process.run_process()
 
 
-def get_list_of_timer_functions_for_stack_handler():
-    stack_handler_data = dataBlob(log_name="stack_handler")
-    stack_handler = stackHandler(stack_handler_data)
+def get_list_of_timer_functions_for_stack_handler(stack_handler: stackHandler = None):
+    if stack_handler is None:
+        stack_handler_data = dataBlob(log_name="stack_handler")
+        stack_handler = stackHandler(stack_handler_data)
+
     list_of_timer_names_and_functions = [
         ("check_external_position_break", stack_handler),
         ("spawn_children_from_new_instrument_orders", stack_handler),
@@ -28,5 +52,29 @@ def get_list_of_timer_functions_for_stack_handler():
     return list_of_timer_names_and_functions
 
 
+def get_process_events_for_stack_handler(stack_handler: stackHandler) -> processEvents:
+    data_broker = stack_handler.data_broker
+
+    ## whilst we wait, the broker can call us back
+    process_events = processEvents(
+        sleep_function=data_broker.sleep_and_process_broker_messages
+    )
+    data_broker.add_callback_on_broker_order_status_change(
+        lambda: process_events.publish(BROKER_ORDER_STATUS_CHANGE)
+    )
+
+    ## other processes can't, so we look for new orders
+    process_events.add_poller(
+        stack_handler.instrument_stack.get_current_max_order_id,
+        event_name=NEW_INSTRUMENT_ORDERS,
+    )
+    process_events.add_poller(
+        stack_handler.contract_stack.get_current_max_order_id,
+        event_name=NEW_CONTRACT_ORDERS,
+    )
+
+    return process_events
+
+
 if __name__ == '__main__':
     run_stack_handler()
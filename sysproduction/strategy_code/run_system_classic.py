@@ -6,10 +6,16 @@ this:
 - gets the final positions and position buffers
 - writes these into a table (earmarked with a strategy name)
 
+If incremental is True, slow estimates (forecast scalars, forecast and instrument weights, diversification
+multipliers) from the last full run are reused rather than estimated again, so only the per instrument
+calculations are redone with the new prices. A full run is done if the saved estimates are more than
+max_estimate_age_days old, or were made with a different config or list of instruments.
+
 
 """
 
-from syscore.objects import arg_not_supplied, missing_data
+from syscore.genutils import str2Bool
+from syscore.objects import arg_not_supplied, missing_data, success
 
 from sysdata.config.configdata import Config
 from sysdata.data_blob import dataBlob
@@ -23,7 +29,12 @@ from sysproduction.data.contracts import dataContracts
 from sysproduction.data.positions import dataOptimalPositions
 from sysproduction.data.sim_data import get_sim_data_object_for_production
 
-from sysproduction.data.backtest import store_backtest_state
+from sysproduction.data.backtest import (
+    store_backtest_state,
+    store_estimates_state,
+    load_most_recent_estimates_state,
+    get_estimates_fingerprint,
+)
 
 from syslogdiag.log_to_screen import logtoscreen
 
@@ -37,6 +48,8 @@ class runSystemClassic(object):
         data: dataBlob,
         strategy_name: str,
         backtest_config_filename=arg_not_supplied,
+        incremental: bool = False,
+        max_estimate_age_days: float = 7,
     ):
 
         if backtest_config_filename is arg_not_supplied:
@@ -45,6 +58,8 @@ class runSystemClassic(object):
         self.data = data
         self.strategy_name = strategy_name
         self.backtest_config_filename = backtest_config_filename
+        self.incremental = str2Bool(incremental)
+        self.max_estimate_age_days = float(max_estimate_age_days)
 
     ## DO NOT CHANGE THE NAME OF THIS FUNCTION
     def run_backtest(self):
@@ -58,6 +73,12 @@ class runSystemClassic(object):
             base_currency=base_currency,
         )
 
+        ## worked out before the system runs, so it compares like with like
+        estimates_fingerprint = self._estimates_fingerprint_if_incremental(system)
+        estimates_loaded = self._load_estimates_if_incremental(
+            system, fingerprint=estimates_fingerprint
+        )
+
         function_to_call_on_update = self.function_to_call_on_update
         function_to_call_on_update(data=data,
                                    strategy_name =strategy_name,
@@ -65,6 +86,42 @@ class runSystemClassic(object):
 
         store_backtest_state(data, system, strategy_name=strategy_name)
 
+        if self.incremental and not estimates_loaded:
+            # this was a full run, so the estimates are fresh
+            store_estimates_state(
+                data,
+                system,
+                strategy_name=strategy_name,
+                fingerprint=estimates_fingerprint,
+            )
+
+    def _estimates_fingerprint_if_incremental(self, system: System):
+        if not self.incremental:
+            return arg_not_supplied
+
+        return get_estimates_fingerprint(system)
+
+    def _load_estimates_if_incremental(
+        self, system: System, fingerprint: str = arg_not_supplied
+    ) -> bool:
+        if not self.incremental:
+            return False
+
+        result = load_most_recent_estimates_state(
+            self.data,
+            system,
+            strategy_name=self.strategy_name,
+            max_age_days=self.max_estimate_age_days,
+            fingerprint=fingerprint,
+        )
+        if result is success:
+            self.data.log.msg("Incremental run: reusing saved estimates")
+            return True
+
+        self.data.log.msg("Incremental run: no recent estimates, doing a full run")
+
+        return False
+
     ## MODIFY THIS WHEN INHERITING FOR A DIFFERENT STRATEGY
     ## ARGUMENTS MUST BE: data: dataBlob, strategy_name: str, system: System
     @property
@@ -49,6 +49,13 @@ def update_historical_prices_with_data(data: dataBlob,
     cleaning_config = get_config_for_price_filtering(data)
     price_data = diagPrices(data)
     list_of_codes_all = price_data.get_list_of_instruments_in_multiple_prices()
+
+    if not interactive_mode:
+        ## no need to wait for the user, so we can ask the broker for everything at once
+        update_historical_prices_for_list_of_instruments(list_of_codes_all, data,
+                                                         cleaning_config=cleaning_config)
+        return
+
     for instrument_code in list_of_codes_all:
         data.log.label(instrument_code=instrument_code)
         update_historical_prices_for_instrument(instrument_code, data,
@@ -56,6 +63,75 @@ def update_historical_prices_with_data(data: dataBlob,
                                                 interactive_mode = interactive_mode)
 
 
+def update_historical_prices_for_list_of_instruments(list_of_instrument_codes: list,
+                                                     data: dataBlob,
+                                                     cleaning_config: priceFilterConfig = arg_not_supplied):
+    """
+    Do a daily update for futures contract prices, using IB historical data
+
+    All the (contract, frequency) requests are made up front, so the broker can work on them concurrently;
+    we add prices as they arrive, and write merged prices for each contract once all its frequencies are in
+
+    :param list_of_instrument_codes: list of str
+    :param data: dataBlob
+    :return: success, even if we couldn't get prices for some contracts (these are reported as they arrive)
+    """
+    list_of_frequencies = get_list_of_frequencies_for_historical_download(data)
+    list_of_contracts = get_list_of_contracts_currently_sampling(list_of_instrument_codes, data)
+
+    list_of_contracts_and_frequencies = [(contract_object, frequency)
+                                         for contract_object in list_of_contracts
+                                         for frequency in list_of_frequencies]
+    frequencies_still_to_arrive = [len(list_of_frequencies)] * len(list_of_contracts)
+
+    broker_data_source = dataBroker(data)
+    for list_of_prices in broker_data_source.get_cleaned_prices_for_list_of_contracts_and_frequencies(
+            list_of_contracts_and_frequencies, cleaning_config=cleaning_config):
+        for idx, broker_prices in list_of_prices:
+            contract_object, frequency = list_of_contracts_and_frequencies[idx]
+            data.update_log(contract_object.specific_log(data.log))
+            add_prices_for_frequency(data,
+                                     contract_object,
+                                     frequency=frequency,
+                                     broker_prices=broker_prices,
+                                     cleaning_config=cleaning_config)
+
+            contract_idx = idx // len(list_of_frequencies)
+            frequencies_still_to_arrive[contract_idx] -= 1
+            if frequencies_still_to_arrive[contract_idx] == 0:
+                write_merged_prices_for_contract(data,
+                                                 contract_object=contract_object,
+                                                 list_of_frequencies=list_of_frequencies)
+
+    return success
+
+
+def get_list_of_contracts_currently_sampling(list_of_instrument_codes: list,
+                                             data: dataBlob) -> list:
+    diag_contracts = dataContracts(data)
+    list_of_contracts = []
+    for instrument_code in list_of_instrument_codes:
+        all_contracts_list = diag_contracts.get_all_contract_objects_for_instrument_code(
+            instrument_code
+        )
+        contract_list = all_contracts_list.currently_sampling()
+        if len(contract_list) == 0:
+            data.log.warn("No contracts marked for sampling for %s" % instrument_code)
+            continue
+
+        list_of_contracts = list_of_contracts + list(contract_list)
+
+    return list_of_contracts
+
+
+def get_list_of_frequencies_for_historical_download(data: dataBlob) -> list:
+    ## daily has to be last, see write_merged_prices_for_contract
+    diag_prices = diagPrices(data)
+    intraday_frequency = diag_prices.get_intraday_frequency_for_historical_download()
+
+    return [intraday_frequency, DAILY_PRICE_FREQ]
+
+
 def update_historical_prices_for_instrument(instrument_code: str,
                                             data: dataBlob,
                                             cleaning_config: priceFilterConfig = arg_not_supplied,
@@ -91,11 +167,7 @@ def update_historical_prices_for_instrument_and_contract(
         interactive_mode: bool = False
 ):
 
-    diag_prices = diagPrices(data)
-    intraday_frequency = diag_prices.get_intraday_frequency_for_historical_download()
-    daily_frequency = DAILY_PRICE_FREQ
-
-    list_of_frequencies = [intraday_frequency, daily_frequency]
+    list_of_frequencies = get_list_of_frequencies_for_historical_download(data)
 
     for frequency in list_of_frequencies:
         get_and_add_prices_for_frequency(
@@ -126,6 +198,22 @@ def get_and_add_prices_for_frequency(
         contract_object, frequency, cleaning_config = cleaning_config
     )
 
+    return add_prices_for_frequency(data,
+                                    contract_object,
+                                    frequency=frequency,
+                                    broker_prices=broker_prices,
+                                    cleaning_config=cleaning_config,
+                                    interactive_mode=interactive_mode)
+
+
+def add_prices_for_frequency(
+    data: dataBlob,
+    contract_object: futuresContract,
+    frequency: Frequency,
+    broker_prices: futuresContractPrices,
+    cleaning_config: priceFilterConfig,
+    interactive_mode: bool = False
+):
     if broker_prices is missing_data:
         print("Something went wrong with getting prices for %s to check" % str(contract_object))
         return failure
@@ -13,24 +13,25 @@ def assets_in_cluster_order(corr_matrix: correlationEstimate,
 def cluster_correlation_matrix(corr_matrix: correlationEstimate,
                                cluster_size: int = 2):
 
-    if corr_matrix.is_boring:
-        # Boring correlation will break if we try and cluster
-        corr_as_np = corr_matrix.values
-        clusters = arbitrary_split_of_correlation_matrix(
-            corr_as_np,
-            cluster_size=cluster_size
-        )
-    else:
-        clusters = get_list_of_clusters_for_non_boring_correlation_matrix(corr_matrix,
-                                                                          cluster_size=cluster_size)
+    clusters = cluster_index_for_correlation_values(corr_matrix.values,
+                                                    is_boring=corr_matrix.is_boring,
+                                                    cluster_size=cluster_size)
     clusters_as_names = from_cluster_index_to_asset_names(clusters, corr_matrix)
 
     return clusters_as_names
 
 
-def get_list_of_clusters_for_non_boring_correlation_matrix(corr_matrix: np.array,
-                                             cluster_size: int = 2) -> list:
-    corr_as_np = corr_matrix.values
+def cluster_index_for_correlation_values(corr_as_np: np.array,
+                                         is_boring: bool = False,
+                                         cluster_size: int = 2) -> list:
+    # cluster number for each asset, starting at 1
+    if is_boring:
+        # Boring correlation will break if we try and cluster
+        return arbitrary_split_of_correlation_matrix(
+            corr_as_np,
+            cluster_size=cluster_size
+        )
+
     try:
         clusters = get_list_of_clusters_for_correlation_matrix(
             corr_as_np,
@@ -44,6 +45,13 @@ def get_list_of_clusters_for_non_boring_correlation_matrix(corr_matrix: np.array
 
     return clusters
 
+
+def get_list_of_clusters_for_non_boring_correlation_matrix(corr_matrix: np.array,
+                                             cluster_size: int = 2) -> list:
+    return cluster_index_for_correlation_values(corr_matrix.values,
+                                                cluster_size=cluster_size)
+
+
 def get_list_of_clusters_for_correlation_matrix(corr_as_np: np.array,
                                              cluster_size: int = 2) -> list:
     d = sch.distance.pdist(corr_as_np)
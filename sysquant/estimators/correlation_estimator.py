@@ -10,6 +10,7 @@ from sysquant.estimators.correlations import (
 from sysquant.estimators.exponential_correlation import exponentialCorrelation
 from sysquant.fitting_dates import fitDates
 from sysquant.estimators.generic_estimator import genericEstimator
+from sysquant.estimators.incremental_correlation import correlationMomentsByBlock
 
 
 class correlationEstimator(genericEstimator):
@@ -21,7 +22,18 @@ class correlationEstimator(genericEstimator):
     def calculate_estimate_normally(self, fit_period: fitDates) -> correlationEstimate:
         data_for_correlation = self.data
         kwargs_for_estimator = self.kwargs_for_estimator
-        corr_matrix = correlation_estimator_for_subperiod(
+
+        ## rather than data[fit_start:fit_end].corr(), which goes over all the data again for every period
+        raw_corr_matrix_values = (
+            self.get_correlation_moments_by_block().correlation_for_period(
+                fit_period.fit_start, fit_period.fit_end
+            )
+        )
+        raw_corr_matrix = correlationEstimate(
+            raw_corr_matrix_values, data_for_correlation.columns
+        )
+        corr_matrix = clean_and_modify_correlation_for_subperiod(
+            raw_corr_matrix,
             data_for_correlation=data_for_correlation,
             fit_period=fit_period,
             **kwargs_for_estimator
@@ -29,6 +41,14 @@ class correlationEstimator(genericEstimator):
 
         return corr_matrix
 
+    def get_correlation_moments_by_block(self) -> correlationMomentsByBlock:
+        moments_by_block = getattr(self, "_stored_moments_by_block", None)
+        if moments_by_block is None:
+            moments_by_block = correlationMomentsByBlock(self.data)
+            self._stored_moments_by_block = moments_by_block
+
+        return moments_by_block
+
     def calculate_exponential_estimator_for_entire_dataset(
         self,
     ) -> exponentialCorrelation:
@@ -61,6 +81,30 @@ def correlation_estimator_for_subperiod(
 
     corr_matrix_values = subperiod_data.corr()
     corr_matrix = correlationEstimate(corr_matrix_values, data_for_correlation.columns)
+
+    return clean_and_modify_correlation_for_subperiod(
+        corr_matrix,
+        data_for_correlation=data_for_correlation,
+        fit_period=fit_period,
+        cleaning=cleaning,
+        floor_at_zero=floor_at_zero,
+        offdiag=offdiag,
+        clip=clip,
+        shrinkage=shrinkage,
+    )
+
+
+def clean_and_modify_correlation_for_subperiod(
+    corr_matrix: correlationEstimate,
+    data_for_correlation: pd.DataFrame,
+    fit_period: fitDates,
+    cleaning: bool = True,
+    floor_at_zero: bool = True,
+    offdiag: float = 0.99,
+    clip: float = arg_not_supplied,
+    shrinkage: float = 0.0,
+    **_ignored_kwargs
+) -> correlationEstimate:
     if cleaning:
         corr_matrix = corr_matrix.clean_corr_matrix_given_data(
             data_for_correlation=data_for_correlation,
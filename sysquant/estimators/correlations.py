@@ -293,18 +293,8 @@ def boring_corr_matrix_values(
     size: int, offdiag: float = 0.99, diag: float = 1.0
 ) -> np.array:
 
-    size_index = range(size)
-
-    def _od(i, j, offdiag, diag):
-        if i == j:
-            return diag
-        else:
-            return offdiag
-
-    corr_matrix_values_as_list = [
-        [_od(i, j, offdiag, diag) for i in size_index] for j in size_index
-    ]
-    corr_matrix_values = np.array(corr_matrix_values_as_list)
+    corr_matrix_values = np.full((size, size), offdiag, dtype=float)
+    np.fill_diagonal(corr_matrix_values, diag)
 
     return corr_matrix_values
 
@@ -392,50 +382,25 @@ def _get_cleaned_matrix_values(
     must_haves: list,
     corr_for_cleaning: correlationEstimate,
 ) -> np.array:
-    size_range = range(raw_corr_matrix.size)
-
     # We replace missing values that we must have with the average, or
     #   if not with the correlation value we use if there is no data at all
 
     avgcorr = raw_corr_matrix.average_corr()
 
-    def _good_correlation(
-        i, j, corrmat_as_array, avgcorr, must_haves, corr_with_no_data_as_array
-    ):
-        if i == j:
-            return 1.0
-        value = corrmat_as_array[i][j]
-        must_have_value = must_haves[i] and must_haves[j]
-
-        if np.isnan(value):
-            if must_have_value:
-                return avgcorr
-            else:
-                return corr_with_no_data_as_array[i][j]
-        else:
-            return value
-
-    corrmat_as_array = raw_corr_matrix.values
-    corr_with_no_data_as_array = corr_for_cleaning.values
-    corrmat_values = np.array(
-        [
-            [
-                _good_correlation(
-                    i,
-                    j,
-                    corrmat_as_array,
-                    avgcorr,
-                    must_haves,
-                    corr_with_no_data_as_array,
-                )
-                for i in size_range
-            ]
-            for j in size_range
-        ],
-        ndmin=2,
+    corrmat_as_array = np.array(raw_corr_matrix.values, dtype=float, ndmin=2)
+    corr_with_no_data_as_array = np.array(corr_for_cleaning.values, dtype=float)
+    must_haves = np.array(must_haves, dtype=bool)
+    must_have_value = np.outer(must_haves, must_haves)
+
+    corrmat_values = np.where(
+        np.isnan(corrmat_as_array),
+        np.where(must_have_value, avgcorr, corr_with_no_data_as_array),
+        corrmat_as_array,
     )
+    np.fill_diagonal(corrmat_values, 1.0)
 
-    return corrmat_values
+    # element [j, i] comes from [i, j], as it always has; the same if the matrix is symmetric
+    return corrmat_values.T
 
 
 @dataclass
@@ -38,25 +38,23 @@ def diversification_multiplier_from_list(
 
     ref_periods = [fit_period.period_start for fit_period in correlation_list.fit_dates]
 
-    # here's where we stack up the answers
-    div_mult_vector = []
-
-    for (corrmatrix, start_of_period) in zip(correlation_list.corr_list, ref_periods):
-
-        weight_slice = weight_df_aligned[:start_of_period]
-        if weight_slice.shape[0] == 0:
-            # empty space
-            div_mult_vector.append(1.0)
-            continue
-
-        # take the current weights and work out the DM
-        weights_dict = weight_slice.iloc[-1].to_dict()
-        weights = portfolioWeights(weights_dict)
-        div_multiplier = diversification_mult_single_period(
-            corrmatrix, weights, **kwargs
-        )
-
-        div_mult_vector.append(div_multiplier)
+    # current weights at the start of each period, as weight_df_aligned[:start_of_period].iloc[-1]
+    row_of_weights_for_each_period = (
+        weight_df_aligned.index.searchsorted(ref_periods, side="right") - 1
+    )
+    no_weights_yet = row_of_weights_for_each_period < 0
+    stacked_weights = _stacked_weights(
+        weight_df_aligned, row_of_weights_for_each_period
+    )
+    stacked_corr = _stacked_correlations(correlation_list)
+
+    # work out all the DM in one go
+    div_mult_vector = diversification_mult_for_stacked_weights(
+        stacked_corr, stacked_weights, **kwargs
+    )
+
+    # empty space
+    div_mult_vector[no_weights_yet] = 1.0
 
     # In same space as correlations probably annually
     div_mult_df = pd.Series(div_mult_vector, index=ref_periods)
@@ -73,6 +71,62 @@ def diversification_multiplier_from_list(
     return div_mult_df_smoothed
 
 
+def _stacked_weights(weight_df: pd.DataFrame, rows: np.array) -> np.array:
+    all_weights = weight_df.values.astype(float)
+    if all_weights.shape[0] == 0:
+        return np.full((len(rows), all_weights.shape[1]), np.nan)
+
+    return all_weights[np.maximum(rows, 0)]
+
+
+def _stacked_correlations(correlation_list: CorrelationList) -> np.array:
+    size = len(correlation_list.column_names)
+
+    def _values_or_nan(corrmatrix: correlationEstimate) -> np.array:
+        values = np.array(corrmatrix.values, dtype=float)
+        if values.shape != (size, size):
+            # can't calculate a DM, will be 1.0
+            return np.full((size, size), np.nan)
+        return values
+
+    return np.array(
+        [_values_or_nan(corrmatrix) for corrmatrix in correlation_list.corr_list]
+    ).reshape(-1, size, size)
+
+
+def diversification_mult_for_stacked_weights(
+    stacked_corr: np.array, stacked_weights: np.array, dm_max: float = 2.5
+) -> np.array:
+    """
+    As diversification_mult_single_period, for P periods at once
+
+    :param stacked_corr: correlation matrix for each period
+    :type stacked_corr: P x N x N np.array
+
+    :param stacked_weights: weights for each period, nan if no weight
+    :type stacked_weights: P x N np.array
+
+    :returns: P np.array
+    """
+    # as portfolioWeights.portfolio_stdev, only use assets with a weight and some correlations
+    has_weight = ~np.isnan(stacked_weights)
+    has_correlation = (~np.isnan(stacked_corr)).sum(axis=1) >= 2
+    valid = has_weight & has_correlation
+    both_valid = valid[:, :, np.newaxis] & valid[:, np.newaxis, :]
+
+    weights = np.where(valid, stacked_weights, 0.0)
+    corr = np.where(both_valid, stacked_corr, 0.0)
+
+    variance = np.einsum("pi,pij,pj->p", weights, corr, weights)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        risk = np.sqrt(variance)
+        dm = np.minimum(1.0 / risk, dm_max)
+
+    dm[np.isnan(risk) | (risk < 0.0000001)] = 1.0
+
+    return dm
+
+
 def diversification_mult_single_period(
     corrmatrix: correlationEstimate, weights: portfolioWeights, dm_max: float = 2.5
 ) -> float:
@@ -1,3 +1,5 @@
+import warnings
+
 import numpy as np
 from dataclasses import dataclass
 
@@ -263,3 +265,126 @@ def shrink_SR_with_lists(
     ]
 
     return post_means
+
+
+@dataclass
+class stackedEstimates:
+    """
+    Estimates for P periods over the same N assets, held as arrays so we can optimise them all at once
+
+    Assets without data in a period have nan estimates
+    """
+
+    asset_names: list
+    correlation: np.array  # P x N x N
+    mean: np.array  # P x N
+    stdev: np.array  # P x N
+    data_length: np.array  # P
+    frequency: str
+    correlation_is_boring: np.array = None  # P bool
+
+    def __post_init__(self):
+        if self.correlation_is_boring is None:
+            self.correlation_is_boring = np.full(self.number_of_periods, False)
+
+    @classmethod
+    def from_list_of_estimates(
+        stackedEstimates, list_of_estimates: list, asset_names: list
+    ):
+        def _values_for_assets(some_estimates: dict) -> list:
+            return [some_estimates.get(asset_name, np.nan) for asset_name in asset_names]
+
+        def _correlation_for_assets(correlation: correlationEstimate) -> np.array:
+            values = correlation.as_pd().reindex(index=asset_names, columns=asset_names)
+            return values.values.astype(float)
+
+        size = len(asset_names)
+        return stackedEstimates(
+            asset_names=list(asset_names),
+            correlation=np.array(
+                [
+                    _correlation_for_assets(estimates.correlation)
+                    for estimates in list_of_estimates
+                ]
+            ).reshape(-1, size, size),
+            mean=np.array(
+                [_values_for_assets(estimates.mean) for estimates in list_of_estimates]
+            ).reshape(-1, size),
+            stdev=np.array(
+                [_values_for_assets(estimates.stdev) for estimates in list_of_estimates]
+            ).reshape(-1, size),
+            data_length=np.array(
+                [estimates.data_length for estimates in list_of_estimates], dtype=float
+            ),
+            frequency=list_of_estimates[0].frequency if len(list_of_estimates) else "W",
+            correlation_is_boring=np.array(
+                [estimates.correlation.is_boring for estimates in list_of_estimates],
+                dtype=bool,
+            ),
+        )
+
+    @property
+    def number_of_periods(self) -> int:
+        return len(self.data_length)
+
+    @property
+    def size(self) -> int:
+        return len(self.asset_names)
+
+    @property
+    def data_length_years(self) -> np.array:
+        return self.data_length / how_many_times_a_year_is_pd_frequency(self.frequency)
+
+    @property
+    def sharpe_ratio(self) -> np.array:
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return self.mean / self.stdev
+
+    def assets_with_available_data(self) -> np.array:
+        """
+        :returns: P x N bool np.array; same assets as Estimates.assets_with_available_data
+        """
+        has_correlation = (~np.isnan(self.correlation)).sum(axis=1) >= 2
+        has_stdev = ~np.isnan(self.stdev)
+
+        return has_correlation & has_stdev
+
+    def equalise_estimates(
+        self,
+        equalise_SR: bool = True,
+        ann_target_SR: float = 0.5,
+        equalise_vols: bool = True,
+    ):
+        """
+        As equalise_estimates, for all periods at once; only assets with available data are used to work
+          out the average vol, and anything else is nan
+        """
+        equalise_vols = str2Bool(equalise_vols)
+        equalise_SR = str2Bool(equalise_SR)
+
+        available = self.assets_with_available_data()
+        mean = np.where(available, self.mean, np.nan)
+        stdev = np.where(available, self.stdev, np.nan)
+
+        if equalise_vols:
+            with warnings.catch_warnings():
+                # periods with no data
+                warnings.simplefilter("ignore", category=RuntimeWarning)
+                avg_stdev = np.nanmean(stdev, axis=1, keepdims=True)
+            with np.errstate(invalid="ignore", divide="ignore"):
+                norm_factor = stdev / avg_stdev
+                mean = mean / norm_factor
+                stdev = stdev / norm_factor
+
+        if equalise_SR:
+            mean = ann_target_SR * stdev
+
+        return stackedEstimates(
+            asset_names=self.asset_names,
+            correlation=self.correlation,
+            mean=mean,
+            stdev=stdev,
+            data_length=self.data_length,
+            frequency=self.frequency,
+            correlation_is_boring=self.correlation_is_boring,
+        )
@@ -9,6 +9,7 @@ from sysquant.estimators.correlations import (
     modify_correlation,
 )
 from sysquant.estimators.generic_estimator import exponentialEstimator
+from sysquant.estimators.incremental_correlation import exponentialCorrelationState
 
 
 class exponentialCorrelation(exponentialEstimator):
@@ -151,27 +152,36 @@ class exponentialCorrelationResults(object):
 
         columns = data_for_correlation.columns
         self._columns = columns
+        self._data_for_correlation = data_for_correlation
+        self._ew_lookback = ew_lookback
+        self._min_periods = min_periods
 
-        raw_correlations = data_for_correlation.ewm(
-            span=ew_lookback, min_periods=min_periods, ignore_na=True
-        ).corr(pairwise=True, ignore_na=True)
-
-        self._raw_correlations = raw_correlations
+        ## Only the correlations at the end of each fit period are calculated, as they are needed
+        self._correlation_state = exponentialCorrelationState(
+            data_for_correlation, ew_lookback=ew_lookback, min_periods=min_periods
+        )
 
     @property
     def raw_correlations(self):
-        return self._raw_correlations
+        ## every correlation matrix, as a pandas multiindex; slow, so only done if asked for
+        raw_correlations = getattr(self, "_raw_correlations", None)
+        if raw_correlations is None:
+            raw_correlations = self._data_for_correlation.ewm(
+                span=self._ew_lookback, min_periods=self._min_periods, ignore_na=True
+            ).corr(pairwise=True)
+            self._raw_correlations = raw_correlations
+
+        return raw_correlations
 
     def last_valid_cor_matrix_for_date(
         self, date_point: datetime.datetime
     ) -> correlationEstimate:
-        raw_correlations = self.raw_correlations
-        columns = self.columns
-
-        return last_valid_cor_matrix_for_date(
-            raw_correlations=raw_correlations, date_point=date_point, columns=columns
+        corr_matrix_values = self._correlation_state.last_correlation_before_date(
+            date_point
         )
 
+        return correlationEstimate(values=corr_matrix_values, columns=self.columns)
+
     @property
     def size_of_matrix(self) -> int:
         return len(self.columns)
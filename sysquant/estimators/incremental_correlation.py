@@ -0,0 +1,283 @@
+"""
+Correlations over time without going back over all the data for each fit period
+
+Both estimators keep statistics for every pair of assets, updated using only the data that has arrived since
+the last estimate, so each new correlation matrix costs O(N^2) per row of new data. Missing data is handled
+pairwise, as pandas does: each pair only uses the rows where both assets have data.
+"""
+
+import datetime
+
+import numpy as np
+import pandas as pd
+
+## standard deviation, relative to the size of the values, below which we assume it's really zero
+ROUNDING_TOLERANCE = 1e-12
+
+
+class exponentialCorrelationState(object):
+    """
+    Exponentially weighted correlations, the same as
+
+        data.ewm(span=ew_lookback, min_periods=min_periods, ignore_na=True).corr(pairwise=True)
+
+    but only for the dates we ask for, and without a python loop over each pair of assets.
+
+    This follows the ewmcov recursion in pandas (adjust=True, ignore_na=True, bias=True), with the means,
+    weights and (co)variances for each pair held as N x N arrays. Dates must be asked for in order;
+    if we go backwards we start again from the beginning.
+    """
+
+    def __init__(
+        self, data_for_correlation: pd.DataFrame, ew_lookback: int, min_periods: int
+    ):
+        self._index = data_for_correlation.index
+        self._values = data_for_correlation.values.astype(float)
+        self._old_wt_factor = 1.0 - 2.0 / (float(ew_lookback) + 1.0)
+        self._min_periods = max(int(min_periods), 1)
+        self._reset()
+
+    def _reset(self):
+        size = self._values.shape[1]
+
+        ## element [i,j] is the mean of asset i, using rows where both i and j have data
+        self._mean = np.full((size, size), np.nan)
+        self._cov = np.zeros((size, size))
+        ## element [i,j] is the variance of asset i, using rows where both i and j have data
+        self._var = np.zeros((size, size))
+        self._old_wt = np.ones((size, size))
+        self._nobs = np.zeros((size, size), dtype=int)
+
+        self._next_row = 0
+
+    def correlation_at_row(self, row_idx: int) -> np.ndarray:
+        if row_idx < self._next_row - 1:
+            self._reset()
+
+        while self._next_row <= row_idx:
+            self._update(self._next_row)
+            self._next_row += 1
+
+        return self._correlation()
+
+    def last_correlation_before_date(self, date_point: datetime.datetime) -> np.ndarray:
+        """
+        :returns: N x N np.array, or an empty array if we have no data before the date
+        """
+        row_idx = self._index.searchsorted(date_point, side="left") - 1
+        if row_idx < 0:
+            return np.empty((0, self._values.shape[1]))
+
+        return self.correlation_at_row(row_idx)
+
+    def _update(self, row_idx: int):
+        row = self._values[row_idx]
+        has_data = ~np.isnan(row)
+        both_have_data = np.outer(has_data, has_data)
+        if not both_have_data.any():
+            return
+
+        self._nobs = self._nobs + both_have_data
+
+        row_i = np.broadcast_to(row[:, np.newaxis], self._mean.shape)
+        row_j = row_i.T
+
+        first_observation = both_have_data & np.isnan(self._mean)
+        update = both_have_data & ~first_observation
+
+        old_mean = self._mean
+        old_wt = np.where(update, self._old_wt * self._old_wt_factor, self._old_wt)
+        total_wt = old_wt + 1.0
+
+        new_mean = np.where(
+            update & (old_mean != row_i),
+            (old_wt * old_mean + row_i) / total_wt,
+            old_mean,
+        )
+        mean_change = old_mean - new_mean
+        diff_from_mean = row_i - new_mean
+
+        new_cov = (
+            old_wt * (self._cov + mean_change * mean_change.T)
+            + diff_from_mean * diff_from_mean.T
+        ) / total_wt
+        new_var = (
+            old_wt * (self._var + mean_change * mean_change)
+            + diff_from_mean * diff_from_mean
+        ) / total_wt
+
+        self._cov = np.where(update, new_cov, self._cov)
+        self._var = np.where(update, new_var, self._var)
+        self._mean = np.where(
+            first_observation, row_i, np.where(update, new_mean, old_mean)
+        )
+        self._old_wt = np.where(update, total_wt, self._old_wt)
+
+    def _correlation(self) -> np.ndarray:
+        with np.errstate(divide="ignore", invalid="ignore"):
+            correlation = self._cov / np.sqrt(self._var * self._var.T)
+
+        correlation[self._nobs < self._min_periods] = np.nan
+
+        return correlation
+
+
+class correlationMomentsByBlock(object):
+    """
+    Means, sums of squared deviations and co-moments for each pair of assets (using rows where both have
+    data), for blocks of rows between fit period boundaries. The moments for any window are then found by
+    combining the blocks inside it, and for expanding windows by adding the latest block to the moments up to
+    the previous boundary, so we never go back over the data.
+
+    The moments are kept centred (as in Welford's algorithm) and combined with the pairwise update of Chan et
+    al., rather than taking the difference of running sums of x, x^2 and xy. Those lose precision over long
+    histories, or when the mean is large relative to the variation.
+
+    Gives the same answer as data[start:end].corr(), apart from rounding
+    """
+
+    def __init__(self, data_for_correlation: pd.DataFrame):
+        self._index = data_for_correlation.index
+        self._values = data_for_correlation.values.astype(float)
+        self._boundaries = [0, len(self._values)]
+        self._moments_for_block = {}
+        self._moments_up_to_row = {0: self._no_moments()}
+
+    def correlation_for_period(
+        self, start_date: datetime.datetime, end_date: datetime.datetime
+    ) -> np.ndarray:
+        ## same rows as data[start_date:end_date]
+        start_row = self._index.searchsorted(start_date, side="left")
+        end_row = self._index.searchsorted(end_date, side="right")
+
+        if start_row == 0:
+            moments = self._moments_from_start_to_row(end_row)
+        else:
+            moments = self._moments_between_rows(start_row, end_row)
+
+        return _correlation_from_moments(*moments)
+
+    def _moments_from_start_to_row(self, row: int) -> tuple:
+        moments = self._moments_up_to_row.get(row, None)
+        if moments is not None:
+            return moments
+
+        ## add on the rows from the nearest moments we already have
+        previous_row = max(
+            [existing_row for existing_row in self._moments_up_to_row if existing_row < row]
+        )
+        moments = _combine_moments(
+            self._moments_up_to_row[previous_row],
+            self._moments_between_rows(previous_row, row),
+        )
+        self._moments_up_to_row[row] = moments
+
+        return moments
+
+    def _moments_between_rows(self, start_row: int, end_row: int) -> tuple:
+        self._add_boundary(start_row)
+        self._add_boundary(end_row)
+
+        moments = self._no_moments()
+        for block in self._blocks_between_rows(start_row, end_row):
+            moments = _combine_moments(moments, self._get_moments_for_block(block))
+
+        return moments
+
+    def _blocks_between_rows(self, start_row: int, end_row: int) -> list:
+        boundaries = [
+            row for row in self._boundaries if row >= start_row and row <= end_row
+        ]
+
+        return list(zip(boundaries[:-1], boundaries[1:]))
+
+    def _add_boundary(self, row: int):
+        if row in self._boundaries:
+            return
+
+        ## split the block this row falls in
+        block_idx = np.searchsorted(self._boundaries, row)
+        block_start = self._boundaries[block_idx - 1]
+        block_end = self._boundaries[block_idx]
+        self._boundaries.insert(block_idx, row)
+        self._moments_for_block.pop((block_start, block_end), None)
+
+    def _get_moments_for_block(self, block: tuple) -> tuple:
+        moments = self._moments_for_block.get(block, None)
+        if moments is None:
+            moments = self._moments_for_rows(*block)
+            self._moments_for_block[block] = moments
+
+        return moments
+
+    def _moments_for_rows(self, start_row: int, end_row: int) -> tuple:
+        values = self._values[start_row:end_row]
+        has_data = ~np.isnan(values)
+
+        ## shift each asset by its mean in this block, so the sums below are of small numbers
+        count = has_data.sum(axis=0)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            shift = np.where(count > 0, np.nansum(values, axis=0) / count, 0.0)
+        has_data = has_data.astype(float)
+        values = np.nan_to_num(values - shift)
+
+        nobs = has_data.T.dot(has_data)
+        ## element [i,j] is the sum of asset i, using rows where both i and j have data
+        sum_x = values.T.dot(has_data)
+        sum_xx = (values**2).T.dot(has_data)
+        sum_xy = values.T.dot(values)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            shifted_mean = np.where(nobs > 0, sum_x / nobs, 0.0)
+        mean = np.where(nobs > 0, shifted_mean + shift[:, np.newaxis], 0.0)
+        sum_squares = sum_xx - sum_x * shifted_mean
+        co_moment = sum_xy - sum_x * shifted_mean.T
+
+        return nobs, mean, sum_squares, co_moment
+
+    def _no_moments(self) -> tuple:
+        size = self._values.shape[1]
+        return tuple(np.zeros((size, size)) for _ in range(4))
+
+
+def _combine_moments(moments: tuple, other_moments: tuple) -> tuple:
+    """
+    Moments for two sets of rows combined, as Chan, Golub and LeVeque (1979)
+
+    Each is a tuple of N x N np.arrays: number of observations, mean of asset i, sum of squared deviations
+    from the mean of asset i, and co-moment of assets i and j; in each case using rows where both i and j
+    have data
+    """
+    nobs, mean, sum_squares, co_moment = moments
+    other_nobs, other_mean, other_sum_squares, other_co_moment = other_moments
+
+    total_nobs = nobs + other_nobs
+    with np.errstate(divide="ignore", invalid="ignore"):
+        other_fraction = np.where(total_nobs > 0, other_nobs / total_nobs, 0.0)
+    mean_change = other_mean - mean
+    weight = nobs * other_fraction
+
+    total_mean = mean + mean_change * other_fraction
+    total_sum_squares = sum_squares + other_sum_squares + weight * mean_change**2
+    total_co_moment = co_moment + other_co_moment + weight * mean_change * mean_change.T
+
+    return total_nobs, total_mean, total_sum_squares, total_co_moment
+
+
+def _correlation_from_moments(
+    nobs: np.ndarray, mean: np.ndarray, sum_squares: np.ndarray, co_moment: np.ndarray
+) -> np.ndarray:
+    with np.errstate(divide="ignore", invalid="ignore"):
+        sum_squares_y = sum_squares.T
+        divisor = np.sqrt(sum_squares * sum_squares_y)
+
+        correlation = co_moment / divisor
+
+    ## as pandas, no correlation if there is no variation; allowing for rounding
+    sum_of_values_squared = sum_squares + nobs * mean**2
+    no_variation = (sum_squares <= ROUNDING_TOLERANCE**2 * sum_of_values_squared) | (
+        sum_squares_y <= ROUNDING_TOLERANCE**2 * sum_of_values_squared.T
+    )
+    correlation[(nobs < 1) | no_variation | ~(divisor > 0)] = np.nan
+
+    return correlation
@@ -2,7 +2,11 @@ import numpy as np
 import pandas as pd
 
 from syscore.dateutils import BUSINESS_DAYS_IN_YEAR
-from syscore.pdutils import prices_to_daily_prices
+from syscore.pdutils import (
+    prices_to_daily_prices,
+    union_of_indices,
+    series_covers_index_between_its_dates,
+)
 
 
 def robust_daily_vol_given_price(price: pd.Series, **kwargs):
@@ -200,3 +204,75 @@ def simple_vol_calc(
     vol = daily_returns.rolling(days, min_periods=min_periods).std()
 
     return vol
+
+
+def vol_calc_for_dict_of_returns(
+    vol_function, dict_of_daily_returns: dict, **kwargs
+) -> dict:
+    """
+    Calculate vol for several instruments with a single call of vol_function on a panel of returns
+
+    Only safe for functions which act on each column independently, eg robust_vol_calc, mixed_vol_calc and
+    simple_ewvol_calc. Instruments whose returns are missing some of the panel's dates between their
+    first and last date would get a different answer (the rolling windows count rows), so they are
+    calculated on their own.
+
+    :param vol_function: function, called as vol_function(daily_returns, **kwargs)
+    :param dict_of_daily_returns: dict of pd.Series, keys are instrument codes
+    :return: dict of pd.Series, keys are instrument codes. Same as calling vol_function for each.
+    """
+    common_index = union_of_indices(
+        [daily_returns.index for daily_returns in dict_of_daily_returns.values()]
+    )
+    instruments_on_common_index = [
+        instrument_code
+        for instrument_code, daily_returns in dict_of_daily_returns.items()
+        if series_covers_index_between_its_dates(daily_returns, common_index)
+    ]
+
+    vol_for_instruments_on_common_index = {}
+    if len(instruments_on_common_index) > 0:
+        panel_of_returns = pd.concat(
+            [
+                dict_of_daily_returns[instrument_code]
+                for instrument_code in instruments_on_common_index
+            ],
+            axis=1,
+            keys=instruments_on_common_index,
+        )
+        panel_vol = vol_function(panel_of_returns, **kwargs)
+        vol_for_instruments_on_common_index = dict(
+            [
+                (
+                    instrument_code,
+                    _vol_for_instrument_from_panel(
+                        panel_vol, instrument_code, dict_of_daily_returns
+                    ),
+                )
+                for instrument_code in instruments_on_common_index
+            ]
+        )
+
+    dict_of_vol = dict(
+        [
+            (
+                instrument_code,
+                vol_for_instruments_on_common_index[instrument_code]
+                if instrument_code in vol_for_instruments_on_common_index
+                else vol_function(daily_returns, **kwargs),
+            )
+            for instrument_code, daily_returns in dict_of_daily_returns.items()
+        ]
+    )
+
+    return dict_of_vol
+
+
+def _vol_for_instrument_from_panel(
+    panel_vol: pd.DataFrame, instrument_code: str, dict_of_daily_returns: dict
+) -> pd.Series:
+    daily_returns = dict_of_daily_returns[instrument_code]
+    vol = panel_vol[instrument_code].reindex(daily_returns.index)
+    vol.name = daily_returns.name
+
+    return vol
@@ -1,3 +1,5 @@
+import warnings
+
 import scipy.stats as stats
 import pandas as pd
 import numpy as np
@@ -39,19 +41,18 @@ def adjust_dataframe_of_weights_for_SR(
     years_of_data: float = 10,
 ) -> pd.DataFrame:
 
-    list_of_weight_lists = [
-        list(weights.iloc[idx].values) for idx in range(len(weights.index))
-    ]
+    if len(weights.columns) == 1:
+        return weights
 
-    adj_weight_list = adjust_list_of_weight_lists_for_SR(
-        list_of_weight_lists,
-        SR_list=SR_list,
-        avg_correlation=avg_correlation,
-        years_of_data=years_of_data,
+    # the multipliers are the same for every row, so work them out once
+    multipliers = multipliers_for_SR_list(
+        SR_list, avg_correlation=avg_correlation, years_of_data=years_of_data
     )
+    new_weights = weights.values.astype(float) * multipliers
+    norm_new_weights = new_weights / new_weights.sum(axis=1, keepdims=True)
 
     adj_weights = pd.DataFrame(
-        adj_weight_list, columns=weights.columns, index=weights.index
+        norm_new_weights, columns=weights.columns, index=weights.index
     )
 
     return adj_weights
@@ -84,24 +85,76 @@ def adjust_weights_for_SR(
     if len(weights_as_list) == 1:
         return weights_as_list
 
-    avg_SR = np.nanmean(SR_list)
-    relative_SR_list = [SR - avg_SR for SR in SR_list]
-    multipliers = [
-        float(multiplier_from_relative_SR(relative_SR, avg_correlation, years_of_data))
-        for relative_SR in relative_SR_list
-    ]
+    multipliers = multipliers_for_SR_list(
+        SR_list, avg_correlation=avg_correlation, years_of_data=years_of_data
+    )
 
-    new_weights = list(np.array(weights_as_list) * np.array(multipliers))
+    new_weights = list(np.array(weights_as_list) * multipliers)
     norm_new_weights = norm_weights(new_weights)
 
     return norm_new_weights
 
 
+def multipliers_for_SR_list(
+    SR_list: list, avg_correlation: float, years_of_data: float
+) -> np.array:
+    avg_SR = np.nanmean(SR_list)
+    relative_SR = np.array(SR_list, dtype=float) - avg_SR
+
+    return multiplier_from_relative_SR(relative_SR, avg_correlation, years_of_data)
+
+
+def adjust_stacked_weights_for_SR(
+    stacked_weights: np.array,
+    stacked_SR: np.array,
+    avg_correlation: np.array,
+    years_of_data: np.array,
+) -> np.array:
+    """
+    As adjust_weights_for_SR, for P portfolios at once
+
+    :param stacked_weights: weights for each period, nan for assets that aren't in the portfolio
+    :type stacked_weights: P x N np.array
+
+    :param stacked_SR: Sharpe Ratio of each asset in each period
+    :type stacked_SR: P x N np.array
+
+    :param avg_correlation: average correlation of the assets in the portfolio for each period
+    :type avg_correlation: P np.array
+
+    :param years_of_data: P np.array
+
+    :returns: P x N np.array
+    """
+    in_portfolio = ~np.isnan(stacked_weights)
+    SR_in_portfolio = np.where(in_portfolio, stacked_SR, np.nan)
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", category=RuntimeWarning)
+        avg_SR = np.nanmean(SR_in_portfolio, axis=1, keepdims=True)
+
+    multipliers = multiplier_from_relative_SR(
+        SR_in_portfolio - avg_SR,
+        avg_correlation=np.asarray(avg_correlation)[:, np.newaxis],
+        years_of_data=np.asarray(years_of_data)[:, np.newaxis],
+    )
+
+    new_weights = stacked_weights * multipliers
+    with np.errstate(invalid="ignore", divide="ignore"):
+        norm_new_weights = new_weights / np.nansum(new_weights, axis=1, keepdims=True)
+
+    # nothing to adjust with only one asset
+    only_one_asset = in_portfolio.sum(axis=1) == 1
+    norm_new_weights[only_one_asset] = stacked_weights[only_one_asset]
+
+    return norm_new_weights
+
+
 def multiplier_from_relative_SR(
-    relative_SR: float, avg_correlation: float, years_of_data: float
-) -> float:
+    relative_SR, avg_correlation, years_of_data
+) -> np.array:
     # Return a multiplier
     # 1 implies no adjustment required
+    # Arguments can be floats or np.arrays of any shape that broadcast together
     ratio = mini_bootstrap_ratio_given_SR_diff(
         relative_SR, avg_correlation, years_of_data
     )
@@ -110,14 +163,14 @@ def multiplier_from_relative_SR(
 
 
 def mini_bootstrap_ratio_given_SR_diff(
-    SR_diff: float,
-    avg_correlation: float,
-    years_of_data: float,
+    SR_diff,
+    avg_correlation,
+    years_of_data,
     avg_SR=0.5,
     std=0.15,
     how_many_assets=2,
     p_step=0.2,
-):
+) -> np.array:
     """
     Do a parametric bootstrap of portfolio weights to tell you what the ratio should be between an asset which
        has a higher backtested SR (by SR_diff) versus another asset(s) with average Sharpe Ratio (avg_SR)
@@ -131,30 +184,41 @@ def mini_bootstrap_ratio_given_SR_diff(
     :param std: Standard deviation (doesn't affect results, just a scaling parameter)
     :param how_many_assets: How many assets in the imaginary portfolio
     :param p_step: Step size to go through in the CDF of the mean estimate
-    :return: float, ratio of weight of asset with different SR to 1/n weight
+    :return: float, ratio of weight of asset with different SR to 1/n weight; or an np.array if the first
+       three arguments are arrays
+
+    >>> float(mini_bootstrap_ratio_given_SR_diff(0.0, 0.5, 10))
+    1.0
+    >>> mini_bootstrap_ratio_given_SR_diff(np.array([-0.2, np.nan, 0.2]), 0.5, 10).round(4)
+    array([0.4444, 1.    , 1.4297])
     """
     dist_points = np.arange(p_step, stop=(1 - p_step) + 0.00000001, step=p_step)
-    list_of_weights = [
-        weights_given_SR_diff(
-            SR_diff,
-            avg_correlation,
-            confidence_interval,
-            years_of_data,
-            avg_SR=avg_SR,
-            std=std,
-            how_many_assets=how_many_assets,
-        )
-        for confidence_interval in dist_points
-    ]
 
-    array_of_weights = np.array(list_of_weights)
-    average_weights = np.nanmean(array_of_weights, axis=0)
-    ratio_of_weights = weight_ratio(average_weights)
+    # The last axis is the confidence interval
+    SR_diff = np.asarray(SR_diff, dtype=float)[..., np.newaxis]
+    avg_correlation = np.asarray(avg_correlation, dtype=float)[..., np.newaxis]
+    years_of_data = np.asarray(years_of_data, dtype=float)[..., np.newaxis]
+
+    weight_first_asset = weight_of_first_asset_given_SR_diff(
+        SR_diff,
+        avg_correlation,
+        dist_points,
+        years_of_data,
+        avg_SR=avg_SR,
+        std=std,
+        how_many_assets=how_many_assets,
+    )
 
-    if np.sign(ratio_of_weights - 1.0) != np.sign(SR_diff):
-        # This shouldn't happen, and only occurs because weight distributions
-        # get curtailed at zero
-        return 1.0
+    with warnings.catch_warnings():
+        # all nan if we don't have a valid SR_diff
+        warnings.simplefilter("ignore", category=RuntimeWarning)
+        average_weight = np.nanmean(weight_first_asset, axis=-1)
+    ratio_of_weights = average_weight / (1.0 / how_many_assets)
+
+    # This shouldn't happen, and only occurs because weight distributions
+    # get curtailed at zero
+    wrong_sign = np.sign(ratio_of_weights - 1.0) != np.sign(SR_diff[..., 0])
+    ratio_of_weights = np.where(wrong_sign, 1.0, ratio_of_weights)
 
     return ratio_of_weights
 
@@ -183,7 +247,7 @@ def weights_given_SR_diff(
     how_many_assets=2,
 ):
     """
-    Return the ratio of weight to 1/N weight for an asset with unusual SR
+    Return the weights of an asset with unusual SR, and the other (average) assets
 
     :param SR_diff: Difference between the SR and the average SR. 0.0 indicates same as average
     :param avg_correlation: Average correlation amongst assets
@@ -193,7 +257,37 @@ def weights_given_SR_diff(
     :param how_many_assets: .... are we optimising over (I only consider 2, but let's keep it general)
     :param std: Standard deviation to use
 
-    :return: Ratio of weight, where 1.0 means no difference
+    :return: list of weights, first asset is the unusual one
+    """
+
+    weight_first_asset = float(
+        weight_of_first_asset_given_SR_diff(
+            SR_diff,
+            avg_correlation,
+            confidence_interval,
+            years_of_data,
+            avg_SR=avg_SR,
+            std=std,
+            how_many_assets=how_many_assets,
+        )
+    )
+    weight_other_assets = (1.0 - weight_first_asset) / (how_many_assets - 1)
+
+    return [weight_first_asset] + [weight_other_assets] * (how_many_assets - 1)
+
+
+def weight_of_first_asset_given_SR_diff(
+    SR_diff,
+    avg_correlation,
+    confidence_interval,
+    years_of_data,
+    avg_SR=0.5,
+    std=0.15,
+    how_many_assets=2,
+) -> np.array:
+    """
+    As weights_given_SR_diff, but only returns the weight of the first asset. Arguments can be floats
+       or np.arrays of any shape that broadcast together.
     """
 
     average_mean = avg_SR * std
@@ -208,11 +302,55 @@ def weights_given_SR_diff(
 
     confident_asset1_mean = confident_mean_difference + average_mean
 
-    mean_list = [confident_asset1_mean] + [average_mean] * (how_many_assets - 1)
+    weight_first_asset = weight_of_first_asset_with_optimal_SR(
+        confident_asset1_mean,
+        average_mean=average_mean,
+        avg_correlation=avg_correlation,
+        how_many_assets=how_many_assets,
+    )
+
+    return weight_first_asset
+
+
+def weight_of_first_asset_with_optimal_SR(
+    asset1_mean, average_mean: float, avg_correlation, how_many_assets: int = 2
+) -> np.array:
+    """
+    Long only, fully invested, maximum Sharpe Ratio weight for the first of a number of assets with the
+      same standard deviation and correlation, where all the other assets have the same mean.
+
+    This is what optimise_using_correlation is looking for, but in closed form so we can do lots at once:
+      the unconstrained solution is proportional to inverse(sigma).mean, and if that's negative for any asset
+      we drop it and share the weight equally amongst the rest. The optimiser can stop at its starting point
+      of equal weights instead, particularly when correlations are high.
+
+    >>> float(weight_of_first_asset_with_optimal_SR(0.1, 0.1, 0.5))
+    0.5
+    >>> float(weight_of_first_asset_with_optimal_SR(0.2, 0.1, 0.0))
+    0.6666666666666666
+    >>> float(weight_of_first_asset_with_optimal_SR(0.01, 0.1, 0.5))
+    0.0
+    """
+    number_of_others = how_many_assets - 1
+    with np.errstate(invalid="ignore", divide="ignore"):
+        sum_of_means = asset1_mean + number_of_others * average_mean
+        common_part = (
+            avg_correlation * sum_of_means / (1.0 + number_of_others * avg_correlation)
+        )
+        unconstrained_asset1 = asset1_mean - common_part
+        unconstrained_others = average_mean - common_part
+
+        weight = unconstrained_asset1 / (
+            unconstrained_asset1 + number_of_others * unconstrained_others
+        )
+
+        weight = np.where(unconstrained_others <= 0.0, 1.0, weight)
+        weight = np.where(unconstrained_asset1 <= 0.0, 0.0, weight)
 
-    weights = optimise_using_correlation(mean_list, avg_correlation, std)
+    # if we can't work it out, neither could the optimiser
+    weight = np.where(np.isnan(unconstrained_asset1), np.nan, weight)
 
-    return list(weights)
+    return weight
 
 
 def calculate_confident_mean_difference(
@@ -224,8 +362,8 @@ def calculate_confident_mean_difference(
 ) -> float:
 
     omega_difference = calculate_omega_difference(std, years_of_data, avg_correlation)
-    confident_mean_difference = stats.norm(mean_difference, omega_difference).ppf(
-        confidence_interval
+    confident_mean_difference = (
+        stats.norm.ppf(confidence_interval) * omega_difference + mean_difference
     )
 
     return confident_mean_difference
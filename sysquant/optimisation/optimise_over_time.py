@@ -42,24 +42,27 @@ class optimiseWeightsOverTime(object):
     def weights(self) -> pd.DataFrame:
         fit_dates = self.fit_dates
         optimiser = self.optimiser
-       
-        progress = progressBar(len(fit_dates), "Optimising weights")
-        
+
         weight_list = []
-        
+
         # Now for each time period, estimate weights
-        if self.n_threads is None:
+        if self.n_threads is None and optimiser.can_optimise_all_periods_at_once:
+            weight_list = optimiser.calculate_weights_for_list_of_periods(
+                list(fit_dates)
+            )
+        elif self.n_threads is None:
+            progress = progressBar(len(fit_dates), "Optimising weights")
             for fit_period in fit_dates:
                 weight_dict = optimiser.calculate_weights_for_period(fit_period)
                 weight_list.append(weight_dict)
                 progress.iterate()
         else:
+            progress = progressBar(len(fit_dates), "Optimising weights")
             with Pool(self.n_threads) as p:
-                for i, weight_dict in enumerate(p.imap(optimiser.calculate_weights_for_period, fit_dates), 1):
+                for weight_dict in p.imap(optimiser.calculate_weights_for_period, fit_dates):
                     weight_list.append(weight_dict)
-                    print(i)
-                    progress.iterate()                  
-                   
+                    progress.iterate()
+
         weight_index = fit_dates.list_of_starting_periods()
         weights = pd.DataFrame(weight_list, index=weight_index)
         weights.sort_index(ascending=True, inplace=True)
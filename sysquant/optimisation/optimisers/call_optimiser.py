@@ -1,13 +1,21 @@
+import numpy as np
+
 from sysquant.optimisation.optimisers.equal_weights import equal_weights_optimisation
 from sysquant.optimisation.optimisers.shrinkage import shrinkage_optimisation
-from sysquant.optimisation.optimisers.handcraft import handcraft_optimisation
-from sysquant.optimisation.optimisers.one_period import one_period_optimisation
+from sysquant.optimisation.optimisers.handcraft import (
+    handcraft_optimisation,
+    handcraft_optimisation_for_stacked_estimates,
+)
+from sysquant.optimisation.optimisers.one_period import (
+    one_period_optimisation,
+    one_period_optimisation_for_stacked_estimates,
+)
 
 from sysquant.optimisation.weights import (
     estimatesWithPortfolioWeights,
     portfolioWeights,
 )
-from sysquant.estimators.estimates import Estimates
+from sysquant.estimators.estimates import Estimates, stackedEstimates
 
 
 REGISTER_OF_OPTIMISERS = dict(
@@ -17,6 +25,12 @@ REGISTER_OF_OPTIMISERS = dict(
     one_period=one_period_optimisation,
 )
 
+## Optimisers that can do all the periods at once
+REGISTER_OF_STACKED_OPTIMISERS = dict(
+    handcraft=handcraft_optimisation_for_stacked_estimates,
+    one_period=one_period_optimisation_for_stacked_estimates,
+)
+
 
 def optimiser_for_method(
     method: str, estimates: Estimates, **weighting_args
@@ -72,3 +86,23 @@ def call_optimiser(
     )
 
     return weights_with_estimates_for_valid_data
+
+
+def can_optimise_stacked_estimates(method: str) -> bool:
+    return method in REGISTER_OF_STACKED_OPTIMISERS
+
+
+def optimiser_for_method_with_stacked_estimates(
+    method: str, stacked_estimates: stackedEstimates, **weighting_args
+) -> np.array:
+    """
+    :returns: P x N np.array of weights, nan for assets without data in that period
+    """
+    optimisation_function = REGISTER_OF_STACKED_OPTIMISERS.get(method, None)
+    if optimisation_function is None:
+        error_msg = "Optimiser %s can't optimise stacked estimates" % method
+        raise Exception(error_msg)
+
+    stacked_weights = optimisation_function(stacked_estimates, **weighting_args)
+
+    return stacked_weights
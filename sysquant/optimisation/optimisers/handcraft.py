@@ -1,9 +1,17 @@
+import warnings
+
 import numpy as np
 
-from sysquant.estimators.clustering_correlations import cluster_correlation_matrix
-from sysquant.estimators.estimates import Estimates
+from sysquant.estimators.clustering_correlations import (
+    cluster_correlation_matrix,
+    cluster_index_for_correlation_values,
+)
+from sysquant.estimators.estimates import Estimates, stackedEstimates
 from sysquant.estimators.correlations import correlationEstimate
-from sysquant.optimisation.SR_adjustment import adjust_weights_for_SR
+from sysquant.optimisation.SR_adjustment import (
+    adjust_weights_for_SR,
+    adjust_stacked_weights_for_SR,
+)
 from sysquant.optimisation.weights import (
     portfolioWeights,
     estimatesWithPortfolioWeights,
@@ -12,6 +20,7 @@ from sysquant.optimisation.weights import (
 
 from sysquant.estimators.diversification_multipliers import (
     diversification_mult_single_period,
+    diversification_mult_for_stacked_weights,
 )
 
 ## This is a cut down and rewritten version of the original code,
@@ -258,3 +267,195 @@ def multiplied_out_risk_weight_for_sub_portfolios(
     )
 
     return mult_weights
+
+
+## ALL PERIODS AT ONCE
+
+
+def handcraft_optimisation_for_stacked_estimates(
+    stacked_estimates: stackedEstimates,
+    equalise_SR: bool = False,
+    equalise_vols: bool = True,
+    **_ignored_weighting_kwargs
+) -> np.array:
+    """
+    As handcraft_optimisation, for every period in stacked_estimates
+
+    :returns: P x N np.array of weights, nan for assets without data in that period
+    """
+    if not equalise_vols:
+        raise Exception("Non equalised vols not supported")
+
+    # As with one period, the assets with data are in alphabetical order before we cluster them
+    order = np.argsort(stacked_estimates.asset_names, kind="stable")
+    available = stacked_estimates.assets_with_available_data()[:, order]
+    correlation = stacked_estimates.correlation[:, order][:, :, order]
+
+    risk_weights = stacked_risk_weights_with_equal_SR(
+        correlation,
+        available=available,
+        correlation_is_boring=stacked_estimates.correlation_is_boring,
+    )
+
+    if not equalise_SR:
+        risk_weights = adjust_stacked_weights_for_SR(
+            risk_weights,
+            stacked_SR=stacked_estimates.sharpe_ratio[:, order],
+            avg_correlation=_stacked_avg_correlation(correlation, available),
+            years_of_data=stacked_estimates.data_length_years,
+        )
+
+    weights = np.full(risk_weights.shape, np.nan)
+    weights[:, order] = risk_weights
+
+    return weights
+
+
+def stacked_risk_weights_with_equal_SR(
+    correlation: np.array, available: np.array, correlation_is_boring: np.array
+) -> np.array:
+    """
+    handcraftPortfolio.risk_weights(equalise_SR=True), for P periods
+
+    We cluster each period as we would one at a time, but then work out the diversification multipliers
+      for all the sub portfolios at the same depth in one go, starting at the bottom.
+
+    :param correlation: P x N x N np.array
+    :param available: P x N bool np.array, assets to include in each period
+    :param correlation_is_boring: P bool np.array
+    :returns: P x N np.array, nan for assets not included
+    """
+    periods, size = available.shape
+    tree = _stackedClusterTree(size)
+    for period in range(periods):
+        members = np.flatnonzero(available[period])
+        if len(members) > 0:
+            tree.add_cluster(
+                correlation[period],
+                period=period,
+                members=members,
+                is_boring=bool(correlation_is_boring[period]),
+            )
+
+    return tree.risk_weights(correlation, periods=periods)
+
+
+class _stackedClusterTree(object):
+    ## Each node is a portfolio (or sub portfolio) for one period; parent is -1 for the top level
+    def __init__(self, size: int):
+        self._size = size
+        self._period = []
+        self._members = []
+        self._parent = []
+        self._depth = []
+
+    def add_cluster(
+        self,
+        correlation: np.array,
+        period: int,
+        members: np.array,
+        is_boring: bool,
+        parent: int = -1,
+        depth: int = 0,
+    ):
+        node = len(self._period)
+        self._period.append(period)
+        self._members.append(members)
+        self._parent.append(parent)
+        self._depth.append(depth)
+
+        if len(members) <= FIXED_CLUSTER_SIZE:
+            # don't cluster one or two assets
+            return
+
+        clusters = np.array(
+            cluster_index_for_correlation_values(
+                correlation[np.ix_(members, members)],
+                is_boring=is_boring,
+                cluster_size=FIXED_CLUSTER_SIZE,
+            )
+        )
+        assert len(set(clusters)) == FIXED_CLUSTER_SIZE
+
+        for cluster_id in sorted(set(clusters)):
+            self.add_cluster(
+                correlation,
+                period=period,
+                members=members[clusters == cluster_id],
+                is_boring=is_boring,
+                parent=node,
+                depth=depth + 1,
+            )
+
+    def risk_weights(self, correlation: np.array, periods: int) -> np.array:
+        number_of_nodes = len(self._period)
+        node_period = np.array(self._period, dtype=int)
+        node_parent = np.array(self._parent, dtype=int)
+        node_depth = np.array(self._depth, dtype=int)
+
+        node_in_portfolio = np.full((number_of_nodes, self._size), False)
+        for node, members in enumerate(self._members):
+            node_in_portfolio[node, members] = True
+
+        # one over N for one or two assets, will be replaced for anything we cluster
+        count_in_portfolio = node_in_portfolio.sum(axis=1, keepdims=True)
+        node_weights = np.where(node_in_portfolio, 1.0 / count_in_portfolio, np.nan)
+
+        max_depth = node_depth.max() if number_of_nodes > 0 else 0
+        for depth in range(max_depth, 0, -1):
+            # all the sub portfolios at this depth, across all periods
+            nodes = np.flatnonzero(node_depth == depth)
+            in_portfolio = node_in_portfolio[nodes]
+            both_in_portfolio = (
+                in_portfolio[:, :, np.newaxis] & in_portfolio[:, np.newaxis, :]
+            )
+            sub_correlation = np.where(
+                both_in_portfolio, correlation[node_period[nodes]], np.nan
+            )
+            sub_weights = node_weights[nodes]
+
+            div_mult = diversification_mult_for_stacked_weights(
+                sub_correlation, sub_weights
+            )
+
+            # We allocate half to each, adjusted for IDM
+            multiplied_out_risk_weights = (
+                0.5 * div_mult[:, np.newaxis] * sub_weights
+            )
+            # each asset is in only one of the sub portfolios, so we can just add them up
+            parents = node_parent[nodes]
+            aggregate_weights = np.zeros((number_of_nodes, self._size))
+            np.add.at(
+                aggregate_weights,
+                parents,
+                np.where(in_portfolio, multiplied_out_risk_weights, 0.0),
+            )
+            parents = np.unique(parents)
+            node_weights[parents] = np.where(
+                node_in_portfolio[parents], aggregate_weights[parents], np.nan
+            )
+
+        weights = np.full((periods, self._size), np.nan)
+        top_level = node_parent == -1
+        weights[node_period[top_level]] = node_weights[top_level]
+
+        return weights
+
+
+def _stacked_avg_correlation(correlation: np.array, available: np.array) -> np.array:
+    ## as correlationEstimate.average_corr(), only using available assets
+    size = correlation.shape[1]
+    off_diagonal = ~np.eye(size, dtype=bool)
+    both_available = available[:, :, np.newaxis] & available[:, np.newaxis, :]
+    to_average = np.where(both_available & off_diagonal, correlation, np.nan)
+
+    with warnings.catch_warnings():
+        # a portfolio of one asset has no correlations
+        warnings.simplefilter("ignore", category=RuntimeWarning)
+        # numpy can sum the rows of a stacked array in a different order, so we average each period on its
+        #   own to get exactly the same answer however many periods we do at once
+        avg_correlation = np.array(
+            [np.nanmean(to_average_for_period) for to_average_for_period in to_average]
+        )
+
+    return avg_correlation
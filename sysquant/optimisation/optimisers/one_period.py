@@ -1,6 +1,12 @@
+import numpy as np
+
 from sysquant.optimisation.weights import estimatesWithPortfolioWeights
-from sysquant.estimators.estimates import Estimates
-from sysquant.optimisation.shared import optimise_given_estimates
+from sysquant.estimators.estimates import Estimates, stackedEstimates
+from sysquant.optimisation.shared import (
+    optimise_given_estimates,
+    optimise_from_sigma_and_mean_list,
+    sigma_from_corr_and_std,
+)
 
 
 def one_period_optimisation(
@@ -12,3 +18,43 @@ def one_period_optimisation(
     )
 
     return estimates_with_portfolio_weights
+
+
+def one_period_optimisation_for_stacked_estimates(
+    stacked_estimates: stackedEstimates,
+    equalise_SR: bool = True,
+    ann_target_SR: float = 0.5,
+    equalise_vols: bool = True,
+    **_ignored_kwargs
+) -> np.array:
+    """
+    As one_period_optimisation, for every period in stacked_estimates. The estimates are equalised for
+      all periods at once, but we still need to run the optimiser for each period.
+
+    :returns: P x N np.array of weights, nan for assets without data in that period
+    """
+    equalised_estimates = stacked_estimates.equalise_estimates(
+        equalise_SR=equalise_SR,
+        ann_target_SR=ann_target_SR,
+        equalise_vols=equalise_vols,
+    )
+    available = stacked_estimates.assets_with_available_data()
+
+    # As with one period, the assets with data are in alphabetical order
+    order = np.argsort(stacked_estimates.asset_names, kind="stable")
+
+    weights = np.full(available.shape, np.nan)
+    for period in range(stacked_estimates.number_of_periods):
+        valid = order[available[period, order]]
+        if len(valid) == 0:
+            continue
+
+        sigma = sigma_from_corr_and_std(
+            stdev_list=equalised_estimates.stdev[period, valid],
+            corrmatrix=equalised_estimates.correlation[period][np.ix_(valid, valid)],
+        )
+        weights[period, valid] = optimise_from_sigma_and_mean_list(
+            sigma, mean_list=list(equalised_estimates.mean[period, valid])
+        )
+
+    return weights
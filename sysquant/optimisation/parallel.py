@@ -0,0 +1,75 @@
+"""
+Run the optimisations for a number of assets (eg forecast weights for each instrument) in a pool of worker
+processes.
+
+Each optimiser is set up in the parent process, so it already has its pre-processed returns. Workers are
+forked with the optimisers as a module global, so they share these read only inputs with the parent without
+anything being pickled on the way out; only the weights are pickled on the way back. On platforms without
+fork we just run in one process.
+"""
+
+import multiprocessing
+
+from syscore.genutils import progressBar
+
+
+def estimate_weights_in_worker_pool(optimisers: dict, n_workers: int) -> dict:
+    """
+    :param optimisers: dict of objects with a weights() method, eg genericOptimiser; keynames asset names
+    :returns: dict of pd.DataFrame of weights, keynames asset names
+    """
+    list_of_names = list(optimisers.keys())
+    progress = progressBar(len(list_of_names), "Estimating weights")
+
+    if n_workers > 1 and _can_fork():
+        weights_by_name = _estimate_weights_in_forked_pool(
+            optimisers, n_workers=n_workers, progress=progress
+        )
+    else:
+        weights_by_name = {}
+        for asset_name in list_of_names:
+            weights_by_name[asset_name] = optimisers[asset_name].weights()
+            progress.iterate()
+
+    progress.finished()
+
+    # same order as we were given them, whatever order the workers finished in
+    return dict(
+        [(asset_name, weights_by_name[asset_name]) for asset_name in list_of_names]
+    )
+
+
+def _estimate_weights_in_forked_pool(
+    optimisers: dict, n_workers: int, progress: progressBar
+) -> dict:
+    global _optimisers_in_worker
+
+    # has to be set before the pool is created, so the forked workers inherit it
+    _optimisers_in_worker = optimisers
+
+    weights_by_name = {}
+    try:
+        with multiprocessing.get_context("fork").Pool(n_workers) as pool:
+            for asset_name, weights in pool.imap_unordered(
+                _estimate_weights_in_worker, list(optimisers.keys())
+            ):
+                weights_by_name[asset_name] = weights
+                progress.iterate()
+    finally:
+        _optimisers_in_worker = None
+
+    return weights_by_name
+
+
+# Only used inside forked worker processes
+_optimisers_in_worker = None
+
+
+def _can_fork() -> bool:
+    return "fork" in multiprocessing.get_all_start_methods()
+
+
+def _estimate_weights_in_worker(asset_name: str) -> tuple:
+    weights = _optimisers_in_worker[asset_name].weights()
+
+    return asset_name, weights
@@ -1,5 +1,7 @@
 from copy import copy
 
+import numpy as np
+
 from syscore.objects import resolve_function
 from syscore.genutils import str2Bool
 
@@ -11,13 +13,17 @@ from sysquant.estimators.stdev_estimator import stdevEstimates
 from sysquant.estimators.mean_estimator import meanEstimates
 from sysquant.estimators.generic_estimator import genericEstimator
 
-from sysquant.optimisation.optimisers.call_optimiser import optimiser_for_method
+from sysquant.optimisation.optimisers.call_optimiser import (
+    optimiser_for_method,
+    optimiser_for_method_with_stacked_estimates,
+    can_optimise_stacked_estimates,
+)
 from sysquant.optimisation.weights import (
     portfolioWeights,
     one_over_n_weights_given_data,
     estimatesWithPortfolioWeights,
 )
-from sysquant.estimators.estimates import Estimates
+from sysquant.estimators.estimates import Estimates, stackedEstimates
 from sysquant.optimisation.cleaning import clean_weights, get_must_have_dict_from_data
 
 from sysquant.returns import returnsForOptimisation
@@ -73,6 +79,67 @@ class portfolioOptimiser:
 
         return weights
 
+    @property
+    def can_optimise_all_periods_at_once(self) -> bool:
+        return can_optimise_stacked_estimates(self.method)
+
+    def calculate_weights_for_list_of_periods(
+        self, list_of_fit_periods: list
+    ) -> list:
+        """
+        Same as calling calculate_weights_for_period for each period, but if we can we optimise all the
+          periods with data in one go
+
+        :returns: list of portfolioWeights, one for each period
+        """
+        if not self.can_optimise_all_periods_at_once:
+            return [
+                self.calculate_weights_for_period(fit_period)
+                for fit_period in list_of_fit_periods
+            ]
+
+        periods_with_data = [
+            fit_period for fit_period in list_of_fit_periods if not fit_period.no_data
+        ]
+        weights_for_periods_with_data = iter(
+            self.calculate_weights_given_data_for_list_of_periods(periods_with_data)
+        )
+
+        weight_list = []
+        for fit_period in list_of_fit_periods:
+            if fit_period.no_data:
+                weights = one_over_n_weights_given_data(self.net_returns)
+            else:
+                weights = next(weights_for_periods_with_data)
+                if self.cleaning:
+                    weights = self.clean_weights_for_period(
+                        weights, fit_period=fit_period
+                    )
+            weight_list.append(weights)
+
+        return weight_list
+
+    def calculate_weights_given_data_for_list_of_periods(
+        self, list_of_fit_periods: list
+    ) -> list:
+        if len(list_of_fit_periods) == 0:
+            return []
+
+        stacked_estimates = self.get_stacked_estimators_for_periods(
+            list_of_fit_periods
+        )
+        stacked_weights = optimiser_for_method_with_stacked_estimates(
+            self.method, stacked_estimates=stacked_estimates, **self.weighting_args
+        )
+
+        asset_names = stacked_estimates.asset_names
+        weight_list = [
+            _portfolio_weights_from_row_of_stacked_weights(weights, asset_names)
+            for weights in stacked_weights
+        ]
+
+        return weight_list
+
     def clean_weights_for_period(
         self, weights: portfolioWeights, fit_period: fitDates
     ) -> portfolioWeights:
@@ -88,6 +155,9 @@ class portfolioOptimiser:
         return cleaned_weights
 
     def calculate_weights_given_data(self, fit_period: fitDates) -> portfolioWeights:
+        if self.can_optimise_all_periods_at_once:
+            # so we get exactly the same answer whether we do periods together or one at a time
+            return self.calculate_weights_given_data_for_list_of_periods([fit_period])[0]
 
         estimates_and_portfolio_weights = (
             self.get_weights_and_returned_estimates_for_period(fit_period)
@@ -129,6 +199,18 @@ class portfolioOptimiser:
 
         return estimates
 
+    def get_stacked_estimators_for_periods(
+        self, list_of_fit_periods: list
+    ) -> stackedEstimates:
+        list_of_estimates = [
+            self.get_estimators_for_period(fit_period)
+            for fit_period in list_of_fit_periods
+        ]
+
+        return stackedEstimates.from_list_of_estimates(
+            list_of_estimates, asset_names=list(self.net_returns.columns)
+        )
+
     def data_length_for_period(self, fit_period: fitDates) -> int:
         if fit_period.no_data:
             return 0
@@ -167,7 +249,7 @@ class portfolioOptimiser:
         estimator = getattr(self, store_as_name, None)
         if estimator is None:
             estimator = self._get_estimator(param_entry)
-            setattr(self, param_entry, estimator)
+            setattr(self, store_as_name, estimator)
 
         return estimator
 
@@ -183,3 +265,15 @@ class portfolioOptimiser:
         estimator = function_object(data, **params)
 
         return estimator
+
+
+def _portfolio_weights_from_row_of_stacked_weights(
+    weights: np.array, asset_names: list
+) -> portfolioWeights:
+    if np.all(np.isnan(weights)):
+        # as optimiser_for_method, when there is no valid data
+        return portfolioWeights.allnan([])
+
+    return portfolioWeights.from_weights_and_keys(
+        list_of_weights=list(weights), list_of_keys=asset_names
+    )
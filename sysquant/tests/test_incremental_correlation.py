@@ -0,0 +1,150 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from sysquant.estimators.correlation_estimator import (
+    correlationEstimator,
+    correlation_estimator_for_subperiod,
+)
+from sysquant.estimators.correlations import correlationEstimate
+from sysquant.estimators.diversification_multipliers import (
+    diversification_mult_for_stacked_weights,
+    diversification_mult_single_period,
+)
+from sysquant.estimators.incremental_correlation import (
+    exponentialCorrelationState,
+    correlationMomentsByBlock,
+)
+from sysquant.fitting_dates import generate_fitting_dates
+from sysquant.optimisation.weights import portfolioWeights
+
+
+def _returns_with_gaps(n_assets: int = 6, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    index = pd.bdate_range("2010-01-01", periods=800)
+    common = rng.normal(size=(len(index), 1))
+    returns = pd.DataFrame(
+        0.5 * common + rng.normal(size=(len(index), n_assets)),
+        index=index,
+        columns=["asset%d" % i for i in range(n_assets)],
+    )
+    returns.iloc[:300, 1] = np.nan
+    returns.iloc[400:450, 2] = np.nan
+    returns.iloc[rng.integers(0, len(index), 40), 3] = np.nan
+    returns.iloc[:, 4] = returns.iloc[:, 4].where(returns.index > index[700])
+
+    return returns
+
+
+class TestIncrementalCorrelation:
+    def test_exponential_matches_pandas(self):
+        returns = _returns_with_gaps()
+        expected = returns.ewm(span=25, min_periods=20, ignore_na=True).corr(
+            pairwise=True
+        )
+        state = exponentialCorrelationState(returns, ew_lookback=25, min_periods=20)
+
+        for row_idx in [0, 19, 250, 420, 701, 799, 100]:
+            expected_matrix = expected.loc[returns.index[row_idx]].values
+            np.testing.assert_allclose(
+                state.correlation_at_row(row_idx), expected_matrix, rtol=1e-10
+            )
+
+    def test_nothing_before_first_date(self):
+        returns = _returns_with_gaps()
+        state = exponentialCorrelationState(returns, ew_lookback=25, min_periods=20)
+
+        assert state.last_correlation_before_date(returns.index[0]).shape == (0, 6)
+
+    @pytest.mark.parametrize("date_method", ["expanding", "rolling", "in_sample"])
+    def test_moments_match_correlation_for_subperiod(self, date_method):
+        returns = _returns_with_gaps()
+        estimator = correlationEstimator(returns, using_exponent=False)
+        fit_dates = generate_fitting_dates(
+            returns, date_method=date_method, rollyears=1, interval_frequency="3M"
+        )
+
+        for fit_period in fit_dates:
+            if fit_period.no_data:
+                continue
+            expected = correlation_estimator_for_subperiod(returns, fit_period)
+            result = estimator.calculate_estimate_for_period(fit_period)
+
+            np.testing.assert_allclose(result.values, expected.values, atol=1e-10)
+
+    @pytest.mark.parametrize("date_method", ["expanding", "rolling"])
+    def test_moments_match_pandas_for_long_series_with_large_mean(self, date_method):
+        ## differences of running sums of x^2 would lose most of the precision here
+        rng = np.random.default_rng(2)
+        index = pd.bdate_range("1980-01-01", periods=12000)
+        common = rng.normal(size=(len(index), 1))
+        data = pd.DataFrame(
+            1e6 + 0.5 * common + rng.normal(size=(len(index), 4)),
+            index=index,
+            columns=["a", "b", "c", "d"],
+        )
+        data.iloc[:2000, 1] = np.nan
+        data.iloc[5000:5500, 2] = np.nan
+
+        moments = correlationMomentsByBlock(data)
+        fit_dates = generate_fitting_dates(
+            data, date_method=date_method, rollyears=5, interval_frequency="3M"
+        )
+        for fit_period in fit_dates:
+            if fit_period.no_data:
+                continue
+            expected = data[fit_period.fit_start : fit_period.fit_end].corr()
+            result = moments.correlation_for_period(
+                fit_period.fit_start, fit_period.fit_end
+            )
+
+            np.testing.assert_allclose(result, expected.values, atol=1e-8)
+
+    def test_moments_for_constant_series(self):
+        returns = _returns_with_gaps()
+        returns["asset5"] = 0.1
+        moments = correlationMomentsByBlock(returns)
+        correlation = moments.correlation_for_period(
+            returns.index[0], returns.index[-1]
+        )
+
+        assert np.isnan(correlation[5]).all()
+        np.testing.assert_allclose(
+            correlation[:5, :5], returns.iloc[:, :5].corr().values, rtol=1e-10
+        )
+
+
+class TestStackedDiversificationMultiplier:
+    def test_matches_single_period(self):
+        rng = np.random.default_rng(1)
+        assets = ["a", "b", "c", "d"]
+        corr_values = np.corrcoef(rng.normal(size=(50, 4)), rowvar=False)
+        corr_with_missing = corr_values.copy()
+        corr_with_missing[3, :] = np.nan
+        corr_with_missing[:, 3] = np.nan
+
+        stacked_corr = np.array([corr_values, corr_with_missing, corr_values])
+        stacked_weights = np.array(
+            [[0.25, 0.25, 0.25, 0.25], [0.3, 0.3, 0.2, 0.2], [0.5, np.nan, 0.5, 0.0]]
+        )
+
+        result = diversification_mult_for_stacked_weights(
+            stacked_corr, stacked_weights, dm_max=2.5
+        )
+        expected = [
+            diversification_mult_single_period(
+                correlationEstimate(corr, columns=assets),
+                portfolioWeights(dict(zip(assets, weights))),
+                dm_max=2.5,
+            )
+            for corr, weights in zip(stacked_corr, stacked_weights)
+        ]
+
+        np.testing.assert_allclose(result, expected, rtol=1e-12)
+
+    def test_no_risk(self):
+        result = diversification_mult_for_stacked_weights(
+            np.array([np.eye(2)]), np.array([[0.0, 0.0]])
+        )
+
+        assert result[0] == 1.0
@@ -0,0 +1,39 @@
+import os
+
+import pandas as pd
+
+from sysquant.optimisation.parallel import estimate_weights_in_worker_pool
+
+
+class _fakeOptimiser(object):
+    def __init__(self, weight: float):
+        self._weight = weight
+
+    def weights(self) -> pd.DataFrame:
+        return pd.DataFrame(
+            dict(rule1=[self._weight], rule2=[1.0 - self._weight], pid=[os.getpid()]),
+            index=pd.to_datetime(["2020-01-01"]),
+        )
+
+
+def _optimisers() -> dict:
+    return dict([("instrument%d" % i, _fakeOptimiser(i / 10.0)) for i in range(6)])
+
+
+class TestParallelOptimisation:
+    def test_worker_pool_matches_one_process(self):
+        in_one_process = estimate_weights_in_worker_pool(_optimisers(), n_workers=1)
+        in_workers = estimate_weights_in_worker_pool(_optimisers(), n_workers=3)
+
+        assert list(in_workers.keys()) == list(in_one_process.keys())
+        for asset_name, weights in in_one_process.items():
+            pd.testing.assert_frame_equal(
+                in_workers[asset_name][["rule1", "rule2"]], weights[["rule1", "rule2"]]
+            )
+
+        assert all(
+            weights.pid.iloc[0] == os.getpid() for weights in in_one_process.values()
+        )
+        assert all(
+            weights.pid.iloc[0] != os.getpid() for weights in in_workers.values()
+        )
@@ -0,0 +1,193 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from sysquant.fitting_dates import fitDates, generate_fitting_dates
+from sysquant.optimisation.portfolio_optimiser import portfolioOptimiser
+from sysquant.optimisation.SR_adjustment import (
+    adjust_dataframe_of_weights_for_SR,
+    adjust_weights_for_SR,
+    mini_bootstrap_ratio_given_SR_diff,
+    optimise_using_correlation,
+    weight_of_first_asset_with_optimal_SR,
+)
+from sysquant.optimisation.weights import (
+    one_over_n_weights_given_data,
+    portfolioWeights,
+)
+from sysquant.returns import returnsForOptimisation
+
+WEIGHTING_ARGS = dict(
+    cleaning=True,
+    ann_target_SR=0.5,
+    equalise_vols=True,
+    correlation_estimate=dict(
+        func="sysquant.estimators.correlation_estimator.correlationEstimator",
+        using_exponent=True,
+        ew_lookback=500,
+        min_periods=10,
+        cleaning=False,
+        floor_at_zero=False,
+    ),
+    mean_estimate=dict(
+        func="sysquant.estimators.mean_estimator.meanEstimator",
+        using_exponent=True,
+        ew_lookback=500,
+        min_periods=5,
+    ),
+    vol_estimate=dict(
+        func="sysquant.estimators.stdev_estimator.stdevEstimator",
+        using_exponent=True,
+        ew_lookback=500,
+        min_periods=5,
+    ),
+)
+
+
+def _returns_for_optimisation() -> returnsForOptimisation:
+    rng = np.random.default_rng(3)
+    index = pd.date_range("2000-01-07", periods=52 * 8, freq="W-FRI")
+    factors = rng.normal(size=(len(index), 3))
+    loadings = rng.normal(size=(3, 8))
+    ## not in alphabetical order, as the stacked optimisers have to cope with that
+    returns = pd.DataFrame(
+        0.5 * factors.dot(loadings) + rng.normal(size=(len(index), 8)) + 0.05,
+        index=index,
+        columns=["rule%s" % letter for letter in "kdbafcgh"],
+    )
+    returns.iloc[:100, 2] = np.nan
+    returns.iloc[:250, 5] = np.nan
+
+    return returnsForOptimisation(returns, frequency="W")
+
+
+def _weights_for_period_without_stacking(
+    optimiser: portfolioOptimiser, fit_period: fitDates
+) -> portfolioWeights:
+    if fit_period.no_data:
+        return one_over_n_weights_given_data(optimiser.net_returns)
+
+    weights = optimiser.get_weights_and_returned_estimates_for_period(
+        fit_period
+    ).weights
+
+    return optimiser.clean_weights_for_period(weights, fit_period=fit_period)
+
+
+class TestStackedOptimisation:
+    @pytest.mark.parametrize("method", ["handcraft", "one_period"])
+    @pytest.mark.parametrize("equalise_SR", [False, True])
+    def test_matches_one_period_at_a_time(self, method, equalise_SR):
+        returns = _returns_for_optimisation()
+        optimiser = portfolioOptimiser(
+            returns, method=method, equalise_SR=equalise_SR, **WEIGHTING_ARGS
+        )
+        fit_dates = generate_fitting_dates(returns, date_method="expanding")
+        assert optimiser.can_optimise_all_periods_at_once
+
+        ## calculate_weights_for_period goes through the stacked code, so use the original path
+        one_at_a_time = pd.DataFrame(
+            [_weights_for_period_without_stacking(optimiser, period) for period in fit_dates]
+        )
+        all_at_once = pd.DataFrame(
+            optimiser.calculate_weights_for_list_of_periods(list(fit_dates))
+        )
+
+        pd.testing.assert_frame_equal(
+            all_at_once[returns.columns], one_at_a_time[returns.columns], atol=1e-7
+        )
+
+    def test_other_methods_one_period_at_a_time(self):
+        returns = _returns_for_optimisation()
+        optimiser = portfolioOptimiser(
+            returns, method="equal_weights", **WEIGHTING_ARGS
+        )
+        fit_dates = generate_fitting_dates(returns, date_method="expanding")
+
+        assert not optimiser.can_optimise_all_periods_at_once
+        assert len(optimiser.calculate_weights_for_list_of_periods(fit_dates)) == len(
+            fit_dates
+        )
+
+
+class TestSRAdjustment:
+    @pytest.mark.parametrize("asset1_SR", [-0.3, 0.2, 0.5, 0.7, 1.5])
+    @pytest.mark.parametrize("avg_correlation", [-0.2, 0.0, 0.5, 0.9])
+    def test_closed_form_matches_optimiser(self, asset1_SR, avg_correlation):
+        weight_first_asset = weight_of_first_asset_with_optimal_SR(
+            asset1_SR * 0.15, average_mean=0.5 * 0.15, avg_correlation=avg_correlation
+        )
+        optimised_weights = optimise_using_correlation(
+            [asset1_SR * 0.15, 0.5 * 0.15], avg_correlation=avg_correlation, std=0.15
+        )
+
+        ## the optimiser only gets close
+        np.testing.assert_allclose(weight_first_asset, optimised_weights[0], atol=0.01)
+
+    @pytest.mark.parametrize(
+        "asset1_mean, avg_correlation",
+        [(0.0752, 0.99), (0.09, 0.99), (0.07, 0.99), (0.08, 0.9), (0.05, 0.5), (0.06, 0.0)],
+    )
+    def test_closed_form_is_maximum_SR(self, asset1_mean, avg_correlation):
+        ## search every weight, rather than trusting an optimiser
+        std = 0.15
+        average_mean = 0.075
+        weights = np.linspace(0.0, 1.0, 100001)
+        portfolio_std = std * np.sqrt(
+            weights**2
+            + (1 - weights) ** 2
+            + 2 * avg_correlation * weights * (1 - weights)
+        )
+        portfolio_SR = (
+            weights * asset1_mean + (1 - weights) * average_mean
+        ) / portfolio_std
+
+        weight_first_asset = weight_of_first_asset_with_optimal_SR(
+            asset1_mean, average_mean=average_mean, avg_correlation=avg_correlation
+        )
+
+        np.testing.assert_allclose(
+            weight_first_asset, weights[np.argmax(portfolio_SR)], atol=1e-4
+        )
+
+    @pytest.mark.parametrize(
+        "SR_diff, avg_correlation, years_of_data, expected_ratio",
+        [
+            ## the SLSQP optimiser used before gave 0.25 and 1.75 for the first two, as it stayed at equal
+            ## weights for some confidence points
+            (-0.05, 0.99, 5, 0.41011584300996),
+            (0.05, 0.99, 5, 1.5888468434821252),
+            (-0.1, 0.9, 5, 0.5035207855256252),
+            (0.1, 0.5, 10, 1.1806652996315599),
+            (-0.3, 0.5, 10, 0.26232196709470174),
+            (0.3, 0.0, 10, 1.1926349199332023),
+        ],
+    )
+    def test_bootstrap_ratio(
+        self, SR_diff, avg_correlation, years_of_data, expected_ratio
+    ):
+        ratio = mini_bootstrap_ratio_given_SR_diff(
+            SR_diff, avg_correlation, years_of_data
+        )
+
+        np.testing.assert_allclose(ratio, expected_ratio, rtol=1e-10)
+
+    def test_dataframe_matches_row_by_row(self):
+        weights = pd.DataFrame(
+            [[0.2, 0.3, 0.5], [0.6, 0.2, 0.2], [0.1, np.nan, 0.9]],
+            columns=["a", "b", "c"],
+        )
+        SR_list = [0.1, 0.5, -0.2]
+
+        result = adjust_dataframe_of_weights_for_SR(
+            weights, SR_list=SR_list, avg_correlation=0.5, years_of_data=10
+        )
+        expected = [
+            adjust_weights_for_SR(
+                list(row), SR_list=SR_list, avg_correlation=0.5, years_of_data=10
+            )
+            for row in weights.values
+        ]
+
+        np.testing.assert_allclose(result.values, expected, rtol=1e-12)
+        assert result.iloc[2].isna().all()
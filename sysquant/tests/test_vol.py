@@ -0,0 +1,48 @@
+import numpy as np
+import pandas as pd
+
+from sysquant.estimators.vol import (
+    robust_vol_calc,
+    mixed_vol_calc,
+    simple_ewvol_calc,
+    vol_calc_for_dict_of_returns,
+)
+
+
+def _dict_of_daily_returns() -> dict:
+    long_index = pd.bdate_range("2000-01-03", periods=1500)
+    short_index = pd.bdate_range("2002-06-03", periods=400)
+    # missing dates which the others have, so can't go in the panel
+    index_with_gaps = long_index[::2]
+
+    list_of_indices = [long_index, short_index, index_with_gaps]
+    rng = np.random.default_rng(0)
+
+    return dict(
+        [
+            (
+                instrument_code,
+                pd.Series(rng.normal(size=len(index)), index=index, name="price"),
+            )
+            for instrument_code, index in zip(["A", "B", "C"], list_of_indices)
+        ]
+    )
+
+
+class TestVolCalcForDictOfReturns:
+    def test_matches_single_instrument(self):
+        dict_of_daily_returns = _dict_of_daily_returns()
+        for vol_function in [robust_vol_calc, mixed_vol_calc, simple_ewvol_calc]:
+            dict_of_vol = vol_calc_for_dict_of_returns(
+                vol_function, dict_of_daily_returns, days=20, backfill=True
+            )
+
+            assert list(dict_of_vol.keys()) == ["A", "B", "C"]
+            for instrument_code, daily_returns in dict_of_daily_returns.items():
+                pd.testing.assert_series_equal(
+                    dict_of_vol[instrument_code],
+                    vol_function(daily_returns, days=20, backfill=True),
+                )
+
+    def test_empty_dict(self):
+        assert vol_calc_for_dict_of_returns(robust_vol_calc, {}) == {}
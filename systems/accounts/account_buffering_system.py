@@ -1,6 +1,6 @@
 import pandas as pd
 
-from syscore.algos import apply_buffer
+from syscore.algos import apply_buffer, apply_buffer_to_dict_of_positions
 from syscore.objects import missing_data
 from syscore.pdutils import turnover
 from systems.system_cache import diagnostic
@@ -86,6 +86,13 @@ class accountBufferingSystemLevel(accountInputs):
             else:
                 return optimal_position
 
+        if instrument_code in self.get_instrument_list():
+            # notional positions depend on all the instruments anyway, so buffer them all at once
+            buffered_positions = self.get_buffered_positions_for_all_instruments(
+                roundpositions=roundpositions
+            )
+            return buffered_positions[instrument_code]
+
         pos_buffers = self.get_buffers_for_position(instrument_code)
 
         buffered_position = (
@@ -98,6 +105,46 @@ class accountBufferingSystemLevel(accountInputs):
 
         return buffered_position
 
+    @diagnostic()
+    def get_buffered_positions_for_all_instruments(
+        self, roundpositions: bool = True
+    ) -> dict:
+        """
+        Get the buffered positions for every instrument in the system, in one go
+
+        Only used when there is a buffer_method; otherwise positions aren't buffered
+
+        :param roundpositions: Round positions to whole contracts
+        :type roundpositions: bool
+
+        :returns: dict of pd.Series, keys are instrument codes
+        """
+        instrument_list = self.get_instrument_list()
+        dict_of_optimal_positions = dict(
+            [
+                (instrument_code, self.get_notional_position(instrument_code))
+                for instrument_code in instrument_list
+            ]
+        )
+        dict_of_pos_buffers = dict(
+            [
+                (instrument_code, self.get_buffers_for_position(instrument_code))
+                for instrument_code in instrument_list
+            ]
+        )
+
+        self.log.msg("Calculating buffered positions for all instruments")
+        trade_to_edge = self.config.buffer_trade_to_edge
+
+        buffered_positions = apply_buffer_to_dict_of_positions(
+            dict_of_optimal_positions,
+            dict_of_pos_buffers,
+            trade_to_edge=trade_to_edge,
+            roundpositions=roundpositions,
+        )
+
+        return buffered_positions
+
     def _get_buffered_position_given_optimal_position_and_buffers(
         self,
         optimal_position: pd.Series,
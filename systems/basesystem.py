@@ -15,6 +15,8 @@ This is used for items which affect an entire system, not just one instrument
 """
 ALL_KEYNAME = "all"
 
+BYTES_PER_MB = 1024 * 1024
+
 
 class System(object):
     """
@@ -75,6 +77,28 @@ class System(object):
         self.data.system_init(self)
         self._setup_stages(stage_list)
         self._cache = systemCache(self)
+        self._setup_disk_cache()
+        self._setup_cache_size_limit()
+
+    def _setup_disk_cache(self):
+        disk_cache_directory = self.config.get_element_or_missing_data(
+            "disk_cache_directory"
+        )
+        if disk_cache_directory is missing_data:
+            return
+
+        self.log.msg("Using disk cache in %s" % disk_cache_directory)
+        self.cache.set_disk_cache_directory(disk_cache_directory)
+
+    def _setup_cache_size_limit(self):
+        cache_size_limit_mb = self.config.get_element_or_missing_data(
+            "cache_size_limit_mb"
+        )
+        if cache_size_limit_mb is missing_data:
+            return
+
+        self.log.msg("Limiting cache size to %.0fMB" % cache_size_limit_mb)
+        self.cache.set_max_size_in_bytes(int(cache_size_limit_mb * BYTES_PER_MB))
 
     def _setup_stages(self, stage_list: list):
         stage_names = []
@@ -385,6 +409,32 @@ class System(object):
 
         return bad_markets
 
+    def precalculate(
+        self,
+        instrument_list: list = arg_not_supplied,
+        n_workers: int = 1,
+        list_of_phases: list = arg_not_supplied,
+    ):
+        """
+        Populate the cache by running the per instrument part of the system for each instrument,
+        optionally spread over a pool of processes. See systems.precalculate for details.
+
+        :param instrument_list: instruments to precalculate, defaults to self.get_instrument_list()
+        :param n_workers: number of processes; 1 means run in this process
+        :param list_of_phases: list of lists of functions(system, instrument_code), defaults to
+                               positions via raw and capped forecasts
+        :return: None
+        """
+        # avoid circular import
+        from systems.precalculate import precalculate_system
+
+        precalculate_system(
+            self,
+            instrument_list=instrument_list,
+            n_workers=n_workers,
+            list_of_phases=list_of_phases,
+        )
+
     def get_list_of_short_history(self, days_required: int = 750) -> list:
         instrument_list = self.data.get_instrument_list()
 
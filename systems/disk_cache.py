@@ -0,0 +1,195 @@
+"""
+A second, persistent, tier for the system cache
+
+Each stage result is written to disk under a content addressed key; a hash of the cache reference,
+the values of the config elements and stage states it was calculated from, and the input data for the
+instruments it was calculated from.
+
+We don't know in advance what a given calculation depends on, so the first time it is done we trace
+the config elements, stages and instruments it touches (see systemCache.record_dependency) and store that
+list alongside the results. A result for one instrument depends on the data for that instrument, plus
+that of any other instrument whose results it used (eg when pooling); a result across instruments depends
+on the data for all of them. On a later run we hash the current values of those dependencies; if nothing
+they depend on has changed we get a hit, otherwise the item is recalculated and stored under a new key.
+
+So rerunning a backtest after changing eg forecast_cap will reload raw forecasts and volatilities from
+disk, but recalculate everything downstream of the forecast cap.
+
+NOTE: Changes to *code* are not detected. Clear the cache directory after upgrading or editing rules.
+"""
+
+import hashlib
+import os
+import pickle
+
+from syscore.fileutils import get_resolved_pathname
+from syscore.objects import missing_data
+
+CONFIG_DEPENDENCY = "config"
+STAGE_DEPENDENCY = "stage"
+DATA_DEPENDENCY = "data"
+
+# name of the data dependency for a result calculated across instruments
+ALL_INSTRUMENTS_DATA = ""
+
+DEPENDENCIES_EXTENSION = ".deps"
+VALUE_EXTENSION = ".pck"
+
+MISSING_FROM_DISK = object()
+
+
+class diskCache(object):
+    def __init__(self, parent_cache, pathname: str):
+        """
+        :param parent_cache: systemCache we are a tier of
+        :param pathname: directory in 'dot' format eg 'private.system_cache', or absolute path
+        """
+        self._parent_cache = parent_cache
+        self._directory = get_resolved_pathname(pathname)
+        os.makedirs(self._directory, exist_ok=True)
+
+        # data won't change within the life of a system, so only need to do these once
+        self._data_fingerprint = missing_data
+        self._data_fingerprint_by_instrument = {}
+
+    def __repr__(self):
+        return "Disk cache in %s" % self.directory
+
+    @property
+    def directory(self) -> str:
+        return self._directory
+
+    @property
+    def parent_cache(self):
+        return self._parent_cache
+
+    @property
+    def system(self):
+        return self.parent_cache.parent
+
+    def get_value_and_dependencies(self, cache_ref) -> tuple:
+        """
+        :returns: tuple (value, dependencies) or (MISSING_FROM_DISK, MISSING_FROM_DISK)
+        """
+        dependencies = self._get_dependencies_for_cache_ref(cache_ref)
+        if dependencies is MISSING_FROM_DISK:
+            return MISSING_FROM_DISK, MISSING_FROM_DISK
+
+        content_key = self._content_key(cache_ref, dependencies)
+        value = self._read_pickle_or_missing(self._value_filename(content_key))
+
+        return value, dependencies
+
+    def set_value_and_dependencies(self, value, cache_ref, dependencies: frozenset):
+        content_key = self._content_key(cache_ref, dependencies)
+
+        self._write_pickle(self._value_filename(content_key), value)
+        self._write_pickle(
+            self._dependencies_filename(cache_ref), sorted(list(dependencies))
+        )
+
+    def _get_dependencies_for_cache_ref(self, cache_ref):
+        dependencies = self._read_pickle_or_missing(
+            self._dependencies_filename(cache_ref)
+        )
+        if dependencies is MISSING_FROM_DISK:
+            return MISSING_FROM_DISK
+
+        return frozenset(dependencies)
+
+    def _content_key(self, cache_ref, dependencies: frozenset) -> str:
+        dependency_hashes = [
+            (dependency, self._hash_of_dependency(dependency))
+            for dependency in sorted(list(dependencies))
+        ]
+        key_contents = (_cache_ref_as_str(cache_ref), dependency_hashes)
+
+        return hash_of_object(key_contents)
+
+    def _hash_of_dependency(self, dependency: tuple) -> str:
+        dependency_type, name = dependency
+        if dependency_type == CONFIG_DEPENDENCY:
+            config_element = self.system.config.get_element_or_missing_data(name)
+            if config_element is missing_data:
+                return ""
+            return hash_of_object(config_element)
+
+        elif dependency_type == STAGE_DEPENDENCY:
+            stage = getattr(self.system, name)
+            return stage.disk_cache_fingerprint()
+
+        elif dependency_type == DATA_DEPENDENCY:
+            if name == ALL_INSTRUMENTS_DATA:
+                return self.data_fingerprint()
+            return self.data_fingerprint_for_instrument(name)
+
+        raise Exception("Dependency type %s not recognised" % dependency_type)
+
+    def data_fingerprint(self) -> str:
+        data_fingerprint = self._data_fingerprint
+        if data_fingerprint is missing_data:
+            data_fingerprint = self.system.data.data_fingerprint()
+            self._data_fingerprint = data_fingerprint
+
+        return data_fingerprint
+
+    def data_fingerprint_for_instrument(self, instrument_code: str) -> str:
+        data_fingerprint = self._data_fingerprint_by_instrument.get(
+            instrument_code, missing_data
+        )
+        if data_fingerprint is missing_data:
+            data_fingerprint = self.system.data.data_fingerprint_for_instrument(
+                instrument_code
+            )
+            self._data_fingerprint_by_instrument[instrument_code] = data_fingerprint
+
+        return data_fingerprint
+
+    def _value_filename(self, content_key: str) -> str:
+        return os.path.join(self.directory, content_key + VALUE_EXTENSION)
+
+    def _dependencies_filename(self, cache_ref) -> str:
+        ref_key = hash_of_object(_cache_ref_as_str(cache_ref))
+        return os.path.join(self.directory, ref_key + DEPENDENCIES_EXTENSION)
+
+    def _read_pickle_or_missing(self, filename: str):
+        if not os.path.isfile(filename):
+            return MISSING_FROM_DISK
+        try:
+            with open(filename, "rb") as fhandle:
+                return pickle.load(fhandle)
+        except Exception as e:
+            # a half written or incompatible file is the same as a missing one
+            self.system.log.warn("Couldn't read cache file %s: %s" % (filename, str(e)))
+            return MISSING_FROM_DISK
+
+    def _write_pickle(self, filename: str, value):
+        # write then rename, so a crashed run can't leave a half written file behind
+        temp_filename = filename + ".%d.tmp" % os.getpid()
+        with open(temp_filename, "wb") as fhandle:
+            pickle.dump(value, fhandle)
+        os.replace(temp_filename, filename)
+
+
+def _cache_ref_as_str(cache_ref) -> str:
+    return "%s/%s/%s/%s/%s" % (
+        cache_ref.stage_name,
+        cache_ref.itemname,
+        cache_ref.instrument_code,
+        cache_ref.keyname,
+        cache_ref.flags,
+    )
+
+
+def hash_of_object(some_object) -> str:
+    """
+    Hash which will be the same across runs (unlike hash()) for the same contents
+
+    Falls back to repr for things that can't be pickled
+    """
+    try:
+        as_bytes = pickle.dumps(some_object, protocol=4)
+    except Exception:
+        as_bytes = repr(some_object).encode("utf-8")
+
+    return hashlib.sha256(as_bytes).hexdigest()
@@ -28,6 +28,8 @@ from sysquant.estimators.turnover import (
     turnoverDataForTradingRule,
 )
 
+from sysquant.optimisation.parallel import estimate_weights_in_worker_pool
+
 from systems.stage import SystemStage
 from systems.system_cache import diagnostic, dont_cache, input, output
 from systems.forecasting import Rules
@@ -531,6 +533,7 @@ class ForecastCombine(SystemStage):
     def _use_estimated_weights(self):
         return str2Bool(self.config.use_forecast_weight_estimates)
 
+    @diagnostic()
     def get_monthly_raw_forecast_weights_estimated(
         self, instrument_code: str
     ) -> pd.DataFrame:
@@ -567,6 +570,13 @@ class ForecastCombine(SystemStage):
         2015-06-01  0.464240  0.192962  0.342798
         2015-12-12  0.464240  0.192962  0.342798
         """
+        if self._number_of_workers_for_forecast_weight_estimation() > 1:
+            forecast_weights_all_instruments = (
+                self.get_monthly_raw_forecast_weights_estimated_for_all_instruments()
+            )
+            if instrument_code in forecast_weights_all_instruments:
+                return forecast_weights_all_instruments[instrument_code]
+
         optimiser = self.calculation_of_raw_estimated_monthly_forecast_weights(
             instrument_code
         )
@@ -574,6 +584,43 @@ class ForecastCombine(SystemStage):
 
         return forecast_weights
 
+    @diagnostic(protected=True)
+    def get_monthly_raw_forecast_weights_estimated_for_all_instruments(self) -> dict:
+        """
+        Estimate the forecast weights for every instrument, with the optimisations spread over a pool of
+        worker processes
+
+        The returns for each instrument are pre-processed here, and the forked workers inherit them, so
+        they only do the optimisation and never need the system
+
+        :returns: dict of TxK pd.DataFrames; keynames instrument_code
+        """
+        instrument_list = self.parent.get_instrument_list()
+        n_workers = self._number_of_workers_for_forecast_weight_estimation()
+
+        self.log.terse(
+            "Estimating forecast weights for %d instruments with %d workers"
+            % (len(instrument_list), n_workers)
+        )
+
+        optimisers = dict(
+            [
+                (
+                    instrument_code,
+                    self.calculation_of_raw_estimated_monthly_forecast_weights(
+                        instrument_code
+                    ),
+                )
+                for instrument_code in instrument_list
+            ]
+        )
+
+        return estimate_weights_in_worker_pool(optimisers, n_workers=n_workers)
+
+    @dont_cache
+    def _number_of_workers_for_forecast_weight_estimation(self) -> int:
+        return int(self.config.forecast_weight_estimate_n_workers)
+
     @diagnostic(not_pickable=True, protected=True)
     def calculation_of_raw_estimated_monthly_forecast_weights(self, instrument_code):
         """
@@ -601,6 +648,10 @@ class ForecastCombine(SystemStage):
         # which function to use for calculation
         weighting_func = resolve_function(weighting_params.pop("func"))
 
+        if self._number_of_workers_for_forecast_weight_estimation() > 1:
+            # worker processes can't have their own pool to optimise each period
+            weighting_params.pop("n_threads", None)
+
         returns_pre_processor = self.returns_pre_processor_for_code(instrument_code)
 
         weight_func = weighting_func(
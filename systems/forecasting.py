@@ -1,9 +1,11 @@
 import pandas as pd
 
 from systems.stage import SystemStage
-from syscore.objects import arg_not_supplied
+from syscore.genutils import str2Bool
+from syscore.objects import arg_not_supplied, missing_data
 
-from systems.system_cache import output, dont_cache
+from systems.system_cache import diagnostic, output, dont_cache
+from systems.disk_cache import hash_of_object, STAGE_DEPENDENCY
 from systems.trading_rules import TradingRule
 
 
@@ -99,11 +101,78 @@ class Rules(SystemStage):
         trading_rule_dict = self.trading_rules()
         trading_rule = trading_rule_dict[rule_variation_name]
 
-        result = trading_rule.call(system, instrument_code)
+        if self._use_panel_for_rule(instrument_code, trading_rule):
+            result = self._get_raw_forecast_using_panel(
+                instrument_code, rule_variation_name
+            )
+        else:
+            result = trading_rule.call(system, instrument_code)
         result = pd.Series(result)
 
         return result
 
+    def _get_raw_forecast_using_panel(
+        self, instrument_code: str, rule_variation_name: str
+    ) -> pd.Series:
+        """
+        Raw forecasts for every instrument, from one call of the trading rule on a panel of data
+
+        The forecasts for the other instruments go straight into the cache, as if get_raw_forecast had
+        been called for them
+
+        Only used if use_panel_rule_evaluation is True, and the rule function is in panel_rule_functions
+        """
+        self.log.msg(
+            "Calculating raw forecast %s for all instruments" % rule_variation_name,
+            rule_variation_name=rule_variation_name,
+        )
+        cache = self.parent.cache
+        all_results, dependencies = cache.calculate_with_dependency_trace(
+            self._call_rule_on_panel_for_all_instruments, rule_variation_name
+        )
+
+        for other_instrument_code, result in all_results.items():
+            if other_instrument_code == instrument_code:
+                continue
+            cache_ref = cache.cache_ref(
+                self.get_raw_forecast, self, other_instrument_code, rule_variation_name
+            )
+            if cache_ref in cache:
+                continue
+            cache.set_item_calculated_with_another_item(
+                pd.Series(result), cache_ref, dependencies=dependencies
+            )
+
+        return all_results[instrument_code]
+
+    def _call_rule_on_panel_for_all_instruments(self, rule_variation_name: str) -> dict:
+        trading_rule = self.trading_rules()[rule_variation_name]
+        instrument_list = self.parent.get_instrument_list()
+
+        return trading_rule.call_on_panel(self.parent, instrument_list)
+
+    def _use_panel_for_rule(self, instrument_code: str, trading_rule: TradingRule) -> bool:
+        config = self.parent.config
+        use_panel = config.get_element_or_missing_data("use_panel_rule_evaluation")
+        if use_panel is missing_data or not str2Bool(use_panel):
+            return False
+
+        panel_rule_functions = config.get_element_or_missing_data(
+            "panel_rule_functions"
+        )
+        if panel_rule_functions is missing_data:
+            return False
+
+        if _function_name(trading_rule.function) not in panel_rule_functions:
+            return False
+
+        # the results for other instruments are kept in the cache, so without it we'd do this every time
+        if not self.parent.cache.are_we_caching():
+            return False
+
+        # eg a forecast for an instrument we aren't trading
+        return instrument_code in self.parent.get_instrument_list()
+
     @dont_cache
     def trading_rules(self):
         """
@@ -120,6 +189,8 @@ class Rules(SystemStage):
         # We have already parsed the trading rules for this object, just return
         # them
         if current_rules is not None:
+            # the config isn't read again, so need to tell the cache this was used
+            self.parent.cache.record_dependency(STAGE_DEPENDENCY, self.name)
             return current_rules
 
         trading_rules = self._get_trading_rules_from_passed_rules()
@@ -127,6 +198,9 @@ class Rules(SystemStage):
 
         return trading_rules
 
+    def disk_cache_fingerprint(self) -> str:
+        return hash_of_object(self.trading_rules())
+
     def _get_trading_rules_from_passed_rules(self):
 
         # What where we passed when object was created?
@@ -247,6 +321,10 @@ def _process_single_trading_rule(trading_rule):
     return processed_rules
 
 
+def _function_name(function) -> str:
+    return "%s.%s" % (function.__module__, function.__name__)
+
+
 if __name__ == "__main__":
     import doctest
 
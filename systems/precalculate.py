@@ -0,0 +1,173 @@
+"""
+Populate a system cache by running the per instrument part of the system (rawdata, rules, forecast
+scaling and capping, combination and position sizing) for a list of instruments, optionally spread over
+a pool of worker processes. Whatever the workers calculate is merged back into the cache of the parent
+system, so subsequent cross instrument calls (instrument weights, portfolio, accounts) are much faster.
+
+Things like pooled forecast turnover or forecast scalar estimates need forecasts for *other* instruments.
+So we run in phases: every instrument gets its raw forecasts before any instrument gets capped forecasts,
+and so on, see DEFAULT_PRECALCULATION_PHASES. Each phase forks a fresh pool from the parent, which by then has everything calculated in
+earlier phases. Cross instrument estimates (eg pooled forecast weights) will still be calculated in
+each worker that needs them.
+
+Before any of this the data object reads everything it will need for all the instruments in one go
+(see simData.prime_data_cache_for_instrument_list), so workers don't each go back to the database.
+
+Workers are forked so they get a copy of the system without having to pickle it; on platforms without
+fork we just run in one process. Items in the cache that can't be pickled (eg accountCurve objects)
+aren't sent back to the parent, and will be recalculated there if needed.
+"""
+
+import multiprocessing
+
+from syscore.genutils import progressBar
+from syscore.objects import arg_not_supplied
+
+
+def precalculate_raw_forecasts(system, instrument_code: str):
+    for rule_variation_name in system.combForecast.get_trading_rule_list(
+        instrument_code
+    ):
+        system.rules.get_raw_forecast(instrument_code, rule_variation_name)
+
+
+def precalculate_capped_forecasts(system, instrument_code: str):
+    for rule_variation_name in system.combForecast.get_trading_rule_list(
+        instrument_code
+    ):
+        system.forecastScaleCap.get_capped_forecast(
+            instrument_code, rule_variation_name
+        )
+
+
+def precalculate_forecast_turnover(system, instrument_code: str):
+    # turnover is usually pooled across instruments, which would mean each worker calculating it for every
+    # instrument; do the individual instrument turnovers here instead
+    if not hasattr(system, "accounts"):
+        return
+
+    for rule_variation_name in system.combForecast.get_trading_rule_list(
+        instrument_code
+    ):
+        system.accounts._forecast_turnover_for_individual_instrument(
+            instrument_code, rule_variation_name
+        )
+
+
+def precalculate_subsystem_position(system, instrument_code: str):
+    system.positionSize.get_subsystem_position(instrument_code)
+
+
+DEFAULT_PRECALCULATION_PHASES = [
+    [precalculate_raw_forecasts],
+    [precalculate_capped_forecasts],
+    [precalculate_forecast_turnover],
+    [precalculate_subsystem_position],
+]
+
+
+def precalculate_system(
+    system,
+    instrument_list: list = arg_not_supplied,
+    n_workers: int = 1,
+    list_of_phases: list = arg_not_supplied,
+):
+    if instrument_list is arg_not_supplied:
+        instrument_list = system.get_instrument_list()
+    if list_of_phases is arg_not_supplied:
+        list_of_phases = DEFAULT_PRECALCULATION_PHASES
+
+    if n_workers > 1 and not _can_fork():
+        system.log.warn(
+            "Can't fork processes on this platform, precalculating in one process"
+        )
+        n_workers = 1
+
+    # one parallel read of all the data, which forked workers will then inherit
+    system.data.prime_data_cache_for_instrument_list(instrument_list)
+
+    for phase_number, list_of_functions in enumerate(list_of_phases):
+        progress = progressBar(
+            len(instrument_list),
+            "Precalculating phase %d of %d" % (phase_number + 1, len(list_of_phases)),
+        )
+        if n_workers > 1:
+            _precalculate_phase_in_worker_pool(
+                system,
+                instrument_list=instrument_list,
+                list_of_functions=list_of_functions,
+                n_workers=n_workers,
+                progress=progress,
+            )
+        else:
+            for instrument_code in instrument_list:
+                _call_functions_for_instrument(
+                    system, instrument_code, list_of_functions
+                )
+                progress.iterate()
+
+        progress.finished()
+
+
+def _precalculate_phase_in_worker_pool(
+    system,
+    instrument_list: list,
+    list_of_functions: list,
+    n_workers: int,
+    progress: progressBar,
+):
+    global _system_in_worker, _functions_in_worker
+
+    # has to be set before the pool is created, so the forked workers inherit it
+    _system_in_worker = system
+    _functions_in_worker = list_of_functions
+
+    try:
+        with multiprocessing.get_context("fork").Pool(n_workers) as pool:
+            for new_cache_items in pool.imap_unordered(
+                _precalculate_in_worker, instrument_list
+            ):
+                _merge_into_cache(system, new_cache_items)
+                progress.iterate()
+    finally:
+        _system_in_worker = None
+        _functions_in_worker = None
+
+
+def _call_functions_for_instrument(system, instrument_code: str, list_of_functions: list):
+    for function in list_of_functions:
+        function(system, instrument_code)
+
+
+def _merge_into_cache(system, new_cache_items: dict):
+    cache = system.cache
+    for cache_ref, cache_element in new_cache_items.items():
+        # don't overwrite anything already in the parent, it will be the same
+        if cache_ref not in cache:
+            cache[cache_ref] = cache_element
+
+
+# Only used inside forked worker processes
+_system_in_worker = None
+_functions_in_worker = None
+
+
+def _can_fork() -> bool:
+    return "fork" in multiprocessing.get_all_start_methods()
+
+
+def _precalculate_in_worker(instrument_code: str) -> dict:
+    system = _system_in_worker
+    cache = system.cache
+    cache_refs_before = set(cache.get_items_with_data())
+
+    _call_functions_for_instrument(system, instrument_code, _functions_in_worker)
+
+    # only send back what we've added, and can be pickled to get it back
+    new_cache_refs = [
+        cache_ref
+        for cache_ref in cache._get_pickable_items()
+        if cache_ref not in cache_refs_before
+    ]
+
+    return dict([(cache_ref, cache[cache_ref]) for cache_ref in new_cache_refs])
@@ -211,19 +211,24 @@ class dataForOptimisation(object):
     ## not cached as not used by outside functions
     @property
     def _minima(self) -> portfolioWeights:
-        return self._min_max_and_direction_start.minima
+        return self.min_max_and_direction_start.minima
 
     @property
     def _maxima(self) -> portfolioWeights:
-        return self._min_max_and_direction_start.maxima
+        return self.min_max_and_direction_start.maxima
 
     @property
     def _starting_weights(self) -> portfolioWeights:
-        return self._min_max_and_direction_start.starting_weights
+        return self.min_max_and_direction_start.starting_weights
 
     @property
     def _direction(self) -> portfolioWeights:
-        return self._min_max_and_direction_start.direction
+        return self.min_max_and_direction_start.direction
+
+    ## cached, as we use it four times
+    @property
+    def min_max_and_direction_start(self) -> "minMaxAndDirectionAndStart":
+        return self.get_key("min_max_and_direction_start")
 
     @property
     def _min_max_and_direction_start(self) -> "minMaxAndDirectionAndStart":
@@ -1,5 +1,3 @@
-from copy import copy
-
 import numpy as np
 
 
@@ -10,81 +8,160 @@ def greedy_algo_across_integer_values(
     ## These will either be all zero, or in the presence of constraints will include the minima
     weight_start = obj_instance.starting_weights_as_np
     best_value = obj_instance.evaluate(weight_start)
-    best_solution = weight_start
-
-    at_limit = [False] * len(weight_start)
 
-    done = False
+    incremental_objective = incrementalObjectiveForGreedy(
+        obj_instance, weights=weight_start
+    )
+    at_limit = np.full(len(weight_start), False)
 
-    while not done:
-        new_best_value, new_solution, at_limit = _find_possible_new_best_live(
-            best_solution=best_solution,
+    while True:
+        new_best_value, index_to_step, at_limit = _find_possible_new_best_live(
+            incremental_objective=incremental_objective,
             best_value=best_value,
-            obj_instance=obj_instance,
             at_limit=at_limit,
         )
 
         if new_best_value < best_value:
             # reached a new optimium
             best_value = new_best_value
-            best_solution = new_solution
+            incremental_objective.take_step(index_to_step)
         else:
             # we can't do any better
             break
 
-    return best_solution
+    return incremental_objective.weights
 
 
 def _find_possible_new_best_live(
-    best_solution: np.array,
+    incremental_objective: "incrementalObjectiveForGreedy",
     best_value: float,
-    obj_instance: "objectiveFunctionForGreedy",
-    at_limit: list,
+    at_limit: np.array,
 ) -> tuple:
-    new_best_value = best_value
-    new_solution = best_solution
+    temp_steps = incremental_objective.weights_after_each_step()
+    at_limit = at_limit | _past_limit(
+        incremental_objective.obj_instance, temp_steps=temp_steps
+    )
+
+    ## we evaluate every possible step at once; those at their limit are excluded
+    temp_objective_values = incremental_objective.evaluate_each_step(
+        valid_steps=~at_limit
+    )
+    temp_objective_values[at_limit] = np.inf
+
+    # NaN is never better, like comparing with < in a loop; argmin returns the first of any ties
+    temp_objective_values[np.isnan(temp_objective_values)] = np.inf
+    index_to_step = int(np.argmin(temp_objective_values))
+    new_best_value = temp_objective_values[index_to_step]
+
+    if new_best_value < best_value:
+        return new_best_value, index_to_step, at_limit
+
+    return best_value, None, at_limit
+
 
-    per_contract_value = obj_instance.per_contract_value_as_np
+def _past_limit(
+    obj_instance: "objectiveFunctionForGreedy", temp_steps: np.array
+) -> np.array:
     direction = obj_instance.direction_as_np
+    maxima = np.array(obj_instance.maxima_as_np)
+    minima = np.array(obj_instance.minima_as_np)
+
+    return np.where(direction > 0, temp_steps > maxima, temp_steps < minima)
+
+
+class incrementalObjectiveForGreedy(object):
+    """
+    Evaluates objectiveFunctionForGreedy.evaluate for every possible single step of the greedy algorithm at once
 
-    count_assets = len(best_solution)
-    for i in range(count_assets):
-        if at_limit[i]:
-            continue
-        temp_step = copy(best_solution)
-        temp_step[i] = temp_step[i] + per_contract_value[i] * direction[i]
+    A step changes one weight, so rather than evaluating the quadratic form for the tracking error from scratch
+    for each step we use a rank one update from the current weights:
 
-        at_limit = _update_at_limit(
-            i, at_limit=at_limit, temp_step=temp_step, obj_instance=obj_instance
+        (g + d.e_i)' C (g + d.e_i) = g' C g + 2.d.(C g)_i + d^2.C_ii
+
+    where g is the gap between current and optimal weights. Costs are a sum over assets, so only one term changes.
+    Each step is then O(n) rather than O(n^2), and we do them all in one vectorised pass.
+    """
+
+    def __init__(self, obj_instance: "objectiveFunctionForGreedy", weights: np.array):
+        self._obj_instance = obj_instance
+        self._covariance = obj_instance.covariance_matrix_as_np
+        self._step_sizes = (
+            obj_instance.per_contract_value_as_np * obj_instance.direction_as_np
         )
-        if at_limit[i]:
-            continue
+        self._set_weights(np.array(weights, dtype=float))
 
-        temp_objective_value = obj_instance.evaluate(temp_step)
+    @property
+    def obj_instance(self) -> "objectiveFunctionForGreedy":
+        return self._obj_instance
 
-        if temp_objective_value < new_best_value:
-            new_best_value = temp_objective_value
-            new_solution = temp_step
+    @property
+    def weights(self) -> np.array:
+        return self._weights
 
-    return new_best_value, new_solution, at_limit
+    def weights_after_each_step(self) -> np.array:
+        ## element i is the weight of asset i after we step asset i
+        return self.weights + self._step_sizes
 
+    def take_step(self, index: int):
+        new_weights = np.copy(self.weights)
+        new_weights[index] = new_weights[index] + self._step_sizes[index]
 
-def _update_at_limit(
-    i: int,
-    at_limit: list,
-    temp_step: np.array,
-    obj_instance: "objectiveFunctionForGreedy",
-) -> list:
-    direction_this_item = obj_instance.direction_as_np[i]
-    temp_weight_this_item = temp_step[i]
-    if direction_this_item > 0:
-        max_this_item = obj_instance.maxima_as_np[i]
-        if temp_weight_this_item > max_this_item:
-            at_limit[i] = True
-
-    else:
-        min_this_item = obj_instance.minima_as_np[i]
-        if temp_weight_this_item < min_this_item:
-            at_limit[i] = True
-
-    return at_limit
+        # recalculated in full once per step, so rounding errors don't build up
+        self._set_weights(new_weights)
+
+    def evaluate_each_step(self, valid_steps: np.array) -> np.array:
+        tracking_error_of_steps = self._tracking_error_of_each_step(valid_steps)
+        costs_of_steps = self._costs_of_each_step()
+
+        return tracking_error_of_steps + costs_of_steps
+
+    def _set_weights(self, weights: np.array):
+        self._weights = weights
+        solution_gap = weights - self.obj_instance.weights_optimal_as_np
+
+        self._covariance_times_gap = self._covariance.dot(solution_gap)
+        self._track_error_var = solution_gap.dot(self._covariance_times_gap)
+
+        self._set_trade_costs(weights)
+
+    def _tracking_error_of_each_step(self, valid_steps: np.array) -> np.array:
+        step_sizes = self._step_sizes
+        track_error_var = (
+            self._track_error_var
+            + 2.0 * step_sizes * self._covariance_times_gap
+            + step_sizes ** 2 * np.diag(self._covariance)
+        )
+
+        if any(track_error_var[valid_steps] < 0):
+            ## can happen in some corner cases due to way covar estimated
+            ## this effectively means we won't trade until problem solved seems reasonable
+            msg = "Negative covariance when optimising!"
+            self.obj_instance.log.critical(msg)
+            raise Exception(msg)
+
+        # steps we don't take could have a negative variance; they are ignored
+        track_error_var[~valid_steps] = np.nan
+
+        return track_error_var ** 0.5
+
+    def _set_trade_costs(self, weights: np.array):
+        obj_instance = self.obj_instance
+        if obj_instance.no_prior_positions_provided:
+            return
+
+        self._trade_gap = weights - obj_instance.weights_prior_as_np_replace_nans_with_zeros
+        self._cost_per_unit_trade = (
+            obj_instance.costs_as_np * obj_instance.trade_shadow_cost
+        )
+        self._costs_by_asset = abs(self._cost_per_unit_trade * self._trade_gap)
+        self._total_costs = sum(self._costs_by_asset)
+
+    def _costs_of_each_step(self) -> np.array:
+        if self.obj_instance.no_prior_positions_provided:
+            return np.zeros(len(self.weights))
+
+        costs_by_asset_after_step = abs(
+            self._cost_per_unit_trade * (self._trade_gap + self._step_sizes)
+        )
+
+        return self._total_costs - self._costs_by_asset + costs_by_asset_after_step
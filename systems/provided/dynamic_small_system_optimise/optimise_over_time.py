@@ -0,0 +1,322 @@
+"""
+Run the dynamic optimisation for every day in a backtest
+
+Building the inputs for each day from pandas objects (covariance matrices in particular) takes much longer
+than the optimisation itself. So instead we get everything we need for all the days up front, as arrays
+with a row for each day and a column for each instrument. Correlations only change when they are
+re-estimated, so they are shrunk and aligned once per estimation period rather than every day.
+
+The optimisation on each day depends on the positions from the day before, so days have to be done in
+order. Optionally the history can be split into chunks which are optimised in parallel: each chunk starts
+with no positions a number of days (the warm up) before it is needed, by which time it will usually have
+converged to the positions it would have had if we had run through the whole history. Results can differ
+slightly from optimising in one go, so this is off by default.
+"""
+
+import multiprocessing
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from syscore.genutils import progressBar
+from syscore.objects import arg_not_supplied
+from sysquant.estimators.correlations import correlationEstimate
+from sysquant.estimators.mean_estimator import meanEstimates
+from sysquant.optimisation.weights import portfolioWeights
+from systems.provided.dynamic_small_system_optimise.buffering import (
+    speedControlForDynamicOpt,
+)
+from systems.provided.dynamic_small_system_optimise.data_for_optimisation import (
+    dataForOptimisation,
+)
+from systems.provided.dynamic_small_system_optimise.optimisation import (
+    objectiveFunctionForGreedy,
+    constraintsForDynamicOpt,
+)
+
+
+@dataclass
+class inputsForOptimisationOverTime:
+    """
+    Arrays are T x N, for T dates and N instruments; correlations are a list of N x N arrays, with
+    correlation_index saying which to use on each date
+    """
+
+    dates: pd.Index
+    instrument_list: list
+    contracts_optimal: np.ndarray
+    per_contract_value: np.ndarray
+    costs: np.ndarray
+    stdev: np.ndarray
+    correlation_index: np.ndarray
+    list_of_correlations: list
+    speed_control: speedControlForDynamicOpt
+    constraints: constraintsForDynamicOpt
+
+    def __post_init__(self):
+        self._assets_with_correlation_data = [
+            _assets_with_correlation_data(correlation)
+            for correlation in self.list_of_correlations
+        ]
+
+    def __len__(self):
+        return len(self.dates)
+
+    def objective_on_day(
+        self, day_idx: int, previous_positions: portfolioWeights
+    ) -> "objectiveFunctionForGreedyWithArrays":
+        instrument_list = self.instrument_list
+
+        return objectiveFunctionForGreedyWithArrays(
+            contracts_optimal=_weights_from_row(
+                instrument_list, self.contracts_optimal[day_idx]
+            ),
+            covariance_matrix=self.covariance_on_day(day_idx),
+            per_contract_value=_weights_from_row(
+                instrument_list, self.per_contract_value[day_idx]
+            ),
+            costs=meanEstimates(
+                _weights_from_row(instrument_list, self.costs[day_idx])
+            ),
+            previous_positions=previous_positions,
+            constraints=self.constraints,
+            speed_control=self.speed_control,
+        )
+
+    def covariance_on_day(self, day_idx: int) -> np.ndarray:
+        """
+        :returns: N x N np.array, rows and columns for instruments without data are nan
+        """
+        correlation_idx = self.correlation_index[day_idx]
+        correlation = self.list_of_correlations[correlation_idx]
+        stdev = self.stdev[day_idx]
+
+        has_data = self._assets_with_correlation_data[correlation_idx] & ~np.isnan(
+            stdev
+        )
+        valid_idx = np.flatnonzero(has_data)
+
+        # as sigma_from_corr_and_std, so we get exactly the same numbers
+        stdev_diag = np.diag(stdev[valid_idx])
+        sigma = stdev_diag.dot(correlation[np.ix_(valid_idx, valid_idx)]).dot(
+            stdev_diag
+        )
+
+        covariance = np.full(correlation.shape, np.nan)
+        covariance[np.ix_(valid_idx, valid_idx)] = sigma
+
+        return covariance
+
+
+class objectiveFunctionForGreedyWithArrays(objectiveFunctionForGreedy):
+    """
+    As objectiveFunctionForGreedy, but the covariance matrix is a np.array for all the keys (in the same
+    order as the per contract values), with nan for those without data
+    """
+
+    @property
+    def input_data(self):
+        input_data = getattr(self, "_input_data", None)
+        if input_data is None:
+            input_data = dataForOptimisationWithArrays(self)
+            self._input_data = input_data
+
+        return input_data
+
+
+class dataForOptimisationWithArrays(dataForOptimisation):
+    @property
+    def _keys_with_valid_data(self) -> list:
+        all_keys = list(self.per_contract_value.keys())
+        valid = (
+            ~np.all(np.isnan(self.covariance_matrix), axis=1)
+            & ~np.isnan(self.weights_optimal.as_np())
+            & ~np.isnan(self.per_contract_value.as_np())
+        )
+
+        return [key for key, key_is_valid in zip(all_keys, valid) if key_is_valid]
+
+    @property
+    def _covariance_matrix_as_np(self) -> np.array:
+        all_keys = list(self.per_contract_value.keys())
+        valid_idx = [all_keys.index(key) for key in self.keys_with_valid_data]
+
+        return self.covariance_matrix[np.ix_(valid_idx, valid_idx)]
+
+
+def _weights_from_row(instrument_list: list, row: np.ndarray) -> portfolioWeights:
+    return portfolioWeights(zip(instrument_list, row.tolist()))
+
+
+def _assets_with_correlation_data(correlation: np.ndarray) -> np.ndarray:
+    # as correlationEstimate.assets_with_missing_data
+    return (~np.isnan(correlation)).sum(axis=0) >= 2
+
+
+def correlation_as_np_for_instruments(
+    correlation: correlationEstimate, instrument_list: list
+) -> np.ndarray:
+    """
+    :returns: N x N np.array in the order of instrument_list; nan for instruments not in the correlation
+    """
+    correlation_as_pd = pd.DataFrame(
+        correlation.values, index=correlation.columns, columns=correlation.columns
+    )
+
+    return correlation_as_pd.reindex(
+        index=instrument_list, columns=instrument_list
+    ).values
+
+
+DEFAULT_WARMUP_DAYS = 250
+
+
+def optimise_positions_over_time(
+    inputs: inputsForOptimisationOverTime,
+    n_workers: int = 1,
+    warmup_days: int = DEFAULT_WARMUP_DAYS,
+    log=arg_not_supplied,
+) -> list:
+    """
+    :returns: list of portfolioWeights, positions for each date
+    """
+    if n_workers > 1 and not _can_fork():
+        n_workers = 1
+
+    if n_workers <= 1:
+        progress = progressBar(
+            len(inputs),
+            suffix="Optimising positions",
+            show_timings=True,
+            show_each_time=True,
+        )
+        position_list = optimise_positions_for_days(
+            inputs, start_idx=0, end_idx=len(inputs), progress=progress, log=log
+        )
+        progress.finished()
+
+        return position_list
+
+    return _optimise_positions_in_parallel_chunks(
+        inputs, n_workers=n_workers, warmup_days=warmup_days, log=log
+    )
+
+
+def optimise_positions_for_days(
+    inputs: inputsForOptimisationOverTime,
+    start_idx: int,
+    end_idx: int,
+    previous_positions: portfolioWeights = arg_not_supplied,
+    progress: progressBar = arg_not_supplied,
+    log=arg_not_supplied,
+) -> list:
+    if previous_positions is arg_not_supplied:
+        previous_positions = portfolioWeights.allzeros(inputs.instrument_list)
+
+    position_list = []
+    for day_idx in range(start_idx, end_idx):
+        optimal_positions = _optimise_positions_on_day(
+            inputs, day_idx=day_idx, previous_positions=previous_positions, log=log
+        )
+        position_list.append(optimal_positions)
+        previous_positions = optimal_positions
+        if progress is not arg_not_supplied:
+            progress.iterate()
+
+    return position_list
+
+
+def _optimise_positions_on_day(
+    inputs: inputsForOptimisationOverTime,
+    day_idx: int,
+    previous_positions: portfolioWeights,
+    log=arg_not_supplied,
+) -> portfolioWeights:
+    obj_instance = inputs.objective_on_day(
+        day_idx, previous_positions=previous_positions
+    )
+    try:
+        return obj_instance.optimise_positions()
+    except Exception as e:
+        msg = "Error %s when optimising at %s with previous positions %s" % (
+            str(e),
+            str(inputs.dates[day_idx]),
+            str(previous_positions),
+        )
+        if log is arg_not_supplied:
+            print(msg)
+        else:
+            log.warn(msg)
+
+        return previous_positions
+
+
+def _optimise_positions_in_parallel_chunks(
+    inputs: inputsForOptimisationOverTime,
+    n_workers: int,
+    warmup_days: int,
+    log=arg_not_supplied,
+) -> list:
+    global _inputs_in_worker
+
+    list_of_chunks = _chunks_with_warmup(
+        len(inputs), number_of_chunks=n_workers, warmup_days=warmup_days
+    )
+    progress = progressBar(
+        len(list_of_chunks), suffix="Optimising positions in parallel chunks"
+    )
+
+    # has to be set before the pool is created, so the forked workers inherit it
+    _inputs_in_worker = inputs
+    try:
+        position_list = []
+        with multiprocessing.get_context("fork").Pool(n_workers) as pool:
+            for positions_for_chunk in pool.imap(
+                _optimise_chunk_in_worker, list_of_chunks
+            ):
+                position_list += positions_for_chunk
+                progress.iterate()
+    finally:
+        _inputs_in_worker = None
+
+    progress.finished()
+
+    return position_list
+
+
+def _chunks_with_warmup(
+    number_of_days: int, number_of_chunks: int, warmup_days: int
+) -> list:
+    """
+    :returns: list of tuples (warmup start, start, end)
+
+    >>> _chunks_with_warmup(10, 3, 2)
+    [(0, 0, 3), (1, 3, 7), (5, 7, 10)]
+    """
+    boundaries = np.linspace(0, number_of_days, number_of_chunks + 1)
+    boundaries = boundaries.round().astype(int)
+
+    return [
+        (max(int(start) - warmup_days, 0), int(start), int(end))
+        for start, end in zip(boundaries[:-1], boundaries[1:])
+        if end > start
+    ]
+
+
+# Only used inside forked worker processes
+_inputs_in_worker = None
+
+
+def _can_fork() -> bool:
+    return "fork" in multiprocessing.get_all_start_methods()
+
+
+def _optimise_chunk_in_worker(chunk: tuple) -> list:
+    warmup_start_idx, start_idx, end_idx = chunk
+    position_list = optimise_positions_for_days(
+        _inputs_in_worker, start_idx=warmup_start_idx, end_idx=end_idx
+    )
+
+    # throw away the warm up
+    return position_list[start_idx - warmup_start_idx :]
@@ -1,6 +1,7 @@
 import datetime
 from copy import copy
 
+import numpy as np
 import pandas as pd
 
 from sysquant.estimators.stdev_estimator import stdevEstimates, seriesOfStdevEstimates
@@ -13,7 +14,6 @@ from sysquant.estimators.covariance import (
     covarianceEstimate,
     covariance_from_stdev_and_correlation,
 )
-from syscore.genutils import progressBar
 from syscore.objects import arg_not_supplied, missing_data
 from syscore.pdutils import calculate_cost_deflator, get_row_of_series
 from systems.provided.dynamic_small_system_optimise.optimisation import (
@@ -23,6 +23,11 @@ from systems.provided.dynamic_small_system_optimise.optimisation import (
 from systems.provided.dynamic_small_system_optimise.buffering import (
     speedControlForDynamicOpt,
 )
+from systems.provided.dynamic_small_system_optimise.optimise_over_time import (
+    inputsForOptimisationOverTime,
+    optimise_positions_over_time,
+    correlation_as_np_for_instruments,
+)
 
 from systems.stage import SystemStage
 from systems.system_cache import diagnostic
@@ -54,28 +59,122 @@ class optimisedPositions(SystemStage):
     @diagnostic()
     def get_optimised_position_df(self) -> pd.DataFrame:
         self.log.msg("Optimising positions for small capital: may take a while!")
-        common_index = list(self.common_index())
-        progress = progressBar(
-            len(common_index),
-            suffix="Optimising positions",
-            show_timings=True,
-            show_each_time=True
+        inputs = self.get_inputs_for_optimisation_over_time()
+        position_list = optimise_positions_over_time(
+            inputs,
+            n_workers=self.number_of_workers_for_optimisation(),
+            warmup_days=self.warmup_days_for_parallel_optimisation(),
+        )
+        position_df = pd.DataFrame(
+            position_list, index=inputs.dates, columns=inputs.instrument_list
         )
-        previous_optimal_positions = portfolioWeights.allzeros(self.instrument_list())
-        position_list = []
-        for relevant_date in common_index:
-            # self.log.msg(relevant_date)
-            optimal_positions = self.get_optimal_positions_with_fixed_contract_values(
-                relevant_date, previous_positions=previous_optimal_positions
-            )
-            position_list.append(optimal_positions)
-            previous_optimal_positions = copy(optimal_positions)
-            progress.iterate()
-        progress.finished()
-        position_df = pd.DataFrame(position_list, index=common_index)
 
         return position_df
 
+    def get_inputs_for_optimisation_over_time(self) -> inputsForOptimisationOverTime:
+        common_index = self.common_index()
+        instrument_list = self.instrument_list()
+
+        contracts_optimal = self.portfolio_stage.get_position_contracts_as_df()
+        per_contract_value = self.get_per_contract_value_as_proportion_of_capital_df()
+        costs = self.get_costs_per_contract_as_proportion_of_capital_df()
+        stdev = self.get_df_of_perc_vol_for_optimisation()
+        correlation_index, list_of_correlations = self.get_correlations_for_optimisation()
+
+        def _as_np(df: pd.DataFrame) -> np.ndarray:
+            return df.reindex(index=common_index, columns=instrument_list).values
+
+        return inputsForOptimisationOverTime(
+            dates=common_index,
+            instrument_list=instrument_list,
+            contracts_optimal=_as_np(contracts_optimal),
+            per_contract_value=_as_np(per_contract_value),
+            costs=_as_np(costs),
+            stdev=_as_np(stdev),
+            correlation_index=correlation_index,
+            list_of_correlations=list_of_correlations,
+            speed_control=self.get_speed_control(),
+            constraints=self.get_constraints(),
+        )
+
+    def get_costs_per_contract_as_proportion_of_capital_df(self) -> pd.DataFrame:
+        instrument_list = self.instrument_list()
+        costs = dict(
+            [
+                (
+                    instrument_code,
+                    self.get_cost_deflator(instrument_code)
+                    * self.get_cost_per_notional_weight_as_proportion_of_capital(
+                        instrument_code
+                    ),
+                )
+                for instrument_code in instrument_list
+            ]
+        )
+
+        return pd.DataFrame(costs)
+
+    def get_df_of_perc_vol_for_optimisation(self) -> pd.DataFrame:
+        df_of_vol = self.portfolio_stage.get_df_of_perc_vol()
+        common_index = self.common_index()
+        aligned_vol = pd.DataFrame(df_of_vol).reindex(common_index)
+
+        ## as get_stdev_on_date, dates before the first estimate use the first estimate
+        before_first_estimate = common_index < df_of_vol.index[0]
+        aligned_vol[before_first_estimate] = df_of_vol.iloc[0].values
+
+        return aligned_vol
+
+    def get_correlations_for_optimisation(self) -> tuple:
+        """
+        Correlations are only re-estimated occasionally, so rather than shrinking a correlation matrix on
+        every day we do each one once
+
+        :returns: tuple: np.array, index into the list for each date in common_index; list of N x N np.array
+        """
+        instrument_list = self.instrument_list()
+        list_of_instrument_correlations = (
+            self.portfolio_stage.get_list_of_instrument_returns_correlations()
+        )
+
+        ## as portfolio_stage.get_correlation_matrix, used before the first estimate
+        boring_correlation = create_boring_corr_matrix(
+            len(instrument_list), columns=instrument_list, offdiag=0.0
+        )
+        correlation_list = list(list_of_instrument_correlations.corr_list) + [
+            boring_correlation
+        ]
+        index_of_boring_correlation = len(correlation_list) - 1
+
+        fit_dates = list_of_instrument_correlations.fit_dates
+        correlation_index = []
+        for relevant_date in self.common_index():
+            try:
+                index_of_correlation = (
+                    fit_dates.index_of_most_recent_period_before_relevant_date(
+                        relevant_date
+                    )
+                )
+            except:
+                index_of_correlation = index_of_boring_correlation
+            correlation_index.append(index_of_correlation)
+
+        correlation_list = [
+            correlation_as_np_for_instruments(
+                self.shrink_correlation_matrix(correlation_matrix),
+                instrument_list=instrument_list,
+            )
+            for correlation_matrix in correlation_list
+        ]
+
+        return np.array(correlation_index), correlation_list
+
+    def number_of_workers_for_optimisation(self) -> int:
+        return int(self.config.small_system["n_workers"])
+
+    def warmup_days_for_parallel_optimisation(self) -> int:
+        return int(self.config.small_system["parallel_warmup_days"])
+
     def get_optimal_positions_with_fixed_contract_values(
         self,
         relevant_date: datetime.datetime = arg_not_supplied,
@@ -273,11 +372,19 @@ class optimisedPositions(SystemStage):
         corr_matrix = self.portfolio_stage.get_correlation_matrix(
             relevant_date=relevant_date
         )
-        corr_matrix = copy(corr_matrix.shrink_to_offdiag(shrinkage_corr=self.correlation_shrinkage,
-                                                         offdiag=0.0))
+        corr_matrix = self.shrink_correlation_matrix(corr_matrix)
 
         return corr_matrix
 
+    def shrink_correlation_matrix(
+        self, corr_matrix: correlationEstimate
+    ) -> correlationEstimate:
+        return copy(
+            corr_matrix.shrink_to_offdiag(
+                shrinkage_corr=self.correlation_shrinkage, offdiag=0.0
+            )
+        )
+
     @property
     def correlation_shrinkage(self) -> float:
         correlation_shrinkage = float(self.config.small_system['shrink_instrument_returns_correlation'])
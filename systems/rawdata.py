@@ -3,9 +3,11 @@ from copy import copy
 import pandas as pd
 
 from systems.stage import SystemStage
-from syscore.objects import resolve_function
+from syscore.genutils import str2Bool
+from syscore.objects import resolve_function, missing_data
 from syscore.dateutils import ROOT_BDAYS_INYEAR
 from syscore.pdutils import prices_to_daily_prices
+from sysquant.estimators.vol import vol_calc_for_dict_of_returns
 from systems.system_cache import input, diagnostic, output
 
 from sysdata.sim.futures_sim_data import futuresSimData
@@ -13,6 +15,7 @@ from sysdata.sim.multiple_types_sim_data import MultipleTypesSimData
 from sysdata.config.configdata import Config
 
 from sysobjects.carry_data import rawCarryData
+from sysobjects.instruments import assetClassesAndInstruments
 
 
 class RawData(SystemStage):
@@ -172,6 +175,10 @@ class RawData(SystemStage):
             instrument_code=instrument_code,
         )
 
+        if self._use_panel_for_vol(instrument_code):
+            all_vol = self.get_daily_returns_volatility_for_all_instruments()
+            return all_vol[instrument_code]
+
         dailyreturns = self.daily_returns(instrument_code)
         volconfig = copy(self.config.volatility_calculation)
 
@@ -184,6 +191,49 @@ class RawData(SystemStage):
 
         return vol
 
+    @diagnostic()
+    def get_daily_returns_volatility_for_all_instruments(self) -> dict:
+        """
+        Volatility of daily returns for every instrument, from one call of the vol function on a panel of returns
+
+        Only used if use_panel_vol_calculation is True, and the vol function is in panel_vol_functions
+
+        :returns: dict of pd.Series, keys are instrument codes
+        """
+        self.log.msg("Calculating daily volatility for all instruments")
+
+        instrument_list = self.parent.get_instrument_list()
+        dict_of_daily_returns = dict(
+            [
+                (instrument_code, self.daily_returns(instrument_code))
+                for instrument_code in instrument_list
+            ]
+        )
+        volconfig = copy(self.config.volatility_calculation)
+        volfunction = resolve_function(volconfig.pop("func"))
+
+        return vol_calc_for_dict_of_returns(
+            volfunction, dict_of_daily_returns, **volconfig
+        )
+
+    def _use_panel_for_vol(self, instrument_code: str) -> bool:
+        config = self.config
+        use_panel = config.get_element_or_missing_data("use_panel_vol_calculation")
+        if use_panel is missing_data or not str2Bool(use_panel):
+            return False
+
+        panel_vol_functions = config.get_element_or_missing_data("panel_vol_functions")
+        if panel_vol_functions is missing_data:
+            return False
+
+        vol_function = resolve_function(config.volatility_calculation["func"])
+        vol_function_name = "%s.%s" % (vol_function.__module__, vol_function.__name__)
+        if vol_function_name not in panel_vol_functions:
+            return False
+
+        # eg vol for an instrument we aren't trading
+        return instrument_code in self.parent.get_instrument_list()
+
     @output()
     def get_daily_percentage_returns(self, instrument_code: str) -> pd.Series:
         """
@@ -292,20 +342,29 @@ class RawData(SystemStage):
 
         return cum_norm_returns
 
-    @diagnostic()
     def _aggregate_daily_vol_normalised_returns_for_list_of_instruments(
         self, list_of_instruments: list
     ) -> pd.Series:
         """
-        Average normalised returns across an asset class
+        Average normalised returns across a list of instruments
 
-        :param asset_class: str
+        :param list_of_instruments: list of str
         :return: pd.Series
         """
+        # the same instruments in a different order are the same aggregate, so
+        # only calculate it once
+        return self._median_daily_vol_normalised_returns_for_instruments(
+            _sorted_unique_instruments(list_of_instruments)
+        )
+
+    @diagnostic()
+    def _median_daily_vol_normalised_returns_for_instruments(
+        self, instrument_codes: tuple
+    ) -> pd.Series:
 
         aggregate_returns_across_instruments_list = [
             self.get_daily_vol_normalised_returns(instrument_code)
-            for instrument_code in list_of_instruments
+            for instrument_code in instrument_codes
         ]
 
         aggregate_returns_across_instruments = pd.concat(
@@ -318,18 +377,26 @@ class RawData(SystemStage):
 
         return median_returns
 
-    @diagnostic()
     def _daily_vol_normalised_price_for_list_of_instruments(
         self, list_of_instruments: list
     ) -> pd.Series:
 
-        norm_returns = \
-            self._aggregate_daily_vol_normalised_returns_for_list_of_instruments(list_of_instruments)
+        return self._daily_vol_normalised_price_for_instruments(
+            _sorted_unique_instruments(list_of_instruments)
+        )
+
+    @diagnostic()
+    def _daily_vol_normalised_price_for_instruments(
+        self, instrument_codes: tuple
+    ) -> pd.Series:
+
+        norm_returns = self._median_daily_vol_normalised_returns_for_instruments(
+            instrument_codes
+        )
         norm_price = norm_returns.cumsum()
 
         return norm_price
 
-
     @diagnostic()
     def _by_asset_class_daily_vol_normalised_price_for_asset_class(
         self, asset_class: str
@@ -341,14 +408,34 @@ class RawData(SystemStage):
         :return: pd.Series
         """
 
-        instruments_in_asset_class = self.data_stage.all_instruments_in_asset_class(
-            asset_class
-        )
+        instruments_in_asset_class = self.all_instruments_in_asset_class(asset_class)
 
-        norm_price = self._daily_vol_normalised_price_for_list_of_instruments(instruments_in_asset_class)
+        norm_price = self._daily_vol_normalised_price_for_list_of_instruments(
+            instruments_in_asset_class
+        )
 
         return norm_price
 
+    @diagnostic()
+    def get_daily_vol_normalised_price_for_all_asset_classes(self) -> dict:
+        """
+        Price for every asset class, each calculated once from an aligned panel of the instruments in it
+
+        :return: dict of pd.Series, keys are asset classes
+        """
+
+        return dict(
+            [
+                (
+                    asset_class,
+                    self._by_asset_class_daily_vol_normalised_price_for_asset_class(
+                        asset_class
+                    ),
+                )
+                for asset_class in self._asset_classes_with_instruments()
+            ]
+        )
+
     @output()
     def normalised_price_for_asset_class(self, instrument_code: str) -> pd.Series:
         """
@@ -357,7 +444,7 @@ class RawData(SystemStage):
         :return:
         """
 
-        asset_class = self.data_stage.asset_class_for_instrument(instrument_code)
+        asset_class = self.asset_class_for_instrument(instrument_code)
         normalised_price_for_asset_class = (
             self._by_asset_class_daily_vol_normalised_price_for_asset_class(asset_class)
         )
@@ -373,6 +460,54 @@ class RawData(SystemStage):
 
         return normalised_price_for_asset_class_aligned
 
+    def all_instruments_in_asset_class(self, asset_class: str) -> list:
+        """
+        Instruments in the data for a given asset class; as data.all_instruments_in_asset_class but without going
+        back to the data each time
+
+        :param asset_class: str
+        :return: list of str
+        """
+        instruments_by_asset_class = self._instruments_by_asset_class()
+
+        return copy(instruments_by_asset_class.get(asset_class, []))
+
+    def asset_class_for_instrument(self, instrument_code: str) -> str:
+        asset_class_data = self._instrument_asset_classes()
+
+        return asset_class_data[instrument_code]
+
+    def _asset_classes_with_instruments(self) -> list:
+        instruments_by_asset_class = self._instruments_by_asset_class()
+
+        return [
+            asset_class
+            for asset_class, instruments_in_asset_class in instruments_by_asset_class.items()
+            if len(instruments_in_asset_class) > 0
+        ]
+
+    @diagnostic()
+    def _instruments_by_asset_class(self) -> dict:
+        asset_class_data = self._instrument_asset_classes()
+        list_of_instrument_codes = self.data_stage.get_instrument_list()
+
+        return dict(
+            [
+                (
+                    asset_class,
+                    asset_class_data.all_instruments_in_asset_class(
+                        asset_class, must_be_in=list_of_instrument_codes
+                    ),
+                )
+                for asset_class in asset_class_data.all_asset_classes()
+            ]
+        )
+
+    @diagnostic()
+    def _instrument_asset_classes(self) -> assetClassesAndInstruments:
+        # this can mean reading a file, so only do it once
+        return self.data_stage.get_instrument_asset_classes()
+
     def rolls_per_year(self, instrument_code: str) -> int:
         try:
             rolls = self.parent.data.get_rolls_per_year(instrument_code)
@@ -593,13 +728,27 @@ class RawData(SystemStage):
         :return:
         """
 
-        instruments_in_asset_class = self.parent.data.all_instruments_in_asset_class(
-            asset_class
+        instruments_in_asset_class = self.all_instruments_in_asset_class(asset_class)
+
+        return self._median_carry_for_list_of_instruments(
+            instruments_in_asset_class, smooth_days=smooth_days
         )
 
+    def _median_carry_for_list_of_instruments(
+        self, list_of_instruments: list, smooth_days: int = 90
+    ) -> pd.Series:
+        # always pass smooth_days the same way, so it's one cache entry however we are called
+        return self._median_carry_for_instruments(
+            _sorted_unique_instruments(list_of_instruments), int(smooth_days)
+        )
+
+    @diagnostic()
+    def _median_carry_for_instruments(
+        self, instrument_codes: tuple, smooth_days: int
+    ) -> pd.Series:
+
         raw_carry_across_asset_class = [
-            self.raw_carry(instrument_code)
-            for instrument_code in instruments_in_asset_class
+            self.raw_carry(instrument_code) for instrument_code in instrument_codes
         ]
 
         raw_carry_across_asset_class_pd = pd.concat(
@@ -626,7 +775,7 @@ class RawData(SystemStage):
         :return: pd.Series
         """
 
-        asset_class = self.parent.data.asset_class_for_instrument(instrument_code)
+        asset_class = self.asset_class_for_instrument(instrument_code)
         median_carry = self._by_asset_class_median_carry_for_asset_class(asset_class)
         instrument_carry = self.raw_carry(instrument_code)
 
@@ -671,6 +820,10 @@ class RawData(SystemStage):
         return daily_prices
 
 
+def _sorted_unique_instruments(list_of_instruments: list) -> tuple:
+    return tuple(sorted(set(list_of_instruments)))
+
+
 if __name__ == "__main__":
     import doctest
 
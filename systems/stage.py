@@ -42,6 +42,16 @@ class SystemStage(object):
         log = system.log.setup(stage=self.name)
         self._log = log
 
+    def disk_cache_fingerprint(self) -> str:
+        """
+        Anything held in the stage, rather than the config or cache, which affects the results of the stage
+
+        Override if the stage holds such state, eg the trading rules in Rules
+
+        :return: str, must be the same across runs for the same state
+        """
+        return ""
+
     @property
     def log(self) -> logger:
         log = getattr(self, "_log", logtoscreen(""))
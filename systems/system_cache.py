@@ -13,9 +13,23 @@ There are 3 kinds of things in a cache with different levels of persistence:
 """
 
 from syscore.fileutils import get_filename_for_package
+from syscore.objects import arg_not_supplied
+from systems.disk_cache import (
+    diskCache,
+    MISSING_FROM_DISK,
+    CONFIG_DEPENDENCY,
+    STAGE_DEPENDENCY,
+    DATA_DEPENDENCY,
+    ALL_INSTRUMENTS_DATA,
+)
 import pickle
+import sys
+from collections import OrderedDict
 from functools import wraps
 
+import numpy as np
+import pandas as pd
+
 """
 This is used for items which affect an entire system, not just one instrument
 """
@@ -120,10 +134,13 @@ class cacheElement(object):
     Each cache element consists of a value, and some bool values telling us what we can do with it
     """
 
-    def __init__(self, value, protected=False, not_pickable=False):
+    def __init__(
+        self, value, protected=False, not_pickable=False, dependencies=frozenset()
+    ):
         self._value = value
         self._protected = protected
         self._not_pickable = not_pickable
+        self._dependencies = dependencies
 
     def __repr__(self):
         return str(self._value)
@@ -140,14 +157,137 @@ class cacheElement(object):
     def can_be_pickled(self):
         return not self._not_pickable
 
+    def dependencies(self) -> frozenset:
+        # only populated when using a disk cache; older pickles won't have this
+        return getattr(self, "_dependencies", frozenset())
+
 
 class systemCache(dict):
     def __init__(self, parent_system):
 
         super().__init__()
         self._parent = parent_system  # so we can access the instrument list
+        self._disk_cache = None
+        self._dependency_traces = []
+
+        # Sizes of items, in least recently used order; None if we haven't needed to work it out yet
+        self._sizes_in_bytes = OrderedDict()
+        self._total_size_in_bytes = 0
+        self._max_size_in_bytes = None
+
         self.set_caching_on()
 
+    def __setitem__(self, cache_ref, cache_element):
+        if cache_ref in self:
+            self._remove_size_of_item(cache_ref)
+
+        super().__setitem__(cache_ref, cache_element)
+        self._add_size_of_item(cache_ref, cache_element)
+        self._evict_least_recently_used_if_over_max_size(keep_cache_ref=cache_ref)
+
+    def __delitem__(self, cache_ref):
+        super().__delitem__(cache_ref)
+        self._remove_size_of_item(cache_ref)
+
+    def clear(self):
+        super().clear()
+        self._sizes_in_bytes.clear()
+        self._total_size_in_bytes = 0
+
+    def set_max_size_in_bytes(self, max_size_in_bytes: int):
+        """
+        Limit the memory used by the cache. When we go over the limit the least recently used items
+        are removed, except for protected items. Set to None for no limit.
+
+        Sizes are estimates; see estimate_size_in_bytes. They are only worked out as items are added
+        whilst there is a limit, since that takes a while for large items
+
+        :param max_size_in_bytes: int or None
+        """
+        self._max_size_in_bytes = max_size_in_bytes
+        if max_size_in_bytes is not None:
+            self._estimate_sizes_of_items(list(self._sizes_in_bytes.keys()))
+        self._evict_least_recently_used_if_over_max_size()
+
+    @property
+    def max_size_in_bytes(self):
+        return self._max_size_in_bytes
+
+    def size_in_bytes(self, cache_ref_list=None) -> int:
+        """
+        Estimated memory used by some items in the cache
+
+        :param cache_ref_list: list of cache refs eg from get_items_with_data().filter_by_stage_name(...),
+                               or None for everything
+        :return: int
+        """
+        if cache_ref_list is None:
+            cache_ref_list = list(self._sizes_in_bytes.keys())
+
+        self._estimate_sizes_of_items(cache_ref_list)
+
+        return sum(
+            [self._sizes_in_bytes.get(cache_ref, 0) for cache_ref in cache_ref_list]
+        )
+
+    def size_in_bytes_by_stage(self) -> pd.Series:
+        """
+        Estimated memory used by each stage
+
+        :return: pd.Series, index is stage name, sorted largest first
+        """
+        cache_ref_list = self.get_items_with_data()
+        stage_names = cache_ref_list.unique_list_of_stage_names()
+        sizes = [
+            self.size_in_bytes(cache_ref_list.filter_by_stage_name(stage_name))
+            for stage_name in stage_names
+        ]
+
+        return pd.Series(sizes, index=stage_names, dtype=float).sort_values(
+            ascending=False
+        )
+
+    def _add_size_of_item(self, cache_ref, cache_element):
+        self._sizes_in_bytes[cache_ref] = None
+        if self.max_size_in_bytes is not None:
+            self._estimate_sizes_of_items([cache_ref])
+
+    def _estimate_sizes_of_items(self, cache_ref_list: list):
+        for cache_ref in cache_ref_list:
+            if cache_ref not in self._sizes_in_bytes:
+                continue
+            if self._sizes_in_bytes[cache_ref] is not None:
+                continue
+
+            ## doesn't change the least recently used order
+            size = estimate_size_in_bytes(dict.__getitem__(self, cache_ref).value())
+            self._sizes_in_bytes[cache_ref] = size
+            self._total_size_in_bytes += size
+
+    def _remove_size_of_item(self, cache_ref):
+        size = self._sizes_in_bytes.pop(cache_ref, None)
+        if size is not None:
+            self._total_size_in_bytes -= size
+
+    def _mark_as_recently_used(self, cache_ref):
+        if cache_ref in self._sizes_in_bytes:
+            self._sizes_in_bytes.move_to_end(cache_ref)
+
+    def _evict_least_recently_used_if_over_max_size(self, keep_cache_ref=None):
+        max_size = self.max_size_in_bytes
+        if max_size is None or self._total_size_in_bytes <= max_size:
+            return
+
+        for cache_ref in list(self._sizes_in_bytes.keys()):
+            if self._total_size_in_bytes <= max_size:
+                break
+            if cache_ref == keep_cache_ref:
+                continue
+            if self[cache_ref].protected():
+                continue
+
+            del self[cache_ref]
+
     @property
     def parent(self):
         return self._parent
@@ -161,6 +301,46 @@ class systemCache(dict):
     def are_we_caching(self):
         return self._caching_on
 
+    def set_disk_cache_directory(self, pathname: str):
+        """
+        Add a persistent tier to the cache; stage results are also saved to, and loaded from, pathname
+
+        :param pathname: directory in 'dot' format eg 'private.system_cache', or absolute path
+        """
+        self._disk_cache = diskCache(self, pathname)
+        self.parent.config.set_element_access_recorder(self._record_config_dependency)
+
+    def remove_disk_cache(self):
+        self._disk_cache = None
+        self.parent.config.set_element_access_recorder(None)
+
+    @property
+    def disk_cache(self) -> diskCache:
+        return self._disk_cache
+
+    def using_disk_cache(self) -> bool:
+        return self._disk_cache is not None
+
+    def record_dependency(self, dependency_type: str, name: str):
+        """
+        Note that whatever we are currently calculating depends on something
+
+        Only needed when using a disk cache. Config elements are recorded automatically; stages which hold
+        state that isn't in the cache (eg Rules.trading_rules) should call this when that state is used
+
+        :param dependency_type: CONFIG_DEPENDENCY or STAGE_DEPENDENCY
+        :param name: config element name or stage name
+        """
+        self._add_to_dependency_trace(frozenset([(dependency_type, name)]))
+
+    def _record_config_dependency(self, element_name: str):
+        self.record_dependency(CONFIG_DEPENDENCY, element_name)
+
+    def _add_to_dependency_trace(self, dependencies: frozenset):
+        if len(self._dependency_traces) == 0:
+            return
+        self._dependency_traces[-1].update(dependencies)
+
     def __repr__(self):
         if self.are_we_caching():
             list_of_elements = ", ".join(
@@ -194,7 +374,7 @@ class systemCache(dict):
 
         return new_cache
 
-    def pickle(self, relativefilename):
+    def pickle(self, relativefilename, item_names: list = arg_not_supplied):
         """
         Save everything in the cache to a pickle
 
@@ -203,6 +383,9 @@ class systemCache(dict):
         :param relativefilename: cache location filename in 'dot' format eg 'systems.basesystem.py' is this file
         :type relativefilename: str
 
+        :param item_names: Only save items with these names, eg slow estimates we want to reuse in a later system
+        :type item_names: list of str
+
         :returns: None
 
         """
@@ -210,6 +393,12 @@ class systemCache(dict):
         filename = get_filename_for_package(relativefilename)
 
         pickable_cache_refs = self._get_pickable_items()
+        if item_names is not arg_not_supplied:
+            pickable_cache_refs = [
+                cache_ref
+                for cache_ref in pickable_cache_refs
+                if cache_ref.itemname in item_names
+            ]
 
         cache_to_pickle = self.partial_cache(pickable_cache_refs)
         cache_to_pickle_as_dict = cache_to_pickle.as_dict()
@@ -476,7 +665,14 @@ class systemCache(dict):
         if cache_ref in self:
             del self[cache_ref]
 
-    def set_item_in_cache(self, value, cache_ref, protected=False, not_pickable=False):
+    def set_item_in_cache(
+        self,
+        value,
+        cache_ref,
+        protected=False,
+        not_pickable=False,
+        dependencies=frozenset(),
+    ):
         """
         Set an item in a cache to a specific value.
 
@@ -489,12 +685,17 @@ class systemCache(dict):
         :param cache_ref: The item to set
         :type cache_ref: cacheRef
 
+        :param dependencies: config elements and stages the item depends on (only used with a disk cache)
+
 
         :returns: nothing
         """
 
         self[cache_ref] = cacheElement(
-            value, protected=protected, not_pickable=not_pickable
+            value,
+            protected=protected,
+            not_pickable=not_pickable,
+            dependencies=dependencies,
         )
 
     def _get_item_from_cache(self, cache_ref):
@@ -512,6 +713,10 @@ class systemCache(dict):
         if cache_element is MISSING_FROM_CACHE:
             return MISSING_FROM_CACHE
 
+        # whatever we are calculating inherits the dependencies of this item
+        self._add_to_dependency_trace(cache_element.dependencies())
+        self._mark_as_recently_used(cache_ref)
+
         return cache_element.value()
 
     def get_instrument_list(self):
@@ -568,15 +773,129 @@ class systemCache(dict):
         value = self._get_item_from_cache(cache_ref)
 
         if value is MISSING_FROM_CACHE:
-            # call the function. Note in the original function 'this_stage' was
-            # 'self'
-            value = func(this_stage, *args, **kwargs)
-            self.set_item_in_cache(
-                value, cache_ref, protected=protected, not_pickable=not_pickable
+            if self.using_disk_cache():
+                # items in the base system aren't saved to disk, but we still
+                # need to trace what they depend on
+                value = self._get_from_disk_or_calculate_and_trace(
+                    func,
+                    this_stage,
+                    cache_ref,
+                    *args,
+                    protected=protected,
+                    not_pickable=not_pickable,
+                    store_on_disk=instrument_classify,
+                    **kwargs
+                )
+            else:
+                # call the function. Note in the original function 'this_stage' was
+                # 'self'
+                value = func(this_stage, *args, **kwargs)
+                self.set_item_in_cache(
+                    value, cache_ref, protected=protected, not_pickable=not_pickable
+                )
+
+        return value
+
+    def _get_from_disk_or_calculate_and_trace(
+        self,
+        func,
+        this_stage,
+        cache_ref,
+        *args,
+        protected=False,
+        not_pickable=False,
+        store_on_disk=True,
+        **kwargs
+    ):
+        # only stage items depend on data; the base system just passes it through
+        is_stage_item = store_on_disk
+        store_on_disk = store_on_disk and not not_pickable
+
+        if store_on_disk:
+            value, dependencies = self.disk_cache.get_value_and_dependencies(cache_ref)
+        else:
+            value = MISSING_FROM_DISK
+
+        if value is MISSING_FROM_DISK:
+            value, dependencies = self._calculate_with_dependency_trace(
+                func, this_stage, *args, **kwargs
             )
+            if is_stage_item:
+                dependencies = dependencies.union(
+                    [_data_dependency_for_cache_ref(cache_ref)]
+                )
+            if store_on_disk:
+                dependencies = dependencies.union(
+                    [(STAGE_DEPENDENCY, this_stage.name)]
+                )
+                self.disk_cache.set_value_and_dependencies(
+                    value, cache_ref, dependencies
+                )
+
+        dependencies = _dependencies_to_pass_on(dependencies)
+        self._add_to_dependency_trace(dependencies)
+        self.set_item_in_cache(
+            value,
+            cache_ref,
+            protected=protected,
+            not_pickable=not_pickable,
+            dependencies=dependencies,
+        )
 
         return value
 
+    def calculate_with_dependency_trace(self, func, *args, **kwargs) -> tuple:
+        """
+        Call func, and find out which config elements and stages the result depends on
+
+        Only needed to add items with set_item_calculated_with_another_item. The dependencies also
+        count towards whatever we are calculating at the moment.
+
+        :returns: tuple (value, frozenset of dependencies); empty unless using a disk cache
+        """
+        self._dependency_traces.append(set())
+        try:
+            value = func(*args, **kwargs)
+        finally:
+            dependencies = frozenset(self._dependency_traces.pop())
+
+        self._add_to_dependency_trace(dependencies)
+
+        return value, dependencies
+
+    def set_item_calculated_with_another_item(
+        self, value, cache_ref, dependencies=frozenset()
+    ):
+        """
+        Add an item which was worked out as a side effect of calculating something else, eg when one
+        calculation gives a result for every instrument
+
+        Saved to disk, if using a disk cache, as if the item had been calculated by itself
+
+        :param dependencies: from calculate_with_dependency_trace
+        """
+        if self.using_disk_cache():
+            dependencies = dependencies.union(
+                [
+                    (STAGE_DEPENDENCY, cache_ref.stage_name),
+                    _data_dependency_for_cache_ref(cache_ref),
+                ]
+            )
+            self.disk_cache.set_value_and_dependencies(value, cache_ref, dependencies)
+
+        self.set_item_in_cache(
+            value, cache_ref, dependencies=_dependencies_to_pass_on(dependencies)
+        )
+
+    def _calculate_with_dependency_trace(self, func, this_stage, *args, **kwargs):
+        self._dependency_traces.append(set())
+        try:
+            value = func(this_stage, *args, **kwargs)
+        finally:
+            dependencies = frozenset(self._dependency_traces.pop())
+
+        return value, dependencies
+
     def cache_ref(self, func, this_stage, *args,
                   use_arg_names = True,
                   instrument_classify=True, **kwargs):
@@ -627,6 +946,77 @@ class systemCache(dict):
         return cache_ref
 
 
+def _data_dependency_for_cache_ref(cache_ref: cacheRef) -> tuple:
+    if cache_ref.instrument_code == ALL_KEYNAME:
+        return (DATA_DEPENDENCY, ALL_INSTRUMENTS_DATA)
+
+    return (DATA_DEPENDENCY, cache_ref.instrument_code)
+
+
+def _dependencies_to_pass_on(dependencies: frozenset) -> frozenset:
+    ## A result across instruments is saved under the data for all of them, but only passes on the
+    ## data it actually used; otherwise everything downstream of eg the forecast cap would be
+    ## recalculated whenever the data for any instrument changed
+    return dependencies.difference([(DATA_DEPENDENCY, ALL_INSTRUMENTS_DATA)])
+
+
+def estimate_size_in_bytes(some_object, _depth: int = 0) -> int:
+    """
+    Rough estimate of memory used by something in the cache
+
+    We look inside containers, and the attributes of objects (eg the p&l calculators inside an accountCurve),
+    but only a few levels down
+    """
+    if isinstance(some_object, (pd.Series, pd.DataFrame)):
+        size = int(np.sum(some_object.memory_usage(deep=True)))
+        if _depth >= MAX_DEPTH_FOR_SIZE_ESTIMATE:
+            return size
+
+        # subclasses (eg accountCurve) can carry other things around
+        extra_attributes = [
+            value
+            for name, value in vars(some_object).items()
+            if name not in _PANDAS_INTERNAL_ATTRIBUTES
+        ]
+        size += sum(
+            [
+                estimate_size_in_bytes(item, _depth=_depth + 1)
+                for item in extra_attributes
+            ]
+        )
+
+        return size
+    elif isinstance(some_object, pd.Index):
+        return int(some_object.memory_usage(deep=True))
+    elif isinstance(some_object, np.ndarray):
+        return int(some_object.nbytes)
+
+    size = sys.getsizeof(some_object)
+    if _depth >= MAX_DEPTH_FOR_SIZE_ESTIMATE:
+        return size
+
+    if isinstance(some_object, dict):
+        contents = list(some_object.keys()) + list(some_object.values())
+    elif isinstance(some_object, (list, tuple, set, frozenset)):
+        contents = list(some_object)
+    elif hasattr(some_object, "__dict__"):
+        contents = list(vars(some_object).values())
+    else:
+        contents = []
+
+    size += sum(
+        [estimate_size_in_bytes(item, _depth=_depth + 1) for item in contents]
+    )
+
+    return size
+
+
+MAX_DEPTH_FOR_SIZE_ESTIMATE = 3
+_PANDAS_INTERNAL_ATTRIBUTES = set(vars(pd.Series(dtype=float))).union(
+    vars(pd.DataFrame())
+)
+
+
 def resolve_args_to_code_and_key(args, list_of_codes,
                                  use_arg_names = True):
     """
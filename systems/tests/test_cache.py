@@ -1,8 +1,20 @@
+import os
+import shutil
+import tempfile
 import unittest
+from unittest import mock
+
+import pandas as pd
 
 from systems.stage import SystemStage
 from systems.basesystem import System
-from systems.system_cache import input, diagnostic, output, ALL_KEYNAME
+from systems.system_cache import (
+    input,
+    diagnostic,
+    output,
+    ALL_KEYNAME,
+    estimate_size_in_bytes,
+)
 from sysdata.sim.sim_data import simData
 from sysdata.config.configdata import Config
 
@@ -318,5 +330,236 @@ class TestCache(unittest.TestCase):
         self.assertEqual(["base_system", "test_stage1", "test_stage2"], stage_names)
 
 
+class testSimData(simData):
+    def __init__(self, prices: dict):
+        super().__init__()
+        self._prices = prices
+
+    def get_instrument_list(self) -> list:
+        return list(self._prices.keys())
+
+    def get_raw_price(self, instrument_code: str) -> pd.Series:
+        return self._prices[instrument_code]
+
+
+class testStageWithConfig(SystemStage):
+    calls = 0
+
+    @property
+    def name(self):
+        return "test_config_stage"
+
+    @output()
+    def scaled_price(self, instrument_code):
+        testStageWithConfig.calls += 1
+        return self.parent.data.get_raw_price(instrument_code) * self.parent.config.scale
+
+    @output()
+    def scaled_and_shifted_price(self, instrument_code):
+        testStageWithConfig.calls += 1
+        return self.scaled_price(instrument_code) + self.parent.config.shift
+
+    @output()
+    def total_scaled_price(self):
+        testStageWithConfig.calls += 1
+        return sum(
+            [
+                self.scaled_price(instrument_code)
+                for instrument_code in self.parent.get_instrument_list()
+            ]
+        )
+
+
+class TestDiskCache(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        testStageWithConfig.calls = 0
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def _system(self, scale=2.0, shift=1.0, last_price=3.0, other_last_price=3.0):
+        prices = dict(
+            code=pd.Series([1.0, 2.0, last_price]),
+            other_code=pd.Series([1.0, 2.0, other_last_price]),
+        )
+        config = Config(
+            dict(
+                instruments=["code", "other_code"],
+                scale=scale,
+                shift=shift,
+                disk_cache_directory=self.directory,
+            )
+        )
+
+        return System([testStageWithConfig()], testSimData(prices), config)
+
+    def test_reload_from_disk(self):
+        first = self._system().test_config_stage.scaled_and_shifted_price("code")
+        self.assertEqual(2, testStageWithConfig.calls)
+
+        second = self._system().test_config_stage.scaled_and_shifted_price("code")
+        self.assertEqual(2, testStageWithConfig.calls)
+        self.assertEqual(list(first.values), list(second.values))
+
+    def test_only_dependent_items_recalculated(self):
+        self._system().test_config_stage.scaled_and_shifted_price("code")
+
+        # shift is only used by scaled_and_shifted_price
+        ans = self._system(shift=5.0).test_config_stage.scaled_and_shifted_price(
+            "code"
+        )
+        self.assertEqual(3, testStageWithConfig.calls)
+        self.assertEqual([7.0, 9.0, 11.0], list(ans.values))
+
+        # scale is used by both, directly or indirectly
+        ans = self._system(scale=1.0).test_config_stage.scaled_and_shifted_price(
+            "code"
+        )
+        self.assertEqual(5, testStageWithConfig.calls)
+        self.assertEqual([2.0, 3.0, 4.0], list(ans.values))
+
+    def test_data_change_recalculates(self):
+        self._system().test_config_stage.scaled_and_shifted_price("code")
+        ans = self._system(last_price=4.0).test_config_stage.scaled_and_shifted_price(
+            "code"
+        )
+        self.assertEqual(4, testStageWithConfig.calls)
+        self.assertEqual(9.0, ans.values[-1])
+
+    def test_data_change_only_recalculates_that_instrument(self):
+        self._system().test_config_stage.scaled_and_shifted_price("code")
+        self._system().test_config_stage.total_scaled_price()
+        self.assertEqual(4, testStageWithConfig.calls)
+
+        system = self._system(other_last_price=4.0)
+        system.test_config_stage.scaled_and_shifted_price("code")
+        self.assertEqual(4, testStageWithConfig.calls)
+
+        # uses the data for other_code as well
+        ans = system.test_config_stage.total_scaled_price()
+        self.assertEqual(6, testStageWithConfig.calls)
+        self.assertEqual(14.0, ans.values[-1])
+
+
+class testStageWithBigItems(SystemStage):
+    @property
+    def name(self):
+        return "test_big_stage"
+
+    @output()
+    def big_item(self, instrument_code):
+        return pd.Series(range(1000), dtype=float)
+
+    @output(protected=True)
+    def big_protected_item(self, instrument_code):
+        return pd.Series(range(1000), dtype=float)
+
+
+class TestCacheSizeLimit(unittest.TestCase):
+    def setUp(self):
+        config = Config(dict(instruments=["code", "another_code", "third_code"]))
+        self.system = System([testStageWithBigItems()], simData(), config)
+        self.item_size = estimate_size_in_bytes(pd.Series(range(1000), dtype=float))
+
+    def test_size_by_stage(self):
+        self.system.test_big_stage.big_item("code")
+        self.system.test_big_stage.big_item("another_code")
+
+        cache = self.system.cache
+        stage_refs = cache.get_items_with_data().filter_by_stage_name("test_big_stage")
+        self.assertEqual(2 * self.item_size, cache.size_in_bytes(stage_refs))
+        self.assertEqual(
+            2 * self.item_size, cache.size_in_bytes_by_stage()["test_big_stage"]
+        )
+
+        cache.delete_items_for_instrument("code")
+        self.assertEqual(self.item_size, cache.size_in_bytes(stage_refs))
+
+    def test_sizes_only_worked_out_when_needed(self):
+        with mock.patch(
+            "systems.system_cache.estimate_size_in_bytes",
+            side_effect=estimate_size_in_bytes,
+        ) as mock_estimate:
+            self.system.test_big_stage.big_item("code")
+            self.system.test_big_stage.big_item("another_code")
+            self.system.test_big_stage.big_item("third_code")
+            self.assertEqual(mock_estimate.call_count, 0)
+
+            cache = self.system.cache
+            number_of_items = len(cache)
+            # oldest item goes when we set a limit
+            cache.set_max_size_in_bytes(int(2.5 * self.item_size))
+            # not counting calls it makes itself for the contents of items
+            items_estimated = [
+                call for call in mock_estimate.call_args_list if "_depth" not in call.kwargs
+            ]
+            self.assertEqual(len(items_estimated), number_of_items)
+
+        stage_refs = cache.get_cacherefs_for_stage("test_big_stage")
+        self.assertEqual(
+            ["another_code", "third_code"],
+            sorted(stage_refs.unique_list_of_instrument_codes()),
+        )
+        self.assertEqual(2 * self.item_size, cache.size_in_bytes(stage_refs))
+
+    def test_least_recently_used_evicted(self):
+        cache = self.system.cache
+        cache.set_max_size_in_bytes(int(2.5 * self.item_size))
+
+        self.system.test_big_stage.big_item("code")
+        self.system.test_big_stage.big_item("another_code")
+        # now 'code' is the most recently used
+        self.system.test_big_stage.big_item("code")
+        self.system.test_big_stage.big_item("third_code")
+
+        stage_refs = cache.get_cacherefs_for_stage("test_big_stage")
+        self.assertEqual(
+            ["code", "third_code"], sorted(stage_refs.unique_list_of_instrument_codes())
+        )
+        self.assertLessEqual(cache.size_in_bytes(), cache.max_size_in_bytes)
+
+    def test_protected_not_evicted(self):
+        cache = self.system.cache
+        cache.set_max_size_in_bytes(int(1.5 * self.item_size))
+
+        self.system.test_big_stage.big_protected_item("code")
+        self.system.test_big_stage.big_item("code")
+        self.system.test_big_stage.big_item("another_code")
+
+        stage_refs = cache.get_cacherefs_for_stage("test_big_stage")
+        self.assertEqual(
+            ["big_item", "big_protected_item"],
+            sorted(stage_refs.unique_list_of_item_names()),
+        )
+        self.assertEqual(
+            "another_code", stage_refs.filter_by_itemname("big_item")[0].instrument_code
+        )
+
+
+class TestPickleSomeItems(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_only_named_items_pickled(self):
+        config = Config(dict(instruments=["code"]))
+        system = System([testStageWithBigItems()], simData(), config)
+        system.test_big_stage.big_item("code")
+        system.test_big_stage.big_protected_item("code")
+
+        filename = os.path.join(self.directory, "estimates.pck")
+        system.cache.pickle(filename, item_names=["big_item"])
+
+        new_system = System([testStageWithBigItems()], simData(), config)
+        new_system.cache.unpickle(filename)
+        self.assertEqual(
+            ["big_item"],
+            new_system.cache.get_items_with_data().unique_list_of_item_names(),
+        )
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -4,6 +4,11 @@ Created on 30 Nov 2015
 @author: rob
 """
 import unittest
+
+import numpy as np
+import pandas as pd
+
+from sysdata.sim.sim_data import simData
 from systems.provided.rules.ewmac import ewmac_forecast_with_defaults
 from systems.forecasting import (
     Rules,
@@ -231,6 +236,105 @@ class Test(unittest.TestCase):
         assert ans["rule0"].other_args["Lfast"] == 50
 
 
+class panelTestSimData(simData):
+    def get_instrument_list(self) -> list:
+        return ["long_history", "short_history", "with_gap"]
+
+    def get_raw_price(self, instrument_code: str) -> pd.Series:
+        # different start and end dates, so the panel has to be aligned
+        if instrument_code == "long_history":
+            index = pd.bdate_range("2000-01-03", periods=2000)
+            seed = 1
+        elif instrument_code == "short_history":
+            index = pd.bdate_range("2003-06-02", periods=800)
+            seed = 2
+        else:
+            # missing dates which the other instruments have, so can't go in the panel
+            index = pd.bdate_range("2001-01-01", periods=1000)
+            index = index[:400].append(index[460:])
+            seed = 3
+        returns = np.random.default_rng(seed).normal(size=len(index))
+
+        return pd.Series(100.0 + returns.cumsum(), index=index)
+
+
+class TestPanelRules(unittest.TestCase):
+    def get_system(self, use_panel_rule_evaluation: bool) -> System:
+        data_list = ["rawdata.get_daily_prices", "rawdata.daily_returns_volatility"]
+        trading_rules = dict(
+            ewmac8=dict(
+                function="systems.provided.rules.ewmac.ewmac",
+                data=data_list,
+                other_args=dict(Lfast=8, Lslow=32),
+            ),
+            breakout20=dict(
+                function="systems.provided.rules.breakout.breakout",
+                data=["rawdata.get_daily_prices"],
+                other_args=dict(lookback=20),
+            ),
+            # not resampled to business days, so the gap stays
+            breakout20_raw_prices=dict(
+                function="systems.provided.rules.breakout.breakout",
+                data=["data.get_raw_price"],
+                other_args=dict(lookback=20),
+            ),
+            accel16=dict(
+                function="systems.provided.rules.accel.accel",
+                data=data_list,
+                other_args=dict(Lfast=16),
+            ),
+            mrwings4=dict(
+                function="systems.provided.rules.mr_wings.mr_wings",
+                data=data_list,
+                other_args=dict(Lfast=4),
+            ),
+        )
+        config = Config(
+            dict(
+                trading_rules=trading_rules,
+                use_panel_rule_evaluation=use_panel_rule_evaluation,
+            )
+        )
+        system = System([RawData(), Rules()], panelTestSimData(), config)
+        system.set_logging_level("off")
+
+        return system
+
+    def get_raw_forecasts(self, use_panel_rule_evaluation: bool) -> dict:
+        system = self.get_system(use_panel_rule_evaluation)
+
+        return dict(
+            [
+                (
+                    (instrument_code, rule_name),
+                    system.rules.get_raw_forecast(instrument_code, rule_name),
+                )
+                for instrument_code in system.get_instrument_list()
+                for rule_name in system.rules.trading_rules().keys()
+            ]
+        )
+
+    def testPanelMatchesSingleInstrument(self):
+        single_instrument = self.get_raw_forecasts(False)
+        panel = self.get_raw_forecasts(True)
+
+        for key, forecast in single_instrument.items():
+            pd.testing.assert_series_equal(forecast, panel[key])
+
+    def testPanelFillsCacheForOtherInstruments(self):
+        system = self.get_system(True)
+        system.rules.get_raw_forecast("long_history", "breakout20")
+
+        cached_instruments = (
+            system.cache.get_items_with_data()
+            .filter_by_itemname("get_raw_forecast")
+            .unique_list_of_instrument_codes()
+        )
+        self.assertEqual(
+            sorted(cached_instruments), ["long_history", "short_history", "with_gap"]
+        )
+
+
 if __name__ == "__main__":
     # import sys;sys.argv = ['', 'Test.testTradingRules']
     unittest.main()
@@ -0,0 +1,103 @@
+import unittest
+from copy import copy
+
+import numpy as np
+
+from syscore.objects import arg_not_supplied
+from sysquant.estimators.covariance import covarianceEstimate
+from sysquant.estimators.mean_estimator import meanEstimates
+from sysquant.optimisation.weights import portfolioWeights
+from systems.provided.dynamic_small_system_optimise.buffering import (
+    speedControlForDynamicOpt,
+)
+from systems.provided.dynamic_small_system_optimise.greedy_algo import (
+    greedy_algo_across_integer_values,
+)
+from systems.provided.dynamic_small_system_optimise.optimisation import (
+    objectiveFunctionForGreedy,
+    constraintsForDynamicOpt,
+)
+
+
+def _reference_greedy_algo(obj_instance) -> np.array:
+    ## evaluates every step from scratch, as the greedy algorithm used to
+    best_solution = obj_instance.starting_weights_as_np
+    best_value = obj_instance.evaluate(best_solution)
+    at_limit = [False] * len(best_solution)
+    per_contract_value = obj_instance.per_contract_value_as_np
+    direction = obj_instance.direction_as_np
+
+    while True:
+        new_best_value = best_value
+        new_solution = best_solution
+        for i in range(len(best_solution)):
+            if at_limit[i]:
+                continue
+            temp_step = copy(best_solution)
+            temp_step[i] = temp_step[i] + per_contract_value[i] * direction[i]
+            if direction[i] > 0:
+                at_limit[i] = temp_step[i] > obj_instance.maxima_as_np[i]
+            else:
+                at_limit[i] = temp_step[i] < obj_instance.minima_as_np[i]
+            if at_limit[i]:
+                continue
+            temp_objective_value = obj_instance.evaluate(temp_step)
+            if temp_objective_value < new_best_value:
+                new_best_value = temp_objective_value
+                new_solution = temp_step
+
+        if new_best_value < best_value:
+            best_value = new_best_value
+            best_solution = new_solution
+        else:
+            return best_solution
+
+
+def _random_objective(seed: int, with_prior: bool) -> objectiveFunctionForGreedy:
+    rng = np.random.default_rng(seed)
+    n_assets = 25
+    keys = ["asset%d" % i for i in range(n_assets)]
+
+    random_returns = rng.normal(size=(200, n_assets)) * rng.uniform(
+        0.05, 0.3, n_assets
+    )
+    covariance = np.cov(random_returns, rowvar=False) * 16
+
+    def _weights(values) -> portfolioWeights:
+        return portfolioWeights(dict(zip(keys, values)))
+
+    if with_prior:
+        previous_positions = _weights(rng.integers(-3, 4, n_assets).astype(float))
+        maximum_positions = _weights([5.0] * n_assets)
+        constraints = constraintsForDynamicOpt(reduce_only_keys=keys[:3])
+    else:
+        previous_positions = maximum_positions = constraints = arg_not_supplied
+
+    return objectiveFunctionForGreedy(
+        contracts_optimal=_weights(rng.normal(0, 2, n_assets)),
+        covariance_matrix=covarianceEstimate(covariance, columns=keys),
+        per_contract_value=_weights(rng.uniform(0.01, 0.1, n_assets)),
+        costs=meanEstimates(dict(zip(keys, rng.uniform(0.0001, 0.001, n_assets)))),
+        speed_control=speedControlForDynamicOpt(
+            trade_shadow_cost=10, tracking_error_buffer=0.01
+        ),
+        previous_positions=previous_positions,
+        constraints=constraints,
+        maximum_positions=maximum_positions,
+    )
+
+
+class TestGreedyAlgo(unittest.TestCase):
+    def test_matches_evaluating_every_step(self):
+        for seed in range(5):
+            for with_prior in [False, True]:
+                obj_instance = _random_objective(seed, with_prior=with_prior)
+                expected = _reference_greedy_algo(obj_instance)
+                result = greedy_algo_across_integer_values(obj_instance)
+
+                self.assertTrue(any(result != 0))
+                np.testing.assert_allclose(result, expected, rtol=1e-12, atol=1e-12)
+
+
+if __name__ == "__main__":
+    unittest.main()
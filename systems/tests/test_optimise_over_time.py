@@ -0,0 +1,151 @@
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from sysquant.estimators.correlations import correlationEstimate
+from sysquant.estimators.covariance import covariance_from_stdev_and_correlation
+from sysquant.estimators.mean_estimator import meanEstimates
+from sysquant.estimators.stdev_estimator import stdevEstimates
+from sysquant.optimisation.weights import portfolioWeights
+from systems.provided.dynamic_small_system_optimise.buffering import (
+    speedControlForDynamicOpt,
+)
+from systems.provided.dynamic_small_system_optimise.optimisation import (
+    objectiveFunctionForGreedy,
+    constraintsForDynamicOpt,
+)
+from systems.provided.dynamic_small_system_optimise.optimise_over_time import (
+    inputsForOptimisationOverTime,
+    optimise_positions_for_days,
+    optimise_positions_over_time,
+    correlation_as_np_for_instruments,
+    _chunks_with_warmup,
+)
+
+
+def _random_inputs(seed: int, n_days: int = 60) -> inputsForOptimisationOverTime:
+    rng = np.random.default_rng(seed)
+    n_assets = 10
+    keys = ["asset%d" % i for i in range(n_assets)]
+
+    def _random_correlation(assets: list) -> correlationEstimate:
+        returns = rng.normal(size=(100, len(assets)))
+        return correlationEstimate(np.corrcoef(returns, rowvar=False), columns=assets)
+
+    ## the second correlation doesn't include the last asset
+    list_of_correlations = [
+        correlation_as_np_for_instruments(_random_correlation(keys), keys),
+        correlation_as_np_for_instruments(_random_correlation(keys[:-1]), keys),
+    ]
+
+    contracts_optimal = np.cumsum(rng.normal(0, 0.3, (n_days, n_assets)), axis=0)
+    stdev = rng.uniform(0.05, 0.3, (n_days, n_assets))
+    per_contract_value = rng.uniform(0.01, 0.1, (n_days, n_assets))
+    ## an asset with no data at the start
+    contracts_optimal[:10, 0] = np.nan
+    stdev[:10, 0] = np.nan
+
+    return inputsForOptimisationOverTime(
+        dates=pd.bdate_range("2020-01-01", periods=n_days),
+        instrument_list=keys,
+        contracts_optimal=contracts_optimal,
+        per_contract_value=per_contract_value,
+        costs=rng.uniform(0.0001, 0.001, (n_days, n_assets)),
+        stdev=stdev,
+        correlation_index=np.array(
+            [0] * (n_days // 2) + [1] * (n_days - n_days // 2)
+        ),
+        list_of_correlations=list_of_correlations,
+        speed_control=speedControlForDynamicOpt(
+            trade_shadow_cost=10, tracking_error_buffer=0.01
+        ),
+        constraints=constraintsForDynamicOpt(reduce_only_keys=keys[1:2]),
+    )
+
+
+def _reference_objective_on_day(
+    inputs: inputsForOptimisationOverTime,
+    day_idx: int,
+    previous_positions: portfolioWeights,
+) -> objectiveFunctionForGreedy:
+    ## builds the inputs for each day as the optimisedPositions stage used to
+    keys = inputs.instrument_list
+
+    def _weights(values) -> portfolioWeights:
+        return portfolioWeights(dict(zip(keys, values)))
+
+    correlation = inputs.list_of_correlations[inputs.correlation_index[day_idx]]
+    assets_in_correlation = [
+        key
+        for key, in_correlation in zip(keys, ~np.isnan(np.diag(correlation)))
+        if in_correlation
+    ]
+    idx = [keys.index(key) for key in assets_in_correlation]
+    correlation_estimate = correlationEstimate(
+        correlation[np.ix_(idx, idx)], columns=assets_in_correlation
+    )
+    stdev_estimate = stdevEstimates(dict(zip(keys, inputs.stdev[day_idx])))
+
+    return objectiveFunctionForGreedy(
+        contracts_optimal=_weights(inputs.contracts_optimal[day_idx]),
+        covariance_matrix=covariance_from_stdev_and_correlation(
+            correlation_estimate, stdev_estimate
+        ),
+        per_contract_value=_weights(inputs.per_contract_value[day_idx]),
+        costs=meanEstimates(_weights(inputs.costs[day_idx])),
+        previous_positions=previous_positions,
+        constraints=inputs.constraints,
+        speed_control=inputs.speed_control,
+    )
+
+
+class TestOptimiseOverTime(unittest.TestCase):
+    def test_matches_building_inputs_each_day(self):
+        for seed in range(3):
+            inputs = _random_inputs(seed)
+            position_list = optimise_positions_for_days(
+                inputs, start_idx=0, end_idx=len(inputs)
+            )
+
+            previous_positions = portfolioWeights.allzeros(inputs.instrument_list)
+            for day_idx, positions in enumerate(position_list):
+                expected = _reference_objective_on_day(
+                    inputs, day_idx, previous_positions=previous_positions
+                ).optimise_positions()
+
+                self.assertEqual(dict(positions), dict(expected))
+                previous_positions = expected
+
+            self.assertTrue(
+                any(any(positions.values()) for positions in position_list)
+            )
+            self.assertTrue(
+                all(positions["asset0"] == 0 for positions in position_list[:10])
+            )
+
+    def test_chunks_with_warmup(self):
+        self.assertEqual(
+            _chunks_with_warmup(10, number_of_chunks=3, warmup_days=2),
+            [(0, 0, 3), (1, 3, 7), (5, 7, 10)],
+        )
+        self.assertEqual(
+            _chunks_with_warmup(2, number_of_chunks=4, warmup_days=5),
+            [(0, 0, 1), (0, 1, 2)],
+        )
+
+    def test_parallel_chunks_cover_every_day(self):
+        inputs = _random_inputs(0)
+        position_list = optimise_positions_over_time(
+            inputs, n_workers=3, warmup_days=len(inputs)
+        )
+
+        ## with a warm up as long as the history, each chunk is optimised from the first day
+        self.assertEqual(
+            position_list,
+            optimise_positions_for_days(inputs, start_idx=0, end_idx=len(inputs)),
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,71 @@
+import unittest
+
+import pandas as pd
+
+from sysdata.config.configdata import Config
+from sysdata.sim.sim_data import simData
+from systems.basesystem import System
+from systems.stage import SystemStage
+from systems.system_cache import output
+
+
+class testSimData(simData):
+    def get_instrument_list(self) -> list:
+        return ["code", "another_code"]
+
+    def get_raw_price(self, instrument_code: str) -> pd.Series:
+        return pd.Series([1.0, 2.0, 3.0]) * len(instrument_code)
+
+
+class testStage(SystemStage):
+    @property
+    def name(self):
+        return "test_stage"
+
+    @output()
+    def doubled_price(self, instrument_code):
+        return self.parent.data.get_raw_price(instrument_code) * 2.0
+
+    @output(not_pickable=True)
+    def not_pickable_price(self, instrument_code):
+        return self.doubled_price(instrument_code)
+
+
+def precalculate_doubled_price(system, instrument_code):
+    system.test_stage.doubled_price(instrument_code)
+    system.test_stage.not_pickable_price(instrument_code)
+
+
+class TestPrecalculate(unittest.TestCase):
+    def setUp(self):
+        config = Config(dict(instruments=["code", "another_code"]))
+        self.system = System([testStage()], testSimData(), config)
+
+    def test_precalculate_in_workers(self):
+        self.system.precalculate(
+            n_workers=2, list_of_phases=[[precalculate_doubled_price]]
+        )
+
+        cache_refs = self.system.cache.get_cacherefs_for_stage("test_stage")
+        # not pickable items stay in the workers
+        self.assertEqual(
+            ["doubled_price"], cache_refs.unique_list_of_item_names()
+        )
+        self.assertEqual(
+            ["another_code", "code"], sorted(cache_refs.unique_list_of_instrument_codes())
+        )
+
+        doubled_price = self.system.test_stage.doubled_price("another_code")
+        self.assertEqual([24.0, 48.0, 72.0], list(doubled_price.values))
+
+    def test_precalculate_in_this_process(self):
+        self.system.precalculate(
+            n_workers=1, list_of_phases=[[precalculate_doubled_price]]
+        )
+
+        cache_refs = self.system.cache.get_cacherefs_for_stage("test_stage")
+        self.assertEqual(4, len(cache_refs))
+
+
+if __name__ == "__main__":
+    unittest.main()
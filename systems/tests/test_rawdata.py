@@ -1,7 +1,14 @@
 from systems.tests.testdata import get_test_object
 from systems.basesystem import System
+from systems.rawdata import RawData
+from sysdata.config.configdata import Config
+from sysdata.sim.sim_data import simData
+from sysobjects.instruments import assetClassesAndInstruments
 import unittest
 
+import numpy as np
+import pandas as pd
+
 
 class Test(unittest.TestCase):
     def setUp(self):
@@ -54,5 +61,118 @@ class Test(unittest.TestCase):
         )
 
 
+class panelVolTestSimData(simData):
+    def get_instrument_list(self) -> list:
+        return ["long_history", "short_history", "with_gap"]
+
+    def get_raw_price(self, instrument_code: str) -> pd.Series:
+        # different start and end dates, so the panel has to be aligned
+        if instrument_code == "long_history":
+            index = pd.bdate_range("2000-01-03", periods=2000)
+        elif instrument_code == "short_history":
+            index = pd.bdate_range("2003-06-02", periods=800)
+        else:
+            # a month with no prices at all
+            index = pd.bdate_range("2001-01-01", periods=900)
+            index = index[(index < "2002-03-01") | (index > "2002-03-31")]
+        seed = self.get_instrument_list().index(instrument_code)
+        returns = np.random.default_rng(seed).normal(size=len(index))
+
+        return pd.Series(100.0 + returns.cumsum(), index=index)
+
+
+class TestPanelVol(unittest.TestCase):
+    def get_vol(self, vol_function: str, use_panel_vol_calculation: bool) -> dict:
+        config = Config(
+            dict(
+                volatility_calculation=dict(func=vol_function),
+                use_panel_vol_calculation=use_panel_vol_calculation,
+            )
+        )
+        system = System([RawData()], panelVolTestSimData(), config)
+        system.set_logging_level("off")
+
+        return dict(
+            [
+                (
+                    instrument_code,
+                    system.rawdata.daily_returns_volatility(instrument_code),
+                )
+                for instrument_code in system.get_instrument_list()
+            ]
+        )
+
+    def testPanelMatchesSingleInstrument(self):
+        for vol_function in [
+            "sysquant.estimators.vol.robust_vol_calc",
+            "sysquant.estimators.vol.mixed_vol_calc",
+            "sysquant.estimators.vol.simple_ewvol_calc",
+        ]:
+            single_instrument = self.get_vol(vol_function, False)
+            panel = self.get_vol(vol_function, True)
+
+            for instrument_code, vol in single_instrument.items():
+                pd.testing.assert_series_equal(vol, panel[instrument_code])
+
+
+class assetClassTestSimData(panelVolTestSimData):
+    def __init__(self):
+        super().__init__()
+        self.number_of_asset_class_reads = 0
+
+    def get_instrument_asset_classes(self) -> assetClassesAndInstruments:
+        self.number_of_asset_class_reads += 1
+
+        return assetClassesAndInstruments(
+            dict(long_history="Bond", short_history="Bond", with_gap="Equity")
+        )
+
+
+class TestAssetClassAggregates(unittest.TestCase):
+    def setUp(self):
+        self.data = assetClassTestSimData()
+        system = System([RawData()], self.data, Config(dict()))
+        system.set_logging_level("off")
+        self.system = system
+
+    def testAggregateCalculatedOnceWhateverTheOrder(self):
+        rawdata = self.system.rawdata
+        median_returns = (
+            rawdata._aggregate_daily_vol_normalised_returns_for_list_of_instruments(
+                ["short_history", "long_history"]
+            )
+        )
+        same_median_returns = (
+            rawdata._aggregate_daily_vol_normalised_returns_for_list_of_instruments(
+                ["long_history", "short_history", "long_history"]
+            )
+        )
+        self.assertIs(median_returns, same_median_returns)
+
+        expected_median_returns = pd.concat(
+            [
+                rawdata.get_daily_vol_normalised_returns("long_history"),
+                rawdata.get_daily_vol_normalised_returns("short_history"),
+            ],
+            axis=1,
+        ).median(axis=1)
+        pd.testing.assert_series_equal(median_returns, expected_median_returns)
+
+    def testAssetClassPricesShareOneCalculation(self):
+        rawdata = self.system.rawdata
+        for instrument_code in self.system.get_instrument_list():
+            rawdata.normalised_price_for_asset_class(instrument_code)
+
+        all_asset_classes = rawdata.get_daily_vol_normalised_price_for_all_asset_classes()
+        self.assertEqual(sorted(all_asset_classes.keys()), ["Bond", "Equity"])
+        self.assertIs(
+            all_asset_classes["Bond"],
+            rawdata._daily_vol_normalised_price_for_list_of_instruments(
+                ["short_history", "long_history"]
+            ),
+        )
+        self.assertEqual(self.data.number_of_asset_class_reads, 1)
+
+
 if __name__ == "__main__":
     unittest.main()
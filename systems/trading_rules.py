@@ -9,7 +9,11 @@ from syscore.objects import (
     resolve_function,
     hasallattr,
 )
-from syscore.pdutils import replace_all_zeros_with_nan
+from syscore.pdutils import (
+    replace_all_zeros_with_nan,
+    union_of_indices,
+    series_covers_index_between_its_dates,
+)
 from syscore.text import (
     sort_dict_by_underscore_length,
     strip_underscores_from_dict_keys,
@@ -111,6 +115,80 @@ class TradingRule(object):
 
         return result
 
+    def call_on_panel(self, system: "System", instrument_list: list) -> dict:
+        """
+        Call a trading rule once for several instruments
+
+        Each data item becomes a panel (a DataFrame with a column per instrument, on the union of
+        their dates) and the rule function is called with those instead of individual series.
+        Only safe for functions which act on each column independently, eg ewmac, breakout.
+
+        Instruments whose data is missing some of the panel's dates between its first and last date
+        would get a different answer (the rolling windows count rows), so the rule is called for them
+        on their own.
+
+        :param system: A system
+        :param instrument_list: list of str
+        :return: dict of pd.Series, keys are instrument codes. Same as calling call() for each.
+        """
+
+        dict_of_data_for_each_instrument = dict(
+            [
+                (instrument_code, self._get_data_from_system(system, instrument_code))
+                for instrument_code in instrument_list
+            ]
+        )
+        instruments_on_common_index = _instruments_with_data_on_common_index(
+            dict_of_data_for_each_instrument
+        )
+
+        results = {}
+        if len(instruments_on_common_index) > 0:
+            results = self._call_on_panel_with_data(
+                instruments_on_common_index, dict_of_data_for_each_instrument
+            )
+
+        for instrument_code in instrument_list:
+            if instrument_code in results:
+                continue
+            list_of_data_for_call = dict_of_data_for_each_instrument[instrument_code]
+            result = self._call_with_data(list_of_data_for_call)
+            results[instrument_code] = replace_all_zeros_with_nan(result)
+
+        return results
+
+    def _call_on_panel_with_data(
+        self, instrument_list: list, dict_of_data_for_each_instrument: dict
+    ) -> dict:
+        list_of_panels_for_call = [
+            _panel_from_list_of_series(
+                [
+                    dict_of_data_for_each_instrument[instrument_code][data_idx]
+                    for instrument_code in instrument_list
+                ],
+                instrument_list,
+            )
+            for data_idx in range(len(self.data))
+        ]
+
+        panel_result = self._call_with_data(list_of_panels_for_call)
+
+        results = dict(
+            [
+                (
+                    instrument_code,
+                    _result_for_instrument_from_panel(
+                        panel_result,
+                        instrument_code,
+                        dict_of_data_for_each_instrument[instrument_code],
+                    ),
+                )
+                for instrument_code in instrument_list
+            ]
+        )
+
+        return results
+
     def _get_data_from_system(self, system: "System", instrument_code: str):
         """
         Prepare the data for a function call
@@ -173,6 +251,69 @@ class TradingRule(object):
         return result
 
 
+def _instruments_with_data_on_common_index(
+    dict_of_data_for_each_instrument: dict,
+) -> list:
+    ## the common index covers every data item, as the rule function will align them
+    dict_of_series_for_each_instrument = dict(
+        [
+            (instrument_code, [_as_series(data) for data in list_of_data])
+            for instrument_code, list_of_data in dict_of_data_for_each_instrument.items()
+        ]
+    )
+    common_index = union_of_indices(
+        [
+            data.index
+            for list_of_data in dict_of_series_for_each_instrument.values()
+            for data in list_of_data
+            if isinstance(data, pd.Series)
+        ]
+    )
+
+    return [
+        instrument_code
+        for instrument_code, list_of_data in dict_of_series_for_each_instrument.items()
+        if all(
+            [
+                series_covers_index_between_its_dates(data, common_index)
+                for data in list_of_data
+            ]
+        )
+    ]
+
+
+def _panel_from_list_of_series(list_of_series: list, instrument_list: list) -> pd.DataFrame:
+    # single column data frames are squeezed so each instrument ends up as one column
+    list_of_series = [_as_series(data) for data in list_of_series]
+    panel = pd.concat(list_of_series, axis=1, keys=instrument_list)
+
+    return panel
+
+
+def _as_series(data):
+    if isinstance(data, pd.DataFrame) and len(data.columns) == 1:
+        return data.iloc[:, 0]
+
+    return data
+
+
+def _result_for_instrument_from_panel(
+    panel_result: pd.DataFrame, instrument_code: str, list_of_data_for_call: list
+) -> pd.Series:
+    # trim to the dates of the instrument's own data, which is what call() would return
+    index_for_instrument = list_of_data_for_call[0].index
+    for data_for_call in list_of_data_for_call[1:]:
+        index_for_instrument = index_for_instrument.union(data_for_call.index)
+
+    result = panel_result[instrument_code].reindex(index_for_instrument)
+    result.name = None
+
+    # Check for all zeros
+    result = replace_all_zeros_with_nan(result)
+
+    return result
+
+
 def _repr_trading_rule(rule: TradingRule):
     data = rule.data
     data_args = rule.data_args
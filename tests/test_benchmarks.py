@@ -0,0 +1,55 @@
+import pytest
+
+from benchmarks.backtest_stages import (
+    compare_benchmark_results,
+    run_benchmarks,
+    instruments_for_benchmarks,
+)
+
+
+def _results(seconds: float, peak_memory_mb: float) -> dict:
+    return dict(
+        metadata={},
+        results=[
+            dict(
+                benchmark="base/rawdata_vol",
+                n_instruments=6,
+                seconds=seconds,
+                all_seconds=[seconds],
+                peak_memory_mb=peak_memory_mb,
+            )
+        ],
+    )
+
+
+class TestBenchmarks:
+    def test_compare_within_tolerance(self):
+        comparison = compare_benchmark_results(
+            _results(1.0, 10.0), _results(1.1, 10.5), time_tolerance=0.2
+        )
+
+        assert not comparison.regression.any()
+
+    def test_compare_flags_slower_and_bigger(self):
+        slower = compare_benchmark_results(_results(1.0, 10.0), _results(1.5, 10.0))
+        bigger = compare_benchmark_results(_results(1.0, 10.0), _results(1.0, 20.0))
+
+        assert slower.regression.all()
+        assert bigger.regression.all()
+        assert slower.time_ratio.iloc[0] == pytest.approx(1.5)
+
+    def test_instruments_start_with_config(self):
+        instrument_list = instruments_for_benchmarks(8)
+
+        assert len(instrument_list) == 8
+        assert instrument_list[:2] == ["EDOLLAR", "US10"]
+
+    @pytest.mark.slow
+    def test_run_benchmark(self):
+        results = run_benchmarks(
+            instrument_counts=[2], benchmark_names=["base/rawdata_vol"]
+        )
+
+        assert len(results["results"]) == 1
+        assert results["results"][0]["seconds"] > 0
+        assert results["results"][0]["peak_memory_mb"] > 0